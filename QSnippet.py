@@ -1,11 +1,12 @@
 import sys
 import os
 import logging
+import multiprocessing
 from pathlib import Path
 import psutil, tempfile
 
 # Import utility modules (UI imports moved to __init__ to avoid import errors in test environments)
-from utils import FileUtils, SnippetDB, ConfigLoader, SettingsLoader, AppLogger, sys_utils
+from utils import FileUtils, SnippetDB, db_options_from_config, SnapshotManager, MaintenanceScheduler, QueryProfiler, DEFAULT_SLOW_QUERY_MS, ConfigCache, ConfigLoader, SettingsLoader, AppLogger, sys_utils
 
 # Import build info
 try:
@@ -18,6 +19,12 @@ except ImportError:
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Config sections that scale_ui_cfg turns into scaled sizes and fonts
+SCALED_CONFIG_SECTIONS = {"fonts", "dimensions"}
+
+# Config sections the editor styles are built from
+STYLED_CONFIG_SECTIONS = {"colors", "fonts", "dimensions"}
+
 """
 Name: QSnippet
 
@@ -48,6 +55,7 @@ class main():
 
         # Import UI modules here (after PySide6 to avoid import errors in test environments)
         from ui.window import QSnippet
+        from ui.db_worker import DbWorker
         from ui.widgets import AppMessageBox
         from ui.widgets.notice_carousel import NoticeCarouselDialog
 
@@ -59,6 +67,7 @@ class main():
         self.QFont = QFont
         self.QIcon = QIcon
         self.QSnippet = QSnippet
+        self.DbWorker = DbWorker
         self.AppMessageBox = AppMessageBox
         self.NoticeCarouselDialog = NoticeCarouselDialog
 
@@ -173,19 +182,47 @@ class main():
             },
         ])
 
+        # Parsed config shared by the merge below and the loaders, so a
+        # warm start does not parse any YAML
+        self.config_cache = ConfigCache(self.app_data_dir / "config_cache.bin")
+
         # Load and Merge
         self.config = FileUtils.load_and_merge_yaml(
             default_path=self.default_config_file,
             user_path=self.config_file,
+            cache=self.config_cache,
         )
 
         self.settings = FileUtils.load_and_merge_yaml(
             default_path=self.default_settings_file,
             user_path=self.settings_file,
+            cache=self.config_cache,
         )
         
         # Initialize Snippet DB instance
-        self.snippet_db = SnippetDB(self.snippet_db_file)
+        db_config = self.config.get("database", {})
+        # Shared with the service's SnippetDB so both use the same profile,
+        # read-only libraries (highest precedence first) and body codec
+        self.snippet_db = SnippetDB(self.snippet_db_file, **db_options_from_config(db_config))
+
+        # Opt-in query profiler, shared by every SnippetDB instance
+        self.db_profiler = QueryProfiler(
+            slow_log_path=Path(self.logs_dir) / "slow_queries.log",
+            threshold_ms=float(db_config.get("slow_query_ms", DEFAULT_SLOW_QUERY_MS)),
+            enabled=bool(db_config.get("profiling", False)),
+        )
+        self.db_profiler.attach(self.snippet_db)
+
+        # Rotating online snapshots, taken on schedule by the snippet service
+        self.db_snapshots = SnapshotManager(self.snippet_db, self.app_data_dir / "snapshots")
+        self.db_snapshots.configure(self.settings.get("backups", {}))
+
+        # ANALYZE, optimize and incremental vacuum, run by the snippet service when idle
+        self.db_maintenance = MaintenanceScheduler(self.snippet_db)
+        self.db_maintenance.configure(db_config)
+
+        # Widgets run their queries through this so SQLite never blocks the UI thread
+        self.db_worker = self.DbWorker(self.snippet_db)
 
         logger.info("Global variables created")
     
@@ -264,33 +301,47 @@ class main():
             sys.exit(1)
 
         # Setup Config file watcher
-        self.loader = ConfigLoader(self.config_file, parent=self)
-        self.loader.configChanged.connect(self.on_config_updated)
-        self.cfg = self.loader.config
+        self.config_loader = ConfigLoader(self.config_file, parent=self, cache=self.config_cache)
+        self.config_loader.configKeysChanged.connect(self.on_config_updated)
+        self.cfg = self.config_loader.config
         self.flatten_yaml(items=self.cfg)
 
-    def on_config_updated(self, config) -> None:
+    def on_config_updated(self, config, paths) -> None:
         """
         Handle updates to the configuration file.
 
-        Refreshes the stored configuration, re-flattens attributes, rescales
-        UI configuration, and reapplies styles to the editor when changes are detected.
+        Re-flattens only the sections that changed. Sizes are rescaled
+        and editor styles reapplied only when a section they depend on
+        changed, and maintenance settings when the database section did.
 
         Args:
             config (dict): The updated configuration dictionary.
+            paths (list[tuple]): Key paths that changed.
 
         Returns:
             None
         """
-        logger.info("Config reloaded.")
+        sections = {path[0] for path in paths}
+        logger.info(f"Config reloaded. Changed sections: {sorted(sections)}")
+
+        if not config:
+            return
 
-        if config:
-            self.cfg = config
-            self.flatten_yaml()  # Flatten config again to refresh attributes.
-            self.scale_ui_cfg(items=self.cfg) # Refresh UI config and scale
+        # Scaling works on the flattened values, so both are refreshed together
+        if sections & SCALED_CONFIG_SECTIONS:
+            sections |= SCALED_CONFIG_SECTIONS
+
+        self.cfg = config
+        self.flatten_yaml(items={key: config[key] for key in sections if key in config})
+        if "images" in sections:
+            self.fix_image_paths()
+        if sections & SCALED_CONFIG_SECTIONS:
+            self.scale_ui_cfg()
+        if sections & STYLED_CONFIG_SECTIONS:
             self.qsnippet.editor.applyStyles()    # Trigger UI update
             self.app.processEvents()
-        # Should also fire off UI refresh, etc to ensure the UI matches the config
+        if "database" in sections:
+            self.db_maintenance.configure(config.get("database", {}))
 
     def load_settings(self) -> None:
         """
@@ -312,31 +363,38 @@ class main():
             sys.exit(1)
 
         # Setup Config file watcher
-        self.loader = SettingsLoader(self.settings_file, parent=self)
-        self.loader.settingsChanged.connect(self.on_settings_updated)
-        self.settings = self.loader.settings
+        self.settings_loader = SettingsLoader(self.settings_file, parent=self, cache=self.config_cache)
+        self.settings_loader.settingsKeysChanged.connect(self.on_settings_updated)
+        self.settings = self.settings_loader.settings
         self.flatten_yaml(items=self.settings)
         self.handle_start_up_reg()
 
-    def on_settings_updated(self, config) -> None:
+    def on_settings_updated(self, config, paths) -> None:
         """
         Handle updates to the settings file.
 
-        Refreshes the stored settings, re-flattens attributes, and updates
-        startup registration behavior when changes are detected.
+        Re-flattens the changed sections and only re-applies startup
+        registration or backup scheduling when their settings changed.
 
         Args:
             config (dict): The updated settings dictionary.
+            paths (list[tuple]): Key paths that changed.
 
         Returns:
             None
         """
-        logger.info("Settings reloaded.")
+        sections = {path[0] for path in paths}
+        logger.info(f"Settings reloaded. Changed sections: {sorted(sections)}")
 
-        if config:
-            self.settings = config
-            self.flatten_yaml(items=self.settings)  # Flatten config again to refresh attributes.
+        if not config:
+            return
+
+        self.settings = config
+        self.flatten_yaml(items={key: config[key] for key in sections if key in config})
+        if any(path[:2] == ("general", "startup_behavior") for path in paths):
             self.handle_start_up_reg()
+        if "backups" in sections:
+            self.db_snapshots.configure(self.settings.get("backups", {}))
 
     def scale_ui_cfg(self):
         """ 
@@ -686,7 +744,7 @@ class main():
 
             logger.info("User disabled future notices")
 
-        FileUtils.write_yaml(self.settings_file, self.settings)
+        self.settings_loader.save(self.settings)
         logger.debug("Finished checking notices")
 
     def start_program(self):
@@ -713,6 +771,10 @@ class main():
 
 
 if __name__ == '__main__':
+    # Import validation starts worker processes, which frozen builds
+    # must intercept before anything else runs
+    multiprocessing.freeze_support()
+
     from PySide6.QtWidgets import QApplication, QMessageBox
     from PySide6.QtGui import QIcon
 
@@ -81,6 +81,29 @@ def temp_snippet_db_path(tmp_path):
     return tmp_path / "snippets.db"
 
 
+@pytest.fixture
+def make_entry():
+    """Provide a factory for complete snippet entries.
+
+    Returns:
+        Callable: make_entry(trigger, snippet="x", **fields) returning an
+            entry labelled with its trigger; fields override any key.
+    """
+    def factory(trigger, snippet="x", **fields):
+        return {
+            "enabled": True,
+            "label": trigger,
+            "trigger": trigger,
+            "snippet": snippet,
+            "paste_style": "Clipboard",
+            "return_press": False,
+            "folder": "",
+            "tags": "",
+            **fields,
+        }
+    return factory
+
+
 @pytest.fixture
 def temp_config_file(tmp_path):
     """Provide a temporary config.yaml path.
@@ -176,7 +199,7 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
 
     _results.sort(key=lambda r: (r["qty"], r["type"]))
 
-    header = f"{'Qty':>12}  {'Type':<12}  {'Per Item':>15}  {'Total':>12}"
+    header = f"{'Qty':>12}  {'Type':<20}  {'Per Item':>15}  {'Total':>12}  {'Peak Mem':>12}  {'DB Size':>12}"
     divider = "-" * len(header)
 
     terminalreporter.write_sep("=", "Benchmark Results")
@@ -188,11 +211,17 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
         if prev_qty is not None and r["qty"] != prev_qty:
             terminalreporter.write_line("")
         prev_qty = r["qty"]
+        peak = r.get("peak_bytes")
+        peak_text = f"{peak / (1024 * 1024):>8.2f} MiB" if peak is not None else f"{'-':>12}"
+        size = r.get("db_bytes")
+        size_text = f"{size / (1024 * 1024):>8.2f} MiB" if size is not None else f"{'-':>12}"
         terminalreporter.write_line(
             f"{r['qty']:>12,}  "
-            f"{r['type']:<12}  "
+            f"{r['type']:<20}  "
             f"{r['per_item_ms']:>12.4f} ms  "
-            f"{r['total_ms']:>9.2f} ms"
+            f"{r['total_ms']:>9.2f} ms  "
+            f"{peak_text}  "
+            f"{size_text}"
         )
 
     terminalreporter.write_line(divider)
\ No newline at end of file
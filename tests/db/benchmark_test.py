@@ -1,13 +1,38 @@
+import os
 import time
 import random
+import sqlite3
+import tracemalloc
 import string
+import threading
+from itertools import islice
 import pytest
-
+import yaml
+from pathlib import Path
+
+from utils import yaml_codec
+from utils.config_cache import ConfigCache
+from utils.config_utils import ConfigLoader, SettingsLoader
+from utils.body_codec import content_hash
+from utils.file_utils import FileUtils
+from utils.import_validation import validate_entries
 from utils.snippet_db import SnippetDB
+from utils.yaml_stream import iter_yaml_snippets
 
 
 BENCHMARK_SIZES = [10, 100, 1_000, 5_000, 10_000, 100_000]
 
+# Random sampling should stay flat, so it is also measured at 1M rows
+RANDOM_BENCHMARK_SIZES = BENCHMARK_SIZES + [1_000_000]
+RANDOM_CALLS = 200
+
+# Seconds each concurrent read/write run lasts
+CONCURRENCY_DURATION = 2.0
+CONCURRENT_READERS = 4
+
+# Rows in the large-body compression corpus
+LARGE_BODY_COUNT = 2_000
+
 _results: list = []
 
 
@@ -52,13 +77,15 @@ def seed_large_db(db, count):
         )
 
 
-def record(count, op, elapsed):
+def record(count, op, elapsed, peak_bytes=None, db_bytes=None):
     """Record a benchmark result into the global results list.
 
     Args:
         count (int): Number of rows in the database for this run.
         op (str): Name of the operation being benchmarked (e.g. ``"search"``).
         elapsed (float): Wall-clock time in seconds for the operation.
+        peak_bytes (int | None): Peak traced memory for the operation, if measured.
+        db_bytes (int | None): Size of the database file, if measured.
     """
     per_item = (elapsed / count) * 1000 if count else 0
     _results.append({
@@ -66,6 +93,8 @@ def record(count, op, elapsed):
         "type": op,
         "per_item_ms": per_item,
         "total_ms": elapsed * 1000,
+        "peak_bytes": peak_bytes,
+        "db_bytes": db_bytes,
     })
 
 
@@ -105,19 +134,671 @@ def test_benchmark_get_all_snippets(tmp_path, count):
 
 @pytest.mark.benchmark
 @pytest.mark.parametrize("count", BENCHMARK_SIZES)
+def test_benchmark_cached_reads(tmp_path, count):
+    """Benchmark repeated folder/tag/snippet reads served by the query cache.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows seeded before timing the reads.
+    """
+    db = SnippetDB(tmp_path / f"bench_cache_{count}.db")
+    seed_large_db(db, count)
+
+    for op in ("uncached", "cached"):
+        start = time.perf_counter()
+        db.get_all_folders()
+        db.get_all_tags()
+        db.get_all_snippets()
+        record(count, f"form_reads_{op}", time.perf_counter() - start)
+
+    # Results above the row limit (largest size) are skipped, not cached
+    stats = db.cache_stats()
+    assert stats["hits"] + stats["skipped"] >= 3
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", BENCHMARK_SIZES)
+def test_benchmark_iter_snippets(tmp_path, count):
+    """Benchmark streaming every row with iter_snippets.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows seeded before timing the stream.
+    """
+    db = SnippetDB(tmp_path / f"bench_iter_{count}.db")
+    seed_large_db(db, count)
+    start = time.perf_counter()
+    streamed = sum(1 for _ in db.iter_snippets(order_by="folder"))
+    record(count, "iter_snippets", time.perf_counter() - start)
+    assert streamed >= count
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", BENCHMARK_SIZES)
+def test_benchmark_last_page_keyset_vs_offset(tmp_path, count):
+    """Compare fetching the final page by keyset against LIMIT/OFFSET.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows seeded before timing the page fetch.
+    """
+    db = SnippetDB(tmp_path / f"bench_page_{count}.db")
+    seed_large_db(db, count)
+    limit = 50
+    last_label, last_id = db.conn.execute(
+        "SELECT label, id FROM snippets ORDER BY label, id LIMIT 1 OFFSET ?",
+        (max(count - limit, 0),),
+    ).fetchone()
+
+    start = time.perf_counter()
+    db.conn.execute(
+        "SELECT * FROM snippets ORDER BY label, id LIMIT ? OFFSET ?",
+        (limit, max(count - limit, 0)),
+    ).fetchall()
+    record(count, "page_offset", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    rows, _ = db.get_snippets_page((last_label, last_id), limit, order_by="label")
+    record(count, "page_keyset", time.perf_counter() - start)
+    assert rows
+
+
+def fetch_as_dicts(db_path):
+    """Fetch every snippet the way SnippetDB did before SnippetRecord.
+
+    Args:
+        db_path (Path): Path to the database file.
+
+    Returns:
+        list[dict]: One dictionary per row with boolean flags converted.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.execute("SELECT * FROM snippets")
+        columns = [col[0] for col in cur.description]
+        rows = []
+        for row in cur.fetchall():
+            item = dict(zip(columns, row))
+            item["enabled"] = bool(item["enabled"])
+            item["return_press"] = bool(item["return_press"])
+            rows.append(item)
+        return rows
+    finally:
+        conn.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_benchmark_row_representation(tmp_path, count):
+    """Compare time and memory of dict rows against SnippetRecord rows.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows seeded before timing the fetches.
+    """
+    db_path = tmp_path / f"bench_rows_{count}.db"
+    db = SnippetDB(db_path)
+    seed_large_db(db, count)
+
+    for op, fetch in (
+        ("rows_dict", lambda: fetch_as_dicts(db_path)),
+        ("rows_record", db.get_all_snippets),
+    ):
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = fetch()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        record(count, op, elapsed, peak)
+        assert len(rows) >= count
+        del rows
+
+    db.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", RANDOM_BENCHMARK_SIZES)
 def test_benchmark_get_random_snippet(tmp_path, count):
     """Benchmark get_random_snippet across varying database sizes.
 
+    A quarter of the rows are disabled so sampling has gaps to skip. The
+    recorded total is the mean time of a single call.
+
     Args:
         tmp_path (Path): Pytest-provided temporary directory.
         count (int): Number of rows seeded before timing the random fetch.
     """
     db = SnippetDB(tmp_path / f"bench_random_{count}.db")
     seed_large_db(db, count)
+    with db.conn:
+        db.conn.execute("UPDATE snippets SET enabled = 0 WHERE id % 4 = 0")
+
+    start = time.perf_counter()
+    for _ in range(RANDOM_CALLS):
+        result = db.get_random_snippet()
+    record(count, "get_random", (time.perf_counter() - start) / RANDOM_CALLS)
+    assert result
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_benchmark_backup_vs_yaml_export(tmp_path, count):
+    """Benchmark an online backup against a full YAML export.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows seeded before timing both copies.
+    """
+    db = SnippetDB(tmp_path / f"bench_backup_{count}.db")
+    seed_large_db(db, count)
+
+    start = time.perf_counter()
+    backup = db.backup(tmp_path / "backup.db")
+    record(count, "backup", time.perf_counter() - start)
+
     start = time.perf_counter()
-    result = db.get_random_snippet()
-    record(count, "get_random", time.perf_counter() - start)
-    assert result is not None
+    db.export_to_yaml(tmp_path / "export.yaml")
+    record(count, "export_to_yaml", time.perf_counter() - start)
+
+    assert backup is not None
+    db.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+def test_benchmark_large_body_compression(tmp_path, compression):
+    """Benchmark size and read latency for a corpus of large snippets.
+
+    Bodies are several kilobytes of repetitive text, like templated emails
+    or signatures. Records the file size after a checkpoint, a listing
+    that never reads bodies, a full read of every body and a keyword
+    search that has to look inside every body.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        compression (str): Compression used for bodies above the threshold.
+    """
+    count = LARGE_BODY_COUNT
+    db_path = tmp_path / f"bench_bodies_{compression}.db"
+    db = SnippetDB(db_path, compression=compression)
+    words = [random_string(random.randint(3, 9)) for _ in range(400)]
+    for i in range(count):
+        db.insert_snippet({
+            "enabled": True,
+            "label": f"Template {i}",
+            "trigger": f"/template-{i}",
+            "snippet": "\n".join(" ".join(random.choices(words, k=12)) for _ in range(80)),
+            "paste_style": "Clipboard",
+            "return_press": False,
+            "folder": "",
+            "tags": "",
+        })
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    db.conn.execute("VACUUM")
+    size = db_path.stat().st_size
+
+    # Listing only touches labels, so bodies stay compressed
+    start = time.perf_counter()
+    labels = [s["label"] for s in db.get_all_snippets()]
+    record(count, f"list_{compression}", time.perf_counter() - start, db_bytes=size)
+
+    start = time.perf_counter()
+    bodies = [s["snippet"] for s in db.get_all_snippets()]
+    record(count, f"read_{compression}", time.perf_counter() - start, db_bytes=size)
+
+    start = time.perf_counter()
+    results = db.search_snippets("zzzz")
+    record(count, f"search_{compression}", time.perf_counter() - start, db_bytes=size)
+
+    assert len(labels) == len(bodies) == count + 1 and results == []
+    db.close()
+
+
+def write_export_file(path, count):
+    """Write an export file in FileUtils.export_snippets_yaml's layout.
+
+    Args:
+        path (Path): Destination YAML file.
+        count (int): Number of snippet entries to write.
+    """
+    with path.open("w", encoding="utf-8") as f:
+        f.write("snippets:\n")
+        for i in range(count):
+            f.write(
+                f"- enabled: true\n  folder: Folder A\n  label: Label {i}\n  paste_style: Clipboard\n"
+                f"  return_press: false\n  snippet: Snippet content {random_string(20)} for entry {i}\n"
+                f"  tags: {random_string(4)},{random_string(4)}\n  trigger: /import-{i}\n"
+            )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [1_000, 10_000])
+def test_benchmark_streaming_import(tmp_path, count):
+    """Compare peak memory of a whole-file import against a streamed one.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of entries in the export file.
+    """
+    path = tmp_path / "export.yaml"
+    write_export_file(path, count)
+
+    for op, run in (
+        ("import_full_load", lambda db: db.import_snippets(FileUtils.import_snippets_yaml(path))),
+        ("import_streamed", lambda db: db.import_from_yaml(path)),
+    ):
+        db = SnippetDB(tmp_path / f"{op}.db")
+        tracemalloc.start()
+        start = time.perf_counter()
+        counts = run(db)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        record(count, op, elapsed, peak)
+        assert counts["new"] == count
+        db.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [1_000, 10_000])
+def test_benchmark_streaming_export(tmp_path, count):
+    """Compare peak memory of a whole-library export against a streamed one.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows seeded before exporting.
+    """
+    db = SnippetDB(tmp_path / f"bench_export_{count}.db")
+    seed_large_db(db, count)
+
+    for op, run in (
+        ("export_full_dump", lambda: FileUtils.export_snippets_yaml(tmp_path / "full.yaml", db.get_all_snippets())),
+        ("export_streamed", lambda: db.export_to_yaml(tmp_path / "streamed.yaml")),
+    ):
+        db.cache.bump()
+        tracemalloc.start()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        record(count, op, elapsed, peak)
+
+    assert (tmp_path / "full.yaml").read_text() == (tmp_path / "streamed.yaml").read_text()
+    db.close()
+
+
+def use_pure_yaml(monkeypatch):
+    """Route the YAML codec through PyYAML's pure-Python classes.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture used to swap the classes.
+    """
+    monkeypatch.setattr(yaml_codec, "SafeLoader", yaml.SafeLoader)
+    monkeypatch.setattr(yaml_codec, "SafeDumper", yaml.SafeDumper)
+    monkeypatch.setattr(yaml_codec, "StreamLoader", yaml.SafeLoader)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("backend", ["python", "libyaml"])
+def test_benchmark_yaml_config_load(monkeypatch, backend):
+    """Time repeated loads of the bundled config and settings files.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Fixture used to pick the backend.
+        backend (str): "python" or "libyaml".
+    """
+    if backend == "python":
+        use_pure_yaml(monkeypatch)
+    elif not yaml_codec.HAS_LIBYAML:
+        pytest.skip("PyYAML built without libyaml")
+
+    repeats = 200
+    for name in ("config", "settings"):
+        path = Path("config") / f"{name}.yaml"
+        start = time.perf_counter()
+        for _ in range(repeats):
+            data = FileUtils.read_yaml(path)
+        record(repeats, f"{name}_load_{backend}", time.perf_counter() - start)
+        assert data
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("cached", [False, True])
+def test_benchmark_config_startup(tmp_path, mock_qt_app, cached):
+    """Time the startup config path with and without a warm ConfigCache.
+
+    Each start merges config.yaml and settings.yaml with their defaults
+    and builds both loaders, as QSnippet does.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        mock_qt_app (QApplication): Application needed by the file watchers.
+        cached (bool): Whether to share a persisted ConfigCache.
+    """
+    past = time.time() - 60
+    paths = {}
+    for name in ("config", "settings"):
+        user = tmp_path / f"{name}.yaml"
+        user.write_text((Path("config") / f"{name}.yaml").read_text(encoding="utf-8"), encoding="utf-8")
+        os.utime(user, (past, past))
+        paths[name] = (Path("config") / f"{name}.yaml", user)
+
+    def start():
+        cache = ConfigCache(tmp_path / "config_cache.bin") if cached else None
+        config = FileUtils.load_and_merge_yaml(*paths["config"], cache=cache)
+        settings = FileUtils.load_and_merge_yaml(*paths["settings"], cache=cache)
+        loaders = (
+            ConfigLoader(paths["config"][1], cache=cache),
+            SettingsLoader(paths["settings"][1], cache=cache),
+        )
+        return config, settings, loaders
+
+    start()  # cold start fills the cache
+    # Each start emits both loader signals; PySide6 6.12 drops a reference
+    # to True per emitted bool, so keep the count close to real use.
+    repeats = 10
+    begin = time.perf_counter()
+    for _ in range(repeats):
+        config, settings, loaders = start()
+    record(repeats, "startup_config_" + ("cached" if cached else "parsed"), time.perf_counter() - begin)
+
+    assert config == loaders[0].config and settings
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("backend", ["python", "libyaml"])
+def test_benchmark_yaml_import_export(tmp_path, monkeypatch, backend):
+    """Time a 100k-snippet streamed export and re-import per backend.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        monkeypatch (pytest.MonkeyPatch): Fixture used to pick the backend.
+        backend (str): "python" or "libyaml".
+    """
+    if backend == "python":
+        use_pure_yaml(monkeypatch)
+    elif not yaml_codec.HAS_LIBYAML:
+        pytest.skip("PyYAML built without libyaml")
+
+    count = 100_000
+    source = SnippetDB(tmp_path / "source.db")
+    seed_large_db(source, count)
+    path = tmp_path / "export.yaml"
+
+    start = time.perf_counter()
+    exported = source.export_to_yaml(path)
+    record(count, f"yaml_export_{backend}", time.perf_counter() - start)
+
+    target = SnippetDB(tmp_path / "target.db")
+    start = time.perf_counter()
+    counts = target.import_from_yaml(path, duplicates="skip")
+    record(count, f"yaml_import_{backend}", time.perf_counter() - start)
+
+    assert exported["exported"] == len(source.get_all_snippets())
+    assert counts["failed"] == 0 and counts["cancelled"] == 0
+    source.close()
+    target.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("fmt", ["yaml", "qsnip"])
+def test_benchmark_archive_vs_yaml(tmp_path, fmt):
+    """Time a 100k-snippet export and import as YAML and as a .qsnip archive.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        fmt (str): "yaml" or "qsnip".
+    """
+    count = 100_000
+    source = SnippetDB(tmp_path / "source.db")
+    seed_large_db(source, count)
+    path = tmp_path / f"export.{fmt}"
+    export, import_ = (
+        (source.export_to_yaml, "import_from_yaml") if fmt == "yaml"
+        else (source.export_to_archive, "import_from_archive")
+    )
+
+    start = time.perf_counter()
+    exported = export(path)
+    record(count, f"{fmt}_export", time.perf_counter() - start, db_bytes=path.stat().st_size)
+
+    target = SnippetDB(tmp_path / "target.db")
+    start = time.perf_counter()
+    counts = getattr(target, import_)(path)
+    record(count, f"{fmt}_import", time.perf_counter() - start)
+
+    folder = "Folder A"
+    partial = SnippetDB(tmp_path / "partial.db")
+    start = time.perf_counter()
+    if fmt == "qsnip":
+        partial.import_from_archive(path, folders=[folder])
+    else:
+        partial.import_snippets(e for e in iter_yaml_snippets(path) if e.get("folder") == folder)
+    record(count, f"{fmt}_import_folder", time.perf_counter() - start)
+
+    assert exported["exported"] == len(source.get_all_snippets())
+    assert counts["failed"] == 0
+    for db in (source, target, partial):
+        db.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_benchmark_delta_export(tmp_path, count):
+    """Compare a full YAML export with a delta of 50 edits and 10 deletions.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of snippets in the library.
+    """
+    db = SnippetDB(tmp_path / "delta.db")
+    seed_large_db(db, count)
+    db.run_backfills()
+    since = db.export_since(0)["until"]
+    ids = [r["id"] for r in islice(db.iter_snippets(), 60)]
+    for snippet_id in ids[:50]:
+        db.rename_snippet(snippet_id, f"Edited {snippet_id}")
+    for snippet_id in ids[50:]:
+        db.delete_snippet(snippet_id)
+
+    full_path = tmp_path / "full.yaml"
+    start = time.perf_counter()
+    db.export_to_yaml(full_path)
+    record(count, "full_export", time.perf_counter() - start, db_bytes=full_path.stat().st_size)
+
+    delta_path = tmp_path / "delta.yaml"
+    start = time.perf_counter()
+    delta = db.export_since(since)
+    FileUtils.write_yaml(delta_path, delta)
+    record(count, "delta_export", time.perf_counter() - start, db_bytes=delta_path.stat().st_size)
+
+    replica = SnippetDB(tmp_path / "replica.db")
+    start = time.perf_counter()
+    counts = replica.import_delta(FileUtils.read_yaml(delta_path))
+    record(count, "delta_import", time.perf_counter() - start)
+
+    # The inclusive bound may also resend rows stamped exactly at since
+    assert len(delta["snippets"]) >= 50 and len(delta["deleted"]) == 10
+    assert counts["new"] + counts["updated"] + counts["stale"] == len(delta["snippets"]) and counts["invalid"] == 0
+    db.close()
+    replica.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [100_000, 1_000_000])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_benchmark_import_validation(count, workers):
+    """Time import validation of generated entries in-process and across workers.
+
+    Args:
+        count (int): Number of entries validated.
+        workers (int): Worker processes passed to validate_entries.
+    """
+    entries = (
+        {
+            "label": f"Label {i}",
+            "trigger": f"/import-{i}",
+            "snippet": f"Snippet content for entry {i} {{/import-{i + 1}}}" if i % 10 else f"Entry {i}",
+            "paste_style": "Clipboard",
+            "enabled": True,
+            "folder": "Folder A",
+            "tags": "Work,Email",
+        }
+        for i in range(count)
+    )
+
+    start = time.perf_counter()
+    report = validate_entries(entries, workers=workers)
+    record(count, f"validate_{workers}_workers", time.perf_counter() - start)
+
+    assert report["valid"] == count and report["error_count"] == 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_benchmark_import_preview(tmp_path, count):
+    """Compare the snapshot diff against looking each incoming row up by trigger.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Rows in the database and entries in the incoming stream.
+    """
+    db = SnippetDB(tmp_path / f"bench_preview_{count}.db")
+    seed_large_db(db, count)
+    # Half the incoming entries already exist, the other half are new
+    entries = [dict(s) for s in islice(db.iter_snippets(), count // 2)]
+    entries += [{"trigger": f"/incoming-{i}", "snippet": f"New body {i}", "label": f"New {i}"} for i in range(count - len(entries))]
+
+    start = time.perf_counter()
+    preview = db._preview_stream(lambda track: iter(entries), None, None)
+    record(count, "preview_snapshot_diff", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    found = 0
+    for e in entries:
+        row = db.get_snippet(e["trigger"])
+        found += bool(row) and content_hash(row["snippet"]) == content_hash(e["snippet"])
+    record(count, "preview_query_per_row", time.perf_counter() - start)
+
+    assert preview["counts"]["unchanged"] == found
+    db.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_benchmark_find_duplicates(tmp_path, count):
+    """Benchmark hashing existing rows and grouping duplicates in SQL.
+
+    Every tenth row is given a copy of another row's body with different
+    whitespace, so a tenth of the library ends up in duplicate groups.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows seeded before timing.
+    """
+    db = SnippetDB(tmp_path / f"bench_dupes_{count}.db")
+    seed_large_db(db, count)
+    with db.conn:
+        db.conn.execute("UPDATE snippets SET snippet = '  ' || (SELECT s.snippet FROM snippets s WHERE s.id = snippets.id - 1) WHERE id % 10 = 0")
+
+    start = time.perf_counter()
+    assert db.run_backfills() is True
+    record(count, "content_hash_backfill", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    groups = db.find_duplicates()
+    record(count, "find_duplicates", time.perf_counter() - start)
+
+    assert len(groups) >= count // 10 - 1
+    db.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_benchmark_attached_library(tmp_path, count):
+    """Benchmark opening, searching and indexing with a large attached library.
+
+    The main database holds 1,000 rows and a shared library holds count
+    rows. Opening and a trigger lookup should not depend on the library
+    size; the full union stream is what the expander pays once at start.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        count (int): Number of rows in the attached library.
+    """
+    library = SnippetDB(tmp_path / f"library_{count}.db")
+    seed_large_db(library, count)
+    library.close()
+    main_path = tmp_path / "main.db"
+    seed_large_db(SnippetDB(main_path), 1_000)
+
+    start = time.perf_counter()
+    db = SnippetDB(main_path, libraries=[tmp_path / f"library_{count}.db"])
+    db.get_library_snippets(["/trigger-0"])
+    record(count, "library_open", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(200):
+        db.get_library_snippets([f"/missing-{i}"])
+    record(count, "library_lookup_x200", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    rows = sum(1 for _ in db.iter_all_snippets(filters={"enabled": True}))
+    record(count, "library_union_stream", time.perf_counter() - start)
+
+    assert rows >= count
+    db.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("profile", ["legacy", "balanced"])
+def test_benchmark_concurrent_read_write(tmp_path, profile):
+    """Benchmark read and write throughput with concurrent threads.
+
+    Runs several reader threads against one writer thread for a fixed
+    duration. The ``legacy`` profile uses the rollback journal the app
+    shipped with, ``balanced`` uses WAL. Results are recorded with the
+    number of completed operations as the quantity.
+
+    Args:
+        tmp_path (Path): Pytest-provided temporary directory.
+        profile (str): Pragma profile used by the database.
+    """
+    db = SnippetDB(tmp_path / f"bench_rw_{profile}.db", profile=profile)
+    seed_large_db(db, 10_000)
+    triggers = [row[0] for row in db.conn.execute("SELECT trigger FROM snippets")]
+
+    stop = threading.Event()
+    reads = [0] * CONCURRENT_READERS
+    writes = [0]
+
+    def reader(slot):
+        while not stop.is_set():
+            db.get_snippet(random.choice(triggers))
+            reads[slot] += 1
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            db.rename_snippet(random.randint(1, 10_000), f"Renamed {i}")
+            writes[0] += 1
+            i += 1
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(CONCURRENT_READERS)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(CONCURRENCY_DURATION)
+    stop.set()
+    for t in threads:
+        t.join()
+    db.close()
+
+    record(sum(reads), f"{profile}_reads", CONCURRENCY_DURATION)
+    record(writes[0], f"{profile}_writes", CONCURRENCY_DURATION)
+    assert sum(reads) > 0 and writes[0] > 0
 
 
 def pytest_terminal_summary(terminalreporter, exitstatus, config):
@@ -136,7 +817,7 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
 
     _results.sort(key=lambda r: (r["qty"], r["type"]))
 
-    header = f"{'Qty':>12}  {'Type':<12}  {'Per Item':>15}  {'Total':>12}"
+    header = f"{'Qty':>12}  {'Type':<20}  {'Per Item':>15}  {'Total':>12}  {'Peak Mem':>12}  {'DB Size':>12}"
     divider = "-" * len(header)
 
     terminalreporter.write_sep("=", "Benchmark Results")
@@ -148,11 +829,17 @@ def pytest_terminal_summary(terminalreporter, exitstatus, config):
         if prev_qty is not None and r["qty"] != prev_qty:
             terminalreporter.write_line("")
         prev_qty = r["qty"]
+        peak = r.get("peak_bytes")
+        peak_text = f"{peak / (1024 * 1024):>8.2f} MiB" if peak is not None else f"{'-':>12}"
+        size = r.get("db_bytes")
+        size_text = f"{size / (1024 * 1024):>8.2f} MiB" if size is not None else f"{'-':>12}"
         terminalreporter.write_line(
             f"{r['qty']:>12,}  "
-            f"{r['type']:<12}  "
+            f"{r['type']:<20}  "
             f"{r['per_item_ms']:>12.4f} ms  "
-            f"{r['total_ms']:>9.2f} ms"
+            f"{r['total_ms']:>9.2f} ms  "
+            f"{peak_text}  "
+            f"{size_text}"
         )
 
     terminalreporter.write_line(divider)
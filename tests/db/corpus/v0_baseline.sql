@@ -0,0 +1,22 @@
+-- Schema shipped before versioning (user_version 0) with indexes and data.
+CREATE TABLE snippets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    enabled BOOLEAN DEFAULT True,
+    label TEXT NOT NULL,
+    trigger TEXT UNIQUE NOT NULL,
+    snippet TEXT NOT NULL,
+    paste_style TEXT,
+    return_press BOOLEAN DEFAULT False,
+    folder TEXT,
+    tags TEXT DEFAULT ''
+);
+CREATE INDEX idx_snippets_enabled ON snippets(enabled);
+CREATE INDEX idx_snippets_folder ON snippets(folder);
+CREATE INDEX idx_snippets_label ON snippets(label);
+CREATE INDEX idx_snippets_tags ON snippets(tags);
+
+INSERT INTO snippets (enabled, label, trigger, snippet, paste_style, return_press, folder, tags) VALUES
+    (1, 'Welcome Snippet', '/welcome', 'Welcome to QSnippet!', 'clipboard', 0, 'Getting Started', 'default,example'),
+    (1, 'Signature', '/sig', 'Best regards,\nQuynn', 'Clipboard', 1, 'Email', 'email'),
+    (0, 'Disabled', '/off', 'Should stay disabled', 'Keystroke', 0, 'Email', ''),
+    (1, 'Nested', '/nest', 'Hi {/sig}', 'Keystroke', 0, NULL, NULL);
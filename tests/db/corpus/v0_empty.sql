@@ -0,0 +1,12 @@
+-- Table created but never seeded.
+CREATE TABLE snippets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    enabled BOOLEAN DEFAULT True,
+    label TEXT NOT NULL,
+    trigger TEXT UNIQUE NOT NULL,
+    snippet TEXT NOT NULL,
+    paste_style TEXT,
+    return_press BOOLEAN DEFAULT False,
+    folder TEXT,
+    tags TEXT DEFAULT ''
+);
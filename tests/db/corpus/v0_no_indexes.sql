@@ -0,0 +1,16 @@
+-- Early schema created before indexes were added.
+CREATE TABLE snippets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    enabled BOOLEAN DEFAULT True,
+    label TEXT NOT NULL,
+    trigger TEXT UNIQUE NOT NULL,
+    snippet TEXT NOT NULL,
+    paste_style TEXT,
+    return_press BOOLEAN DEFAULT False,
+    folder TEXT,
+    tags TEXT DEFAULT ''
+);
+
+INSERT INTO snippets (enabled, label, trigger, snippet, paste_style, return_press, folder, tags) VALUES
+    (1, 'Address', '/addr', '123 Main St', 'Clipboard', 0, 'Personal', 'home'),
+    (1, 'Phone', '/phone', '555-0100', 'Keystroke', 1, 'Personal', 'home,contact');
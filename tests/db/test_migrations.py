@@ -0,0 +1,227 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from utils.snippet_db import SnippetDB
+from utils.db_migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    Migration,
+    MigrationError,
+    MigrationRunner,
+)
+
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+CORPUS_FILES = sorted(CORPUS_DIR.glob("*.sql"))
+
+
+def build_db_from_script(db_path: Path, script: Path) -> None:
+    """Create a database file from an SQL script.
+
+    Args:
+        db_path (Path): Destination database path.
+        script (Path): SQL script describing the old schema and its rows.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(script.read_text(encoding="utf-8"))
+    conn.close()
+
+
+def read_rows(db_path: Path) -> list[tuple]:
+    """Read the original snippet columns ordered by id.
+
+    Args:
+        db_path (Path): Path to the database file.
+
+    Returns:
+        list[tuple]: Rows of (trigger, label, snippet, enabled, folder).
+    """
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT trigger, label, snippet, enabled, folder FROM snippets ORDER BY id"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+@pytest.mark.parametrize("script", CORPUS_FILES, ids=lambda p: p.stem)
+def test_corpus_upgrades_to_latest(tmp_path, script):
+    """Every old-schema database should upgrade without losing rows."""
+    db_path = tmp_path / "snippets.db"
+    build_db_from_script(db_path, script)
+    before = read_rows(db_path)
+
+    db = SnippetDB(db_path)
+    version = db.conn.execute("PRAGMA user_version").fetchone()[0]
+    db.close()
+
+    assert version == LATEST_VERSION
+
+    after = read_rows(db_path)
+    if before:
+        assert after == before
+    else:
+        # Empty databases are seeded after migrating
+        assert [row[0] for row in after] == ["/welcome"]
+
+    conn = sqlite3.connect(db_path)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    assert {"idx_snippets_enabled", "idx_snippets_folder", "idx_snippets_label", "idx_snippets_tags"} <= indexes
+
+
+def test_new_database_starts_at_latest_version(temp_snippet_db_path):
+    """A fresh database should be created at the latest schema version."""
+    db = SnippetDB(temp_snippet_db_path)
+    assert MigrationRunner(db.conn).current_version() == LATEST_VERSION
+    assert MigrationRunner(db.conn).pending() == []
+
+
+def test_upgrade_is_idempotent(tmp_path):
+    """Re-running the runner on an upgraded database should change nothing."""
+    db_path = tmp_path / "snippets.db"
+    build_db_from_script(db_path, CORPUS_DIR / "v0_baseline.sql")
+
+    conn = sqlite3.connect(db_path)
+    runner = MigrationRunner(conn)
+    assert runner.upgrade() == LATEST_VERSION
+
+    # Pretend the version was never recorded and run every step again
+    conn.execute("PRAGMA user_version = 0")
+    assert runner.upgrade() == LATEST_VERSION
+    assert conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0] == 4
+    conn.close()
+
+
+def test_failed_migration_rolls_back(tmp_path):
+    """A failing step should leave the schema and version untouched."""
+    conn = sqlite3.connect(tmp_path / "snippets.db")
+
+    def broken(c):
+        c.execute("CREATE TABLE half_done (id INTEGER)")
+        raise RuntimeError("boom")
+
+    migrations = MIGRATIONS + [Migration(LATEST_VERSION + 1, "Broken step", broken)]
+    runner = MigrationRunner(conn, migrations)
+
+    with pytest.raises(MigrationError):
+        runner.upgrade()
+
+    assert runner.current_version() == LATEST_VERSION
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "half_done" not in tables
+    conn.close()
+
+
+def test_newer_schema_is_left_alone(tmp_path):
+    """Databases from a newer build should not be downgraded."""
+    conn = sqlite3.connect(tmp_path / "snippets.db")
+    conn.execute(f"PRAGMA user_version = {LATEST_VERSION + 10}")
+
+    assert MigrationRunner(conn).upgrade() == LATEST_VERSION + 10
+    conn.close()
+
+
+def test_migrations_must_be_ordered(tmp_path):
+    """Out of order migration lists should be rejected."""
+    conn = sqlite3.connect(tmp_path / "snippets.db")
+    noop = lambda c: None
+
+    with pytest.raises(ValueError):
+        MigrationRunner(conn, [Migration(2, "b", noop), Migration(1, "a", noop)])
+    conn.close()
+
+
+def test_backfill_runs_in_resumable_batches(tmp_path):
+    """Backfills should process rows in batches and resume after a budget stop."""
+    conn = sqlite3.connect(tmp_path / "snippets.db")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+    conn.executemany("INSERT INTO items (id) VALUES (?)", [(i,) for i in range(25)])
+    conn.commit()
+
+    batches = []
+
+    def fill(c, batch_size):
+        ids = [row[0] for row in c.execute(
+            "SELECT id FROM items WHERE value IS NULL LIMIT ?", (batch_size,)
+        )]
+        c.executemany("UPDATE items SET value = 'done' WHERE id = ?", [(i,) for i in ids])
+        batches.append(len(ids))
+        return len(ids)
+
+    runner = MigrationRunner(conn, [Migration(1, "Fill items", lambda c: None, fill)])
+    runner.upgrade()
+
+    # A zero budget stops before the first batch
+    assert runner.backfill(batch_size=10, max_seconds=0) is False
+    assert batches == []
+
+    assert runner.backfill(batch_size=10) is True
+    assert batches == [10, 10, 5]
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE value IS NULL").fetchone()[0] == 0
+    conn.close()
+
+
+def test_backfill_compresses_existing_large_bodies(tmp_path):
+    """Large plain bodies from older versions should be compressed in place."""
+    db_path = tmp_path / "snippets.db"
+    body = "signature line\n" * 1000
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE snippets (id INTEGER PRIMARY KEY AUTOINCREMENT, enabled BOOLEAN, label TEXT, "
+        "trigger TEXT UNIQUE, snippet TEXT, paste_style TEXT, return_press BOOLEAN, folder TEXT, tags TEXT)"
+    )
+    conn.execute("INSERT INTO snippets (label, trigger, snippet) VALUES ('Sig', '/sig', ?)", (body,))
+    conn.commit()
+    conn.close()
+
+    db = SnippetDB(db_path)
+    assert db.run_backfills() is True
+    assert db.conn.execute("SELECT body_format FROM snippets").fetchone()[0] == 1
+    assert db.get_all_snippets()[0]["snippet"] == body
+    db.close()
+
+
+def test_backfill_reencode_is_not_a_content_change(tmp_path):
+    """Compressing stored bodies should not log changes or move updated_at."""
+    db_path = tmp_path / "snippets.db"
+    body = "signature line\n" * 1000
+    db = SnippetDB(db_path, compress_threshold=0)
+    db.insert_snippet({
+        "enabled": True, "label": "Sig", "trigger": "/sig", "snippet": body,
+        "paste_style": "Clipboard", "return_press": False, "folder": "", "tags": "",
+    })
+    seq = db.latest_change_seq()
+    updated_at = db.conn.execute("SELECT updated_at FROM snippets WHERE trigger = '/sig'").fetchone()[0]
+    db.close()
+
+    db = SnippetDB(db_path, compress_threshold=1024)
+    assert db.run_backfills() is True
+    row = db.conn.execute("SELECT body_format, updated_at FROM snippets WHERE trigger = '/sig'").fetchone()
+    assert row == (1, updated_at)
+    assert db.changes_since(seq) == []
+    assert db.conn.execute("SELECT COUNT(*) FROM trigger_suspensions").fetchone()[0] == 0
+
+    # Real edits are still logged and stamped
+    db.conn.execute("UPDATE snippets SET label = 'Signature' WHERE trigger = '/sig'")
+    db.conn.commit()
+    assert [c["op"] for c in db.changes_since(seq)] == ["update"]
+    db.close()
+
+
+def test_backfill_respects_disabled_compression(tmp_path):
+    """Existing bodies should stay plain when compression is turned off."""
+    db_path = tmp_path / "snippets.db"
+    db = SnippetDB(db_path, compress_threshold=0)
+    db.insert_snippet({
+        "enabled": True, "label": "Big", "trigger": "/big", "snippet": "x" * 10000,
+        "paste_style": "Clipboard", "return_press": False, "folder": "", "tags": "",
+    })
+    db.close()
+
+    db = SnippetDB(db_path, compression="none")
+    assert db.run_backfills() is True
+    assert db.conn.execute("SELECT body_format FROM snippets WHERE trigger = '/big'").fetchone()[0] == 0
+    db.close()
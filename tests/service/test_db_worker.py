@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from ui.db_worker import DbWorker
+from utils.snippet_db import SnippetDB
+
+
+def drain(worker: DbWorker) -> None:
+    """Wait for every queued call and deliver its result.
+
+    Args:
+        worker (DbWorker): The worker to drain.
+    """
+    assert worker.wait_for_done(5000)
+    QCoreApplication.processEvents()
+
+
+@pytest.fixture
+def worker(temp_snippet_db_path):
+    """Provide a DbWorker over a fresh database.
+
+    Yields:
+        DbWorker: The worker, shut down after the test.
+    """
+    db = SnippetDB(temp_snippet_db_path)
+    worker = DbWorker(db)
+    yield worker
+    worker.shutdown()
+    db.close()
+
+
+def test_results_are_delivered_on_the_gui_thread(worker):
+    """Callbacks should run on the thread that owns the worker."""
+    seen = []
+    request = worker.submit(
+        "get_all_triggers",
+        on_result=lambda result: seen.append((result, threading.current_thread())),
+    )
+    drain(worker)
+
+    assert request.done
+    assert seen == [(["/welcome"], threading.current_thread())]
+    assert worker.pending_count() == 0
+
+
+def test_newer_request_supersedes_same_key(worker):
+    """A running request should be dropped once a newer one shares its key."""
+    release = threading.Event()
+    seen = []
+
+    def slow(db):
+        release.wait(5)
+        return "stale"
+
+    first = worker.submit(slow, key="search", on_result=seen.append)
+    second = worker.submit(lambda db: "fresh", key="search", on_result=seen.append)
+    release.set()
+    drain(worker)
+
+    assert first.cancelled and not second.cancelled
+    assert seen == ["fresh"]
+
+
+def test_writes_apply_in_submission_order(worker):
+    """Writes should run one at a time in the order they were queued."""
+    for i in range(5):
+        entry = {
+            "enabled": True,
+            "label": f"w{i}",
+            "trigger": f"/w{i}",
+            "snippet": "x",
+            "paste_style": "Clipboard",
+            "return_press": False,
+            "folder": "",
+            "tags": "",
+        }
+        worker.submit("insert_snippet", entry, write=True)
+    drain(worker)
+
+    triggers = [record["trigger"] for record in worker.db.iter_snippets()]
+    assert triggers == ["/welcome"] + [f"/w{i}" for i in range(5)]
+
+
+def test_errors_reach_the_error_callback(worker):
+    """Exceptions raised by a call should be handed to on_error."""
+    errors = []
+
+    def broken(db):
+        raise RuntimeError("boom")
+
+    worker.submit(broken, on_result=pytest.fail, on_error=errors.append)
+    drain(worker)
+
+    assert [str(e) for e in errors] == ["boom"]
+
+
+def test_submit_after_shutdown_is_ignored(worker):
+    """No new calls should be accepted once the worker is shut down."""
+    worker.shutdown()
+    assert worker.submit("get_all_triggers") is None
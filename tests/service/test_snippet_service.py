@@ -59,6 +59,21 @@ def test_service_initializes(service, mock_expander, mock_db):
     assert service.active() is False
 
 
+def test_service_db_uses_database_config(mock_expander, monkeypatch, tmp_path):
+    """The service's SnippetDB should get the same codec settings as the app's."""
+    calls = []
+    monkeypatch.setattr("ui.service.SnippetDB", lambda *args, **kwargs: calls.append(kwargs) or MagicMock())
+
+    SnippetService(
+        str(tmp_path / "snippets.db"),
+        db_config={"pragma_profile": "balanced", "compression": "none", "compress_threshold_bytes": 512},
+    )
+
+    assert calls[0]["profile"] == "balanced"
+    assert calls[0]["compression"] == "none"
+    assert calls[0]["compress_threshold"] == 512
+
+
 def test_start_starts_expander_and_thread(service, mock_expander):
     """start() should start expander and background thread."""
     service.start()
@@ -104,6 +119,19 @@ def test_refresh_calls_expander(service, mock_expander):
     mock_expander.refresh_snippets.assert_called_once()
 
 
+def test_request_refresh_runs_on_monitor_thread(service, mock_expander):
+    """request_refresh() should wake the monitor thread to reload snippets."""
+    service.start()
+    time.sleep(0.05)
+    mock_expander.refresh_snippets.reset_mock()
+
+    service.request_refresh()
+    time.sleep(0.2)
+
+    mock_expander.refresh_snippets.assert_called_once()
+    service.stop()
+
+
 def test_pause_and_resume_delegate(service, mock_expander):
     """pause() and resume() should delegate to expander."""
     service.pause()
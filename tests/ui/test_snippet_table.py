@@ -0,0 +1,12 @@
+from ui.widgets.snippet_table import merge_entries
+
+
+def test_merge_entries_tracks_row_changes():
+    """Cached entries should follow the rows apply_changes patches."""
+    entries = [{"id": 1, "label": "a"}, {"id": 2, "label": "b"}, {"id": 3, "label": "c"}]
+    records = [{"id": 2, "label": "B"}, {"id": 4, "label": "d"}]
+
+    merged = merge_entries(entries, records, {3})
+
+    assert merged == [{"id": 1, "label": "a"}, {"id": 2, "label": "B"}, {"id": 4, "label": "d"}]
+    assert entries[1]["label"] == "b"
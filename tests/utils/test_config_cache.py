@@ -0,0 +1,77 @@
+import os
+import time
+from pathlib import Path
+
+import yaml
+
+from utils import yaml_codec
+from utils.config_cache import ConfigCache, RACY_SECONDS
+from utils.config_utils import SettingsLoader
+from utils.file_utils import FileUtils
+
+
+def write_old_yaml(path: Path, data: dict) -> None:
+    """Write YAML and backdate it past the racy window."""
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    past = time.time() - RACY_SECONDS * 5
+    os.utime(path, (past, past))
+
+
+def test_cache_hits_until_source_changes(tmp_path):
+    """Entries should survive restarts and be dropped once the file changes."""
+    source = tmp_path / "config.yaml"
+    write_old_yaml(source, {"a": 1})
+    cache = ConfigCache(tmp_path / "cache.bin")
+    cache.put("config", [source], {"a": 1, "nested": {"b": [1, 2]}})
+
+    warm = ConfigCache(tmp_path / "cache.bin")
+    value = warm.get("config", [source])
+    assert value == {"a": 1, "nested": {"b": [1, 2]}}
+    value["a"] = 99
+    assert warm.get("config", [source])["a"] == 1
+
+    write_old_yaml(source, {"a": 22})
+    assert warm.get("config", [source]) is None
+    assert warm.hits == 2 and warm.misses == 1
+
+
+def test_recently_modified_sources_are_not_trusted(tmp_path):
+    """A file written moments before caching could change within its mtime tick."""
+    source = tmp_path / "config.yaml"
+    source.write_text("a: 1\n", encoding="utf-8")
+    cache = ConfigCache()
+    cache.put("config", [source], {"a": 1})
+
+    assert cache.get("config", [source]) is None
+
+
+def test_corrupt_or_unmarshallable_values_are_skipped(tmp_path):
+    """A damaged cache file is ignored, and odd values are just not cached."""
+    cache_path = tmp_path / "cache.bin"
+    cache_path.write_bytes(b"not marshal data")
+    source = tmp_path / "config.yaml"
+    write_old_yaml(source, {"a": 1})
+
+    cache = ConfigCache(cache_path)
+    cache.put("config", [source], {"when": object()})
+
+    assert cache.get("config", [source]) is None
+
+
+def test_warm_start_parses_no_yaml(tmp_path, monkeypatch, mock_qt_app):
+    """Merging and loading settings should come from the cache on a warm start."""
+    default = tmp_path / "default.yaml"
+    user = tmp_path / "settings.yaml"
+    write_old_yaml(default, {"general": {"a": 1, "b": 2}})
+    write_old_yaml(user, {"general": {"a": 5, "b": 2}})
+    FileUtils.load_and_merge_yaml(default, user, cache=ConfigCache(tmp_path / "cache.bin"))
+    SettingsLoader(user, cache=ConfigCache(tmp_path / "cache.bin"))
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("YAML parsed on a warm start")
+    monkeypatch.setattr(yaml_codec, "load", no_parse)
+
+    cache = ConfigCache(tmp_path / "cache.bin")
+    assert FileUtils.load_and_merge_yaml(default, user, cache=cache) == {"general": {"a": 5, "b": 2}}
+    loader = SettingsLoader(user, cache=cache)
+    assert loader.settings == {"general": {"a": {"type": "int", "value": 5}, "b": {"type": "int", "value": 2}}}
@@ -4,7 +4,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from utils.config_utils import ConfigLoader, SettingsLoader
+from utils.config_utils import ConfigLoader, SettingsLoader, changed_paths
 
 
 def write_yaml(path: Path, data: dict):
@@ -75,6 +75,7 @@ def test_config_loader_reload_on_file_change(temp_config_file, mock_qt_app):
 
     write_yaml(temp_config_file, {"a": 2})
     loader.on_file_changed(str(temp_config_file))
+    loader.flush()
 
     assert loader.config["a"] == 2
 
@@ -181,6 +182,7 @@ def test_settings_loader_reload_on_file_change(temp_settings_file, mock_qt_app):
         }
     })
     loader.on_file_changed(str(temp_settings_file))
+    loader.flush()
 
     assert loader.settings["general"]["enabled"]["value"] is True
 
@@ -199,3 +201,101 @@ def test_settings_loader_stop(temp_settings_file, mock_qt_app):
     loader.stop()
 
     remove_spy.assert_called_once()
+
+
+def test_changed_paths_lists_differing_keys():
+    """
+    changed_paths should report added, removed and modified key paths.
+    """
+    old = {"fonts": {"sizes": {"small": 9, "large": 14}}, "colors": {"a": 1}, "gone": 1}
+    new = {"fonts": {"sizes": {"small": 10, "large": 14}}, "colors": {"a": 1}, "added": {"x": 1}}
+
+    assert changed_paths(old, new) == [("fonts", "sizes", "small"), ("gone",), ("added",)]
+    assert changed_paths(old, old) == []
+
+
+def test_config_reloads_are_debounced_and_diffed(temp_config_file, mock_qt_app):
+    """
+    A burst of file events should cause one reload emitting the changed keys.
+    """
+    write_yaml(temp_config_file, {"fonts": {"small": 9}, "colors": {"a": 1}})
+    loader = ConfigLoader(temp_config_file)
+    spy = MagicMock()
+    loader.configKeysChanged.connect(spy)
+
+    for size in (10, 11, 12):
+        write_yaml(temp_config_file, {"fonts": {"small": size}, "colors": {"a": 1}})
+        loader.on_file_changed(str(temp_config_file))
+    spy.assert_not_called()
+    loader.flush()
+
+    spy.assert_called_once_with({"fonts": {"small": 12}, "colors": {"a": 1}}, [("fonts", "small")])
+
+
+def test_unchanged_rewrites_do_not_emit(temp_settings_file, mock_qt_app):
+    """
+    Rewriting identical content or only comments should not notify anyone.
+    """
+    write_yaml(temp_settings_file, {"general": {"enabled": True}})
+    loader = SettingsLoader(temp_settings_file)
+    spy = MagicMock()
+    loader.settingsChanged.connect(spy)
+
+    write_yaml(temp_settings_file, {"general": {"enabled": True}})
+    loader.on_file_changed(str(temp_settings_file))
+    loader.flush()
+    temp_settings_file.write_text("# edited\n" + temp_settings_file.read_text(encoding="utf-8"), encoding="utf-8")
+    loader.on_file_changed(str(temp_settings_file))
+    loader.flush()
+    spy.assert_not_called()
+
+    keys_spy = MagicMock()
+    loader.settingsKeysChanged.connect(keys_spy)
+    write_yaml(temp_settings_file, {"general": {"enabled": False}})
+    loader.on_file_changed(str(temp_settings_file))
+    loader.flush()
+
+    assert keys_spy.call_args.args[1] == [("general", "enabled")]
+
+
+def count_reloads(loader, toggles, write):
+    """
+    Toggle a setting several times and count how often the file was parsed.
+
+    Args:
+        loader (SettingsLoader): The loader watching the settings file.
+        toggles (int): Number of times to flip the setting.
+        write (Callable[[dict], None]): Persists the settings.
+
+    Returns:
+        int: Number of parses after the initial load.
+    """
+    parses = MagicMock(side_effect=loader._parse)
+    loader._parse = parses
+    for _ in range(toggles):
+        enabled = loader.settings["general"]["enabled"]
+        enabled["value"] = not enabled["value"]
+        write(loader.settings)
+        loader.on_file_changed(str(loader.settings_path))
+        loader.flush()
+    return parses.call_count
+
+
+def test_own_writes_do_not_reload(temp_settings_file, mock_qt_app):
+    """
+    Saving through the loader should not re-parse the file it just wrote.
+    """
+    write_yaml(temp_settings_file, {"general": {"enabled": True}})
+    loader = SettingsLoader(temp_settings_file)
+
+    before = count_reloads(loader, 4, lambda settings: write_yaml(temp_settings_file, settings))
+    after = count_reloads(loader, 4, loader.save)
+
+    assert before == 4
+    assert after == 0
+    assert loader.settings["general"]["enabled"]["value"] is True
+
+    write_yaml(temp_settings_file, {"general": {"enabled": False}})
+    loader.on_file_changed(str(temp_settings_file))
+    loader.flush()
+    assert loader.settings["general"]["enabled"]["value"] is False
@@ -0,0 +1,50 @@
+from utils.db_backup import SnapshotManager
+from utils.snippet_db import SnippetDB
+
+
+def test_backup_and_restore_round_trip(temp_snippet_db_path, tmp_path, make_entry):
+    """Restoring a backup should bring back its rows and reset change feeds."""
+    db = SnippetDB(temp_snippet_db_path)
+    backup = db.backup(tmp_path / "backup.db")
+    assert backup.exists()
+    assert not (tmp_path / "backup.db.partial").exists()
+
+    db.insert_snippet(make_entry("/after"))
+    seq = db.latest_change_seq()
+
+    assert db.restore(backup) is True
+    assert [s["trigger"] for s in db.get_all_snippets()] == ["/welcome"]
+    # Readers that applied changes up to seq must reload fully
+    assert db.latest_change_seq() > seq
+    assert not db.change_log_covers(seq)
+    db.close()
+
+
+def test_restore_rejects_invalid_files(temp_snippet_db_path, tmp_path):
+    """Files that are not snippet databases should not be restored."""
+    db = SnippetDB(temp_snippet_db_path)
+    junk = tmp_path / "junk.db"
+    junk.write_text("not a database")
+
+    assert db.restore(junk) is False
+    assert len(db.get_all_snippets()) == 1
+    db.close()
+
+
+def test_snapshots_rotate_and_schedule(temp_snippet_db_path, tmp_path):
+    """Old snapshots should be pruned and the schedule follow the newest one."""
+    db = SnippetDB(temp_snippet_db_path)
+    manager = SnapshotManager(db, tmp_path / "snapshots", interval_hours=1, keep=2)
+    assert manager.due()
+
+    for stamp in ("20240101-000000", "20240102-000000", "20240103-000000"):
+        db.backup(manager.snapshot_dir / f"snippets-{stamp}.db")
+    assert manager.due()
+
+    newest = manager.create_snapshot()
+    assert manager.list_snapshots() == [newest, manager.snapshot_dir / "snippets-20240103-000000.db"]
+    assert not manager.due()
+
+    manager.configure({"snapshots_enabled": {"value": False}})
+    assert not manager.due()
+    db.close()
@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+
+from utils.db_libraries import library_rank
+from utils.snippet_db import SnippetDB
+from tests.utils.test_keyboard_utils import make_expander
+
+
+@pytest.fixture
+def library_paths(tmp_path, make_entry):
+    """Create two library files with overlapping triggers.
+
+    Returns:
+        list[Path]: The company and team library paths, in that order.
+    """
+    paths = []
+    for name, triggers in (("company", ["/sig", "/addr", "/shared"]), ("team", ["/sig", "/standup"])):
+        path = tmp_path / f"{name}.db"
+        db = SnippetDB(path)
+        for trigger in triggers:
+            db.insert_snippet(make_entry(trigger, snippet=f"{name} {trigger}"))
+        db.close()
+        paths.append(path)
+    return paths
+
+
+def test_union_resolves_conflicts_by_precedence(temp_snippet_db_path, library_paths, make_entry):
+    """The main database should win, then libraries in their given order."""
+    db = SnippetDB(temp_snippet_db_path, libraries=library_paths)
+    db.insert_snippet(make_entry("/shared", snippet="mine"))
+
+    expander = make_expander(db)
+    bodies = {t: s["snippet"] for t, s in expander.trigger_map.items()}
+
+    assert bodies["/shared"] == "mine"
+    assert bodies["/sig"] == "company /sig"
+    assert bodies["/standup"] == "team /standup"
+    assert library_rank(expander.trigger_map["/standup"]["id"]) == 2
+
+
+def test_deleting_main_snippet_falls_back_to_library(temp_snippet_db_path, library_paths, make_entry):
+    """A trigger released by the main database should use the library copy."""
+    db = SnippetDB(temp_snippet_db_path, libraries=library_paths)
+    db.insert_snippet(make_entry("/sig", snippet="mine"))
+    expander = make_expander(db)
+    assert expander.trigger_map["/sig"]["snippet"] == "mine"
+
+    db.delete_snippet(db.get_snippet("/sig")["id"])
+    expander.refresh_snippets()
+
+    assert expander.trigger_map["/sig"]["snippet"] == "company /sig"
+
+
+def test_libraries_are_read_only_and_index_backed(temp_snippet_db_path, library_paths):
+    """Libraries must reject writes and trigger lookups must use indexes."""
+    db = SnippetDB(temp_snippet_db_path, libraries=library_paths)
+
+    with pytest.raises(sqlite3.OperationalError):
+        db.conn.execute("DELETE FROM lib_1.snippets")
+
+    plan = " ".join(
+        row[3] for row in db.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM all_snippets WHERE trigger = '/sig'"
+        )
+    )
+    assert "SCAN lib_" not in plan and "SCAN main" not in plan
+    assert "lib_2.snippets USING INDEX" in plan
+
+
+def test_missing_libraries_are_skipped(temp_snippet_db_path, library_paths, tmp_path):
+    """Unreadable library files should not stop the database from opening."""
+    db = SnippetDB(temp_snippet_db_path, libraries=[tmp_path / "missing.db", library_paths[1]])
+    assert db.libraries == [library_paths[1]]
+    assert {"/sig", "/standup"} <= {s["trigger"] for s in db.iter_all_snippets()}
+
+
+def test_reattaching_changes_the_union(temp_snippet_db_path, library_paths):
+    """attach_libraries should take effect on connections already open."""
+    db = SnippetDB(temp_snippet_db_path, libraries=library_paths)
+    assert "/addr" in {s["trigger"] for s in db.iter_all_snippets()}
+
+    db.attach_libraries(library_paths[1:])
+    triggers = {s["trigger"] for s in db.iter_all_snippets()}
+    assert "/addr" not in triggers and "/standup" in triggers
+    assert len(db.library_version()) == 1
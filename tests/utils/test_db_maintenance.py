@@ -0,0 +1,116 @@
+import sqlite3
+import time
+
+from utils.db_maintenance import MaintenanceScheduler
+from utils.snippet_db import SnippetDB
+
+
+def _churn(db: SnippetDB, count: int = 1000) -> None:
+    """Insert and then delete enough rows to leave free pages behind.
+
+    Args:
+        db (SnippetDB): The database to churn.
+        count (int): Number of rows to insert and delete.
+    """
+    with db._write() as conn:
+        conn.executemany(
+            "INSERT INTO snippets (enabled, label, trigger, snippet) VALUES (1, ?, ?, ?)",
+            [(f"Churn {i}", f"/churn{i}", "x" * 1000) for i in range(count)],
+        )
+        conn.execute("DELETE FROM snippets WHERE trigger LIKE '/churn%'")
+
+
+def test_incremental_vacuum_reclaims_free_pages(temp_snippet_db_path):
+    """Maintenance should return free pages and record its metrics."""
+    db = SnippetDB(temp_snippet_db_path)
+    _churn(db)
+    before = db.storage_stats()
+    assert before["auto_vacuum"] == "INCREMENTAL"
+    assert before["fragmentation"] > 0.5
+
+    metrics = db.run_maintenance()
+
+    assert metrics["vacuum"] == "incremental"
+    assert metrics["free_pages_after"] == 0
+    assert db.storage_stats()["page_count"] < before["page_count"]
+    assert db.conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    assert db.last_maintenance()["pages_before"] == before["page_count"]
+
+
+def test_old_databases_are_converted_to_incremental(tmp_path):
+    """Files created without auto_vacuum should be switched with one VACUUM."""
+    db_path = tmp_path / "snippets.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE snippets (id INTEGER PRIMARY KEY AUTOINCREMENT, enabled BOOLEAN, label TEXT, "
+        "trigger TEXT UNIQUE, snippet TEXT, paste_style TEXT, return_press BOOLEAN, folder TEXT, tags TEXT)"
+    )
+    conn.close()
+
+    db = SnippetDB(db_path)
+    assert db.storage_stats()["auto_vacuum"] == "NONE"
+
+    assert db.run_maintenance()["vacuum"] == "full"
+    assert db.storage_stats()["auto_vacuum"] == "INCREMENTAL"
+    db.close()
+
+
+def test_scheduler_offers_full_vacuum_only_for_unconverted_files(tmp_path, monkeypatch):
+    """Bounded runs leave large legacy files alone and flag them for a full VACUUM."""
+    db_path = tmp_path / "snippets.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE snippets (id INTEGER PRIMARY KEY AUTOINCREMENT, enabled BOOLEAN, label TEXT, "
+        "trigger TEXT UNIQUE, snippet TEXT, paste_style TEXT, return_press BOOLEAN, folder TEXT, tags TEXT)"
+    )
+    conn.close()
+    monkeypatch.setattr("utils.snippet_db.FULL_VACUUM_MAX_PAGES", 0)
+
+    db = SnippetDB(db_path)
+    scheduler = MaintenanceScheduler(db)
+    assert scheduler.run()["vacuum"] == "none"
+    assert scheduler.needs_full_vacuum()
+
+    assert scheduler.run(full_vacuum=True)["vacuum"] == "full"
+    assert not scheduler.needs_full_vacuum()
+    db.close()
+
+
+def test_scheduler_waits_for_idle_and_interval(temp_snippet_db_path):
+    """Runs should only be due when idle and the interval has passed."""
+    db = SnippetDB(temp_snippet_db_path)
+    scheduler = MaintenanceScheduler(db, interval_hours=24, idle_seconds=60)
+
+    assert not scheduler.due()
+    scheduler._last_activity -= 61
+    assert scheduler.due()
+
+    assert scheduler.run() is not None
+    scheduler._last_activity -= 61
+    assert not scheduler.due()
+
+    # The last run is read back from the database on a fresh scheduler
+    fresh = MaintenanceScheduler(db, interval_hours=24, idle_seconds=0)
+    assert abs(fresh.last_run() - time.time()) < 60
+    assert not fresh.due()
+
+
+def test_fragmentation_triggers_early_run(temp_snippet_db_path):
+    """A heavily fragmented file should be maintained before the interval."""
+    db = SnippetDB(temp_snippet_db_path)
+    scheduler = MaintenanceScheduler(db, interval_hours=24, idle_seconds=0)
+    scheduler.run()
+    _churn(db)
+
+    scheduler._last_run = time.time() - 2 * 3600
+    assert scheduler.due()
+    scheduler._last_run = time.time() - 60
+    assert not scheduler.due()
+
+
+def test_disabled_scheduler_never_runs(temp_snippet_db_path):
+    """configure() should honour maintenance_enabled."""
+    db = SnippetDB(temp_snippet_db_path)
+    scheduler = MaintenanceScheduler(db, idle_seconds=0)
+    scheduler.configure({"maintenance_enabled": False})
+    assert not scheduler.due()
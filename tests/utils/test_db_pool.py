@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from utils.db_pool import ConnectionPool, PRAGMA_PROFILES, resolve_profile
+from utils.snippet_db import SnippetDB
+
+
+def test_resolve_profile_defaults_and_overrides():
+    """Profiles should resolve by name and accept partial overrides."""
+    assert resolve_profile(None) == PRAGMA_PROFILES["balanced"]
+    assert resolve_profile("legacy")["journal_mode"] == "DELETE"
+    assert resolve_profile("missing") == PRAGMA_PROFILES["balanced"]
+
+    custom = resolve_profile({"synchronous": "FULL"})
+    assert custom["synchronous"] == "FULL"
+    assert custom["journal_mode"] == "WAL"
+
+
+def test_pool_enables_wal(temp_snippet_db_path):
+    """The default profile should switch the database to WAL."""
+    db = SnippetDB(temp_snippet_db_path)
+
+    mode = db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+    db.close()
+
+
+def test_pool_applies_profile_pragmas(temp_snippet_db_path):
+    """Reader connections should carry the configured pragmas."""
+    pool = ConnectionPool(temp_snippet_db_path, profile="performance")
+    conn = pool.reader()
+
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    pool.close()
+
+
+def test_each_thread_gets_its_own_connection(temp_snippet_db_path):
+    """Readers should be per-thread and reused within a thread."""
+    pool = ConnectionPool(temp_snippet_db_path)
+    main_conn = pool.reader()
+    assert pool.reader() is main_conn
+
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(pool.reader()))
+    thread.start()
+    thread.join()
+
+    assert seen[0] is not main_conn
+    assert pool.connection_count() == 3  # writer + two readers
+    pool.close()
+    assert pool.connection_count() == 0
+
+
+def test_nested_writes_share_one_transaction(temp_snippet_db_path):
+    """An error in an outer write block should roll back inner writes."""
+    pool = ConnectionPool(temp_snippet_db_path)
+    with pool.write() as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+
+    with pytest.raises(RuntimeError):
+        with pool.write() as outer:
+            outer.execute("INSERT INTO t VALUES (1)")
+            with pool.write() as inner:
+                inner.execute("INSERT INTO t VALUES (2)")
+            raise RuntimeError("abort")
+
+    assert pool.reader().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_db_usable_from_worker_threads(temp_snippet_db_path, make_entry):
+    """SnippetDB should serve reads and writes from several threads."""
+    db = SnippetDB(temp_snippet_db_path)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(20):
+                db.insert_snippet(make_entry(f"/t{n}-{i}"))
+                assert db.get_all_snippets() is not None
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    # 80 inserted plus the seeded welcome snippet
+    assert len(db.get_all_snippets()) == 81
+    db.close()
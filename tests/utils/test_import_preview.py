@@ -0,0 +1,68 @@
+from utils.file_utils import FileUtils
+from utils.snippet_db import SnippetDB
+
+
+def make_db(path, make_entry):
+    """A database holding /same, /edit and /move."""
+    db = SnippetDB(path)
+    db.import_snippets([make_entry("/same", "Same body"), make_entry("/edit", "Old body"), make_entry("/move", "Moved body")])
+    return db
+
+
+def test_preview_classifies_entries(tmp_path, temp_snippet_db_path, make_entry):
+    """Each entry should land in exactly one category with a reason."""
+    db = make_db(temp_snippet_db_path, make_entry)
+    move_id = db.get_snippet("/move")["id"]
+    path = tmp_path / "incoming.yaml"
+    FileUtils.export_snippets_yaml(path, [
+        make_entry("/same", "Same  body"),
+        make_entry("/edit", "New body"),
+        make_entry("/retag", "Moved body", tags="other"),
+        make_entry("/brand-new", "Fresh"),
+        make_entry("/steal", "Stolen", id=move_id),
+        make_entry("/brand-new", "Twice"),
+    ])
+
+    preview = db.preview_yaml(path)
+
+    assert preview["counts"] == {"insert": 1, "update": 1, "conflict": 3, "unchanged": 1}
+    assert preview["indices"]["unchanged"] == [0]
+    assert preview["indices"]["update"] == [1]
+    assert preview["indices"]["insert"] == [3]
+    reasons = {s["trigger"]: s["reason"] for s in preview["samples"]["conflict"]}
+    assert reasons == {
+        "/retag": "same text as /move",
+        "/steal": f"id {move_id} belongs to /move",
+        "/brand-new": "trigger repeats entry 3",
+    }
+    assert preview["samples"]["update"][0]["reason"] == "changes snippet"
+
+
+def test_preview_compares_settings_and_writes_nothing(tmp_path, temp_snippet_db_path, make_entry):
+    """Setting changes are updates, and previewing must not modify the database."""
+    db = make_db(temp_snippet_db_path, make_entry)
+    before = [dict(s) for s in db.get_all_snippets()]
+    path = tmp_path / "incoming.yaml"
+    FileUtils.export_snippets_yaml(path, [make_entry("/same", "Same body", enabled=False, folder="Home")])
+
+    preview = db.preview_yaml(path)
+
+    assert preview["samples"]["update"][0]["reason"] == "changes folder, enabled"
+    assert [dict(s) for s in db.get_all_snippets()] == before
+
+
+def test_import_accepts_selected_categories(tmp_path, temp_snippet_db_path, make_entry):
+    """Importing with preview indices should only apply the accepted categories."""
+    db = make_db(temp_snippet_db_path, make_entry)
+    path = tmp_path / "incoming.yaml"
+    FileUtils.export_snippets_yaml(path, [make_entry("/edit", "New body"), make_entry("/brand-new", "Fresh"), make_entry("bad", "x")])
+
+    validation = db.validate_yaml(path)
+    preview = db.preview_yaml(path, validation=validation)
+    assert preview["invalid"] == 1
+
+    counts = db.import_from_yaml(path, validation=validation, indices=preview["indices"]["insert"])
+
+    assert counts["new"] == 1 and counts["updated"] == 0
+    assert db.get_snippet("/brand-new")["snippet"] == "Fresh"
+    assert db.get_snippet("/edit")["snippet"] == "Old body"
@@ -0,0 +1,155 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import import_validation
+from utils.file_utils import FileUtils
+from utils.import_validation import normalise_entry, validate_entries, default_workers, MAX_DEFAULT_WORKERS
+from utils.snippet_db import SnippetDB
+
+
+def messages(report, level="error"):
+    """Map each reported trigger to its messages at one level."""
+    found = {}
+    for issue in report[f"{level}s"]:
+        found.setdefault(issue["trigger"], []).append(issue["message"])
+    return found
+
+
+def test_normalise_entry_coerces_fields():
+    """Flags, styles, tags and folders should come out in the editor's form."""
+    normalised, issues = normalise_entry({
+        "trigger": " /sig ",
+        "snippet": "Regards",
+        "enabled": "yes",
+        "return_press": 0,
+        "paste_style": "typing",
+        "tags": ["Work", "work ", "Email"],
+        "folder": "  ",
+        "extra": "dropped",
+    })
+
+    assert normalised == {
+        "trigger": "/sig",
+        "snippet": "Regards",
+        "label": "/sig",
+        "folder": "Default",
+        "tags": "work,email",
+        "enabled": True,
+        "return_press": False,
+        "paste_style": "Keystroke",
+    }
+    assert [level for level, _ in issues] == ["warning"]
+
+
+def test_schema_errors_are_rejected(make_entry):
+    """Entries breaking the schema should be reported and rejected."""
+    entries = [
+        make_entry("/ok"),
+        "not a mapping",
+        make_entry("no-prefix"),
+        make_entry("/has space"),
+        make_entry("/flag", enabled="maybe"),
+        make_entry("/style", paste_style="Fax"),
+        make_entry("/empty", snippet=""),
+    ]
+
+    report = validate_entries(entries, workers=1)
+
+    assert report["total"] == 7 and report["valid"] == 1
+    assert report["rejected"] == [1, 2, 3, 4, 5, 6]
+    assert report["error_count"] == 6
+
+
+def test_duplicate_triggers_across_chunks(make_entry):
+    """A trigger repeated anywhere in the stream should keep only the first."""
+    entries = [make_entry(f"/e{i}") for i in range(10)] + [make_entry("/e3", snippet="again")]
+
+    report = validate_entries(entries, workers=1, chunk_size=4)
+
+    assert report["rejected"] == [10]
+    assert "duplicate trigger, first defined by entry 3" in messages(report)["/e3"]
+
+
+def test_nested_references_and_cycles(make_entry):
+    """Loops are errors; unknown references and deep nesting are warnings."""
+    chain = [make_entry(f"/c{i}", f"{{/c{i + 1}}}") for i in range(7)] + [make_entry("/c7")]
+    entries = [
+        make_entry("/a", "A {/b}"),
+        make_entry("/b", "B {/a}"),
+        make_entry("/self", "{/self}"),
+        make_entry("/loop-db", "{/existing}"),
+        make_entry("/lost", "{/nowhere} {date}"),
+    ] + chain
+
+    report = validate_entries(entries, resolve=lambda triggers: {"/existing": "{/loop-db}"} if "/existing" in triggers else {}, workers=1)
+
+    errors = messages(report)
+    assert set(errors) == {"/a", "/b", "/self", "/loop-db"}
+    assert report["rejected"] == [0, 1, 2, 3]
+    warnings = messages(report, "warning")
+    assert warnings["/lost"] == ["references unknown snippet '/nowhere'"]
+    assert "/c0" in warnings and "/c1" in warnings and "/c2" not in warnings
+
+
+def test_parallel_matches_serial(make_entry):
+    """Worker processes should produce exactly the in-process report."""
+    entries = [make_entry(f"/p{i}") if i % 7 else make_entry(f"bad{i}") for i in range(400)]
+    entries += [make_entry("/p1"), make_entry("/x", "{/y}"), make_entry("/y", "{/x}")]
+
+    serial = validate_entries(entries, workers=1, chunk_size=50)
+    parallel = validate_entries(entries, workers=2, chunk_size=50, parallel_threshold=100)
+
+    assert parallel == serial
+    assert serial["error_count"] == 58 + 1 + 2
+
+
+def test_pool_validates_remaining_chunks(monkeypatch, make_entry):
+    """Past the threshold, every remaining chunk should go to the pool."""
+    submitted = []
+
+    class CountingPool(ProcessPoolExecutor):
+        def submit(self, fn, chunk):
+            submitted.append(chunk[0])
+            return super().submit(fn, chunk)
+
+    monkeypatch.setattr(import_validation, "ProcessPoolExecutor", CountingPool)
+    entries = [make_entry(f"/m{i}") for i in range(500)]
+
+    report = validate_entries(entries, workers=2, chunk_size=50, parallel_threshold=100)
+
+    assert submitted == list(range(100, 500, 50))
+    assert report["valid"] == 500 and report["total"] == 500
+
+
+def test_small_streams_and_defaults_stay_in_process(monkeypatch, make_entry):
+    """Streams under the threshold never start a pool; defaults are capped."""
+    def no_pool(*args, **kwargs):
+        raise AssertionError("worker pool started")
+    monkeypatch.setattr(import_validation, "ProcessPoolExecutor", no_pool)
+
+    report = validate_entries([make_entry(f"/s{i}") for i in range(500)], workers=4, chunk_size=50)
+
+    assert report["valid"] == 500
+    assert 1 <= default_workers() <= MAX_DEFAULT_WORKERS
+
+
+def test_validated_import_skips_rejected_and_normalises(tmp_path, temp_snippet_db_path, make_entry):
+    """validate_yaml should write nothing; the import should use its report."""
+    path = tmp_path / "import.yaml"
+    FileUtils.export_snippets_yaml(path, [
+        make_entry("/good", tags="A,b", paste_style="clipboard", enabled="true"),
+        make_entry("bad"),
+        make_entry("/loop", "{/loop}"),
+    ])
+    db = SnippetDB(temp_snippet_db_path)
+    before = len(db.get_all_snippets())
+
+    report = db.validate_yaml(path)
+    assert report["rejected"] == [1, 2]
+    assert len(db.get_all_snippets()) == before
+
+    counts = db.import_from_yaml(path, validation=report)
+
+    assert counts["new"] == 1 and counts["invalid"] == 2
+    good = db.get_snippet("/good")
+    assert good["tags"] == "a,b" and good["paste_style"] == "Clipboard" and good["enabled"]
+    assert not db.get_snippet("/loop")
@@ -0,0 +1,60 @@
+from utils.keyboard_utils import SnippetExpander
+from utils.snippet_db import SnippetDB
+
+
+def make_expander(db):
+    """Build an expander without the keyboard listener and controller.
+
+    pynput needs a display to create those, which test machines may lack.
+
+    Args:
+        db (SnippetDB): The database to read snippets from.
+
+    Returns:
+        SnippetExpander: An expander with its trigger map built.
+    """
+    expander = SnippetExpander.__new__(SnippetExpander)
+    expander.snippets_db = db
+    expander.change_seq = None
+    expander._trigger_by_id = {}
+    expander.build_trigger_map()
+    return expander
+
+
+def test_refresh_applies_deltas(temp_snippet_db_path, make_entry):
+    """Refreshing should apply inserts, renames, disables and deletes."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.insert_snippet(make_entry("/keep"))
+    db.insert_snippet(make_entry("/rename"))
+    db.insert_snippet(make_entry("/disable"))
+    db.insert_snippet(make_entry("/remove"))
+    expander = make_expander(db)
+    assert {"/keep", "/rename", "/disable", "/remove"} <= set(expander.trigger_map)
+
+    renamed = db.get_snippet("/rename")
+    db.insert_snippet({**renamed, "trigger": "#renamed"})
+    db.insert_snippet({**db.get_snippet("/disable"), "enabled": False})
+    db.delete_snippet(db.get_snippet("/remove")["id"])
+    db.insert_snippet(make_entry("/new"))
+
+    expander.refresh_snippets()
+
+    triggers = set(expander.trigger_map)
+    assert {"/keep", "#renamed", "/new"} <= triggers
+    assert not {"/rename", "/disable", "/remove"} & triggers
+    assert "#" in expander.trigger_prefixs
+    assert expander.trigger_regex.search("hello #renamed")
+    assert expander.change_seq == db.latest_change_seq()
+
+
+def test_refresh_rebuilds_when_log_pruned(temp_snippet_db_path, make_entry):
+    """A pruned change log should trigger a full rebuild."""
+    db = SnippetDB(temp_snippet_db_path)
+    expander = make_expander(db)
+
+    for i in range(5):
+        db.insert_snippet(make_entry(f"/p{i}"))
+    db.prune_change_log(keep=1)
+
+    expander.refresh_snippets()
+    assert {f"/p{i}" for i in range(5)} <= set(expander.trigger_map)
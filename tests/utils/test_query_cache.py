@@ -0,0 +1,82 @@
+from utils.query_cache import QueryCache
+from utils.snippet_db import SnippetDB
+
+
+def test_cache_hits_and_generation_invalidation():
+    """Entries should be served until the generation is bumped."""
+    cache = QueryCache(max_entries=4)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return ["a"]
+
+    assert cache.get_or_load("k", load) == ["a"]
+    assert cache.get_or_load("k", load) == ["a"]
+    assert len(calls) == 1
+
+    cache.bump()
+    cache.get_or_load("k", load)
+    assert len(calls) == 2
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["generation"]) == (1, 2, 1)
+
+
+def test_cache_limits():
+    """The LRU bound and row limit should both be enforced."""
+    cache = QueryCache(max_entries=2, max_rows=3)
+    for key in ("a", "b", "c"):
+        cache.get_or_load(key, lambda: [key])
+    cache.get_or_load("big", lambda: [1, 2, 3, 4])
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["skipped"] == 1
+
+
+def test_result_loaded_across_a_write_is_not_stored():
+    """A load that races with a write must not populate the cache."""
+    cache = QueryCache()
+
+    def load():
+        cache.bump()  # a write lands while the query runs
+        return ["stale"]
+
+    cache.get_or_load("k", load)
+    assert cache.stats()["size"] == 0
+
+
+def test_snippet_db_caches_reads_and_invalidates_on_write(temp_snippet_db_path, make_entry):
+    """Repeated reads should hit the cache and writes should invalidate it."""
+    db = SnippetDB(temp_snippet_db_path)
+
+    first = db.get_all_folders()
+    before = db.cache_stats()
+    assert db.get_all_folders() == first
+    assert db.cache_stats()["hits"] == before["hits"] + 1
+
+    db.insert_snippet(make_entry("/cached", folder="Fresh"))
+    assert "Fresh" in db.get_all_folders()
+    assert "/cached" in db.get_all_triggers()
+
+
+def test_snippet_db_returns_copies(temp_snippet_db_path):
+    """Mutating a returned list must not corrupt the cache."""
+    db = SnippetDB(temp_snippet_db_path)
+
+    db.get_all_snippets().clear()
+    assert db.get_all_snippets()
+
+
+def test_snippet_db_sees_external_writes(temp_snippet_db_path, make_entry):
+    """Writes from another connection should invalidate cached results."""
+    db = SnippetDB(temp_snippet_db_path)
+    assert "/elsewhere" not in db.get_all_triggers()
+
+    other = SnippetDB(temp_snippet_db_path)
+    other.insert_snippet(make_entry("/elsewhere"))
+    other.close()
+
+    assert "/elsewhere" in db.get_all_triggers()
@@ -0,0 +1,107 @@
+import sqlite3
+import time
+
+from utils.query_profiler import QueryProfiler, normalize_sql
+from utils.snippet_db import SnippetDB
+
+
+class FakePool:
+    """Connection pool stand-in exposing only the trace hook."""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def set_trace_callback(self, callback):
+        self.conn.set_trace_callback(callback)
+
+
+class FakeDB:
+    """Minimal profiled database with nested and generator methods."""
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.pool = FakePool(self.conn)
+
+    def outer(self):
+        self.conn.execute("SELECT name FROM sqlite_master").fetchall()
+        self.inner()
+
+    def inner(self):
+        self.conn.execute("SELECT sqlite_version()").fetchall()
+        time.sleep(0.05)
+
+    def rows(self):
+        for i in range(3):
+            time.sleep(0.02)
+            yield i
+
+
+def test_normalize_sql_strips_literals():
+    """Expanded parameters should collapse to placeholders."""
+    sql = "SELECT * FROM snippets\n  WHERE trigger = 'it''s' AND id > 42 AND label = 't1'"
+    assert normalize_sql(sql) == "SELECT * FROM snippets WHERE trigger = ? AND id > ? AND label = ?"
+
+
+def test_profiler_times_methods_and_statements(temp_snippet_db_path):
+    """Enabled profiling should aggregate per method and per statement."""
+    db = SnippetDB(temp_snippet_db_path)
+    profiler = QueryProfiler()
+    profiler.attach(db)
+
+    db.search_snippets("before")
+    assert profiler.stats()["methods"] == {}
+
+    profiler.enable()
+    db.search_snippets("one")
+    db.search_snippets("two")
+
+    stats = profiler.stats()
+    assert stats["methods"]["search_snippets"]["count"] == 2
+    assert any("LIKE ?" in sql and s["count"] == 2 for sql, s in stats["statements"].items())
+    assert "search_snippets" in profiler.report()
+
+    profiler.disable()
+    assert "search_snippets" not in db.__dict__
+    db.search_snippets("after")
+    assert profiler.stats()["methods"]["search_snippets"]["count"] == 2
+
+
+def test_slow_queries_are_logged_with_plan(temp_snippet_db_path, tmp_path):
+    """Statements over the threshold should land in the slow log."""
+    db = SnippetDB(temp_snippet_db_path)
+    log_path = tmp_path / "logs" / "slow_queries.log"
+    profiler = QueryProfiler(slow_log_path=log_path, threshold_ms=0.0, enabled=True)
+    profiler.attach(db)
+
+    db.get_snippets_page(order_by="label")
+
+    slow = [q for q in profiler.slow_queries if q["method"] == "get_snippets_page"]
+    assert slow and any("idx_snippets_label" in step for q in slow for step in q["plan"])
+    assert "get_snippets_page" in log_path.read_text()
+
+
+def test_nested_calls_charge_statements_to_innermost_frame():
+    """A nested profiled call's time should not land on the caller's statement."""
+    db = FakeDB()
+    profiler = QueryProfiler(enabled=True)
+    profiler.attach(db)
+
+    db.outer()
+
+    stats = profiler.stats()
+    assert stats["statements"]["SELECT name FROM sqlite_master"]["total_ms"] < 25
+    assert stats["statements"]["SELECT sqlite_version()"]["total_ms"] >= 50
+    assert stats["methods"]["outer"]["total_ms"] >= 50
+    assert stats["methods"]["inner"]["count"] == 1
+
+
+def test_generator_methods_are_timed_over_iteration():
+    """Generator methods should be timed until exhausted, not just created."""
+    db = FakeDB()
+    profiler = QueryProfiler(enabled=True)
+    profiler.attach(db)
+
+    rows = db.rows()
+    assert profiler.stats()["methods"] == {}
+    assert list(rows) == [0, 1, 2]
+
+    method = profiler.stats()["methods"]["rows"]
+    assert method["count"] == 1 and method["total_ms"] >= 60
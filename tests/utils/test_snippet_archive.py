@@ -0,0 +1,114 @@
+import zipfile
+
+import pytest
+
+from utils.snippet_archive import ArchiveError, iter_archive, read_manifest
+from utils.snippet_db import SnippetDB
+
+
+def make_entries(count):
+    """Build entries spread over three folders with alternating tags."""
+    return [
+        {
+            "enabled": True,
+            "label": f"Entry {i}",
+            "trigger": f"/entry{i}",
+            "snippet": f"Body {i}\nline\u2028sep ✓",
+            "paste_style": "Clipboard",
+            "return_press": False,
+            "folder": f"Folder {i % 3}",
+            "tags": "even,bulk" if i % 2 == 0 else "odd",
+        }
+        for i in range(count)
+    ]
+
+
+def content(db):
+    """Return the comparable fields of every snippet in a database."""
+    return sorted(
+        (s["trigger"], s["snippet"], s["folder"], s["tags"], bool(s["enabled"]))
+        for s in db.get_all_snippets()
+    )
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A database holding 2500 generated snippets."""
+    db = SnippetDB(tmp_path / "source.db")
+    db.import_snippets(make_entries(2500))
+    return db
+
+
+def test_archive_round_trip(tmp_path, source):
+    """Exporting and re-importing should reproduce every snippet exactly."""
+    path = tmp_path / "library.qsnip"
+    progress = []
+
+    result = source.export_to_archive(path, progress=lambda done, total: progress.append(done))
+    target = SnippetDB(tmp_path / "target.db")
+    counts = target.import_from_archive(path)
+
+    assert result == {"exported": 2501, "cancelled": 0}
+    assert progress == [1000, 2000, 2501]
+    assert read_manifest(path)["count"] == 2501
+    assert counts["new"] + counts["updated"] == 2501
+    assert content(target) == content(source)
+
+
+def test_partial_import_by_folder_and_tag(tmp_path, source):
+    """Only matching snippets should be imported."""
+    path = tmp_path / "library.qsnip"
+    source.export_to_archive(path)
+    target = SnippetDB(tmp_path / "target.db")
+
+    target.import_from_archive(path, folders=["Folder 1"])
+    assert {s["folder"] for s in target.get_all_snippets() if s["trigger"].startswith("/entry")} == {"Folder 1"}
+
+    entries = list(iter_archive(path, tags=["odd"]))
+    assert len(entries) == 1250 and all(e["tags"] == "odd" for e in entries)
+
+
+def test_partial_import_skips_unmatched_members(tmp_path):
+    """Members whose manifest lists no matching folder should not be read."""
+    db = SnippetDB(tmp_path / "source.db")
+    entries = make_entries(2000)
+    for entry in entries[:1000]:
+        entry["folder"] = "Early"
+    db.import_snippets(entries)
+    path = tmp_path / "library.qsnip"
+    db.export_to_archive(path)
+    seen = []
+
+    found = list(iter_archive(path, folders=["Early"], progress=lambda done, total: seen.append(total)))
+
+    assert len(found) == 1000
+    assert seen[-1] < 2001
+
+
+def test_corrupt_member_is_rejected(tmp_path, source):
+    """A member whose bytes do not match the manifest checksum should fail."""
+    path = tmp_path / "library.qsnip"
+    source.export_to_archive(path)
+    tampered = tmp_path / "tampered.qsnip"
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(tampered, "w") as dst:
+        for name in src.namelist():
+            data = src.read(name)
+            dst.writestr(name, data.replace(b"Body 1\\n", b"Body X\\n") if name.endswith("000000.jsonl") else data)
+
+    with pytest.raises(ArchiveError):
+        list(iter_archive(tampered))
+    assert SnippetDB(tmp_path / "target.db").import_from_archive(tampered) is None
+
+
+def test_cancelled_archive_export_leaves_target_untouched(tmp_path, source):
+    """Cancelling should keep the previous file and remove the temp file."""
+    target = tmp_path / "library.qsnip"
+    target.write_bytes(b"previous")
+
+    result = source.export_to_archive(target, progress=lambda done, total: False)
+
+    assert result == {"exported": 0, "cancelled": 1}
+    assert target.read_bytes() == b"previous"
+    assert not target.with_suffix(".qsnip.tmp").exists()
+    with pytest.raises(ArchiveError):
+        read_manifest(target)
@@ -1,6 +1,7 @@
 import pytest
 
 from utils.snippet_db import SnippetDB
+from utils.file_utils import FileUtils
 
 
 def test_db_initializes_and_seeds(temp_snippet_db_path):
@@ -112,6 +113,31 @@ def test_get_random_snippet(temp_snippet_db_path):
     assert snippet["enabled"] is True
 
 
+def test_get_random_snippet_skips_gaps_and_disabled(temp_snippet_db_path):
+    """Sampling should only return enabled rows and reach all of them."""
+    db = SnippetDB(temp_snippet_db_path)
+    _seed_many(db, 30)
+
+    # Punch holes in the id range
+    for snippet in db.get_all_snippets():
+        if snippet["id"] % 4 == 0:
+            db.delete_snippet(snippet["id"])
+
+    enabled = {s["trigger"] for s in db.get_all_snippets() if s["enabled"]}
+    seen = {db.get_random_snippet()["trigger"] for _ in range(2000)}
+
+    assert seen == enabled
+
+
+def test_get_random_snippet_empty(temp_snippet_db_path):
+    """With no enabled snippets an empty dictionary is returned."""
+    db = SnippetDB(temp_snippet_db_path)
+    with db.pool.write() as conn:
+        conn.execute("UPDATE snippets SET enabled = 0")
+
+    assert db.get_random_snippet() == {}
+
+
 def test_folder_operations(temp_snippet_db_path):
     """Folder rename and delete should work correctly."""
     db = SnippetDB(temp_snippet_db_path)
@@ -184,3 +210,341 @@ def test_search_snippets(temp_snippet_db_path):
     results = db.search_snippets("needle")
     assert len(results) >= 1
     assert any(r["trigger"] == "/search" for r in results)
+
+
+def _seed_many(db, count):
+    """Insert count snippets spread over a few folders, some without one."""
+    for i in range(count):
+        db.insert_snippet({
+            "enabled": i % 3 != 0,
+            "label": f"Label {i % 7}",
+            "trigger": f"/many{i:03d}",
+            "snippet": "body",
+            "paste_style": "clipboard",
+            "return_press": False,
+            "folder": None if i % 5 == 0 else f"F{i % 4}",
+            "tags": "",
+        })
+
+
+@pytest.mark.parametrize("order_by", ["id", "label", "trigger", "folder"])
+def test_keyset_pages_cover_every_row_once(temp_snippet_db_path, order_by):
+    """Walking pages should return every row exactly once, in order."""
+    db = SnippetDB(temp_snippet_db_path)
+    _seed_many(db, 53)
+
+    seen = []
+    key = None
+    while True:
+        rows, key = db.get_snippets_page(after_key=key, limit=10, order_by=order_by)
+        seen.extend(rows)
+        if key is None:
+            break
+
+    expected = db.get_all_snippets()
+    assert sorted(r["id"] for r in seen) == sorted(r["id"] for r in expected)
+
+    # NULLs sort first in SQLite, so map them below any string
+    sort_keys = [((r[order_by] is not None, r[order_by]), r["id"]) for r in seen]
+    assert sort_keys == sorted(sort_keys)
+
+
+def test_get_snippets_page_rejects_unknown_order(temp_snippet_db_path):
+    """Only whitelisted columns may be used for ordering."""
+    db = SnippetDB(temp_snippet_db_path)
+
+    assert db.get_snippets_page(order_by="snippet; DROP TABLE snippets") is None
+    assert db.get_all_snippets()
+
+
+def test_iter_snippets_streams_with_filters(temp_snippet_db_path):
+    """iter_snippets should be lazy and honour filters across chunks."""
+    db = SnippetDB(temp_snippet_db_path)
+    _seed_many(db, 40)
+
+    stream = db.iter_snippets(chunk_size=7, filters={"enabled": True})
+    assert not isinstance(stream, list)
+
+    rows = list(stream)
+    assert rows and all(r["enabled"] is True for r in rows)
+    assert len(rows) == sum(1 for s in db.get_all_snippets() if s["enabled"])
+
+    in_folder = list(db.iter_snippets(chunk_size=4, filters={"folder": "F1"}))
+    assert in_folder and all(r["folder"] == "F1" for r in in_folder)
+
+    matches = list(db.iter_snippets(filters={"keyword": "many01"}))
+    assert {r["trigger"] for r in matches} == {f"/many{i:03d}" for i in range(10, 20)}
+
+
+def test_change_log_records_inserts_updates_and_deletes(temp_snippet_db_path):
+    """Triggers should log every content change in order."""
+    db = SnippetDB(temp_snippet_db_path)
+    seq = db.latest_change_seq()
+
+    entry = {
+        "enabled": True,
+        "label": "Logged",
+        "trigger": "/logged",
+        "snippet": "v1",
+        "paste_style": "clipboard",
+        "return_press": False,
+        "folder": "",
+        "tags": "",
+    }
+    db.insert_snippet(entry)
+    db.insert_snippet(entry)  # identical upsert is not a change
+    db.insert_snippet({**entry, "snippet": "v2"})
+    snippet_id = db.get_snippet("/logged")["id"]
+    db.delete_snippet(snippet_id)
+
+    changes = db.changes_since(seq)
+    assert [c["op"] for c in changes] == ["insert", "update", "delete"]
+    assert {c["snippet_id"] for c in changes} == {snippet_id}
+    assert all(c["trigger"] == "/logged" for c in changes)
+    assert changes[-1]["seq"] == db.latest_change_seq()
+    assert db.changes_since(db.latest_change_seq()) == []
+
+
+def test_change_log_pruning_is_detected(temp_snippet_db_path):
+    """Readers behind the pruned window must be told to reload fully."""
+    db = SnippetDB(temp_snippet_db_path)
+    start = db.latest_change_seq()
+    _seed_many(db, 10)
+
+    assert db.change_log_covers(start)
+    db.prune_change_log(keep=3)
+
+    assert not db.change_log_covers(start)
+    assert db.change_log_covers(db.latest_change_seq() - 3)
+    assert len(db.changes_since(db.latest_change_seq() - 3)) == 3
+
+
+def test_data_version_sees_other_connections(temp_snippet_db_path):
+    """data_version should move when another connection commits."""
+    db = SnippetDB(temp_snippet_db_path)
+    before = db.data_version()
+    assert db.data_version() == before
+
+    other = SnippetDB(temp_snippet_db_path)
+    other.insert_snippet({
+        "enabled": True,
+        "label": "External",
+        "trigger": "/external",
+        "snippet": "x",
+        "paste_style": "clipboard",
+        "return_press": False,
+        "folder": "",
+        "tags": "",
+    })
+    other.close()
+
+    assert db.data_version() != before
+
+
+def test_usage_is_recorded_without_logging_changes(temp_snippet_db_path):
+    """Usage updates should feed top/recent lists but not the change log."""
+    db = SnippetDB(temp_snippet_db_path)
+    _seed_many(db, 5)
+    ids = [record["id"] for record in db.iter_snippets()]
+    seq = db.latest_change_seq()
+
+    assert db.record_usage({ids[1]: (3, 100.0), ids[2]: (5, 50.0)}) == 2
+    assert db.record_usage({ids[1]: (1, 200.0)}) == 1
+
+    assert [r["id"] for r in db.get_top_snippets(limit=5)] == [ids[2], ids[1]]
+    assert [r["id"] for r in db.get_recent_snippets(limit=1)] == [ids[1]]
+    assert db.get_snippets_by_ids([ids[1]])[0]["use_count"] == 4
+    assert db.changes_since(seq) == []
+
+
+def test_large_bodies_are_compressed_transparently(temp_snippet_db_path):
+    """Large bodies should be stored compressed yet read and search as text."""
+    db = SnippetDB(temp_snippet_db_path, compress_threshold=1024)
+    body = "Dear customer,\n" + "lorem ipsum dolor sit amet " * 200 + "needle"
+    entry = {
+        "enabled": True,
+        "label": "Letter",
+        "trigger": "/letter",
+        "snippet": body,
+        "paste_style": "Clipboard",
+        "return_press": False,
+        "folder": "",
+        "tags": "",
+    }
+    db.insert_snippet(entry)
+
+    stored, body_format = db.conn.execute(
+        "SELECT snippet, body_format FROM snippets WHERE trigger = '/letter'"
+    ).fetchone()
+    assert body_format == 1 and isinstance(stored, bytes)
+    assert len(stored) < len(body)
+
+    record = next(s for s in db.get_all_snippets() if s["trigger"] == "/letter")
+    assert record["snippet"] == body
+    assert [s["trigger"] for s in db.search_snippets("needle")] == ["/letter"]
+    assert [s["trigger"] for s in db.iter_snippets(filters={"keyword": "needle"})] == ["/letter"]
+
+    # Re-saving the same body is not a change
+    seq = db.latest_change_seq()
+    db.insert_snippet({**entry, "id": record["id"]})
+    assert db.changes_since(seq) == []
+
+
+def test_compression_can_be_disabled(temp_snippet_db_path):
+    """A threshold of 0 should keep every body as plain text."""
+    db = SnippetDB(temp_snippet_db_path, compress_threshold=0)
+    db.insert_snippet({
+        "enabled": True,
+        "label": "Big",
+        "trigger": "/big",
+        "snippet": "x" * 10000,
+        "paste_style": "Clipboard",
+        "return_press": False,
+        "folder": "",
+        "tags": "",
+    })
+    row = db.conn.execute("SELECT typeof(snippet), body_format FROM snippets WHERE trigger = '/big'").fetchone()
+    assert row == ("text", 0)
+
+
+def test_find_duplicates_groups_normalised_bodies(temp_snippet_db_path, make_entry):
+    """Bodies differing only in whitespace should be grouped together."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.insert_snippet(make_entry("/a", "Kind regards,\nSam"))
+    db.insert_snippet(make_entry("/b", "  Kind regards,\r\n  Sam  "))
+    db.insert_snippet(make_entry("/c", "kind regards, sam"))
+    db.insert_snippet(make_entry("/d", "Kind regards,\nSam", tags="x"))
+
+    groups = db.find_duplicates()
+
+    assert [[r["trigger"] for r in group] for group in groups] == [["/a", "/b", "/d"]]
+    assert [r["trigger"] for r in db.find_by_content("Kind regards, Sam")] == ["/a", "/b", "/d"]
+
+
+def test_import_can_skip_or_merge_duplicates(temp_snippet_db_path, make_entry):
+    """Duplicate bodies should be skipped or merged into the existing snippet."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.insert_snippet(make_entry("/sig", "Best,\nSam", tags="mail"))
+    batch = [
+        make_entry("/sig2", "Best, Sam", tags="work"),
+        make_entry("/new", "Something else"),
+        make_entry("/new2", "Something  else"),
+    ]
+
+    assert db.import_snippets(batch, duplicates="skip") == {"new": 1, "updated": 0, "skipped": 2, "merged": 0, "failed": 0}
+    assert db.get_snippet("/sig2") == {}
+
+    counts = db.import_snippets([make_entry("/sig3", "Best,  Sam", tags="work,mail")], duplicates="merge")
+    assert counts["merged"] == 1
+    assert db.get_snippet("/sig")["tags"] == "mail,work"
+
+    assert db.import_snippets(batch, duplicates="keep") is not None
+    assert db.get_snippet("/sig2") and db.get_snippet("/new2")
+    with pytest.raises(ValueError):
+        db.import_snippets(batch, duplicates="nope")
+
+
+def _stamps(db, trigger):
+    """Read (created_at, updated_at) of a snippet."""
+    return db.conn.execute("SELECT created_at, updated_at FROM snippets WHERE trigger = ?", (trigger,)).fetchone()
+
+
+def test_timestamps_follow_content_changes(temp_snippet_db_path, make_entry):
+    """updated_at should move on content edits only; created_at never moves."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.insert_snippet(make_entry("/stamp", "v1"))
+    created, updated = _stamps(db, "/stamp")
+    assert created == updated and created is not None
+
+    with db._write() as conn:
+        conn.execute("UPDATE snippets SET created_at = 1.0, updated_at = 1.0 WHERE trigger = '/stamp'")
+    db.insert_snippet(make_entry("/stamp", "v1"))
+    db.record_usage({db.get_snippet("/stamp")["id"]: (1, 5.0)})
+    assert _stamps(db, "/stamp") == (1.0, 1.0)
+
+    db.insert_snippet(make_entry("/stamp", "v2"))
+    created, updated = _stamps(db, "/stamp")
+    assert created == 1.0 and updated > 1.0
+
+
+def test_delta_round_trip(tmp_path, temp_snippet_db_path, make_entry):
+    """A delta should carry edits, renames and deletions to another database."""
+    source = SnippetDB(temp_snippet_db_path)
+    replica = SnippetDB(tmp_path / "replica.db")
+    for trigger in ("/keep", "/edit", "/gone", "/old"):
+        source.insert_snippet(make_entry(trigger, f"Body {trigger}"))
+    assert replica.import_delta(source.export_since(0))["invalid"] == 0
+
+    mark = source.export_since(0)["until"]
+    with source._write() as conn:
+        conn.execute("UPDATE snippets SET updated_at = ? - 10 WHERE trigger = '/keep'", (mark,))
+    source.insert_snippet(make_entry("/edit", "Edited"))
+    source.delete_snippet(source.get_snippet("/gone")["id"])
+    with source._write() as conn:
+        conn.execute("UPDATE snippets SET trigger = '/new' WHERE trigger = '/old'")
+
+    path = tmp_path / "delta.yaml"
+    FileUtils.write_yaml(path, source.export_since(mark))
+    delta = FileUtils.read_yaml(path)
+
+    assert {s["trigger"] for s in delta["snippets"]} == {"/edit", "/new"}
+    assert {d["trigger"] for d in delta["deleted"]} == {"/gone", "/old"}
+    assert replica.import_delta(delta) == {"new": 1, "updated": 1, "deleted": 2, "stale": 0, "invalid": 0}
+    assert replica.get_snippet("/edit")["snippet"] == "Edited"
+    assert not replica.get_snippet("/gone") and not replica.get_snippet("/old")
+    assert _stamps(replica, "/edit")[1] == _stamps(source, "/edit")[1]
+    again = source.export_since(delta["until"])
+    assert again["until"] == delta["until"]
+    assert all(s["updated_at"] == delta["until"] for s in again["snippets"])
+    assert replica.import_delta(again)["stale"] == 0
+
+    # A deletion forwarded by a peer that never had the snippet still applies
+    third = SnippetDB(tmp_path / "third.db")
+    third.insert_snippet(make_entry("/x", "Body /x"))
+    with third._write() as conn:
+        conn.execute("UPDATE snippets SET updated_at = 1.0 WHERE trigger = '/x'")
+    source.insert_snippet(make_entry("/x", "Body /x"))
+    source.delete_snippet(source.get_snippet("/x")["id"])
+
+    assert replica.import_delta(source.export_since(delta["until"]))["deleted"] == 0
+    forwarded = replica.export_since(delta["until"])
+    assert "/x" in {d["trigger"] for d in forwarded["deleted"]}
+    assert third.import_delta(forwarded)["deleted"] == 1
+    assert not third.get_snippet("/x")
+    assert replica.import_delta({"snippets": [{**make_entry("/x", "Old"), "updated_at": 1.0}]})["stale"] == 1
+    assert not replica.get_snippet("/x")
+
+
+def test_old_tombstones_are_pruned(temp_snippet_db_path, make_entry):
+    """Tombstones past the retention period should be dropped."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.insert_snippet(make_entry("/old", "Body"))
+    db.insert_snippet(make_entry("/recent", "Body"))
+    db.delete_snippet(db.get_snippet("/old")["id"])
+    db.delete_snippet(db.get_snippet("/recent")["id"])
+    with db._write() as conn:
+        conn.execute("UPDATE snippet_tombstones SET deleted_at = 1.0 WHERE trigger = '/old'")
+
+    db.prune_tombstones()
+
+    assert [d["trigger"] for d in db.export_since(0)["deleted"]] == ["/recent"]
+
+
+def test_delta_keeps_newer_local_changes(tmp_path, temp_snippet_db_path, make_entry):
+    """Entries and deletions older than the local state should be skipped."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.insert_snippet(make_entry("/mine", "Local edit"))
+    db.insert_snippet(make_entry("/dead", "Removed here"))
+    db.delete_snippet(db.get_snippet("/dead")["id"])
+
+    counts = db.import_delta({
+        "snippets": [
+            {**make_entry("/mine", "Old remote"), "updated_at": 1.0},
+            {**make_entry("/dead", "Old remote"), "updated_at": 1.0},
+        ],
+        "deleted": [{"trigger": "/mine", "deleted_at": 1.0}],
+    })
+
+    assert counts == {"new": 0, "updated": 0, "deleted": 0, "stale": 3, "invalid": 0}
+    assert db.get_snippet("/mine")["snippet"] == "Local edit"
+    assert not db.get_snippet("/dead")
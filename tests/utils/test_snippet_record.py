@@ -0,0 +1,50 @@
+import pytest
+
+from utils.snippet_db import SnippetDB
+from utils.snippet_record import SnippetRecord, SNIPPET_COLUMNS
+
+
+def test_records_behave_like_mappings(temp_snippet_db_path):
+    """Rows should support the dictionary access callers already use."""
+    db = SnippetDB(temp_snippet_db_path)
+
+    record = next(s for s in db.get_all_snippets() if s["trigger"] == "/welcome")
+    assert isinstance(record, SnippetRecord)
+    assert record["trigger"] == record.trigger == "/welcome"
+    assert record.get("missing", "fallback") == "fallback"
+    assert "label" in record
+    assert list(record) == list(SNIPPET_COLUMNS)
+    assert dict(record) == record.to_dict()
+    assert {**record}["id"] == record.id
+
+    with pytest.raises(KeyError):
+        record["missing"]
+
+
+def test_records_are_slotted():
+    """Records should not carry a per-instance __dict__."""
+    record = SnippetRecord(1, True, "L", "/t", "body", "Clipboard", False, None, "")
+    assert not hasattr(record, "__dict__")
+
+
+def test_boolean_columns_are_converted(temp_snippet_db_path):
+    """BOOLEAN columns should come back as bools from every query path."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.insert_snippet({
+        "enabled": False,
+        "label": "Off",
+        "trigger": "/off",
+        "snippet": "x",
+        "paste_style": "Clipboard",
+        "return_press": True,
+        "folder": "",
+        "tags": "",
+    })
+
+    single = db.get_snippet("/off")
+    assert single["enabled"] is False
+    assert single["return_press"] is True
+
+    found = db.search_snippets("/off")[0]
+    assert found["enabled"] is False
+    assert found["return_press"] is True
@@ -0,0 +1,35 @@
+from utils.snippet_db import SnippetDB
+from utils.usage_tracker import UsageTracker
+
+
+def test_record_batches_until_flush(temp_snippet_db_path):
+    """Uses should stay in memory until flushed in one write."""
+    db = SnippetDB(temp_snippet_db_path)
+    snippet_id = db.get_snippet("/welcome")["id"]
+    tracker = UsageTracker(db, flush_seconds=0)
+
+    for _ in range(3):
+        tracker.record(snippet_id)
+    tracker.record(None)
+
+    assert tracker.pending_count() == 1
+    assert db.get_snippet("/welcome")["use_count"] == 0
+    assert tracker.flush_due()
+
+    assert tracker.flush() == 1
+    assert tracker.pending_count() == 0
+    assert not tracker.flush_due()
+    assert db.get_snippet("/welcome")["use_count"] == 3
+    assert db.get_snippet("/welcome")["last_used"] is not None
+
+
+def test_failed_flush_keeps_counts(temp_snippet_db_path):
+    """Counts should be merged back when the write fails."""
+    db = SnippetDB(temp_snippet_db_path)
+    snippet_id = db.get_snippet("/welcome")["id"]
+    tracker = UsageTracker(db)
+    tracker.record(snippet_id)
+
+    db.close()
+    assert tracker.flush() == 0
+    assert tracker.pending_count() == 1
@@ -0,0 +1,49 @@
+import pytest
+import yaml
+
+from utils import yaml_codec
+from utils.file_utils import FileUtils
+from utils.yaml_stream import iter_yaml_snippets
+
+SAMPLE = {
+    "version": "1.0.0",
+    "snippets": [
+        {
+            "id": 1,
+            "enabled": True,
+            "label": "Unicode ✓ — café",
+            "trigger": "/sig",
+            "snippet": "Line one\n  indented\ttab\n\nlast: value # not a comment\n",
+            "tags": None,
+            "folder": "x" * 200,
+        },
+        {"id": 2, "enabled": False, "label": "'quoted' \"both\"", "trigger": "/q", "snippet": "yes"},
+    ],
+}
+
+
+def test_codec_round_trips_and_matches_pure_python():
+    """The codec should emit and parse exactly what safe_dump/safe_load do."""
+    text = yaml_codec.dump(SAMPLE)
+    assert text == yaml.safe_dump(SAMPLE)
+    assert yaml_codec.load(text) == yaml.safe_load(text) == SAMPLE
+
+
+def test_codec_uses_libyaml_when_available():
+    """C classes should be picked whenever PyYAML was built with libyaml."""
+    if not yaml.__with_libyaml__:
+        pytest.skip("PyYAML built without libyaml")
+    assert yaml_codec.HAS_LIBYAML
+    assert yaml_codec.SafeLoader is yaml.CSafeLoader
+    assert yaml_codec.SafeDumper is yaml.CSafeDumper
+
+
+@pytest.mark.parametrize("accelerated", [True, False])
+def test_stream_loader_matches_full_load(tmp_path, monkeypatch, accelerated):
+    """Streaming should give the same entries with or without libyaml."""
+    if not accelerated:
+        monkeypatch.setattr(yaml_codec, "StreamLoader", yaml.SafeLoader)
+    path = tmp_path / "export.yaml"
+    FileUtils.write_yaml(path, SAMPLE)
+
+    assert list(iter_yaml_snippets(path)) == SAMPLE["snippets"]
@@ -0,0 +1,107 @@
+import pytest
+import yaml
+
+from utils.file_utils import FileUtils
+from utils.snippet_db import SnippetDB
+from utils.yaml_stream import iter_yaml_snippets
+
+
+def make_entries(count):
+    """Build snippet entries with unique triggers."""
+    return [
+        {
+            "enabled": True,
+            "label": f"Entry {i}",
+            "trigger": f"/entry{i}",
+            "snippet": f"Body {i}\nsecond line",
+            "paste_style": "Clipboard",
+            "return_press": False,
+            "folder": "Imported",
+            "tags": "bulk",
+        }
+        for i in range(count)
+    ]
+
+
+def test_stream_matches_full_load(tmp_path):
+    """Streaming should yield exactly what the whole-file loader returns."""
+    path = tmp_path / "export.yaml"
+    FileUtils.export_snippets_yaml(path, make_entries(25))
+    seen = []
+
+    entries = list(iter_yaml_snippets(path, progress=lambda done, total: seen.append((done, total))))
+
+    assert entries == FileUtils.import_snippets_yaml(path)
+    assert seen[-1][0] == seen[-1][1] == path.stat().st_size
+
+
+@pytest.mark.parametrize("text", ["", "snippets:\n", "other: [1, 2]\n", "just text\n"])
+def test_stream_without_snippets_yields_nothing(tmp_path, text):
+    """Files without a snippets list should stream as empty."""
+    path = tmp_path / "empty.yaml"
+    path.write_text(text, encoding="utf-8")
+    assert list(iter_yaml_snippets(path)) == []
+
+
+def test_stream_rejects_non_list(tmp_path):
+    """A snippets key that is not a list should be rejected like the full loader."""
+    path = tmp_path / "bad.yaml"
+    path.write_text(yaml.safe_dump({"snippets": {"a": 1}}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_yaml_snippets(path))
+
+
+def test_import_from_yaml_commits_in_batches(tmp_path, temp_snippet_db_path):
+    """Imports should write every batch and report progress after each one."""
+    path = tmp_path / "export.yaml"
+    FileUtils.export_snippets_yaml(path, make_entries(120))
+    db = SnippetDB(temp_snippet_db_path)
+    calls = []
+
+    counts = db.import_from_yaml(path, batch_size=50, progress=lambda done, total: calls.append(done) or True)
+
+    assert counts["new"] == 120 and counts["cancelled"] == 0
+    assert len(calls) == 3 and calls == sorted(calls)
+    assert len(db.get_all_snippets()) == 121
+
+
+def test_import_from_yaml_can_be_cancelled(tmp_path, temp_snippet_db_path):
+    """Returning False from progress should stop after the current batch."""
+    path = tmp_path / "export.yaml"
+    FileUtils.export_snippets_yaml(path, make_entries(120))
+    db = SnippetDB(temp_snippet_db_path)
+
+    counts = db.import_from_yaml(path, batch_size=50, progress=lambda done, total: False)
+
+    assert counts["new"] == 50 and counts["cancelled"] == 1
+    assert len(db.get_all_snippets()) == 51
+
+
+def test_streamed_export_matches_whole_file_export(tmp_path, temp_snippet_db_path):
+    """export_to_yaml should write byte-identical output to the old exporter."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.import_snippets(make_entries(1200))
+    streamed = tmp_path / "streamed.yaml"
+    whole = tmp_path / "whole.yaml"
+    progress = []
+
+    result = db.export_to_yaml(streamed, progress=lambda done, total: progress.append((done, total)))
+    FileUtils.export_snippets_yaml(whole, db.get_all_snippets())
+
+    assert result == {"exported": 1201, "cancelled": 0}
+    assert streamed.read_text(encoding="utf-8") == whole.read_text(encoding="utf-8")
+    assert progress[-1] == (1201, 1201)
+
+
+def test_cancelled_export_leaves_target_untouched(tmp_path, temp_snippet_db_path):
+    """Cancelling should discard the temporary file and keep the old export."""
+    db = SnippetDB(temp_snippet_db_path)
+    db.import_snippets(make_entries(1200))
+    target = tmp_path / "export.yaml"
+    target.write_text("previous", encoding="utf-8")
+
+    result = db.export_to_yaml(target, progress=lambda done, total: False)
+
+    assert result == {"exported": 0, "cancelled": 1}
+    assert target.read_text(encoding="utf-8") == "previous"
+    assert not target.with_suffix(".yaml.tmp").exists()
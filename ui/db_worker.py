@@ -0,0 +1,367 @@
+import logging
+import threading
+from itertools import count
+from typing import Any, Callable, Dict, Hashable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+
+logger = logging.getLogger(__name__)
+
+# Reader threads. Each keeps its own SQLite connection for its lifetime.
+DEFAULT_READ_THREADS = 2
+
+
+class DbRequest:
+    """
+    Handle for a database call submitted to a DbWorker.
+
+    Acts as a small future: once the call finishes, done is set and result
+    or error hold the outcome. Cancelling a request before it starts skips
+    it; cancelling one that is already running discards its result.
+    """
+    __slots__ = ("id", "key", "fn", "args", "kwargs", "on_result", "on_error",
+                 "cancelled", "done", "result", "error")
+
+    def __init__(self, request_id: int, key: Hashable | None, fn, args: tuple, kwargs: dict,
+                 on_result: Callable | None, on_error: Callable | None) -> None:
+        """
+        Initialize the DbRequest.
+
+        Args:
+            request_id (int): Sequential request identifier.
+            key (Hashable | None): Coalescing key, or None for independent calls.
+            fn (str | Callable): SnippetDB method name, or a callable taking
+                the database as its first argument.
+            args (tuple): Positional arguments for the call.
+            kwargs (dict): Keyword arguments for the call.
+            on_result (Callable | None): Called with the result on the GUI thread.
+            on_error (Callable | None): Called with the exception on the GUI thread.
+
+        Returns:
+            None
+        """
+        self.id = request_id
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+        self.cancelled = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def cancel(self) -> None:
+        """
+        Cancel the request. Its callbacks will not be called.
+
+        Returns:
+            None
+        """
+        self.cancelled = True
+
+    def __repr__(self) -> str:
+        name = self.fn if isinstance(self.fn, str) else getattr(self.fn, "__name__", "call")
+        return f"DbRequest(id={self.id}, fn={name!r}, key={self.key!r})"
+
+
+class _DbTask(QRunnable):
+    """
+    Runnable executing one DbRequest on a pool thread.
+    """
+    def __init__(self, worker: "DbWorker", request: DbRequest) -> None:
+        """
+        Initialize the _DbTask.
+
+        Args:
+            worker (DbWorker): The worker owning the database and result signal.
+            request (DbRequest): The request to execute.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.worker = worker
+        self.request = request
+
+    def run(self) -> None:
+        """
+        Execute the request and emit its outcome to the worker.
+
+        Requests cancelled before they start are skipped. Exceptions are
+        caught and delivered as the error rather than raised on the pool
+        thread.
+
+        Returns:
+            None
+        """
+        request = self.request
+        if request.cancelled:
+            self.worker._finished.emit(request, None, None)
+            return
+
+        result, error = None, None
+        try:
+            if isinstance(request.fn, str):
+                result = getattr(self.worker.db, request.fn)(*request.args, **request.kwargs)
+            else:
+                result = request.fn(self.worker.db, *request.args, **request.kwargs)
+        except Exception as e:
+            error = e
+        self.worker._finished.emit(request, result, error)
+
+
+class DbWorker(QObject):
+    """
+    Runs SnippetDB calls off the Qt main thread.
+
+    Reads run on a small thread pool, writes on a single dedicated thread
+    so they apply in submission order. Results are delivered back on the
+    thread that owns the worker (the GUI thread) through a queued signal,
+    so callbacks may touch widgets directly.
+
+    Requests submitted with a key are coalesced: submitting a new request
+    under the same key cancels the previous one. A queued request is
+    skipped; a running SQLite call is not interrupted, but its result is
+    discarded when it finishes. This is how stale searches are dropped
+    while the user keeps typing.
+    """
+    # request, result, error. Emitted from pool threads.
+    _finished = Signal(object, object, object)
+
+    # Emitted on the GUI thread whenever there is no pending request
+    idle = Signal()
+
+    def __init__(self, db, read_threads: int = DEFAULT_READ_THREADS, parent: QObject | None = None) -> None:
+        """
+        Initialize the DbWorker.
+
+        Args:
+            db (SnippetDB): The database to run calls against.
+            read_threads (int): Maximum number of concurrent read calls.
+            parent (QObject | None): Optional Qt parent.
+
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        self.db = db
+
+        # Threads never expire so their per-thread connections stay bounded
+        self._read_pool = QThreadPool(self)
+        self._read_pool.setMaxThreadCount(max(1, read_threads))
+        self._read_pool.setExpiryTimeout(-1)
+        self._write_pool = QThreadPool(self)
+        self._write_pool.setMaxThreadCount(1)
+        self._write_pool.setExpiryTimeout(-1)
+
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._latest: Dict[Hashable, DbRequest] = {}
+        self._pending: Dict[int, DbRequest] = {}
+        self._closed = False
+
+        self._finished.connect(self._deliver, Qt.QueuedConnection)
+
+    def submit(
+        self,
+        fn: str | Callable,
+        *args,
+        key: Hashable | None = None,
+        write: bool = False,
+        on_result: Callable | None = None,
+        on_error: Callable | None = None,
+        **kwargs,
+    ) -> DbRequest | None:
+        """
+        Queue a database call.
+
+        Args:
+            fn (str | Callable): SnippetDB method name, or a callable that is
+                passed the database followed by args and kwargs.
+            *args: Positional arguments for the call.
+            key (Hashable | None): Coalescing key. A newer request with the
+                same key cancels this one.
+            write (bool): Run on the ordered write thread.
+            on_result (Callable | None): Called with the result on the GUI thread.
+            on_error (Callable | None): Called with the exception on the GUI
+                thread. Errors are logged when omitted.
+            **kwargs: Keyword arguments for the call.
+
+        Returns:
+            DbRequest | None: The request handle, or None after shutdown.
+        """
+        if self._closed:
+            logger.warning("DbWorker is shut down; dropping request for %s", fn)
+            return None
+
+        request = DbRequest(next(self._ids), key, fn, args, kwargs, on_result, on_error)
+        with self._lock:
+            if key is not None:
+                previous = self._latest.get(key)
+                if previous is not None:
+                    previous.cancel()
+                self._latest[key] = request
+            self._pending[request.id] = request
+
+        pool = self._write_pool if write else self._read_pool
+        pool.start(_DbTask(self, request))
+        return request
+
+    def cancel(self, key: Hashable) -> None:
+        """
+        Cancel the latest request submitted under key.
+
+        Args:
+            key (Hashable): The coalescing key.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            request = self._latest.pop(key, None)
+        if request is not None:
+            request.cancel()
+
+    def pending_count(self) -> int:
+        """
+        Return the number of requests not yet delivered.
+
+        Returns:
+            int: Queued, running and undelivered requests.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def wait_for_done(self, timeout_ms: int = -1) -> bool:
+        """
+        Block until every queued call has run.
+
+        Results are still delivered through the event loop afterwards.
+        Intended for shutdown and tests, never for the GUI thread in
+        normal operation.
+
+        Args:
+            timeout_ms (int): Maximum wait per pool, -1 for no limit.
+
+        Returns:
+            bool: True if both pools finished in time.
+        """
+        writes_done = self._write_pool.waitForDone(timeout_ms)
+        reads_done = self._read_pool.waitForDone(timeout_ms)
+        return writes_done and reads_done
+
+    def shutdown(self, timeout_ms: int = 5000) -> None:
+        """
+        Cancel queued reads and wait for running calls and writes to finish.
+
+        Args:
+            timeout_ms (int): Maximum wait per pool.
+
+        Returns:
+            None
+        """
+        logger.info("Shutting down DbWorker")
+        self._closed = True
+        self._read_pool.clear()
+        with self._lock:
+            for request in self._pending.values():
+                request.on_result = request.on_error = None
+        if not self.wait_for_done(timeout_ms):
+            logger.warning("DbWorker did not finish pending calls within timeout")
+
+    def _deliver(self, request: DbRequest, result: Any, error: Exception | None) -> None:
+        """
+        Deliver a finished request on the GUI thread.
+
+        Callbacks of cancelled requests are not called.
+
+        Args:
+            request (DbRequest): The finished request.
+            result (Any): The call's return value.
+            error (Exception | None): The exception raised, if any.
+
+        Returns:
+            None
+        """
+        request.done = True
+        request.result = result
+        request.error = error
+
+        with self._lock:
+            self._pending.pop(request.id, None)
+            if request.key is not None and self._latest.get(request.key) is request:
+                del self._latest[request.key]
+            now_idle = not self._pending
+
+        try:
+            if request.cancelled:
+                return
+            if error is not None:
+                if request.on_error:
+                    request.on_error(error)
+                else:
+                    logger.error(f"An error occured in database call {request!r}: {error}")
+            elif request.on_result:
+                request.on_result(result)
+        finally:
+            if now_idle:
+                self.idle.emit()
+
+
+class ProgressRelay(QObject):
+    """
+    Carries progress from a worker thread to the GUI and cancellation back.
+
+    Pass report() as the progress callback of a long database call and
+    connect progress to a progress bar. Qt queues the signal onto the
+    GUI thread; cancel() is checked by the call on its next report.
+    """
+    # done, total. Emitted from the thread running the call.
+    progress = Signal(object, object)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        """
+        Initialize the ProgressRelay.
+
+        Args:
+            parent (QObject | None): Optional Qt parent.
+
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        self._cancelled = threading.Event()
+
+    def report(self, done: int, total: int) -> bool:
+        """
+        Publish progress. Safe to call from any thread.
+
+        Args:
+            done (int): Work completed so far.
+            total (int): Total amount of work.
+
+        Returns:
+            bool: False once cancel() has been called, otherwise True.
+        """
+        self.progress.emit(done, total)
+        return not self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """
+        Ask the running call to stop at its next progress report.
+
+        Returns:
+            None
+        """
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        """
+        Check whether cancel() has been called.
+
+        Returns:
+            bool: True if cancelled.
+        """
+        return self._cancelled.is_set()
@@ -9,9 +9,17 @@ class MenuBar(QMenuBar):
     """
     importAction = Signal()
     exportAction = Signal()
+    importArchiveAction = Signal()
+    exportArchiveAction = Signal()
+    backupAction = Signal()
+    restoreAction = Signal()
+    optimizeAction = Signal()
     renameAction = Signal()
     collectLogsRequested = Signal()
     logLevelChanged = Signal(str)
+    profilingToggled = Signal(bool)
+    showProfilerReport = Signal()
+    resetProfiler = Signal()
     showAppInfo = Signal()
     show_settings = Signal()
 
@@ -73,6 +81,25 @@ class MenuBar(QMenuBar):
         export_act.triggered.connect(self.exportAction.emit)
         file_menu.addAction(export_act)
 
+        import_archive_act = QAction(import_icon, "Import Archive...", self)
+        import_archive_act.triggered.connect(self.importArchiveAction.emit)
+        file_menu.addAction(import_archive_act)
+
+        export_archive_act = QAction(export_icon, "Export Archive...", self)
+        export_archive_act.triggered.connect(self.exportArchiveAction.emit)
+        file_menu.addAction(export_archive_act)
+
+        # --- Snapshot actions ---
+        backup_icon = QIcon.fromTheme("document-save-as")
+        backup_act = QAction(backup_icon, "Back Up Now", self)
+        backup_act.triggered.connect(self.backupAction.emit)
+        file_menu.addAction(backup_act)
+
+        restore_icon = QIcon.fromTheme("document-revert")
+        restore_act = QAction(restore_icon, "Restore Snapshot...", self)
+        restore_act.triggered.connect(self.restoreAction.emit)
+        file_menu.addAction(restore_act)
+
         file_menu.addSeparator()
 
         close_icon = QIcon.fromTheme("window-close")
@@ -172,6 +199,14 @@ class MenuBar(QMenuBar):
                 act.triggered.connect(lambda checked=False, t=token: self.insert_token(t))
                 menu.addAction(act)
 
+        tools_menu.addSeparator()
+
+        optimize_icon = QIcon.fromTheme("system-run")
+        optimize_act = QAction(optimize_icon, "Optimize Database", self)
+        optimize_act.setStatusTip("Reclaim free space and refresh query statistics")
+        optimize_act.triggered.connect(self.optimizeAction.emit)
+        tools_menu.addAction(optimize_act)
+
         # ----- Help Menu -----
         help_menu = self.addMenu("Help")
         help_menu.setMinimumWidth(150)
@@ -208,6 +243,28 @@ class MenuBar(QMenuBar):
             act.triggered.connect(lambda checked=False, lvl=level: self._set_log_level(lvl))
             log_level_menu.addAction(act)
 
+        # Database Profiler submenu
+        profiler_icon = QIcon.fromTheme("utilities-system-monitor")
+        profiler_menu = help_menu.addMenu(profiler_icon, "Database Profiler")
+        profiler_menu.setStatusTip("Profile database queries and log slow ones")
+
+        self.profiling_act = QAction("Enable Profiling", self)
+        self.profiling_act.setCheckable(True)
+        profiler = getattr(self.main, "db_profiler", None)
+        self.profiling_act.setChecked(bool(profiler and profiler.enabled))
+        self.profiling_act.setStatusTip("Time database calls and write slow queries to slow_queries.log")
+        self.profiling_act.toggled.connect(self.profilingToggled.emit)
+        profiler_menu.addAction(self.profiling_act)
+
+        report_act = QAction("View Report", self)
+        report_act.setStatusTip("Show collected query statistics")
+        report_act.triggered.connect(self.showProfilerReport.emit)
+        profiler_menu.addAction(report_act)
+
+        reset_act = QAction("Reset Statistics", self)
+        reset_act.setStatusTip("Clear collected query statistics")
+        reset_act.triggered.connect(self.resetProfiler.emit)
+        profiler_menu.addAction(reset_act)
 
         # About App
         about_icon = QIcon.fromTheme("help-about")
@@ -1,13 +1,20 @@
 import logging
-import time
 from threading import Thread, Event
 from utils.keyboard_utils import SnippetExpander
-from utils.snippet_db import SnippetDB
+from utils.snippet_db import SnippetDB, db_options_from_config
+from utils.usage_tracker import UsageTracker, DEFAULT_FLUSH_SECONDS
 
 logger = logging.getLogger(__name__)
 
 class SnippetService():
-    def __init__(self, config_path: str) -> None:
+    def __init__(
+        self,
+        config_path: str,
+        db_config: dict | None = None,
+        usage_flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        snapshots=None,
+        maintenance=None,
+    ) -> None:
         """
         Initialize the SnippetService.
 
@@ -16,6 +23,14 @@ class SnippetService():
 
         Args:
             config_path (str): Path to the snippets database file.
+            db_config (dict | None): The "database" config section. The
+                pragma profile, libraries and body codec settings are
+                taken from it, matching the application's SnippetDB.
+            usage_flush_seconds (float): Seconds between batched usage writes.
+            snapshots (SnapshotManager | None): Takes scheduled database
+                snapshots from the monitor thread, if given.
+            maintenance (MaintenanceScheduler | None): Runs database
+                maintenance from the monitor thread when idle, if given.
 
         Returns:
             None
@@ -24,12 +39,16 @@ class SnippetService():
         logger.debug(f"Config path: {config_path}")
 
         # Core components
-        self.snippet_db = SnippetDB(config_path)
-        self.expander = SnippetExpander(snippets_db=self.snippet_db, parent=self)
+        self.snippet_db = SnippetDB(config_path, **db_options_from_config(db_config))
+        self.usage = UsageTracker(self.snippet_db, flush_seconds=usage_flush_seconds)
+        self.snapshots = snapshots
+        self.maintenance = maintenance
+        self.expander = SnippetExpander(snippets_db=self.snippet_db, parent=self, usage_tracker=self.usage)
 
         # Thread control
         self._thread   = None
         self._stop_evt = Event()
+        self._refresh_evt = Event()
 
         logger.info("SnippetService initialized successfully")
 
@@ -43,6 +62,19 @@ class SnippetService():
         logger.info("Refreshing snippets via SnippetService")
         self.expander.refresh_snippets()
 
+    def request_refresh(self) -> None:
+        """
+        Ask the monitor thread to reload snippets from the database.
+
+        Safe to call from the GUI thread: the reload runs on the monitor
+        thread, which is woken immediately.
+
+        Returns:
+            None
+        """
+        logger.debug("Snippet refresh requested")
+        self._refresh_evt.set()
+
     def on_snippets_updated(self, new_snippets: list):
         """
         Handle snippet update notifications.
@@ -60,18 +92,64 @@ class SnippetService():
         """
         Run the background monitor loop.
 
-        Sleeps until a stop request is received, then stops the snippet
-        expander and exits.
+        Finishes any pending schema backfills in small time slices and
+        polls PRAGMA data_version so snippet edits made by the editor,
+        another process or a script are applied to the expander as deltas.
+        request_refresh() wakes the loop to apply them right away.
+        A change to an attached library triggers a full rebuild instead,
+        since libraries have no change log of their own.
+        Buffered usage counts are written once the flush interval passes,
+        and a database snapshot is taken whenever one is due. Database
+        activity is reported to the maintenance scheduler, which runs
+        once the database has been idle long enough.
+        Runs until a stop request is received, then flushes remaining
+        usage, stops the snippet expander and exits.
 
         Returns:
             None
         """
         logger.info("SnippetService monitor thread running...")
+        backfills_done = False
+        data_version = self.snippet_db.data_version()
+        library_version = self.snippet_db.library_version()
 
         while not self._stop_evt.is_set():
-            time.sleep(1)
+            if not backfills_done:
+                # Each slice holds the write lock only briefly
+                backfills_done = self.snippet_db.run_backfills(max_seconds=0.1) is not False
+
+            refresh_requested = self._refresh_evt.is_set()
+            self._refresh_evt.clear()
+            current_version = self.snippet_db.data_version()
+            if current_version != data_version or refresh_requested:
+                logger.debug("Database changed; refreshing snippets")
+                data_version = current_version
+                self.expander.refresh_snippets()
+                if self.maintenance is not None:
+                    self.maintenance.note_activity()
+
+            current_library_version = self.snippet_db.library_version()
+            if current_library_version != library_version:
+                logger.debug("Snippet library changed; rebuilding trigger map")
+                library_version = current_library_version
+                self.expander.build_trigger_map()
+
+            if self.usage.flush_due():
+                self.usage.flush()
+                if self.maintenance is not None:
+                    self.maintenance.note_activity()
+
+            if self.snapshots is not None and self.snapshots.due():
+                self.snapshots.create_snapshot()
+
+            if self.maintenance is not None and self.maintenance.due():
+                self.maintenance.run()
+
+            # Wakes early when a refresh is requested
+            self._refresh_evt.wait(1)
 
         logger.info("SnippetService monitor shutting down...")
+        self.usage.flush()
         self.expander.stop()
 
     def start(self) -> None:
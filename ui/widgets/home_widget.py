@@ -188,12 +188,26 @@ class HomeWidget(QWidget):
         """
         Display a random snippet trigger in the instructional label.
 
-        If no snippets exist, restores the default instructional message.
+        The snippet is picked on the database worker. If no snippets
+        exist, restores the default instructional message.
+
+        Returns:
+            None
+        """
+        self.main.db_worker.submit(
+            "get_random_snippet", key=("home", "random"), on_result=self._show_random_snippet
+        )
+
+    def _show_random_snippet(self, snippet) -> None:
+        """
+        Show the trigger of a randomly picked snippet.
+
+        Args:
+            snippet (dict | None): The picked snippet, empty if none exist.
 
         Returns:
             None
         """
-        snippet = self.main.snippet_db.get_random_snippet()
         if not snippet:
             label_text = (
                 "Give your snippets a try below. "
@@ -0,0 +1,124 @@
+import logging
+
+from PySide6.QtWidgets import (
+    QDialog, QLabel, QCheckBox, QTreeWidget, QTreeWidgetItem,
+    QDialogButtonBox, QVBoxLayout, QHBoxLayout,
+)
+from PySide6.QtCore import Qt
+
+from utils.import_preview import PREVIEW_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_TEXT = {
+    "insert": "Insert {} new snippets",
+    "update": "Update {} existing snippets",
+    "conflict": "Import {} conflicting snippets",
+    "unchanged": "Re-import {} unchanged snippets",
+}
+
+# Categories ticked when the dialog opens
+DEFAULT_CATEGORIES = ("insert", "update")
+
+
+class ImportPreviewDialog(QDialog):
+    """
+    Shows what an import would change and lets the user pick which
+    categories of entries to import.
+    """
+    def __init__(self, preview: dict, validation: dict | None = None, parent=None) -> None:
+        """
+        Initialize the ImportPreviewDialog.
+
+        Args:
+            preview (dict): A SnippetDB.preview_yaml or preview_archive result.
+            validation (dict | None): The validation report for the same file.
+            parent (Any): Optional parent widget.
+
+        Returns:
+            None
+        """
+        super().__init__(parent)
+        self.preview = preview
+        self.validation = validation or {}
+        self.checkboxes = {}
+
+        self.setWindowTitle("Import Preview")
+        self.setModal(True)
+        self.setMinimumSize(640, 420)
+
+        self.initUI()
+
+    def initUI(self) -> None:
+        """
+        Initialize the dialog user interface.
+
+        Creates the summary, one checkbox per category, a list of sample
+        entries and validation issues, and the Import/Cancel buttons.
+
+        Returns:
+            None
+        """
+        counts = self.preview["counts"]
+        summary = QLabel(
+            f"{self.preview['total']} entries read. "
+            f"{self.validation.get('error_count', 0)} failed validation and will be left out."
+        )
+        summary.setWordWrap(True)
+
+        category_layout = QHBoxLayout()
+        for category in PREVIEW_CATEGORIES:
+            box = QCheckBox(CATEGORY_TEXT[category].format(counts[category]))
+            box.setChecked(category in DEFAULT_CATEGORIES and counts[category] > 0)
+            box.setEnabled(counts[category] > 0)
+            self.checkboxes[category] = box
+            category_layout.addWidget(box)
+
+        self.details = QTreeWidget()
+        self.details.setHeaderLabels(["Category", "Trigger", "Label", "Detail"])
+        self.details.setRootIsDecorated(False)
+        for category in PREVIEW_CATEGORIES:
+            for sample in self.preview["samples"][category]:
+                self.details.addTopLevelItem(QTreeWidgetItem([
+                    category.title(), str(sample["trigger"]), str(sample["label"] or ""), sample["reason"],
+                ]))
+        for level in ("error", "warning"):
+            for issue in self.validation.get(f"{level}s", []):
+                self.details.addTopLevelItem(QTreeWidgetItem([
+                    level.title(), str(issue["trigger"] or ""), f"Entry {issue['index']}", issue["message"],
+                ]))
+        self.details.resizeColumnToContents(0)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Ok).setText("Import")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(summary)
+        layout.addLayout(category_layout)
+        layout.addWidget(self.details, 1)
+        layout.addWidget(buttons, alignment=Qt.AlignRight)
+
+    def selected_categories(self) -> list[str]:
+        """
+        Return the categories the user chose to import.
+
+        Returns:
+            list[str]: Checked categories, in PREVIEW_CATEGORIES order.
+        """
+        return [c for c in PREVIEW_CATEGORIES if self.checkboxes[c].isChecked()]
+
+    def selected_indices(self) -> list[int]:
+        """
+        Return the positions of the entries to import.
+
+        Returns:
+            list[int]: Sorted entry indices from every checked category.
+        """
+        indices = []
+        for category in self.selected_categories():
+            indices.extend(self.preview["indices"][category])
+        indices.sort()
+        logger.debug("Import preview selected %s (%d entries)", self.selected_categories(), len(indices))
+        return indices
@@ -1,5 +1,4 @@
 import re
-import yaml
 from pathlib import Path
 from datetime import datetime, timedelta
 import logging
@@ -11,6 +10,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon
 
+from utils import yaml_codec
+
 logger = logging.getLogger(__name__)
 
 # Set max limit on notices
@@ -336,7 +337,7 @@ class NoticeCarouselDialog(QDialog):
                 continue
 
             try:
-                data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+                data = yaml_codec.load(path.read_text(encoding="utf-8")) or {}
                 unread.append({
                     "id": nid,
                     "title": data.get("title", "Update Notice"),
@@ -12,6 +12,12 @@ from .snippet_table import SnippetTable
 from .snippet_form  import SnippetForm
 from .home_widget   import HomeWidget
 
+# Loads and change polls track the change log position, so a newer one
+# supersedes the one in flight. Searches coalesce separately so typing
+# never cancels a load and loses its change_seq or on_loaded callback.
+TABLE_REQUEST_KEY = "snippet_table"
+SEARCH_REQUEST_KEY = "snippet_search"
+
 
 class TextEditFocusFilter(QObject):
     """
@@ -71,8 +77,21 @@ class SnippetEditor(QWidget):
         self.search_timer.setSingleShot(True)
         self.search_timer.setInterval(100)  # 0.1 seconds
 
+        # Poll the change log for edits made elsewhere (service, scripts,
+        # other processes) and apply them without a full reload
+        self.change_seq = None
+        self._table_request = None
+        # Status text and callbacks of loads superseded by a newer one,
+        # handed on so they still run when the latest load finishes
+        self._load_status = None
+        self._load_callbacks = []
+        self.change_timer = QTimer(self)
+        self.change_timer.setInterval(2000)  # 2 seconds
+        self.change_timer.timeout.connect(self.check_for_changes)
+
         self.initUI()
         self.load_snippets()
+        self.change_timer.start()
 
     def initUI(self):
         """
@@ -174,21 +193,110 @@ class SnippetEditor(QWidget):
         self.search_bar.setFocus()
         self.search_bar.selectAll()
 
-    def load_snippets(self):
+    def load_snippets(self, on_loaded=None):
         """
         Load all snippets from the database into the table.
 
+        The rows are read on the database worker and handed to the table
+        once ready, so the window stays responsive for large libraries.
         Temporarily updates the status bar while loading and restores
-        the previous message afterward.
+        the previous message afterward. A newer load supersedes one still
+        in flight; its on_loaded callback then runs with the newer one.
+
+        Args:
+            on_loaded (Callable | None): Called once the table is filled.
 
         Returns:
             None
         """
-        old_text = self.parent.statusBar().currentMessage() or ""
+        if self._load_status is None:
+            self._load_status = self.parent.statusBar().currentMessage() or ""
+        if on_loaded:
+            self._load_callbacks.append(on_loaded)
         self.parent.statusBar().showMessage(f"Loading Snippets...")
-        snippets = self.main.snippet_db.get_all_snippets()
-        self.table.load_entries(snippets)
-        self.parent.statusBar().showMessage(old_text)
+
+        def fetch(db):
+            # Remember the change log position so later polls only apply deltas
+            return db.latest_change_seq(), list(db.iter_snippets())
+
+        def finish():
+            self.parent.statusBar().showMessage(self._load_status)
+            callbacks, self._load_status, self._load_callbacks = self._load_callbacks, None, []
+            return callbacks
+
+        def loaded(result):
+            self.change_seq, records = result
+            if self.is_filtered():
+                # A search is showing; refresh it rather than replace it
+                self.run_search()
+            else:
+                self.table.load_entries(records)
+            for callback in finish():
+                callback()
+
+        self._table_request = self.main.db_worker.submit(
+            fetch,
+            key=TABLE_REQUEST_KEY,
+            on_result=loaded,
+            on_error=lambda e: finish(),
+        )
+
+    def check_for_changes(self):
+        """
+        Apply snippet changes made outside the editor to the table.
+
+        Pulls only the logged changes since the last load on the database
+        worker. Falls back to a full reload if the change log was pruned,
+        and re-runs the search if one is active. Skipped while another
+        table request is still in flight.
+
+        Returns:
+            None
+        """
+        if self._table_request is not None and not self._table_request.done:
+            return
+
+        def fetch(db, since):
+            if since is None or not db.change_log_covers(since):
+                return None
+            changes = db.changes_since(since)
+            if not changes:
+                return since, set(), []
+            touched = {change["snippet_id"] for change in changes}
+            records = db.get_snippets_by_ids(touched) or []
+            return max(change["seq"] for change in changes), touched, records
+
+        self._table_request = self.main.db_worker.submit(
+            fetch, self.change_seq, key=TABLE_REQUEST_KEY, on_result=self._apply_changes
+        )
+
+    def _apply_changes(self, result):
+        """
+        Apply the outcome of check_for_changes to the table.
+
+        Args:
+            result (tuple | None): New change sequence, touched snippet ids
+                and their current records, or None if a reload is needed.
+
+        Returns:
+            None
+        """
+        if result is None:
+            self.load_snippets()
+            return
+
+        seq, touched, records = result
+        if not touched:
+            return
+        self.change_seq = seq
+
+        if self.is_filtered():
+            # Filtered views are cheaper to rebuild than to patch
+            self.run_search()
+            return
+
+        removed = touched - {record["id"] for record in records}
+        self.table.apply_changes(records, removed)
 
     def on_entry_selected(self, entry):
         """
@@ -280,18 +388,48 @@ class SnippetEditor(QWidget):
             
             entry = self.form.get_entry()
 
-            # Detect circular reference
-            all_snips = self.main.snippet_db.get_all_snippets()
-            if self.detect_circular_reference(entry, all_snips):
+            def save(db):
+                # Detect circular reference
+                all_snips = db.get_all_snippets()
+                if self.detect_circular_reference(entry, all_snips):
+                    return None, True
+                # Insert the snippet into the DB
+                # returns True if new, False if updated
+                return db.insert_snippet(entry), False
+
+            self.main.db_worker.submit(
+                save,
+                write=True,
+                on_result=lambda result: self.on_saved(entry, *result),
+                on_error=lambda e: self.main.message_box.error(f'Snippet Save Failed: {e}', title="Save Failed"),
+            )
+
+        except Exception as e:
+            self.main.message_box.error(f'Snippet Save Failed: {e}', title="Save Failed")
+
+    def on_saved(self, entry, is_new, circular):
+        """
+        Finish a save once the database worker has written the snippet.
+
+        Reports the outcome, reloads the table and navigates according
+        to the saving settings.
+
+        Args:
+            entry (dict): The saved snippet entry.
+            is_new (bool | None): True if the snippet was created.
+            circular (bool): True if the save was refused because of a
+                circular reference.
+
+        Returns:
+            None
+        """
+        try:
+            if circular:
                 self.main.message_box.error(
                     f'Snippet "{entry["label"]}" references itself or forms a circular chain.',
                     title="Invalid Snippet"
                 )
                 return
-            
-            # Insert the snippet into the DB
-            # returns True if new, False if updated
-            is_new = self.main.snippet_db.insert_snippet(entry)
 
             if is_new:
                 self.main.message_box.info(
@@ -304,8 +442,8 @@ class SnippetEditor(QWidget):
                     title="Snippet Updated"
                 )
 
-            self.load_snippets()    # Reload snippets to reflect changes
-            self.table.select_entry(entry)
+            # Reload snippets to reflect changes
+            self.load_snippets(on_loaded=lambda: self.table.select_entry(entry))
             self.trigger_reload.emit()  # Flag
 
             # Here we could go home or stay on new form
@@ -407,9 +545,11 @@ class SnippetEditor(QWidget):
         new, ok = QInputDialog.getText(self, 'Rename Folder', f'New name for "{old}":', text=old)
         if not ok or not new.strip() or new.strip() == old:
             return
-        self.main.snippet_db.rename_folder(old, new.strip())
-        self.load_snippets()
-        self.main.message_box.info(f'Renamed folder "{old}" to "{new.strip()}"', title='Folder Renamed')
+        def renamed(_):
+            self.load_snippets()
+            self.main.message_box.info(f'Renamed folder "{old}" to "{new.strip()}"', title='Folder Renamed')
+
+        self.main.db_worker.submit("rename_folder", old, new.strip(), write=True, on_result=renamed)
 
     def on_add_snippet(self, parent_item=None, *_):
         """
@@ -453,8 +593,9 @@ class SnippetEditor(QWidget):
         if confirm != QMessageBox.Yes:
             return
         
-        self.main.snippet_db.delete_folder(name)
-        self.load_snippets()
+        self.main.db_worker.submit(
+            "delete_folder", name, write=True, on_result=lambda _: self.load_snippets()
+        )
 
     def on_edit_snippet(self, entry=None, *_):
         """
@@ -493,9 +634,11 @@ class SnippetEditor(QWidget):
             return
         
         # Need to rename based on ID
-        self.main.snippet_db.rename_snippet(entry['id'], new_label.strip())
-        self.load_snippets()
-        self.main.message_box.info(f'Renamed snippet "{old_label}" to "{new_label.strip()}"', title='Snippet Renamed')
+        def renamed(_):
+            self.load_snippets()
+            self.main.message_box.info(f'Renamed snippet "{old_label}" to "{new_label.strip()}"', title='Snippet Renamed')
+
+        self.main.db_worker.submit("rename_snippet", entry['id'], new_label.strip(), write=True, on_result=renamed)
     
     def on_delete_snippet(self, entry):
         """
@@ -521,8 +664,9 @@ class SnippetEditor(QWidget):
             return
 
         # Need to delete by ID
-        self.main.snippet_db.delete_snippet(entry['id'])
-        self.load_snippets()
+        self.main.db_worker.submit(
+            "delete_snippet", entry['id'], write=True, on_result=lambda _: self.load_snippets()
+        )
         self.navigate_home()
 
     def handle_rename_action(self):
@@ -587,13 +731,23 @@ class SnippetEditor(QWidget):
         """
         self.search_timer.start()  # restart timer on every keystroke
 
+    def is_filtered(self):
+        """
+        Check whether the table shows search or filter results.
+
+        Returns:
+            bool: True if a keyword or enabled filter is active.
+        """
+        return bool(self.search_bar.text().strip()) or self.filter_dropdown.currentIndex() != 0
+
     def run_search(self):
         """
         Execute the snippet search operation.
 
         Filters snippets based on keyword and enabled/disabled status,
         updates the table with results, and optionally triggers an
-        easter egg dialog.
+        easter egg dialog. The query runs on the database worker; a newer
+        search cancels one still in flight so stale results never land.
 
         Returns:
             None
@@ -601,16 +755,18 @@ class SnippetEditor(QWidget):
         keyword = self.search_bar.text().strip()
         filter_mode = self.filter_dropdown.currentText()
 
-        # Get results from DB
-        results = self.main.snippet_db.search_snippets(keyword)
+        def search(db):
+            # Get results from DB
+            results = db.search_snippets(keyword) or []
 
-        # Filter further if enabled/disabled only is selected
-        if filter_mode == "Enabled Only":
-            results = [s for s in results if s.get("enabled", True)]
-        elif filter_mode == "Disabled Only":
-            results = [s for s in results if not s.get("enabled", False)]
+            # Filter further if enabled/disabled only is selected
+            if filter_mode == "Enabled Only":
+                results = [s for s in results if s.get("enabled", True)]
+            elif filter_mode == "Disabled Only":
+                results = [s for s in results if not s.get("enabled", False)]
+            return results
 
-        self.table.load_entries(results)
+        self.main.db_worker.submit(search, key=SEARCH_REQUEST_KEY, on_result=self.table.load_entries)
 
         # Easter Egg
         # If user types "cat" in search, show cat dialog
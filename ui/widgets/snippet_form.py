@@ -293,13 +293,13 @@ Snippets come in handy for text you enter often or for standard messages you sen
         self.style_switch.setChecked(entry.get('paste_style', 'Clipboard') == 'Clipboard')
         self.return_switch.setChecked(entry.get('return_press', False))
 
-        # Tags
-        self.populate_tags_input()  # load all tags
-
-        # Set all snippet tags as checked
+        # Set all snippet tags as checked right away, the full tag
+        # list is merged in once the database worker returns it
         raw_tags = entry.get('tags', '')
         tags = [t.strip() for t in raw_tags.split(',') if t.strip()]
-        self.tags_input.setCheckedItems(tags)
+        self.tags_input.clear()
+        self.tags_input.addItems(tags, checked=True)
+        self.populate_tags_input()  # load all tags
 
     def get_entry(self) -> dict:
         """
@@ -342,35 +342,73 @@ Snippets come in handy for text you enter often or for standard messages you sen
         """
         Populate the folder selection input from the database.
 
-        Retrieves all folders and updates the combo box, ensuring
-        a default folder is present.
+        Retrieves all folders on the database worker and updates the
+        combo box, ensuring a default folder is present.
+
+        Returns:
+            None
+        """
+        self.main.db_worker.submit(
+            "get_all_folders", key=("form", "folders"), on_result=self._set_folders
+        )
+
+    def _set_folders(self, folders):
+        """
+        Fill the folder input with the folders read from the database.
+
+        Keeps whatever folder the user picked while the query ran.
+
+        Args:
+            folders (list[str] | None): The folder names.
 
         Returns:
             None
         """
-        # Populate from DB if available
-        folders = self.main.snippet_db.get_all_folders()
+        folders = folders or []
+        current = self.folder_input.currentText()
 
         if folders:
             self.folder_input.addItems(folders)
         # Optionally add "Default" if not present
         if "Default" not in folders:
             self.folder_input.insertItem(0, "Default")
-            self.folder_input.setCurrentText("Default")
+        self.folder_input.setCurrentText(current or "Default")
 
     def populate_tags_input(self):
         """
         Populate the tags input from the database.
 
-        Clears existing items and adds all available tags.
+        Reads all available tags on the database worker, then clears
+        the existing items and adds them.
 
         Returns:
             None
         """
-        tags = self.main.snippet_db.get_all_tags()
+        self.main.db_worker.submit(
+            "get_all_tags", key=("form", "tags"), on_result=self._set_tags
+        )
+
+    def _set_tags(self, tags):
+        """
+        Replace the tag items with the tags read from the database.
+
+        Tags checked while the query ran, including ones typed by the
+        user that are not saved yet, stay checked.
+
+        Args:
+            tags (list[str] | None): The tag names.
+
+        Returns:
+            None
+        """
+        checked = self.tags_input.checkedItems()
+        names = list(tags or [])
+        names += [tag for tag in checked if tag not in names]
+
         self.tags_input.clear() # clear and repopulate
-        if tags:
-            self.tags_input.addItems(tags)
+        if names:
+            self.tags_input.addItems(names)
+        self.tags_input.setCheckedItems(checked)
 
     def on_delete_tag(self, tag):
         """
@@ -385,10 +423,12 @@ Snippets come in handy for text you enter often or for standard messages you sen
         Returns:
             None
         """
-        self.main.snippet_db.delete_tag(tag)
-        self.main.message_box.info(f"Tag '{tag}' deleted from all snippets.", title="Tag Deleted")
-        self.parent.load_config()   # refresh table
-        self.populate_tags_input()
+        def deleted(_):
+            self.main.message_box.info(f"Tag '{tag}' deleted from all snippets.", title="Tag Deleted")
+            self.parent.load_config()   # refresh table
+            self.populate_tags_input()
+
+        self.main.db_worker.submit("delete_tag", tag, write=True, on_result=deleted)
 
     def validate(self) -> bool:
         """
@@ -437,11 +477,29 @@ Snippets come in handy for text you enter often or for standard messages you sen
             "{weekday}", "{month}", "{year}", "{greeting}", "{location}"
         ]
 
-        # Add snippet triggers too
-        self.completions.extend([s["trigger"] for s in self.main.snippet_db.get_all_snippets()])
         for c in self.completions:
             QListWidgetItem(c, self.intellisense_popup)
 
+        # Add snippet triggers too, once the database worker has them
+        self.main.db_worker.submit(
+            "get_all_triggers", key=("form", "triggers"), on_result=self._add_trigger_completions
+        )
+
+    def _add_trigger_completions(self, triggers):
+        """
+        Append snippet triggers to the intellisense completions.
+
+        Args:
+            triggers (list[str] | None): All snippet triggers.
+
+        Returns:
+            None
+        """
+        triggers = triggers or []
+        self.completions.extend(triggers)
+        for c in triggers:
+            QListWidgetItem(c, self.intellisense_popup)
+
     def show_intellisense(self):
         """
         Display the intellisense popup near the cursor position.
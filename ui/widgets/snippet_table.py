@@ -1,5 +1,7 @@
 
+import itertools
 import logging
+from collections.abc import Mapping
 from PySide6.QtWidgets import (
     QTreeView, QAbstractItemView, QHeaderView
 )
@@ -17,6 +19,36 @@ from ui.menus import (
 
 logger = logging.getLogger(__name__)
 
+HEADER_LABELS = ['Label', 'Trigger', 'Enabled', 'Paste Style', 'Tags', 'Uses']
+
+
+def merge_entries(entries, records, removed_ids):
+    """
+    Apply changed and deleted snippets to a cached entry list.
+
+    Changed entries are replaced in place, deleted ones dropped and new
+    ones appended, matching the rows apply_changes leaves in the model.
+
+    Args:
+        entries (Iterable[Mapping]): The cached entries.
+        records (Iterable[Mapping]): Current state of changed snippets.
+        removed_ids (Iterable[int]): Ids of deleted snippets.
+
+    Returns:
+        list: The updated entries.
+    """
+    changed = {record['id']: record for record in records}
+    removed = set(removed_ids)
+    merged = []
+    for entry in entries:
+        entry_id = entry.get('id')
+        if entry_id in changed:
+            merged.append(changed.pop(entry_id))
+        elif entry_id not in removed:
+            merged.append(entry)
+    merged.extend(changed.values())
+    return merged
+
 class SnippetTable(QTreeView):
     # Signals for context‐menu actions
     addFolder = Signal(QStandardItem)  # parent folder or None
@@ -48,14 +80,14 @@ class SnippetTable(QTreeView):
         super().__init__(parent)
         self.main = main
         self.parent = parent
-        self._entries = []
+        self.entries = []
 
         # Set Font Size
         self.setFont(self.main.small_font_size)
 
         # Base model
         self.model = QStandardItemModel()
-        self.model.setHorizontalHeaderLabels(['Label','Trigger','Enabled','Paste Style'])
+        self.model.setHorizontalHeaderLabels(HEADER_LABELS)
 
         # Proxy for sorting/filtering
         self.proxy = QSortFilterProxyModel(self)
@@ -117,6 +149,7 @@ class SnippetTable(QTreeView):
             self.setColumnWidth(2, 80)   # Enabled
             self.setColumnWidth(3, 100)  # Paste Style
             self.setColumnWidth(4, 200)  # Tags
+            self.setColumnWidth(5, 60)   # Uses
 
         except Exception as e:
             logger.error(f"Error configuring columns: {e}")
@@ -129,8 +162,11 @@ class SnippetTable(QTreeView):
         Clears existing data, creates folder nodes, and adds snippet rows with
         associated metadata. Expands folders based on settings.
 
+        Entries are consumed in a single pass, so a generator such as
+        SnippetDB.iter_snippets can be passed to avoid building a full list.
+
         Args:
-            entries (list): List of dictionaries containing snippet data with keys:
+            entries (Iterable[Mapping]): Snippet records or dictionaries with keys:
                 - folder (str): Folder name for organization.
                 - label (str): Display name of the snippet.
                 - trigger (str): Keyboard shortcut to activate the snippet.
@@ -138,56 +174,28 @@ class SnippetTable(QTreeView):
                 - enabled (bool): Whether the snippet is active.
                 - paste_style (str): Paste method ("Clipboard" or "Keystroke").
                 - tags (str): Comma-separated tags for the snippet.
+                - use_count (int): Number of recorded expansions.
 
         Returns:
             None
         """
         logger.info("Loading snippet entries into table")
-        logger.debug("Entry count: %d", len(entries))
 
-        if not entries:
+        # Peek at the first entry so iterators behave like lists here
+        entries = iter(entries or ())
+        first = next(entries, None)
+        if first is None:
             logger.debug("No entries were loaded")
             return      # if none, return
-        
-        self.entries = entries
+
+        self.entries = []
         self.model.clear()
-        self.model.setHorizontalHeaderLabels(['Label','Trigger','Enabled','Paste Style','Tags'])
+        self.model.setHorizontalHeaderLabels(HEADER_LABELS)
         self.folders = {}  # folder_name > QStandardItem
 
-        for entry in entries:
-            folder = entry.get('folder','Default')
-            
-            if folder not in self.folders:
-                folder_item = QStandardItem(folder)
-                # mark it as a folder
-                folder_item.setData(None, Qt.UserRole)
-
-                # Just one call to appendRow, supplying one item per column:
-                self.model.appendRow([
-                    folder_item,
-                    QStandardItem(),
-                    QStandardItem(),
-                    QStandardItem(),
-                    QStandardItem()
-                ])
-                self.folders[folder] = folder_item
-
-            parent = self.folders[folder]
-
-            # Create child snippet row
-            label = entry.get('label', '')
-            logger.debug("Adding snippet '%s' to folder '%s'", label, folder)
-
-            label_item = QStandardItem(label)
-            trigger_item = QStandardItem(entry.get('trigger',''))
-            enabled_item = QStandardItem('On' if entry.get('enabled',False) else 'Off')
-            style_item = QStandardItem(entry.get('paste_style',''))
-            tags_item = QStandardItem(entry.get('tags',''))
-
-            # Store full entry dict on first column
-            label_item.setData(entry, Qt.UserRole)
-
-            parent.appendRow([label_item, trigger_item, enabled_item, style_item, tags_item])
+        for entry in itertools.chain((first,), entries):
+            self.entries.append(entry)
+            self._add_entry(entry)
 
         # Check if we need to expand all folders on load
         # Defailt to False if setting missing
@@ -196,8 +204,96 @@ class SnippetTable(QTreeView):
             self.expandAll()    # Expand all folders on load.
 
         self._configure_columns()   # Resize
+        logger.debug("Entry count: %d", len(self.entries))
         logger.info("Snippet table populated")
 
+    def _add_entry(self, entry):
+        """
+        Append a snippet row under its folder, creating the folder if needed.
+
+        Args:
+            entry (Mapping): The snippet record or dictionary to add.
+
+        Returns:
+            None
+        """
+        folder = entry.get('folder','Default')
+
+        if folder not in self.folders:
+            folder_item = QStandardItem(folder)
+            # mark it as a folder
+            folder_item.setData(None, Qt.UserRole)
+
+            # Just one call to appendRow, supplying one item per column:
+            self.model.appendRow([
+                folder_item,
+                QStandardItem(),
+                QStandardItem(),
+                QStandardItem(),
+                QStandardItem(),
+                QStandardItem()
+            ])
+            self.folders[folder] = folder_item
+
+        parent = self.folders[folder]
+
+        # Create child snippet row
+        label = entry.get('label', '')
+        logger.debug("Adding snippet '%s' to folder '%s'", label, folder)
+
+        label_item = QStandardItem(label)
+        trigger_item = QStandardItem(entry.get('trigger',''))
+        enabled_item = QStandardItem('On' if entry.get('enabled',False) else 'Off')
+        style_item = QStandardItem(entry.get('paste_style',''))
+        tags_item = QStandardItem(entry.get('tags',''))
+        # Store the count as a number so the column sorts numerically
+        uses_item = QStandardItem()
+        uses_item.setData(entry.get('use_count', 0) or 0, Qt.DisplayRole)
+
+        # Store the full entry on the first column. SnippetRecord rows
+        # are kept as-is rather than converted into a QVariantMap copy.
+        label_item.setData(entry, Qt.UserRole)
+
+        parent.appendRow([label_item, trigger_item, enabled_item, style_item, tags_item, uses_item])
+
+    def apply_changes(self, records, removed_ids):
+        """
+        Update individual rows instead of reloading the whole table.
+
+        Rows for every changed or removed snippet id are dropped, then the
+        current records are added back under their folders. Folders left
+        empty are removed by _on_rows_removed. The cached entries are
+        updated to match.
+
+        Args:
+            records (Iterable[Mapping]): Current state of changed snippets.
+            removed_ids (Iterable[int]): Ids of deleted snippets.
+
+        Returns:
+            None
+        """
+        records = list(records)
+        stale_ids = {r['id'] for r in records} | set(removed_ids)
+        logger.info("Applying %d snippet changes to table", len(stale_ids))
+
+        for folder_row in range(self.model.rowCount() - 1, -1, -1):
+            folder_item = self.model.item(folder_row, 0)
+            for row in range(folder_item.rowCount() - 1, -1, -1):
+                data = folder_item.child(row, 0).data(Qt.UserRole)
+                if isinstance(data, Mapping) and data.get('id') in stale_ids:
+                    folder_item.removeRow(row)
+
+        # Empty folders may have been removed, so forget those items
+        live = [self.model.item(row, 0) for row in range(self.model.rowCount())]
+        self.folders = {
+            name: item for name, item in self.folders.items()
+            if any(item is folder_item for folder_item in live)
+        }
+
+        for record in records:
+            self._add_entry(record)
+        self.entries = merge_entries(self.entries, records, stale_ids)
+
     def refresh(self):
         """
         Reload the table data from the cached entries.
@@ -250,8 +346,9 @@ class SnippetTable(QTreeView):
 
         logger.debug(f"Item Selected: {item}; Data: {data}; Src: {src_idx}")
 
-        if isinstance(data, dict):
-            self.entrySelected.emit(data)
+        if isinstance(data, Mapping):
+            # Signals are declared with dict, so hand out a plain copy
+            self.entrySelected.emit(dict(data))
         else:
             self.entrySelected.emit(None)
 
@@ -321,7 +418,7 @@ class SnippetTable(QTreeView):
             menu.deleteRequested.connect(self.deleteFolder.emit)
         else:
             # Clicked on a snippet; show snippet context menu
-            menu = SnippetContextMenu(data, self)
+            menu = SnippetContextMenu(dict(data), self)
             menu.editRequested.connect(self.editSnippet.emit)
             menu.renameRequested.connect(self.renameSnippet.emit)
             menu.deleteRequested.connect(self.deleteSnippet.emit)
@@ -407,7 +504,7 @@ class SnippetTable(QTreeView):
                 label_item = parent.child(row,0)
                 data = label_item.data(Qt.UserRole)
 
-                if isinstance(data, dict) and data.get('trigger')==entry.get('trigger'):
+                if isinstance(data, Mapping) and data.get('trigger')==entry.get('trigger'):
                     logger.debug(
                         "Entry found in folder '%s'",
                         parent.text()
@@ -455,11 +552,11 @@ class SnippetTable(QTreeView):
         item = self.model.itemFromIndex(src_idx)
         data = item.data(Qt.UserRole)
 
-        if not isinstance(data, dict):
+        if not isinstance(data, Mapping):
             logger.debug("Current selection is not a snippet")
             return None
 
-        return data
+        return dict(data)
 
     def _on_rows_removed(self, parent_idx: QModelIndex, start: int, end: int):
         """
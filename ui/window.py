@@ -13,13 +13,14 @@ if sys.platform != "win32":
 # Import PySide6 Modules
 from PySide6.QtWidgets import (
     QSystemTrayIcon, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
-    QMessageBox, QLabel, QPushButton
+    QMessageBox, QLabel, QPushButton, QFileDialog
 )
 from PySide6.QtGui import QIcon
 from PySide6.QtCore import Qt, QTimer
 
 # Import custom modules
 from utils import FileUtils, AppLogger
+from utils.usage_tracker import DEFAULT_FLUSH_SECONDS
 
 from .widgets import SnippetEditor
 from .menus import *
@@ -68,7 +69,15 @@ class QSnippet(QMainWindow):
         self.resize(width, height)
         logger.debug("Window dimensions set: %sx%s", width, height)
 
-        self.snippet_service = SnippetService(self.parent.snippet_db_file)
+        db_config = self.parent.config.get("database", {})
+        self.snippet_service = SnippetService(
+            self.parent.snippet_db_file,
+            db_config=db_config,
+            usage_flush_seconds=float(db_config.get("usage_flush_seconds", DEFAULT_FLUSH_SECONDS)),
+            snapshots=self.parent.db_snapshots,
+            maintenance=self.parent.db_maintenance,
+        )
+        self.parent.db_profiler.attach(self.snippet_service.snippet_db)
 
         self.initUI()
         self.init_menubar()
@@ -155,7 +164,7 @@ class QSnippet(QMainWindow):
 
         # Show editor at startup
         self.editor = SnippetEditor(config_path=self.parent.snippet_db_file, main=self.parent, parent=self)
-        self.editor.trigger_reload.connect(lambda: self.snippet_service.refresh())
+        self.editor.trigger_reload.connect(self.snippet_service.request_refresh)
         
         layout.addWidget(self.linux_notice)
         layout.addWidget(self.editor)
@@ -184,9 +193,17 @@ class QSnippet(QMainWindow):
         self.menubar = MenuBar(main=self.parent, parent=self)
         self.menubar.importAction.connect(self.handle_import_action)
         self.menubar.exportAction.connect(self.handle_export_action)
+        self.menubar.importArchiveAction.connect(lambda: self.handle_import_action(archive=True))
+        self.menubar.exportArchiveAction.connect(lambda: self.handle_export_action(archive=True))
+        self.menubar.backupAction.connect(self.handle_backup_action)
+        self.menubar.restoreAction.connect(self.handle_restore_action)
+        self.menubar.optimizeAction.connect(self.handle_optimize_action)
         self.menubar.renameAction.connect(self.handle_rename_action)
         self.menubar.collectLogsRequested.connect(self.handle_collect_logs)
         self.menubar.logLevelChanged.connect(self.handle_log_level)
+        self.menubar.profilingToggled.connect(self.handle_profiling_toggled)
+        self.menubar.showProfilerReport.connect(self.handle_show_profiler_report)
+        self.menubar.resetProfiler.connect(self.handle_reset_profiler)
         self.menubar.showAppInfo.connect(self.handle_show_info)
         self.menubar.show_settings.connect(self.show_settings_window)
         self.setMenuBar(self.menubar)
@@ -387,10 +404,7 @@ class QSnippet(QMainWindow):
             
             self.parent.skip_reg = False
             self.parent.settings["general"]["startup_behavior"]["start_at_boot"]["value"] = enabled
-            FileUtils.write_yaml(
-                self.parent.settings_file,
-                self.parent.settings,
-            )
+            self.parent.settings_loader.save(self.parent.settings)
 
             QTimer.singleShot(1000, self.unset_skip_reg)
 
@@ -410,42 +424,201 @@ class QSnippet(QMainWindow):
         logger.info("Updating show UI at startup: %s", checked)
 
         self.parent.settings["general"]["startup_behavior"]["show_ui_at_start"]["value"] = checked
-        FileUtils.write_yaml(
-            self.parent.settings_file,
-            self.parent.settings,
-        )
+        self.parent.settings_loader.save(self.parent.settings)
 
-    def handle_import_action(self) -> None:
+    def handle_import_action(self, archive: bool = False) -> None:
         """
         Import snippets via dialog and refresh service and UI.
 
+        The import streams on the database worker; the service and editor
+        reload once it finishes.
+
+        Args:
+            archive (bool): Import a .qsnip archive instead of YAML.
+
         Returns:
             None
         """
         logger.info("Importing snippets via menu action")
 
+        def done(counts):
+            self.snippet_service.request_refresh()
+            self.editor.load_snippets()
+
         FileUtils.import_snippets_with_dialog(
             self,
             self.parent.snippet_db,
+            worker=self.parent.db_worker,
+            on_finished=done,
+            archive=archive,
         )
-        self.snippet_service.refresh()
-        self.editor.load_snippets()
 
-    def handle_export_action(self) -> None:
+    def handle_export_action(self, archive: bool = False) -> None:
         """
         Export snippets via dialog and refresh service and UI.
 
+        Args:
+            archive (bool): Export a .qsnip archive instead of YAML.
+
         Returns:
             None
         """
         logger.info("Exporting snippets via menu action")
 
+        def done(result):
+            self.snippet_service.request_refresh()
+            self.editor.load_snippets()
+
         FileUtils.export_snippets_with_dialog(
             self,
             self.parent.snippet_db,
+            worker=self.parent.db_worker,
+            on_finished=done,
+            archive=archive,
+        )
+
+    def handle_backup_action(self) -> None:
+        """
+        Take a database snapshot on the database worker.
+
+        Returns:
+            None
+        """
+        logger.info("Creating database snapshot via menu action")
+
+        def done(path):
+            if path is None:
+                self.parent.message_box.error("The database snapshot failed. See the logs for details.", title="Backup Failed")
+                return
+            self.parent.message_box.info(f"Snapshot saved to:\n{path}", title="Backup Complete")
+
+        self.parent.db_worker.submit(lambda db: self.parent.db_snapshots.create_snapshot(), key="snapshot", on_result=done)
+
+    def handle_optimize_action(self) -> None:
+        """
+        Run database maintenance now on the database worker.
+
+        Runs the scheduler's time-budgeted pass and reports how much space
+        was reclaimed. If the file still lacks incremental auto_vacuum, the
+        user is offered a one-off full VACUUM to convert it.
+
+        Returns:
+            None
+        """
+        logger.info("Optimizing database via menu action")
+        maintenance = self.parent.db_maintenance
+
+        def done(result):
+            metrics, needs_full_vacuum = result
+            if metrics is None:
+                self.parent.message_box.error("Database maintenance failed. See the logs for details.", title="Optimize Failed")
+                return
+            self.show_optimize_result(metrics)
+            if needs_full_vacuum:
+                self.confirm_full_vacuum()
+
+        self.parent.db_worker.submit(
+            lambda db: (maintenance.run(), maintenance.needs_full_vacuum()),
+            key="maintenance",
+            write=True,
+            on_result=done,
+        )
+
+    def confirm_full_vacuum(self) -> None:
+        """
+        Offer a full VACUUM to convert the file to incremental auto_vacuum.
+
+        A full VACUUM rewrites the whole file and blocks other writes
+        until it finishes, so it only runs after the user confirms.
+
+        Returns:
+            None
+        """
+        confirm = self.parent.message_box.question(
+            "This database was created without incremental vacuum, so free space "
+            "can only be reclaimed by rewriting the whole file once.\n\n"
+            "Rewrite it now? Snippets cannot be saved until it finishes.",
+            title="Compact Database",
+            buttons=QMessageBox.Yes | QMessageBox.No,
+            default_button=QMessageBox.No,
+        )
+        if confirm != QMessageBox.Yes:
+            return
+
+        def done(metrics):
+            if metrics is None:
+                self.parent.message_box.error("Database maintenance failed. See the logs for details.", title="Optimize Failed")
+                return
+            self.show_optimize_result(metrics)
+
+        logger.info("Running confirmed full VACUUM")
+        self.parent.db_worker.submit(
+            lambda db: self.parent.db_maintenance.run(full_vacuum=True),
+            key="maintenance",
+            write=True,
+            on_result=done,
+        )
+
+    def show_optimize_result(self, metrics: dict) -> None:
+        """
+        Report the outcome of a maintenance run.
+
+        Args:
+            metrics (dict): Metrics returned by MaintenanceScheduler.run.
+
+        Returns:
+            None
+        """
+        page_size = metrics["page_size"]
+        before = metrics["pages_before"] * page_size / 1024
+        after = metrics["pages_after"] * page_size / 1024
+        self.parent.message_box.info(
+            f"Database optimized in {metrics['duration_ms']:.0f} ms.\n\n"
+            f"Size: {before:,.0f} KiB -> {after:,.0f} KiB",
+            title="Optimize Complete",
+        )
+
+    def handle_restore_action(self) -> None:
+        """
+        Restore the database from a snapshot picked by the user.
+
+        The current state is snapshotted first, then the service and
+        editor reload from the restored data.
+
+        Returns:
+            None
+        """
+        logger.info("Restoring database snapshot via menu action")
+
+        snapshots = self.parent.db_snapshots
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Restore Snapshot",
+            str(snapshots.snapshot_dir),
+            "Snippet Snapshots (*.db)",
         )
-        self.snippet_service.refresh()
-        self.editor.load_snippets()
+        if not path:
+            return
+
+        confirm = self.parent.message_box.question(
+            f"Replace all snippets with the snapshot {Path(path).name}?\n\n"
+            "A snapshot of your current snippets is saved first.",
+            title="Restore Snapshot",
+            buttons=QMessageBox.Yes | QMessageBox.No,
+            default_button=QMessageBox.No,
+        )
+        if confirm != QMessageBox.Yes:
+            return
+
+        def done(restored):
+            if not restored:
+                self.parent.message_box.error("The snapshot could not be restored. See the logs for details.", title="Restore Failed")
+                return
+            self.snippet_service.request_refresh()
+            self.editor.load_snippets()
+            self.parent.message_box.info("Snippets restored from snapshot.", title="Restore Complete")
+
+        self.parent.db_worker.submit(lambda db: snapshots.restore(path), write=True, on_result=done)
 
     def handle_rename_action(self) -> None:
         """
@@ -509,6 +682,9 @@ class QSnippet(QMainWindow):
                 if info:
                     zipf.writestr("about_info.txt", info["text"])
 
+                # Query statistics; slow_queries.log is already under logs/
+                zipf.writestr("db_profile.txt", self.parent.db_profiler.report())
+
             logger.info("Logs collected: %s", zip_path)
 
             reply = QMessageBox.question(
@@ -534,6 +710,53 @@ class QSnippet(QMainWindow):
                 "An unexpected error occurred while collecting logs.",
             )
 
+    def handle_profiling_toggled(self, enabled: bool) -> None:
+        """
+        Enable or disable the database query profiler.
+
+        Args:
+            enabled (bool): Whether profiling should be active.
+
+        Returns:
+            None
+        """
+        logger.info("Database profiling %s", "enabled" if enabled else "disabled")
+
+        if enabled:
+            self.parent.db_profiler.enable()
+        else:
+            self.parent.db_profiler.disable()
+
+    def handle_show_profiler_report(self) -> None:
+        """
+        Show the database profiler report.
+
+        Returns:
+            None
+        """
+        logger.info("Showing database profiler report")
+
+        profiler = self.parent.db_profiler
+        box = QMessageBox(self)
+        box.setWindowTitle("Database Profiler")
+        box.setIcon(QMessageBox.Information)
+        if profiler.enabled:
+            box.setText("Database profiling is enabled. Open the details for query statistics.")
+        else:
+            box.setText("Database profiling is disabled. Enable it under Help > Database Profiler to collect statistics.")
+        box.setDetailedText(profiler.report())
+        box.exec()
+
+    def handle_reset_profiler(self) -> None:
+        """
+        Clear the database profiler statistics.
+
+        Returns:
+            None
+        """
+        logger.info("Resetting database profiler statistics")
+        self.parent.db_profiler.reset()
+
     def handle_log_level(self, level: str) -> None:
         """
         Update application log level and persist to configuration.
@@ -562,10 +785,7 @@ class QSnippet(QMainWindow):
             root.setLevel(new_level)
 
             self.parent.cfg["log_level"] = level
-            FileUtils.write_yaml(
-                self.parent.config_file,
-                self.parent.cfg,
-            )
+            self.parent.config_loader.save(self.parent.cfg)
 
             self.parent.logger = AppLogger(
                 log_filepath=self.parent.log_path,
@@ -765,10 +985,7 @@ class QSnippet(QMainWindow):
         # Update parent reference in memory
         self.parent.settings = settings
 
-        FileUtils.write_yaml(
-            self.parent.settings_file,
-            self.parent.settings,
-        )
+        self.parent.settings_loader.save(self.parent.settings)
 
         # Refresh the tray settings
         self.tray.contextMenu().refresh()
@@ -827,6 +1044,7 @@ class QSnippet(QMainWindow):
         """
         logger.info("Exiting QSnippet")
         self.stop_service()
+        self.parent.db_worker.shutdown()
         self.tray.hide()
         sys.exit()
 
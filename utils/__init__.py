@@ -1,9 +1,14 @@
 from .config_utils import *
+from .config_cache import ConfigCache
 from .file_utils import *
 from .keyboard_utils import *
 from .logging_utils import *
 from .sys_utils import *
-from .snippet_db import SnippetDB
+from .snippet_db import SnippetDB, db_options_from_config
+from .query_profiler import QueryProfiler, DEFAULT_SLOW_QUERY_MS
+from .db_backup import SnapshotManager
+from .db_maintenance import MaintenanceScheduler
+from .body_codec import DEFAULT_COMPRESS_THRESHOLD, DEFAULT_COMPRESSION
 
 import sys
 if sys.platform == "win32":
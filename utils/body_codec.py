@@ -0,0 +1,115 @@
+import hashlib
+import lzma
+import sqlite3
+import unicodedata
+import zlib
+from typing import Tuple
+
+# Values of the snippets.body_format column
+BODY_PLAIN = 0
+BODY_ZLIB = 1
+BODY_LZMA = 2
+
+COMPRESSION_FORMATS = {
+    "none": BODY_PLAIN,
+    "zlib": BODY_ZLIB,
+    "lzma": BODY_LZMA,
+}
+
+# Bodies at least this many UTF-8 bytes long are stored compressed
+DEFAULT_COMPRESS_THRESHOLD = 4096
+DEFAULT_COMPRESSION = "zlib"
+
+# SQL expression yielding a snippet's plaintext body. Plain rows skip the
+# Python call entirely; compressed rows go through snippet_text().
+SNIPPET_TEXT_SQL = "(CASE WHEN body_format = 0 THEN snippet ELSE snippet_text(snippet, body_format) END)"
+
+
+def encode_body(text: str, threshold: int = DEFAULT_COMPRESS_THRESHOLD, compression: str = DEFAULT_COMPRESSION) -> Tuple[str | bytes, int]:
+    """
+    Prepare a snippet body for storage.
+
+    Args:
+        text (str): The plaintext body.
+        threshold (int): Minimum UTF-8 size in bytes before compressing.
+            0 or less disables compression.
+        compression (str): "zlib", "lzma" or "none".
+
+    Returns:
+        Tuple[str | bytes, int]: The stored value and its body_format.
+
+    Raises:
+        ValueError: If the compression name is unknown.
+    """
+    body_format = COMPRESSION_FORMATS.get(compression)
+    if body_format is None:
+        raise ValueError(f"Unsupported snippet compression: {compression}")
+
+    if text is None or body_format == BODY_PLAIN or threshold <= 0:
+        return text, BODY_PLAIN
+
+    raw = text.encode("utf-8")
+    if len(raw) < threshold:
+        return text, BODY_PLAIN
+    if body_format == BODY_ZLIB:
+        return zlib.compress(raw, 6), BODY_ZLIB
+    return lzma.compress(raw), BODY_LZMA
+
+
+def decode_body(value: str | bytes, body_format: int) -> str:
+    """
+    Return the plaintext of a stored snippet body.
+
+    Args:
+        value (str | bytes): The stored body.
+        body_format (int): The row's body_format.
+
+    Returns:
+        str: The plaintext body.
+
+    Raises:
+        ValueError: If the body format is unknown.
+    """
+    if not body_format:
+        return value
+    if body_format == BODY_ZLIB:
+        return zlib.decompress(value).decode("utf-8")
+    if body_format == BODY_LZMA:
+        return lzma.decompress(value).decode("utf-8")
+    raise ValueError(f"Unknown snippet body format: {body_format}")
+
+
+def content_hash(text: str | None) -> str | None:
+    """
+    Hash a snippet body for duplicate detection.
+
+    The body is normalised first (Unicode NFC, runs of whitespace
+    collapsed to one space, ends trimmed) so copies that differ only in
+    line endings or indentation share a hash. Case is kept, since it
+    matters in expanded text.
+
+    Args:
+        text (str | None): The plaintext body.
+
+    Returns:
+        str | None: A 32 character hex digest, or None for a missing body.
+    """
+    if text is None:
+        return None
+    normalised = " ".join(unicodedata.normalize("NFC", text).split())
+    return hashlib.blake2b(normalised.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    """
+    Register snippet_text(snippet, body_format) on a connection.
+
+    Lets SQL search and filter compressed bodies through SNIPPET_TEXT_SQL.
+
+    Args:
+        conn (sqlite3.Connection): The connection to extend.
+
+    Returns:
+        None
+    """
+    conn.create_function("snippet_text", 2, decode_body, deterministic=True)
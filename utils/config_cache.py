@@ -0,0 +1,172 @@
+import marshal
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the cached layout changes, so old cache files are ignored
+CONFIG_CACHE_VERSION = 1
+
+# A source whose mtime is this close to when its entry was stored may have
+# been rewritten within the same timestamp tick, so the entry is not
+# trusted until the file has been parsed again after this window.
+RACY_SECONDS = 2.0
+
+# (path, mtime_ns, size) of every file an entry was built from
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def file_signature(paths: Iterable[Path]) -> Signature | None:
+    """
+    Return the stat signature of a set of source files.
+
+    Args:
+        paths (Iterable[Path]): The files a cached value is derived from.
+
+    Returns:
+        Signature | None: One (path, mtime_ns, size) tuple per file, or
+            None if any file is missing.
+    """
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        signature.append((os.path.abspath(path), st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+class ConfigCache:
+    """
+    Caches parsed YAML configuration between runs.
+
+    Values are stored marshalled, keyed by a name and validated against
+    the path, mtime and size of the files they were built from, so a
+    warm start loads config and settings without parsing any YAML. Each
+    get returns a fresh copy, so callers may modify what they receive.
+    Values marshal cannot represent, such as YAML timestamps, are simply
+    not cached.
+    """
+    def __init__(self, cache_path: Path | None = None) -> None:
+        """
+        Initialize the ConfigCache.
+
+        Args:
+            cache_path (Path | None): File the cache is persisted to. None
+                keeps it in memory only.
+
+        Returns:
+            None
+        """
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self._entries: Dict[str, Tuple[Signature, float, bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Read persisted entries, discarding a missing, stale or corrupt file.
+
+        Returns:
+            None
+        """
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            data = marshal.loads(self.cache_path.read_bytes())
+            if data.get("version") == (CONFIG_CACHE_VERSION, marshal.version):
+                self._entries = data["entries"]
+                logger.debug("Loaded %d config cache entries from %s", len(self._entries), self.cache_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable config cache {self.cache_path}: {e}")
+
+    def _save(self) -> None:
+        """
+        Persist all entries atomically.
+
+        Returns:
+            None
+        """
+        if self.cache_path is None:
+            return
+        data = {"version": (CONFIG_CACHE_VERSION, marshal.version), "entries": self._entries}
+        temp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        try:
+            temp_path.write_bytes(marshal.dumps(data))
+            temp_path.replace(self.cache_path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            logger.warning(f"Failed to write config cache {self.cache_path}: {e}")
+
+    def get(self, key: str, sources: Iterable[Path]) -> Any | None:
+        """
+        Return a cached value if its source files are unchanged.
+
+        Args:
+            key (str): Name of the value, for example "config:<path>".
+            sources (Iterable[Path]): Files the value was built from.
+
+        Returns:
+            Any | None: A fresh copy of the value, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        signature = file_signature(sources)
+        if entry is None or signature is None or entry[0] != signature:
+            self.misses += 1
+            return None
+
+        if self._is_racy(entry):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.debug("Config cache hit: %s", key)
+        return marshal.loads(entry[2])
+
+    def put(self, key: str, sources: Iterable[Path], value: Any) -> None:
+        """
+        Store a value derived from the given source files.
+
+        Args:
+            key (str): Name of the value.
+            sources (Iterable[Path]): Files the value was built from.
+            value (Any): The parsed value.
+
+        Returns:
+            None
+        """
+        signature = file_signature(sources)
+        if signature is None:
+            return
+        try:
+            payload = marshal.dumps(value)
+        except ValueError:
+            logger.debug("Config value %s cannot be marshalled; not caching it", key)
+            self._entries.pop(key, None)
+            return
+
+        old = self._entries.get(key)
+        if old is not None and old[0] == signature and old[2] == payload and not self._is_racy(old):
+            return
+        self._entries[key] = (signature, time.time(), payload)
+        self._save()
+
+    @staticmethod
+    def _is_racy(entry: Tuple[Signature, float, bytes]) -> bool:
+        """
+        Check whether a source may have changed without its stat changing.
+
+        Args:
+            entry (Tuple[Signature, float, bytes]): A cache entry.
+
+        Returns:
+            bool: True if any source was modified within RACY_SECONDS
+                before the entry was stored.
+        """
+        signature, stored_at, _ = entry
+        return any(mtime_ns / 1e9 + RACY_SECONDS > stored_at for _, mtime_ns, _ in signature)
@@ -1,12 +1,20 @@
 import os
-import yaml
+import hashlib
 import logging
+from pathlib import Path
+
+from . import yaml_codec
+from .file_utils import FileUtils
 
 logger = logging.getLogger(__name__)
 
+# Quiet period after the last file system event before a watched file is
+# reloaded. Editors that save in several steps then cause a single reload.
+RELOAD_DEBOUNCE_MS = 250
+
 # Try to import PySide6, but handle gracefully for test environments
 try:
-    from PySide6.QtCore import QObject, QFileSystemWatcher, Signal
+    from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
 except ImportError:
     # Stub classes for test environments without PySide6
     class QObject:
@@ -40,14 +48,116 @@ except ImportError:
         def connect(self, callback):
             self._connections.append(callback)
 
+    class QTimer:
+        # Without an event loop the stub fires as soon as it is started
+        def __init__(self, parent=None):
+            self.timeout = Signal()
+
+        def setSingleShot(self, single):
+            pass
+
+        def setInterval(self, msec):
+            pass
+
+        def start(self):
+            self.timeout.emit()
+
+        def stop(self):
+            pass
+
+        def isActive(self):
+            return False
+
+
+def content_digest(raw: bytes) -> bytes:
+    """
+    Fingerprint file contents.
+
+    Args:
+        raw (bytes): The file contents.
+
+    Returns:
+        bytes: A 16 byte blake2b digest.
+    """
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def read_with_digest(path: str) -> tuple[bytes, bytes]:
+    """
+    Read a file and fingerprint its contents.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        tuple[bytes, bytes]: The raw contents and their content_digest.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    return raw, content_digest(raw)
+
+
+def write_with_digest(path: str, data: dict) -> bytes:
+    """
+    Serialise data to a YAML file atomically and fingerprint what was written.
+
+    Args:
+        path (str): The destination file.
+        data (dict): The data to write.
+
+    Returns:
+        bytes: The content_digest of the written bytes.
+    """
+    raw = yaml_codec.dump(data).encode("utf-8")
+    with FileUtils.atomic_write(Path(path), "wb") as f:
+        f.write(raw)
+    return content_digest(raw)
+
+
+def changed_paths(old, new, is_leaf=None, prefix: tuple = ()) -> list[tuple]:
+    """
+    List the key paths whose values differ between two nested dictionaries.
+
+    Keys added or removed count as changed. Nested dictionaries are
+    compared key by key, anything else by equality.
+
+    Args:
+        old (Any): The previous value.
+        new (Any): The new value.
+        is_leaf (Callable[[dict], bool] | None): Marks dictionaries that
+            are compared as a whole rather than descended into.
+        prefix (tuple): Path of old and new within the outer dictionary.
+
+    Returns:
+        list[tuple]: Changed key paths, for example [("fonts", "sizes", "small")].
+    """
+    if old == new:
+        return []
+    if not (isinstance(old, dict) and isinstance(new, dict)) or (is_leaf and (is_leaf(old) or is_leaf(new))):
+        return [prefix]
+
+    paths = []
+    for key in list(old) + [k for k in new if k not in old]:
+        if key not in old or key not in new:
+            paths.append(prefix + (key,))
+        else:
+            paths.extend(changed_paths(old[key], new[key], is_leaf, prefix + (key,)))
+    return paths
+
 class ConfigLoader(QObject):
     """
     Loads and watches the YAML application config file.
     Emits `configChanged` when the top-level settings change.
+
+    File system events are debounced and reloads are skipped when the
+    file's contents are unchanged. A reload that changes values also
+    emits `configKeysChanged` with the changed key paths, so consumers
+    can update only the affected parts.
     """
     configChanged = Signal(dict)
+    configKeysChanged = Signal(dict, list)
 
-    def __init__(self, config_path: str, parent=None):
+    def __init__(self, config_path: str, parent=None, cache=None, debounce_ms: int = RELOAD_DEBOUNCE_MS):
         """
         Initialize the ConfigLoader instance.
 
@@ -57,6 +167,9 @@ class ConfigLoader(QObject):
         Args:
             config_path (str): Path to the configuration YAML file.
             parent (Any): Optional parent QObject.
+            cache (ConfigCache | None): Optional parsed-config cache shared
+                with other loaders.
+            debounce_ms (int): Quiet period before a changed file is reloaded.
 
         Returns:
             None
@@ -64,12 +177,19 @@ class ConfigLoader(QObject):
         logger.info("Initializing ConfigLoader")
         super().__init__()
         self.config_path = os.path.abspath(config_path)
+        self.cache = cache
         logger.debug("Config Path: %s", self.config_path)
 
         self._watcher = QFileSystemWatcher(self)
         self._watcher.addPath(self.config_path)
         self._watcher.fileChanged.connect(self.on_file_changed)
 
+        self._digest = None
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(debounce_ms)
+        self._reload_timer.timeout.connect(self.reload_if_changed)
+
         # initial load
         self.config = {}
         self.load_config()
@@ -88,9 +208,7 @@ class ConfigLoader(QObject):
         logger.debug("Loading config file: %s", self.config_path)
 
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
-            self.config = data
+            self.config = self._parse(*read_with_digest(self.config_path))
 
             logger.info("Config loaded successfully")
             logger.debug(f"Loaded config: {self.config_path}")
@@ -98,6 +216,26 @@ class ConfigLoader(QObject):
         except Exception as e:
             logger.error(f"Failed to load config {self.config_path}: {e}")
 
+    def _parse(self, raw: bytes, digest: bytes) -> dict:
+        """
+        Parse config file contents, using the cache when it is current.
+
+        Args:
+            raw (bytes): The file contents.
+            digest (bytes): Their fingerprint, remembered for reloads.
+
+        Returns:
+            dict: The parsed configuration.
+        """
+        key = f"config:{self.config_path}"
+        data = self.cache.get(key, [self.config_path]) if self.cache is not None else None
+        if data is None:
+            data = yaml_codec.load(raw.decode("utf-8")) or {}
+            if self.cache is not None:
+                self.cache.put(key, [self.config_path], data)
+        self._digest = digest
+        return data
+
     def on_file_changed(self, path):
         """
         Handle file change events for the configuration file.
@@ -117,7 +255,78 @@ class ConfigLoader(QObject):
             logger.debug("Re-adding config path to watcher")
             self._watcher.addPath(self.config_path)
 
-        self.load_config()
+        # Restarting the timer folds a burst of events into one reload
+        self._reload_timer.start()
+
+    def flush(self):
+        """
+        Run a pending debounced reload immediately.
+
+        Returns:
+            None
+        """
+        if self._reload_timer.isActive():
+            self._reload_timer.stop()
+            self.reload_if_changed()
+
+    def reload_if_changed(self):
+        """
+        Reload the config file if its contents changed since the last load.
+
+        Emits configChanged and configKeysChanged only when at least one value
+        differs, so rewrites of identical content or comment-only edits
+        cost one read and a hash.
+
+        Returns:
+            None
+        """
+        try:
+            raw, digest = read_with_digest(self.config_path)
+            if digest == self._digest:
+                logger.debug("Config file contents unchanged, skipping reload")
+                return
+            data = self._parse(raw, digest)
+        except Exception as e:
+            logger.error(f"Failed to reload config {self.config_path}: {e}")
+            return
+
+        paths = changed_paths(self.config, data)
+        self.config = data
+        if not paths:
+            logger.debug("Config file rewritten without changing any value")
+            return
+
+        logger.info("Config reloaded, %d keys changed", len(paths))
+        logger.debug("Changed config keys: %s", paths)
+        self.configChanged.emit(self.config)
+        self.configKeysChanged.emit(self.config, paths)
+
+    def save(self, config: dict):
+        """
+        Write config to the config file as the application's own change.
+
+        The fingerprint of the written bytes is remembered, so the file
+        system event caused by this write is recognised by
+        reload_if_changed and skipped instead of re-parsing what was just
+        saved. Writes by anything else still reload as usual.
+
+        Args:
+            config (dict): The config to persist.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: If writing the file fails.
+        """
+        logger.debug("Saving config file: %s", self.config_path)
+        try:
+            self._digest = write_with_digest(self.config_path, config)
+            self.config = config
+            logger.info("Config saved: %s", self.config_path)
+        except Exception as e:
+            logger.error(f"Failed to save config {self.config_path}: {e}")
+            raise
 
     def stop(self):
         """
@@ -129,16 +338,23 @@ class ConfigLoader(QObject):
             None
         """
         logger.debug("Stopping ConfigLoader watcher")
+        self._reload_timer.stop()
         self._watcher.removePath(self.config_path)
 
 class SettingsLoader(QObject):
     """
     Loads and watches the YAML application settings file.
     Emits `settingsChanged` when the top-level settings change.
+
+    File system events are debounced and reloads are skipped when the
+    file's contents are unchanged. A reload that changes values also
+    emits `settingsKeysChanged` with the changed key paths, so consumers
+    can update only the affected parts.
     """
     settingsChanged = Signal(dict)
+    settingsKeysChanged = Signal(dict, list)
 
-    def __init__(self, settings_path: str, parent=None):
+    def __init__(self, settings_path: str, parent=None, cache=None, debounce_ms: int = RELOAD_DEBOUNCE_MS):
         """
         Initialize the SettingsLoader instance.
 
@@ -148,6 +364,9 @@ class SettingsLoader(QObject):
         Args:
             settings_path (str): Path to the settings YAML file.
             parent (Any): Optional parent QObject.
+            cache (ConfigCache | None): Optional parsed-config cache shared
+                with other loaders.
+            debounce_ms (int): Quiet period before a changed file is reloaded.
 
         Returns:
             None
@@ -155,12 +374,19 @@ class SettingsLoader(QObject):
         logger.debug("Initializing SettingsLoader")
         super().__init__()
         self.settings_path = os.path.abspath(settings_path)
+        self.cache = cache
         logger.debug("Settings Path: %s", self.settings_path)
 
         self._watcher = QFileSystemWatcher(self)
         self._watcher.addPath(self.settings_path)
         self._watcher.fileChanged.connect(self.on_file_changed)
 
+        self._digest = None
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(debounce_ms)
+        self._reload_timer.timeout.connect(self.reload_if_changed)
+
         # initial load
         self.settings = {}
         self.load_settings()
@@ -179,15 +405,45 @@ class SettingsLoader(QObject):
         logger.debug("Loading settings file: %s", self.settings_path)
 
         try:
-            with open(self.settings_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
-
-            self.settings = self.normalize_settings(data)
+            self.settings = self._parse(*read_with_digest(self.settings_path))
             logger.info(f"Loaded Settings: {self.settings_path}")
             self.settingsChanged.emit(self.settings)
         except Exception as e:
             logger.error(f"Failed to load Settings {self.settings_path}: {e}")
 
+    def _parse(self, raw: bytes, digest: bytes) -> dict:
+        """
+        Parse and normalize settings file contents, using the cache when it is current.
+
+        Args:
+            raw (bytes): The file contents.
+            digest (bytes): Their fingerprint, remembered for reloads.
+
+        Returns:
+            dict: The normalized settings.
+        """
+        key = f"settings:{self.settings_path}"
+        settings = self.cache.get(key, [self.settings_path]) if self.cache is not None else None
+        if settings is None:
+            settings = self.normalize_settings(yaml_codec.load(raw.decode("utf-8")) or {})
+            if self.cache is not None:
+                self.cache.put(key, [self.settings_path], settings)
+        self._digest = digest
+        return settings
+
+    @staticmethod
+    def is_setting(node) -> bool:
+        """
+        Check whether a normalized node is a single setting.
+
+        Args:
+            node (Any): A node of the normalized settings.
+
+        Returns:
+            bool: True for {"type", "value"} leaves, False for groupings.
+        """
+        return isinstance(node, dict) and "value" in node
+
     def infer_type(self, value):
         """
         Infer the string representation of a value's type.
@@ -261,7 +517,78 @@ class SettingsLoader(QObject):
             logger.debug("Re-adding settings path to watcher")
             self._watcher.addPath(self.settings_path)
 
-        self.load_settings()
+        # Restarting the timer folds a burst of events into one reload
+        self._reload_timer.start()
+
+    def flush(self):
+        """
+        Run a pending debounced reload immediately.
+
+        Returns:
+            None
+        """
+        if self._reload_timer.isActive():
+            self._reload_timer.stop()
+            self.reload_if_changed()
+
+    def reload_if_changed(self):
+        """
+        Reload the settings file if its contents changed since the last load.
+
+        Emits settingsChanged and settingsKeysChanged only when at least one value
+        differs, so rewrites of identical content or comment-only edits
+        cost one read and a hash.
+
+        Returns:
+            None
+        """
+        try:
+            raw, digest = read_with_digest(self.settings_path)
+            if digest == self._digest:
+                logger.debug("Settings file contents unchanged, skipping reload")
+                return
+            data = self._parse(raw, digest)
+        except Exception as e:
+            logger.error(f"Failed to reload settings {self.settings_path}: {e}")
+            return
+
+        paths = changed_paths(self.settings, data, is_leaf=self.is_setting)
+        self.settings = data
+        if not paths:
+            logger.debug("Settings file rewritten without changing any value")
+            return
+
+        logger.info("Settings reloaded, %d keys changed", len(paths))
+        logger.debug("Changed settings keys: %s", paths)
+        self.settingsChanged.emit(self.settings)
+        self.settingsKeysChanged.emit(self.settings, paths)
+
+    def save(self, settings: dict):
+        """
+        Write settings to the settings file as the application's own change.
+
+        The fingerprint of the written bytes is remembered, so the file
+        system event caused by this write is recognised by
+        reload_if_changed and skipped instead of re-parsing what was just
+        saved. Writes by anything else still reload as usual.
+
+        Args:
+            settings (dict): The settings to persist.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: If writing the file fails.
+        """
+        logger.debug("Saving settings file: %s", self.settings_path)
+        try:
+            self._digest = write_with_digest(self.settings_path, settings)
+            self.settings = settings
+            logger.info("Settings saved: %s", self.settings_path)
+        except Exception as e:
+            logger.error(f"Failed to save settings {self.settings_path}: {e}")
+            raise
 
     def stop(self):
         """
@@ -273,4 +600,5 @@ class SettingsLoader(QObject):
             None
         """
         logger.debug("Stopping SettingsLoader watcher")
+        self._reload_timer.stop()
         self._watcher.removePath(self.settings_path)
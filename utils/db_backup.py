@@ -0,0 +1,179 @@
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the backups section of settings.yaml
+DEFAULT_SNAPSHOT_INTERVAL_HOURS = 24
+DEFAULT_SNAPSHOTS_TO_KEEP = 7
+
+SNAPSHOT_PREFIX = "snippets-"
+SNAPSHOT_SUFFIX = ".db"
+SNAPSHOT_TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+
+class SnapshotManager:
+    """
+    Rotating, timestamped snapshots of the snippet database.
+
+    Snapshots are made with SnippetDB.backup, so they can be taken while
+    the application is in use. The newest snapshot's timestamp drives the
+    schedule, which keeps it correct across restarts.
+    """
+    def __init__(
+        self,
+        snippet_db,
+        snapshot_dir: Path,
+        interval_hours: float = DEFAULT_SNAPSHOT_INTERVAL_HOURS,
+        keep: int = DEFAULT_SNAPSHOTS_TO_KEEP,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Initialize the SnapshotManager.
+
+        Args:
+            snippet_db (SnippetDB): The database to snapshot.
+            snapshot_dir (Path): Directory holding the snapshot files.
+            interval_hours (float): Hours between scheduled snapshots.
+            keep (int): Number of snapshots kept by prune().
+            enabled (bool): Whether scheduled snapshots are taken.
+
+        Returns:
+            None
+        """
+        self.snippet_db = snippet_db
+        self.snapshot_dir = Path(snapshot_dir)
+        self.interval_hours = interval_hours
+        self.keep = keep
+        self.enabled = enabled
+
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """
+        Apply the backups section of settings.yaml.
+
+        Args:
+            settings (Dict[str, Any]): The backups settings, each entry
+                holding its value under "value".
+
+        Returns:
+            None
+        """
+        def value(key, default):
+            return (settings.get(key) or {}).get("value", default)
+
+        self.enabled = bool(value("snapshots_enabled", True))
+        self.interval_hours = float(value("snapshot_interval_hours", DEFAULT_SNAPSHOT_INTERVAL_HOURS))
+        self.keep = max(1, int(value("snapshots_to_keep", DEFAULT_SNAPSHOTS_TO_KEEP)))
+        logger.debug(
+            "Snapshot settings: enabled=%s interval=%sh keep=%d",
+            self.enabled, self.interval_hours, self.keep,
+        )
+
+    def list_snapshots(self) -> List[Path]:
+        """
+        Return existing snapshots, newest first.
+
+        Returns:
+            List[Path]: Snapshot files sorted by their timestamp.
+        """
+        if not self.snapshot_dir.is_dir():
+            return []
+        # Timestamps sort lexically, so the name is enough
+        return sorted(
+            self.snapshot_dir.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"),
+            key=lambda p: p.name,
+            reverse=True,
+        )
+
+    def snapshot_time(self, path: Path) -> float | None:
+        """
+        Parse the creation time encoded in a snapshot file name.
+
+        Args:
+            path (Path): A snapshot file.
+
+        Returns:
+            float | None: Epoch seconds, or None if the name does not parse.
+        """
+        stamp = path.name[len(SNAPSHOT_PREFIX):-len(SNAPSHOT_SUFFIX)]
+        try:
+            return datetime.strptime(stamp, SNAPSHOT_TIME_FORMAT).timestamp()
+        except ValueError:
+            return None
+
+    def due(self) -> bool:
+        """
+        Check whether a scheduled snapshot should be taken now.
+
+        Returns:
+            bool: True if enabled and the newest snapshot is older than
+                the interval, or none exists.
+        """
+        if not self.enabled:
+            return False
+        for path in self.list_snapshots():
+            taken = self.snapshot_time(path)
+            if taken is not None:
+                return time.time() - taken >= self.interval_hours * 3600
+        return True
+
+    def create_snapshot(self, prune: bool = True) -> Path | None:
+        """
+        Take a snapshot now and prune old ones.
+
+        Args:
+            prune (bool): Delete snapshots beyond the retention count.
+
+        Returns:
+            Path | None: The new snapshot, or None if the backup failed.
+        """
+        name = f"{SNAPSHOT_PREFIX}{datetime.now().strftime(SNAPSHOT_TIME_FORMAT)}{SNAPSHOT_SUFFIX}"
+        start = time.perf_counter()
+        path = self.snippet_db.backup(self.snapshot_dir / name)
+        if path is None:
+            return None
+
+        logger.info("Created database snapshot %s in %.0f ms", path.name, (time.perf_counter() - start) * 1000)
+        if prune:
+            self.prune()
+        return path
+
+    def prune(self) -> int:
+        """
+        Delete all but the newest snapshots.
+
+        Returns:
+            int: The number of snapshots deleted.
+        """
+        removed = 0
+        for path in self.list_snapshots()[self.keep:]:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                logger.warning("Could not delete old snapshot %s: %s", path, e)
+        if removed:
+            logger.info("Pruned %d old database snapshots", removed)
+        return removed
+
+    def restore(self, path: Path) -> bool | None:
+        """
+        Restore the database from a snapshot.
+
+        A snapshot of the current state is taken first, so a restore can
+        itself be undone. Pruning waits until the restore is done so the
+        snapshot being restored cannot be rotated out from under it.
+
+        Args:
+            path (Path): The snapshot to restore.
+
+        Returns:
+            bool | None: See SnippetDB.restore.
+        """
+        self.create_snapshot(prune=False)
+        restored = self.snippet_db.restore(path)
+        self.prune()
+        return restored
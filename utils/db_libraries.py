@@ -0,0 +1,99 @@
+import sqlite3
+from pathlib import Path
+from typing import List, Sequence
+
+from .snippet_record import SNIPPET_COLUMNS, STORAGE_COLUMNS
+
+# TEMP view exposing the main snippets table and every attached library
+ALL_SNIPPETS_VIEW = "all_snippets"
+
+# Schema alias prefix for attached libraries: lib_1, lib_2, ...
+LIBRARY_ALIAS_PREFIX = "lib_"
+
+# Library rows are given negative ids of -(rank * LIBRARY_ID_SPAN + id), so
+# they never collide with ids in the main database, which is rank 0.
+LIBRARY_ID_SPAN = 1 << 40
+
+# Values used for columns an older library file does not have yet
+_COLUMN_DEFAULTS = {
+    "enabled": "1",
+    "use_count": "0",
+    "body_format": "0",
+}
+
+
+def library_alias(rank: int) -> str:
+    """
+    Return the schema alias of the library with the given rank.
+
+    Args:
+        rank (int): 1-based precedence of the library.
+
+    Returns:
+        str: The ATTACH alias.
+    """
+    return f"{LIBRARY_ALIAS_PREFIX}{rank}"
+
+
+def library_rank(snippet_id: int) -> int:
+    """
+    Return the precedence rank encoded in a snippet id.
+
+    Lower ranks win trigger conflicts; the main database is rank 0.
+
+    Args:
+        snippet_id (int): An id from the unified view.
+
+    Returns:
+        int: 0 for the main database, otherwise the library's rank.
+    """
+    if snippet_id >= 0:
+        return 0
+    return -snippet_id // LIBRARY_ID_SPAN
+
+
+def library_uri(path: Path) -> str:
+    """
+    Build a read-only URI for ATTACH.
+
+    Args:
+        path (Path): The library database file.
+
+    Returns:
+        str: A file: URI opening the library in mode=ro.
+    """
+    return f"{Path(path).resolve().as_uri()}?mode=ro"
+
+
+def build_view_sql(conn: sqlite3.Connection, ranks: Sequence[int]) -> str:
+    """
+    Build the CREATE statement for the unified snippets view.
+
+    Each library contributes a UNION ALL branch selecting SNIPPET_SELECT
+    columns from its own snippets table, so filters on indexed columns
+    such as trigger are pushed down into every branch.
+
+    Args:
+        conn (sqlite3.Connection): A connection with the libraries attached.
+        ranks (Sequence[int]): Ranks of the attached libraries.
+
+    Returns:
+        str: The CREATE TEMP VIEW statement.
+    """
+    columns = SNIPPET_COLUMNS + STORAGE_COLUMNS
+    branches: List[str] = [f"SELECT {', '.join(columns)} FROM main.snippets"]
+
+    for rank in ranks:
+        alias = library_alias(rank)
+        present = {row[1] for row in conn.execute(f"PRAGMA {alias}.table_info(snippets)")}
+        selected = []
+        for column in columns:
+            if column == "id":
+                selected.append(f"-({rank * LIBRARY_ID_SPAN} + id) AS id")
+            elif column in present:
+                selected.append(column)
+            else:
+                selected.append(f"{_COLUMN_DEFAULTS.get(column, 'NULL')} AS {column}")
+        branches.append(f"SELECT {', '.join(selected)} FROM {alias}.snippets")
+
+    return f"CREATE TEMP VIEW {ALL_SNIPPETS_VIEW} AS " + " UNION ALL ".join(branches)
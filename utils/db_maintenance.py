@@ -0,0 +1,157 @@
+import logging
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the maintenance keys in the database section of config.yaml
+DEFAULT_MAINTENANCE_INTERVAL_HOURS = 24
+DEFAULT_MAINTENANCE_IDLE_SECONDS = 120
+DEFAULT_MAINTENANCE_MAX_SECONDS = 2.0
+
+# Free pages as a fraction of the file that trigger maintenance early,
+# for example after a large import was deleted again.
+FRAGMENTATION_THRESHOLD = 0.25
+
+# Minimum hours between runs triggered by fragmentation.
+MIN_INTERVAL_HOURS = 1
+
+
+class MaintenanceScheduler:
+    """
+    Runs SnippetDB.run_maintenance in idle windows.
+
+    The snippet service reports database activity through note_activity().
+    Maintenance becomes due once the database has been quiet for
+    idle_seconds and either the interval has passed since the last run
+    recorded in db_maintenance, or the file is heavily fragmented.
+    """
+    def __init__(
+        self,
+        snippet_db,
+        interval_hours: float = DEFAULT_MAINTENANCE_INTERVAL_HOURS,
+        idle_seconds: float = DEFAULT_MAINTENANCE_IDLE_SECONDS,
+        max_seconds: float = DEFAULT_MAINTENANCE_MAX_SECONDS,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Initialize the MaintenanceScheduler.
+
+        Args:
+            snippet_db (SnippetDB): The database to maintain.
+            interval_hours (float): Hours between scheduled runs.
+            idle_seconds (float): Quiet time required before a run.
+            max_seconds (float): Time budget for incremental vacuum.
+            enabled (bool): Whether scheduled runs happen at all.
+
+        Returns:
+            None
+        """
+        self.snippet_db = snippet_db
+        self.interval_hours = interval_hours
+        self.idle_seconds = idle_seconds
+        self.max_seconds = max_seconds
+        self.enabled = enabled
+
+        self._last_activity = time.monotonic()
+        self._last_run: float | None = None
+        self._last_run_loaded = False
+
+    def configure(self, settings: Dict[str, Any]) -> None:
+        """
+        Apply the maintenance keys of the database config section.
+
+        Args:
+            settings (Dict[str, Any]): The database section of config.yaml.
+
+        Returns:
+            None
+        """
+        self.enabled = bool(settings.get("maintenance_enabled", True))
+        self.interval_hours = float(settings.get("maintenance_interval_hours", DEFAULT_MAINTENANCE_INTERVAL_HOURS))
+        self.idle_seconds = float(settings.get("maintenance_idle_seconds", DEFAULT_MAINTENANCE_IDLE_SECONDS))
+        self.max_seconds = float(settings.get("maintenance_max_seconds", DEFAULT_MAINTENANCE_MAX_SECONDS))
+        logger.debug(
+            "Maintenance settings: enabled=%s interval=%sh idle=%ss budget=%ss",
+            self.enabled, self.interval_hours, self.idle_seconds, self.max_seconds,
+        )
+
+    def note_activity(self) -> None:
+        """
+        Record that the database was just used, restarting the idle window.
+
+        Returns:
+            None
+        """
+        self._last_activity = time.monotonic()
+
+    def last_run(self) -> float | None:
+        """
+        Return when maintenance last ran.
+
+        Read from db_maintenance once, then tracked in memory.
+
+        Returns:
+            float | None: Epoch seconds, or None if it never ran.
+        """
+        if not self._last_run_loaded:
+            last = self.snippet_db.last_maintenance()
+            self._last_run = last["ran_at"] if last else None
+            self._last_run_loaded = True
+        return self._last_run
+
+    def due(self) -> bool:
+        """
+        Check whether maintenance should run now.
+
+        Returns:
+            bool: True if enabled, idle, and either the interval passed or
+                fragmentation is above FRAGMENTATION_THRESHOLD.
+        """
+        if not self.enabled or time.monotonic() - self._last_activity < self.idle_seconds:
+            return False
+
+        last = self.last_run()
+        if last is None:
+            return True
+        hours = (time.time() - last) / 3600
+        if hours >= self.interval_hours:
+            return True
+        if hours < MIN_INTERVAL_HOURS:
+            return False
+
+        stats = self.snippet_db.storage_stats()
+        return bool(stats) and stats["fragmentation"] >= FRAGMENTATION_THRESHOLD
+
+    def needs_full_vacuum(self) -> bool:
+        """
+        Check whether the file can only be converted by a full VACUUM.
+
+        True when the pragma profile wants incremental auto_vacuum but the
+        file was created without it, so bounded runs cannot release its
+        free pages.
+
+        Returns:
+            bool: True if a full VACUUM is needed to enable incremental
+                vacuum.
+        """
+        stats = self.snippet_db.storage_stats()
+        wanted = str(self.snippet_db.pool.pragmas.get("auto_vacuum", "")).upper()
+        return bool(stats) and wanted == "INCREMENTAL" and stats["auto_vacuum"] != "INCREMENTAL"
+
+    def run(self, full_vacuum: bool = False) -> Dict[str, Any] | None:
+        """
+        Run maintenance now.
+
+        Args:
+            full_vacuum (bool): Rewrite the whole file with VACUUM.
+
+        Returns:
+            Dict[str, Any] | None: See SnippetDB.run_maintenance.
+        """
+        metrics = self.snippet_db.run_maintenance(max_seconds=self.max_seconds, full_vacuum=full_vacuum)
+        # Record the attempt even on failure so a broken database is not retried every second
+        self._last_run = time.time()
+        self._last_run_loaded = True
+        self.note_activity()
+        return metrics
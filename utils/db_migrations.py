@@ -0,0 +1,572 @@
+import sqlite3
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Optional, Sequence, Tuple
+
+from .body_codec import (
+    encode_body,
+    decode_body,
+    content_hash,
+    COMPRESSION_FORMATS,
+    BODY_PLAIN,
+    DEFAULT_COMPRESS_THRESHOLD,
+    DEFAULT_COMPRESSION,
+)
+
+logger = logging.getLogger(__name__)
+
+
+BASELINE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS snippets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        enabled BOOLEAN DEFAULT True,
+        label TEXT NOT NULL,
+        trigger TEXT UNIQUE NOT NULL,
+        snippet TEXT NOT NULL,
+        paste_style TEXT,
+        return_press BOOLEAN DEFAULT False,
+        folder TEXT,
+        tags TEXT DEFAULT ''
+    )
+"""
+
+BASELINE_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_snippets_enabled ON snippets(enabled);",
+    "CREATE INDEX IF NOT EXISTS idx_snippets_folder ON snippets(folder);",
+    "CREATE INDEX IF NOT EXISTS idx_snippets_label ON snippets(label);",
+    "CREATE INDEX IF NOT EXISTS idx_snippets_tags ON snippets(tags);",
+]
+
+
+# Current time as Unix epoch seconds, usable in DEFAULT clauses and
+# triggers. unixepoch() needs SQLite 3.38+, so julianday is used instead.
+SQL_EPOCH_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+# Snippet columns whose changes are recorded in the change log.
+# Bookkeeping columns added later must not be listed here, otherwise
+# routine counters would flood the log.
+CHANGE_LOG_COLUMNS = (
+    "enabled",
+    "label",
+    "trigger",
+    "snippet",
+    "paste_style",
+    "return_press",
+    "folder",
+    "tags",
+)
+
+# While this table has rows, the change log and updated_at triggers skip
+# updates. Storage-only rewrites such as re-encoding bodies insert a row
+# and remove it again inside their own transaction, so other connections
+# never observe the suspension.
+TRIGGER_SUSPENSIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS trigger_suspensions (
+        name TEXT PRIMARY KEY
+    )
+"""
+
+
+class MigrationError(Exception):
+    """Raised when a schema migration step fails and is rolled back."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A single ordered schema upgrade step.
+
+    Attributes:
+        version (int): The schema version this step upgrades to.
+        description (str): Short human readable summary of the change.
+        upgrade (Callable): Applies the schema change. Runs inside a
+            single transaction together with the user_version bump, so it
+            must only contain fast DDL and must be safe to re-run.
+        backfill (Callable | None): Optional data rebuild run in batches
+            after the schema change. Receives the connection and a batch
+            size and returns the number of rows it processed. It must only
+            select rows that still need work so that it can resume after
+            an interrupted run.
+        backfill_options (Tuple[str, ...]): Names of runner settings passed
+            to the backfill as keyword arguments when they are provided.
+    """
+    version: int
+    description: str
+    upgrade: Callable[[sqlite3.Connection], None]
+    backfill: Optional[Callable[..., int]] = None
+    backfill_options: Tuple[str, ...] = ()
+
+
+# Helpers
+def column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    """
+    Check whether a column exists on a table.
+
+    Used by upgrade steps to keep ALTER TABLE statements idempotent.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        table (str): The table name.
+        column (str): The column name.
+
+    Returns:
+        bool: True if the column exists, otherwise False.
+    """
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return any(row[1] == column for row in rows)
+
+
+def add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
+    """
+    Add a column to a table if it does not already exist.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+        table (str): The table name.
+        column (str): The column name.
+        definition (str): The column type and constraints.
+
+    Returns:
+        None
+    """
+    if not column_exists(conn, table, column):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+# Migration steps
+def _upgrade_v1_baseline(conn: sqlite3.Connection) -> None:
+    """
+    Create the original snippets table and its indexes.
+
+    Databases created before schema versioning already have this layout,
+    so every statement is a no-op for them.
+    """
+    conn.execute(BASELINE_TABLE_SQL)
+    for statement in BASELINE_INDEXES_SQL:
+        conn.execute(statement)
+
+
+def _upgrade_v2_change_log(conn: sqlite3.Connection) -> None:
+    """
+    Add the append-only snippet_changes log and the triggers feeding it.
+
+    Every insert, delete and content update on snippets appends a row
+    with a monotonically increasing seq, so readers can ask for the
+    changes since the last seq they saw. Updates that leave every logged
+    column unchanged (for example an upsert of identical data) are skipped.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS snippet_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+            snippet_id INTEGER NOT NULL,
+            trigger TEXT,
+            changed_at REAL NOT NULL DEFAULT {SQL_EPOCH_NOW}
+        )
+    """)
+
+    columns = ", ".join(CHANGE_LOG_COLUMNS)
+    changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in CHANGE_LOG_COLUMNS)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS snippets_log_insert AFTER INSERT ON snippets
+        BEGIN
+            INSERT INTO snippet_changes (op, snippet_id, trigger) VALUES ('insert', NEW.id, NEW.trigger);
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS snippets_log_update AFTER UPDATE OF {columns} ON snippets
+        WHEN {changed}
+        BEGIN
+            INSERT INTO snippet_changes (op, snippet_id, trigger) VALUES ('update', NEW.id, NEW.trigger);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS snippets_log_delete AFTER DELETE ON snippets
+        BEGIN
+            INSERT INTO snippet_changes (op, snippet_id, trigger) VALUES ('delete', OLD.id, OLD.trigger);
+        END
+    """)
+
+
+def _upgrade_v3_usage(conn: sqlite3.Connection) -> None:
+    """
+    Add use_count and last_used bookkeeping columns to snippets.
+
+    They are deliberately left out of CHANGE_LOG_COLUMNS, so batched
+    usage updates never fire the change log trigger.
+    """
+    add_column(conn, "snippets", "use_count", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "snippets", "last_used", "REAL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_use_count ON snippets(use_count DESC, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_last_used ON snippets(last_used DESC)")
+
+
+def _upgrade_v4_body_format(conn: sqlite3.Connection) -> None:
+    """
+    Add the body_format storage flag for compressed snippet bodies.
+
+    Existing rows default to plaintext (0); large ones are compressed by
+    the backfill.
+    """
+    add_column(conn, "snippets", "body_format", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _backfill_v4_compress_bodies(
+    conn: sqlite3.Connection,
+    batch_size: int,
+    compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    compression: str = DEFAULT_COMPRESSION,
+) -> int:
+    """
+    Compress plaintext bodies at or above the configured size threshold.
+
+    Compressed rows get a non-zero body_format, so they are not selected
+    again and an interrupted run resumes where it stopped. The text is
+    unchanged, so the change log and updated_at triggers are suspended
+    while rows are rewritten. Nothing is done when compression is off.
+    """
+    if compress_threshold <= 0 or COMPRESSION_FORMATS.get(compression) == BODY_PLAIN:
+        return 0
+
+    rows = conn.execute(
+        "SELECT id, snippet FROM snippets "
+        "WHERE body_format = 0 AND length(CAST(snippet AS BLOB)) >= ? LIMIT ?",
+        (compress_threshold, batch_size),
+    ).fetchall()
+    updates = []
+    for snippet_id, text in rows:
+        body, body_format = encode_body(text, compress_threshold, compression)
+        updates.append((body, body_format, snippet_id))
+
+    conn.execute(TRIGGER_SUSPENSIONS_SQL)
+    conn.execute("INSERT OR IGNORE INTO trigger_suspensions (name) VALUES ('reencode_bodies')")
+    conn.executemany("UPDATE snippets SET snippet = ?, body_format = ? WHERE id = ?", updates)
+    conn.execute("DELETE FROM trigger_suspensions WHERE name = 'reencode_bodies'")
+    return len(rows)
+
+
+def _upgrade_v5_maintenance_log(conn: sqlite3.Connection) -> None:
+    """
+    Add the db_maintenance table recording each maintenance run.
+
+    Rows hold size and fragmentation metrics before and after the run,
+    and the newest row tells the scheduler when maintenance last ran.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS db_maintenance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ran_at REAL NOT NULL DEFAULT {SQL_EPOCH_NOW},
+            duration_ms REAL NOT NULL,
+            page_size INTEGER NOT NULL,
+            pages_before INTEGER NOT NULL,
+            pages_after INTEGER NOT NULL,
+            free_pages_before INTEGER NOT NULL,
+            free_pages_after INTEGER NOT NULL,
+            vacuum TEXT NOT NULL,
+            analyzed BOOLEAN NOT NULL
+        )
+    """)
+
+
+def _upgrade_v6_content_hash(conn: sqlite3.Connection) -> None:
+    """
+    Add the indexed content_hash column used for duplicate detection.
+
+    Hashes are filled in by the backfill. The column is derived from the
+    body, so it is not part of CHANGE_LOG_COLUMNS.
+    """
+    add_column(conn, "snippets", "content_hash", "TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_content_hash ON snippets(content_hash)")
+
+
+def _backfill_v6_content_hash(conn: sqlite3.Connection, batch_size: int) -> int:
+    """
+    Hash bodies that do not have a content_hash yet.
+
+    Also picks up rows written without one, for example by external
+    tools, whenever backfills run.
+    """
+    rows = conn.execute(
+        "SELECT id, snippet, body_format FROM snippets "
+        "WHERE content_hash IS NULL AND snippet IS NOT NULL LIMIT ?",
+        (batch_size,),
+    ).fetchall()
+    conn.executemany(
+        "UPDATE snippets SET content_hash = ? WHERE id = ?",
+        [(content_hash(decode_body(body, body_format)), snippet_id) for snippet_id, body, body_format in rows],
+    )
+    return len(rows)
+
+
+def _upgrade_v7_timestamps(conn: sqlite3.Connection) -> None:
+    """
+    Add created_at/updated_at columns and the snippet_tombstones table.
+
+    Triggers keep both current for every writer. Inserts without
+    timestamps get the current time, and content updates move updated_at
+    unless the statement sets it itself, which lets delta imports keep
+    the source's timestamps. Deleting or renaming a snippet records a
+    tombstone for the old trigger so deltas can carry deletions; reusing
+    the trigger removes it again.
+    """
+    add_column(conn, "snippets", "created_at", "REAL")
+    add_column(conn, "snippets", "updated_at", "REAL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_updated_at ON snippets(updated_at)")
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS snippet_tombstones (
+            trigger TEXT PRIMARY KEY,
+            deleted_at REAL NOT NULL DEFAULT {SQL_EPOCH_NOW}
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_snippet_tombstones_deleted_at ON snippet_tombstones(deleted_at)")
+
+    columns = ", ".join(CHANGE_LOG_COLUMNS)
+    changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in CHANGE_LOG_COLUMNS)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS snippets_stamp_insert AFTER INSERT ON snippets
+        WHEN NEW.created_at IS NULL OR NEW.updated_at IS NULL
+        BEGIN
+            UPDATE snippets
+            SET created_at = COALESCE(NEW.created_at, {SQL_EPOCH_NOW}),
+                updated_at = COALESCE(NEW.updated_at, {SQL_EPOCH_NOW})
+            WHERE id = NEW.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS snippets_stamp_update AFTER UPDATE OF {columns} ON snippets
+        WHEN ({changed}) AND NEW.updated_at IS OLD.updated_at
+        BEGIN
+            UPDATE snippets SET updated_at = {SQL_EPOCH_NOW} WHERE id = NEW.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS snippets_tombstone_delete AFTER DELETE ON snippets
+        BEGIN
+            INSERT OR REPLACE INTO snippet_tombstones (trigger) VALUES (OLD.trigger);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS snippets_tombstone_rename AFTER UPDATE OF trigger ON snippets
+        WHEN OLD.trigger IS NOT NEW.trigger
+        BEGIN
+            INSERT OR REPLACE INTO snippet_tombstones (trigger) VALUES (OLD.trigger);
+            DELETE FROM snippet_tombstones WHERE trigger = NEW.trigger;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS snippets_tombstone_revive AFTER INSERT ON snippets
+        BEGIN
+            DELETE FROM snippet_tombstones WHERE trigger = NEW.trigger;
+        END
+    """)
+
+
+def _backfill_v7_timestamps(conn: sqlite3.Connection, batch_size: int) -> int:
+    """
+    Stamp rows written before timestamps existed with the current time.
+
+    Their real age is unknown, so the first delta after upgrading
+    includes them.
+    """
+    cur = conn.execute(
+        f"UPDATE snippets SET created_at = COALESCE(created_at, {SQL_EPOCH_NOW}), "
+        f"updated_at = COALESCE(updated_at, {SQL_EPOCH_NOW}) "
+        "WHERE id IN (SELECT id FROM snippets WHERE updated_at IS NULL LIMIT ?)",
+        (batch_size,),
+    )
+    return cur.rowcount
+
+
+def _upgrade_v8_trigger_suspensions(conn: sqlite3.Connection) -> None:
+    """
+    Let storage-only rewrites bypass the change log and updated_at triggers.
+
+    Adds the trigger_suspensions table and recreates snippets_log_update
+    and snippets_stamp_update so they skip updates while it has rows.
+    """
+    conn.execute(TRIGGER_SUSPENSIONS_SQL)
+
+    columns = ", ".join(CHANGE_LOG_COLUMNS)
+    changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in CHANGE_LOG_COLUMNS)
+    active = "NOT EXISTS (SELECT 1 FROM trigger_suspensions)"
+
+    conn.execute("DROP TRIGGER IF EXISTS snippets_log_update")
+    conn.execute(f"""
+        CREATE TRIGGER snippets_log_update AFTER UPDATE OF {columns} ON snippets
+        WHEN ({changed}) AND {active}
+        BEGIN
+            INSERT INTO snippet_changes (op, snippet_id, trigger) VALUES ('update', NEW.id, NEW.trigger);
+        END
+    """)
+    conn.execute("DROP TRIGGER IF EXISTS snippets_stamp_update")
+    conn.execute(f"""
+        CREATE TRIGGER snippets_stamp_update AFTER UPDATE OF {columns} ON snippets
+        WHEN ({changed}) AND NEW.updated_at IS OLD.updated_at AND {active}
+        BEGIN
+            UPDATE snippets SET updated_at = {SQL_EPOCH_NOW} WHERE id = NEW.id;
+        END
+    """)
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Baseline snippets table and indexes", _upgrade_v1_baseline),
+    Migration(2, "Snippet change log and triggers", _upgrade_v2_change_log),
+    Migration(3, "Snippet usage statistics", _upgrade_v3_usage),
+    Migration(
+        4,
+        "Compressed snippet bodies",
+        _upgrade_v4_body_format,
+        _backfill_v4_compress_bodies,
+        ("compress_threshold", "compression"),
+    ),
+    Migration(5, "Database maintenance log", _upgrade_v5_maintenance_log),
+    Migration(6, "Snippet content hashes", _upgrade_v6_content_hash, _backfill_v6_content_hash),
+    Migration(7, "Snippet timestamps and tombstones", _upgrade_v7_timestamps, _backfill_v7_timestamps),
+    Migration(8, "Trigger suspension for storage-only rewrites", _upgrade_v8_trigger_suspensions),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+class MigrationRunner:
+    """
+    Applies ordered schema migrations keyed on PRAGMA user_version.
+    """
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        migrations: Sequence[Migration] = MIGRATIONS,
+        settings: Mapping[str, Any] | None = None,
+    ) -> None:
+        """
+        Initialize the MigrationRunner.
+
+        Args:
+            conn (sqlite3.Connection): The connection used to apply migrations.
+            migrations (Sequence[Migration]): The ordered migration steps.
+            settings (Mapping[str, Any] | None): Values handed to backfills
+                that list them in backfill_options, such as the codec
+                settings of the owning SnippetDB.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If migration versions are not strictly increasing.
+        """
+        versions = [m.version for m in migrations]
+        if versions != sorted(set(versions)):
+            raise ValueError("Migration versions must be unique and strictly increasing.")
+
+        self.conn = conn
+        self.migrations = list(migrations)
+        self.latest_version = versions[-1] if versions else 0
+        self.settings = dict(settings or {})
+
+    def current_version(self) -> int:
+        """
+        Read the schema version stored in the database header.
+
+        Returns:
+            int: The current PRAGMA user_version value.
+        """
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def pending(self) -> list[Migration]:
+        """
+        Return migrations that have not been applied yet.
+
+        Returns:
+            list[Migration]: Pending migrations in version order.
+        """
+        current = self.current_version()
+        return [m for m in self.migrations if m.version > current]
+
+    def upgrade(self) -> int:
+        """
+        Apply all pending migrations in order.
+
+        Each step and its user_version bump run in one IMMEDIATE
+        transaction, so a failing step leaves the database at the previous
+        version with no partial changes.
+
+        Returns:
+            int: The schema version after upgrading.
+
+        Raises:
+            MigrationError: If a migration step fails.
+        """
+        current = self.current_version()
+
+        if current > self.latest_version:
+            logger.warning(
+                "Database schema version %d is newer than this build supports (%d). Skipping migrations.",
+                current,
+                self.latest_version,
+            )
+            return current
+
+        for migration in self.pending():
+            logger.info("Applying schema migration %d: %s", migration.version, migration.description)
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+                migration.upgrade(self.conn)
+                self.conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                raise MigrationError(f"Migration {migration.version} ({migration.description}) failed: {e}") from e
+            current = migration.version
+
+        logger.debug("Database schema is at version %d", current)
+        return current
+
+    def backfill(self, batch_size: int = 500, max_seconds: float | None = None) -> bool:
+        """
+        Run pending data backfills in small batches.
+
+        Every batch commits on its own so the write lock is only held
+        briefly. When a time budget is given the runner stops between
+        batches once it is exhausted, and the remaining work resumes on
+        the next call.
+
+        Args:
+            batch_size (int): Maximum rows processed per transaction.
+            max_seconds (float | None): Optional time budget in seconds.
+
+        Returns:
+            bool: True if every backfill has completed, otherwise False.
+
+        Raises:
+            MigrationError: If a backfill batch fails.
+        """
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        current = self.current_version()
+
+        for migration in self.migrations:
+            if migration.backfill is None or migration.version > current:
+                continue
+            options = {k: self.settings[k] for k in migration.backfill_options if k in self.settings}
+
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.debug("Backfill time budget exhausted; resuming later")
+                    return False
+
+                try:
+                    self.conn.execute("BEGIN IMMEDIATE")
+                    processed = migration.backfill(self.conn, batch_size, **options)
+                    self.conn.commit()
+                except Exception as e:
+                    self.conn.rollback()
+                    raise MigrationError(f"Backfill for migration {migration.version} failed: {e}") from e
+
+                if processed:
+                    logger.debug("Backfilled %d rows for migration %d", processed, migration.version)
+                if processed < batch_size:
+                    break
+
+        return True
@@ -0,0 +1,258 @@
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from .body_codec import register_functions
+
+logger = logging.getLogger(__name__)
+
+
+# Named pragma profiles for SnippetDB connections.
+# cache_size is negative to express KiB rather than pages. auto_vacuum
+# INCREMENTAL lets maintenance return free pages in small steps.
+PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Sensible default for a desktop app: WAL with NORMAL sync is
+    # crash safe and only risks the last commit on power loss.
+    "balanced": {
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -8000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Every commit is synced to disk.
+    "durable": {
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    # Larger caches and memory mapping for very large libraries.
+    "performance": {
+        "auto_vacuum": "INCREMENTAL",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Original behaviour: rollback journal with SQLite defaults.
+    "legacy": {
+        "auto_vacuum": "NONE",
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def resolve_profile(profile: str | Dict[str, Any] | None) -> Dict[str, Any]:
+    """
+    Resolve a profile name or override dictionary into pragma values.
+
+    Dictionaries are applied on top of the default profile, so callers
+    only need to provide the pragmas they want to change.
+
+    Args:
+        profile (str | dict | None): A profile name from PRAGMA_PROFILES,
+            a dictionary of pragma overrides, or None for the default.
+
+    Returns:
+        dict: The resolved pragma values.
+    """
+    if profile is None:
+        return dict(PRAGMA_PROFILES[DEFAULT_PROFILE])
+
+    if isinstance(profile, dict):
+        resolved = dict(PRAGMA_PROFILES[DEFAULT_PROFILE])
+        resolved.update(profile)
+        return resolved
+
+    if profile not in PRAGMA_PROFILES:
+        logger.warning("Unknown database profile '%s', using '%s'", profile, DEFAULT_PROFILE)
+        profile = DEFAULT_PROFILE
+
+    return dict(PRAGMA_PROFILES[profile])
+
+
+class ConnectionPool:
+    """
+    Hands each thread its own SQLite connection plus one shared writer.
+
+    Reads use a connection owned by the calling thread, so the GUI thread,
+    the service thread and worker threads never share a connection. All
+    writes go through a single writer connection guarded by a lock, which
+    matches SQLite's single-writer model and avoids SQLITE_BUSY churn.
+    """
+    def __init__(self, db_path: Path, profile: str | Dict[str, Any] | None = None) -> None:
+        """
+        Initialize the ConnectionPool.
+
+        Opens the writer connection and applies the database-wide journal
+        mode before any reader is created.
+
+        Args:
+            db_path (Path): Path to the SQLite database file.
+            profile (str | dict | None): Pragma profile name or overrides.
+
+        Returns:
+            None
+        """
+        self.db_path = db_path
+        self.pragmas = resolve_profile(profile)
+
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+
+        self._trace_callback = None
+
+        self._writer = self._open(is_writer=True)
+        self._closed = False
+
+    def _open(self, is_writer: bool = False) -> sqlite3.Connection:
+        """
+        Open and configure a new connection.
+
+        Args:
+            is_writer (bool): Whether this is the shared writer connection.
+
+        Returns:
+            sqlite3.Connection: The configured connection.
+        """
+        # check_same_thread is disabled so close() can run from any
+        # thread. Each reader is still only used by the thread owning it.
+        # PARSE_DECLTYPES applies registered converters such as BOOLEAN.
+        # Opening by URI lets SnippetDB ATTACH libraries with mode=ro.
+        conn = sqlite3.connect(
+            Path(self.db_path).resolve().as_uri(),
+            uri=True,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+
+        if is_writer:
+            # auto_vacuum only takes effect on a new database or after a
+            # full VACUUM; SnippetDB.run_maintenance converts old files.
+            conn.execute(f"PRAGMA auto_vacuum = {self.pragmas['auto_vacuum']}")
+            # journal_mode is stored in the database file, so set it once
+            mode = conn.execute(f"PRAGMA journal_mode = {self.pragmas['journal_mode']}").fetchone()[0]
+            logger.debug("Database journal mode: %s", mode)
+
+        conn.execute(f"PRAGMA synchronous = {self.pragmas['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = {int(self.pragmas['cache_size'])}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.pragmas['mmap_size'])}")
+        conn.execute(f"PRAGMA temp_store = {self.pragmas['temp_store']}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.pragmas['busy_timeout'])}")
+        conn.set_trace_callback(self._trace_callback)
+        register_functions(conn)
+
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """
+        Return the connection owned by the calling thread.
+
+        The connection is created on first use and reused afterwards.
+
+        Returns:
+            sqlite3.Connection: The calling thread's connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            logger.debug("Opening database connection for thread %s", threading.current_thread().name)
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Acquire the writer connection for a transaction.
+
+        Commits when the outermost block exits cleanly and rolls back on
+        error. Nested blocks on the same thread join the outer transaction.
+
+        Yields:
+            sqlite3.Connection: The writer connection.
+        """
+        with self._write_lock:
+            self._write_depth += 1
+            try:
+                yield self._writer
+                if self._write_depth == 1:
+                    self._writer.commit()
+            except BaseException:
+                if self._write_depth == 1:
+                    self._writer.rollback()
+                raise
+            finally:
+                self._write_depth -= 1
+
+    def set_trace_callback(self, callback) -> None:
+        """
+        Install a statement trace callback on every pooled connection.
+
+        Applies to open connections and to those opened later. The callback
+        runs on the thread executing the statement.
+
+        Args:
+            callback (Callable[[str], None] | None): Receives each SQL
+                statement, or None to remove tracing.
+
+        Returns:
+            None
+        """
+        self._trace_callback = callback
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.set_trace_callback(callback)
+
+    def connection_count(self) -> int:
+        """
+        Return the number of open connections.
+
+        Returns:
+            int: Open reader connections plus the writer.
+        """
+        with self._connections_lock:
+            return len(self._connections)
+
+    def close(self) -> None:
+        """
+        Close every connection opened by the pool.
+
+        Returns:
+            None
+        """
+        if self._closed:
+            return
+
+        with self._write_lock, self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.warning("Failed to close database connection: %s", e)
+            self._connections.clear()
+            self._local = threading.local()
+            self._closed = True
@@ -1,11 +1,15 @@
 import os
 import platform
 import logging
-import yaml
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+from . import yaml_codec
+from .snippet_archive import ARCHIVE_SUFFIX, ArchiveError, read_manifest, write_archive
+from .yaml_stream import write_yaml_snippets
+
 logger = logging.getLogger(__name__)
 
 
@@ -99,7 +103,7 @@ class FileUtils:
 
         try:
             with path.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml_codec.load(f) or {}
             logger.debug("YAML file loaded successfully: %s", path)
             return data
         except Exception as e:
@@ -125,16 +129,41 @@ class FileUtils:
             Exception: If writing to the file fails.
         """
         logger.debug("Writing YAML file: %s", path)
-        temp_path = path.with_suffix(path.suffix + ".tmp")
         try:
-            with temp_path.open("w", encoding="utf-8") as f:
-                yaml.safe_dump(data, f)
-            temp_path.replace(path)
+            with FileUtils.atomic_write(path) as f:
+                yaml_codec.dump(data, f)
             logger.info("YAML file written successfully: %s", path)
         except Exception as e:
             logging.error(f"Failed to write YAML file {path}: {e}")
             raise
 
+    @staticmethod
+    @contextmanager
+    def atomic_write(path: Path, mode: str = "w"):
+        """
+        Open a temporary file that replaces path once the block succeeds.
+
+        The temporary file sits next to the target, so the final replace
+        is atomic. If the block raises, the temporary file is removed and
+        the target is left untouched.
+
+        Args:
+            path (Path): The destination file path.
+            mode (str): "w" for UTF-8 text or "wb" for binary.
+
+        Yields:
+            TextIO | BinaryIO: The temporary file, opened for writing.
+        """
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        encoding = None if "b" in mode else "utf-8"
+        try:
+            with temp_path.open(mode, encoding=encoding) as f:
+                yield f
+            temp_path.replace(path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
     @staticmethod
     def export_snippets_yaml(path: Path, snippets: list[dict]) -> None:
         """
@@ -152,13 +181,73 @@ class FileUtils:
         """
         logger.debug("Exporting %d snippets to %s", len(snippets), path)
         try:
-            data = {"snippets": snippets}
+            # Rows may be SnippetRecord mappings, which YAML cannot represent
+            data = {"snippets": [dict(s) for s in snippets]}
             FileUtils.write_yaml(path, data)
             logger.info("Exported %d snippets to %s", len(snippets), path)
         except Exception as e:
             logging.error(f"Failed to export snippets to YAML: {e}")
             raise
 
+    @staticmethod
+    def export_snippets_yaml_stream(path: Path, snippets, total: int | None = None, progress=None) -> int:
+        """
+        Export snippets to a YAML file without materialising the list.
+
+        Writes the same format as export_snippets_yaml, chunk by chunk,
+        into the temporary file of an atomic write, so the target only
+        changes once every snippet has been written.
+
+        Args:
+            path (Path): The destination file path.
+            snippets (Iterable[Mapping]): Snippets in export order.
+            total (int | None): Number of snippets, for progress only.
+            progress (Callable[[int, int], bool] | None): Called after each
+                chunk with snippets written and total. Returning False
+                cancels the export and leaves path untouched.
+
+        Returns:
+            int: The number of snippets exported.
+
+        Raises:
+            StreamCancelled: If the export was cancelled.
+            Exception: If exporting fails.
+        """
+        logger.debug("Streaming snippets to %s", path)
+        with FileUtils.atomic_write(path) as f:
+            count = write_yaml_snippets(f, snippets, total=total, progress=progress)
+        logger.info("Exported %d snippets to %s", count, path)
+        return count
+
+    @staticmethod
+    def export_snippets_archive(path: Path, snippets, total: int | None = None, progress=None) -> int:
+        """
+        Export snippets to a .qsnip archive.
+
+        Streams the snippets into the temporary file of an atomic write,
+        so the target only changes once every snippet has been written.
+
+        Args:
+            path (Path): The destination archive path.
+            snippets (Iterable[Mapping]): Snippets in export order.
+            total (int | None): Number of snippets, for progress only.
+            progress (Callable[[int, int], bool] | None): Called after each
+                archive member with snippets written and total. Returning
+                False cancels the export and leaves path untouched.
+
+        Returns:
+            int: The number of snippets exported.
+
+        Raises:
+            StreamCancelled: If the export was cancelled.
+            Exception: If exporting fails.
+        """
+        logger.debug("Streaming snippets to archive %s", path)
+        with FileUtils.atomic_write(path, "wb") as f:
+            count = write_archive(f, snippets, total=total, progress=progress)
+        logger.info("Exported %d snippets to %s", count, path)
+        return count
+
     @staticmethod
     def import_snippets_yaml(path: Path) -> list[dict]:
         """
@@ -189,109 +278,310 @@ class FileUtils:
             raise
 
     @staticmethod
-    def import_snippets_with_dialog(parent, db) -> int:
+    def import_snippets_with_dialog(parent, db, worker=None, on_finished=None, archive: bool = False) -> int:
         """
-        Prompt the user to import snippets from a YAML file.
+        Prompt the user to import snippets from a YAML file or archive.
+
+        Opens a file dialog to select a YAML file, asks how snippets whose
+        text already exists should be handled, then validates the file and
+        previews what it would insert, update, conflict with or leave
+        unchanged. The entries in the categories the user accepts are
+        streamed into the database behind a cancellable progress dialog
+        and a summary of imported and updated entries is displayed. For a
+        .qsnip archive the user may also pick a single folder or tag to
+        import.
 
-        Opens a file dialog to select a YAML file, imports snippets into the
-        database, and displays a summary of imported and updated entries.
+        With a worker the import runs on its write thread and this returns
+        immediately; on_finished receives the counts once it is done.
+        Without one the import runs here, keeping the dialog responsive by
+        processing events between batches.
 
         Args:
             parent (Any): The parent widget for dialog windows.
             db (Any): The database instance used to insert snippets.
+            worker (DbWorker | None): Runs the import off the GUI thread.
+            on_finished (Callable[[dict | None], None] | None): Called with
+                the import counts, or None if the import failed.
+            archive (bool): Import a .qsnip archive instead of YAML.
 
         Returns:
-            int: The total number of snippets imported or updated.
+            int: The total number of snippets imported or updated, or 0
+                when the import was handed to the worker.
 
         Raises:
             Exception: If importing snippets fails.
         """
-        from PySide6.QtWidgets import QFileDialog, QMessageBox
+        from PySide6.QtCore import Qt, QCoreApplication
+        from PySide6.QtWidgets import QDialog, QFileDialog, QMessageBox, QInputDialog, QProgressDialog
+        from ui.db_worker import ProgressRelay
+        from ui.widgets.import_preview_dialog import ImportPreviewDialog
 
         logger.debug("Opening import snippets dialog")
 
+        if archive:
+            caption, file_filter = "Import Snippets from Archive", f"QSnippet Archives (*{ARCHIVE_SUFFIX})"
+        else:
+            caption, file_filter = "Import Snippets from YAML", "YAML Files (*.yaml *.yml)"
+
         path, _ = QFileDialog.getOpenFileName(
             parent,
-            "Import Snippets from YAML",
+            caption,
             str(Path.home()),
-            "YAML Files (*.yaml *.yml)"
+            file_filter
         )
         if not path:
             logger.debug("Import cancelled by user")
             return 0
 
-        snippets = FileUtils.import_snippets_yaml(Path(path))
-        new_count = 0
-        updated_count = 0
+        choices = {
+            "Import everything": "keep",
+            "Skip snippets whose text already exists": "skip",
+            "Merge tags into the existing snippet": "merge",
+        }
+        choice, ok = QInputDialog.getItem(
+            parent,
+            "Duplicate Snippets",
+            "When an imported snippet has the same text as an existing one:",
+            list(choices),
+            0,
+            False,
+        )
+        if not ok:
+            logger.debug("Import cancelled by user")
+            return 0
+
+        duplicates = choices[choice]
+
+        if archive:
+            try:
+                manifest = read_manifest(Path(path))
+            except ArchiveError as e:
+                logger.error(f"Failed to open archive: {e}")
+                QMessageBox.critical(parent, "Import Failed", "The selected file is not a valid QSnippet archive.")
+                return 0
+
+            # Offer every folder and tag the manifest lists as a partial import
+            scopes = {"All snippets": {}}
+            for chunk in manifest["chunks"]:
+                for folder in chunk["folders"]:
+                    scopes.setdefault(f"Folder: {folder or '(none)'}", {"folders": [folder]})
+            for chunk in manifest["chunks"]:
+                for tag in chunk["tags"]:
+                    scopes.setdefault(f"Tag: {tag}", {"tags": [tag]})
+
+            scope, ok = QInputDialog.getItem(
+                parent,
+                "Import Scope",
+                f"The archive holds {manifest['count']} snippets. Import:",
+                list(scopes),
+                0,
+                False,
+            )
+            if not ok:
+                logger.debug("Import cancelled by user")
+                return 0
+
+            scope = scopes[scope]
+            validate = lambda target, progress: target.validate_archive(Path(path), progress=progress, **scope)
+            preview = lambda target, progress, validation: target.preview_archive(
+                Path(path), validation=validation, progress=progress, **scope
+            )
+            run = lambda target, progress, validation, indices: target.import_from_archive(
+                Path(path), duplicates, progress=progress, validation=validation, indices=indices, **scope
+            )
+        else:
+            validate = lambda target, progress: target.validate_yaml(Path(path), progress=progress)
+            preview = lambda target, progress, validation: target.preview_yaml(
+                Path(path), validation=validation, progress=progress
+            )
+            run = lambda target, progress, validation, indices: target.import_from_yaml(
+                Path(path), duplicates, progress=progress, validation=validation, indices=indices
+            )
 
-        for entry in snippets:
-            is_new = db.insert_snippet(entry)
-            if is_new:
-                new_count += 1
+        def check(target, progress):
+            """Validate the file, then diff the valid entries against the database."""
+            validation = validate(target, progress)
+            if validation is None or validation["cancelled"]:
+                return validation, None
+            return validation, preview(target, progress, validation)
+
+        # Progress is reported in bytes or records read, scaled to the bar's range
+        dialog = QProgressDialog("Checking snippets...", "Cancel", 0, 1000, parent)
+        dialog.setWindowTitle("Import Snippets")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+        relay = ProgressRelay(dialog)
+        relay.progress.connect(lambda done, total: dialog.setValue(int(done * 1000 / total) if total else 1000))
+        dialog.canceled.connect(relay.cancel)
+
+        def finish(counts):
+            dialog.reset()
+            dialog.deleteLater()
+            if counts is None:
+                QMessageBox.critical(parent, "Import Failed", "The snippets could not be imported. See the logs for details.")
             else:
-                updated_count += 1
+                logger.info(
+                    "Snippet import complete: %d new, %d updated, %d skipped, %d merged",
+                    counts["new"],
+                    counts["updated"],
+                    counts["skipped"],
+                    counts["merged"],
+                )
+                title = "Import Cancelled" if counts["cancelled"] else "Import Complete"
+                message = f"Imported {counts['new']} new snippets.\nUpdated {counts['updated']} existing snippets."
+                if counts["skipped"] or counts["merged"]:
+                    message += f"\nSkipped {counts['skipped']} and merged {counts['merged']} duplicates."
+                if counts.get("invalid"):
+                    message += f"\nLeft out {counts['invalid']} entries that failed validation."
+                QMessageBox.information(parent, title, message)
+            if on_finished is not None:
+                on_finished(counts)
+            return counts
+
+        def cancelled():
+            return finish({"new": 0, "updated": 0, "skipped": 0, "merged": 0, "failed": 0, "cancelled": 1})
+
+        def review(result):
+            validation, changes = result
+            if validation is None or (changes is None and not validation["cancelled"]):
+                return finish(None)
+            if validation["cancelled"] or changes["cancelled"]:
+                logger.info("Import stopped while checking the file")
+                return cancelled()
+
+            dialog.reset()
+            chooser = ImportPreviewDialog(changes, validation, parent)
+            if chooser.exec() != QDialog.Accepted or not chooser.selected_categories():
+                logger.info("Import stopped at the preview")
+                return cancelled()
+            indices = chooser.selected_indices()
+
+            dialog.setLabelText("Importing snippets...")
+            if worker is not None:
+                worker.submit(
+                    lambda worker_db: run(worker_db, relay.report, validation, indices),
+                    key="import",
+                    write=True,
+                    on_result=finish,
+                    on_error=lambda e: finish(None),
+                )
+                return None
+            return finish(run(db, report, validation, indices))
+
+        if worker is not None:
+            worker.submit(
+                lambda worker_db: check(worker_db, relay.report),
+                key="import",
+                on_result=review,
+                on_error=lambda e: finish(None),
+            )
+            return 0
 
-        logger.info(
-            "Snippet import complete: %d new, %d updated",
-            new_count,
-            updated_count,
-        )
+        def report(done, total):
+            keep_going = relay.report(done, total)
+            QCoreApplication.processEvents()
+            return keep_going and not relay.is_cancelled()
 
-        QMessageBox.information(
-            parent,
-            "Import Complete",
-            f"Imported {new_count} new snippets.\nUpdated {updated_count} existing snippets."
-        )
-        return new_count + updated_count
+        counts = review(check(db, report))
+        return counts["new"] + counts["updated"] if counts else 0
 
 
     @staticmethod
-    def export_snippets_with_dialog(parent, db) -> int:
+    def export_snippets_with_dialog(parent, db, worker=None, on_finished=None, archive: bool = False) -> int:
         """
-        Prompt the user to export snippets to a YAML file.
+        Prompt the user to export snippets to a YAML file or archive.
+
+        Opens a save file dialog, streams every snippet from the database
+        into a YAML file or .qsnip archive behind a cancellable progress
+        dialog, and displays a completion message.
 
-        Opens a save file dialog, retrieves all snippets from the database,
-        writes them to a YAML file, and displays a completion message.
+        With a worker the export runs on one of its threads and this
+        returns immediately; on_finished receives the result once done.
 
         Args:
             parent (Any): The parent widget for dialog windows.
             db (Any): The database instance used to retrieve snippets.
+            worker (DbWorker | None): Runs the export off the GUI thread.
+            on_finished (Callable[[dict | None], None] | None): Called with
+                the export result, or None if the export failed.
+            archive (bool): Export a .qsnip archive instead of YAML.
 
         Returns:
-            int: The number of snippets exported.
+            int: The number of snippets exported, or 0 when the export
+                was handed to the worker.
 
         Raises:
             Exception: If exporting snippets fails.
         """
-        from PySide6.QtWidgets import QFileDialog, QMessageBox
+        from PySide6.QtCore import Qt, QCoreApplication
+        from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+        from ui.db_worker import ProgressRelay
 
         date = datetime.now().date()
-        default_name = f"qsnippets-export-{date}.yaml"
+        if archive:
+            default_name = f"qsnippets-export-{date}{ARCHIVE_SUFFIX}"
+            caption, file_filter = "Export Snippets to Archive", f"QSnippet Archives (*{ARCHIVE_SUFFIX})"
+        else:
+            default_name = f"qsnippets-export-{date}.yaml"
+            caption, file_filter = "Export Snippets to YAML", "YAML Files (*.yaml *.yml)"
 
         logger.debug("Opening export snippets dialog")
 
         path, _ = QFileDialog.getSaveFileName(
             parent,
-            "Export Snippets to YAML",
+            caption,
             str(Path.home() / default_name),
-            "YAML Files (*.yaml *.yml)",
+            file_filter,
         )
 
         if not path:
             logger.debug("Export cancelled by user")
             return 0
 
-        snippets = db.get_all_snippets()
-        FileUtils.export_snippets_yaml(Path(path), snippets)
+        export = "export_to_archive" if archive else "export_to_yaml"
+
+        dialog = QProgressDialog("Exporting snippets...", "Cancel", 0, 1000, parent)
+        dialog.setWindowTitle("Export Snippets")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+        relay = ProgressRelay(dialog)
+        relay.progress.connect(lambda done, total: dialog.setValue(int(done * 1000 / total) if total else 1000))
+        dialog.canceled.connect(relay.cancel)
+
+        def finish(result):
+            dialog.reset()
+            dialog.deleteLater()
+            if result is None:
+                QMessageBox.critical(parent, "Export Failed", "The snippets could not be exported. See the logs for details.")
+            elif result["cancelled"]:
+                logger.info("Snippet export cancelled")
+            else:
+                QMessageBox.information(
+                    parent,
+                    "Export Complete",
+                    f"Exported {result['exported']} snippets.",
+                )
+                logger.info("Snippet export completed: %s", path)
+            if on_finished is not None:
+                on_finished(result)
+            return result
+
+        if worker is not None:
+            worker.submit(
+                lambda worker_db: getattr(worker_db, export)(Path(path), progress=relay.report),
+                key="export",
+                on_result=finish,
+                on_error=lambda e: finish(None),
+            )
+            return 0
 
-        QMessageBox.information(
-            parent,
-            "Export Complete",
-            f"Exported {len(snippets)} snippets.",
-        )
+        def report(done, total):
+            keep_going = relay.report(done, total)
+            QCoreApplication.processEvents()
+            return keep_going and not relay.is_cancelled()
 
-        logger.info("Snippet export completed: %s", path)
-        return len(snippets)
+        result = finish(getattr(db, export)(Path(path), progress=report))
+        return result["exported"] if result else 0
 
     @staticmethod
     def file_exists(path: Path) -> bool:
@@ -536,7 +826,7 @@ class FileUtils:
         db.create_table()
 
     @staticmethod
-    def load_and_merge_yaml(default_path: Path, user_path: Path) -> dict:
+    def load_and_merge_yaml(default_path: Path, user_path: Path, cache=None) -> dict:
         """
         Load default and user YAML files and merge them.
 
@@ -544,13 +834,23 @@ class FileUtils:
         added to the user configuration. The merged result is written back
         to the user file if changes are detected.
 
+        Given a ConfigCache, the merged result is reused while neither
+        file has changed, so no YAML is parsed and nothing is written.
+
         Args:
             default_path (Path): Path to the default YAML file.
             user_path (Path): Path to the user YAML file.
+            cache (ConfigCache | None): Optional parsed-config cache.
 
         Returns:
             dict: The merged configuration dictionary.
         """
+        key = f"merged:{os.path.abspath(user_path)}"
+        if cache is not None:
+            merged = cache.get(key, [default_path, user_path])
+            if merged is not None:
+                return merged
+
         logger.debug("Loading default YAML: %s", default_path)
         default_data = FileUtils.read_yaml(default_path)
 
@@ -571,4 +871,6 @@ class FileUtils:
         else:
             logger.debug("User YAML already up to date: %s", user_path)
 
+        if cache is not None:
+            cache.put(key, [default_path, user_path], merged)
         return merged
\ No newline at end of file
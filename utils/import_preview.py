@@ -0,0 +1,146 @@
+import logging
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from .body_codec import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Outcome of importing an entry, in the order the preview dialog lists them
+PREVIEW_CATEGORIES = ("insert", "update", "conflict", "unchanged")
+
+# Entries listed per category in a preview; counts and indices cover all
+PREVIEW_SAMPLE_SIZE = 200
+
+# Progress is reported every this many entries
+PREVIEW_PROGRESS_EVERY = 1000
+
+# Fields compared besides the body to decide whether an entry changes anything
+COMPARED_FIELDS = ("label", "folder", "tags", "enabled", "paste_style", "return_press")
+
+# The same fields selected from the snippets table in the shape
+# compared_values returns. Flags come back as 0 or 1, which compare equal
+# to False and True.
+COMPARED_SQL = "label, folder, tags, COALESCE(enabled, 0) != 0, paste_style, COALESCE(return_press, 0) != 0"
+
+# One existing snippet: (id, content hash, compared field values)
+ExistingRow = Tuple[int, str, Tuple[Any, ...]]
+
+
+def compared_values(entry: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Return the fields of an entry or row that a preview compares.
+
+    Flags are compared as bools, since SQLite stores them as integers.
+
+    Args:
+        entry (Dict[str, Any]): An import entry or database row.
+
+    Returns:
+        Tuple[Any, ...]: Values in COMPARED_FIELDS order.
+    """
+    get = entry.get
+    return (
+        get("label"),
+        get("folder"),
+        get("tags"),
+        bool(get("enabled")),
+        get("paste_style"),
+        bool(get("return_press")),
+    )
+
+
+def diff_entries(
+    entries: Iterable[Any],
+    existing: Dict[str, ExistingRow],
+    existing_ids: Dict[int, str],
+    existing_hashes: Dict[str, str],
+    skip: Iterable[int] = (),
+    progress: Callable[[int], Any] | None = None,
+) -> Dict[str, Any]:
+    """
+    Classify what importing each entry would do, without touching the database.
+
+    Every lookup is a dict or set probe against a snapshot of the
+    database, so the diff is linear in the size of the file:
+
+    - insert: the trigger is not in the database.
+    - update: the trigger exists and its body or settings differ.
+    - unchanged: the trigger exists with the same body and settings.
+    - conflict: importing would clobber something else. The entry's id
+      belongs to a snippet with another trigger, its trigger already
+      appeared earlier in the file, or its body already exists under a
+      different trigger.
+
+    Bodies are compared by content_hash, so edits that only change
+    whitespace or Unicode normalisation count as unchanged.
+
+    Args:
+        entries (Iterable[Any]): Entries in import order.
+        existing (Dict[str, ExistingRow]): Snapshot keyed by trigger.
+        existing_ids (Dict[int, str]): Trigger of every existing id.
+        existing_hashes (Dict[str, str]): A trigger for every existing hash.
+        skip (Iterable[int]): Indices to leave out, such as entries
+            rejected by validation. They are counted as "invalid".
+        progress (Callable[[int], Any] | None): Called every
+            PREVIEW_PROGRESS_EVERY entries. Returning False cancels.
+
+    Returns:
+        Dict[str, Any]: "total", "cancelled", "invalid", "counts" and
+            "indices" (per category) and "samples" (per category, at most
+            PREVIEW_SAMPLE_SIZE dicts with "index", "trigger", "label"
+            and "reason").
+    """
+    skip = set(skip)
+    preview: Dict[str, Any] = {
+        "total": 0,
+        "cancelled": 0,
+        "invalid": 0,
+        "counts": {c: 0 for c in PREVIEW_CATEGORIES},
+        "indices": {c: [] for c in PREVIEW_CATEGORIES},
+        "samples": {c: [] for c in PREVIEW_CATEGORIES},
+    }
+    seen: Dict[str, int] = {}
+
+    for index, entry in enumerate(entries):
+        preview["total"] += 1
+        if progress is not None and index % PREVIEW_PROGRESS_EVERY == 0 and index and progress(index) is False:
+            preview["cancelled"] = 1
+            break
+        if index in skip or not isinstance(entry, dict):
+            preview["invalid"] += 1
+            continue
+
+        trigger = entry.get("trigger")
+        digest = content_hash(entry.get("snippet"))
+        current = existing.get(trigger)
+        owner = existing_ids.get(entry.get("id"))
+        reason = ""
+
+        if trigger in seen:
+            category, reason = "conflict", f"trigger repeats entry {seen[trigger]}"
+        elif owner is not None and owner != trigger:
+            category, reason = "conflict", f"id {entry['id']} belongs to {owner}"
+        elif current is None:
+            duplicate = existing_hashes.get(digest)
+            if duplicate is not None:
+                category, reason = "conflict", f"same text as {duplicate}"
+            else:
+                category = "insert"
+        elif current[1] == digest and current[2] == compared_values(entry):
+            category = "unchanged"
+        else:
+            category = "update"
+            changed = [f for f, old, new in zip(COMPARED_FIELDS, current[2], compared_values(entry)) if old != new]
+            if current[1] != digest:
+                changed.insert(0, "snippet")
+            reason = "changes " + ", ".join(changed)
+
+        seen.setdefault(trigger, index)
+        preview["counts"][category] += 1
+        preview["indices"][category].append(index)
+        samples = preview["samples"][category]
+        if len(samples) < PREVIEW_SAMPLE_SIZE:
+            samples.append({"index": index, "trigger": trigger, "label": entry.get("label"), "reason": reason})
+
+    logger.info("Import preview of %d entries: %s", preview["total"], preview["counts"])
+    return preview
@@ -0,0 +1,474 @@
+import logging
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, count, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Entries sent to a worker process at a time
+VALIDATION_CHUNK_SIZE = 5000
+
+# Entries validated in-process before worker processes are started. Each
+# spawned worker re-imports the app's modules, which only pays off for
+# very large streams, so typical imports never start a pool.
+PARALLEL_MIN_ENTRIES = 50_000
+
+# Upper bound on the default worker count, leaving a core for the GUI
+MAX_DEFAULT_WORKERS = 4
+
+# Issues kept in a report per level; the counts always cover every issue.
+MAX_REPORTED_ISSUES = 1000
+
+# SnippetExpander stops expanding nested snippets beyond this depth
+MAX_NESTING_DEPTH = 5
+
+# Same rules the snippet form documents: a leading special character,
+# up to 255 more characters and no whitespace.
+TRIGGER_PATTERN = re.compile(r"^[^\w\s]\S{1,255}$")
+
+# Nested snippet references, matched exactly as SnippetExpander does
+NESTED_PATTERN = re.compile(r"\{\W(.+?)\}")
+
+PASTE_STYLES = {
+    "clipboard": "Clipboard",
+    "keystroke": "Keystroke",
+    "keystrokes": "Keystroke",
+    "typing": "Keystroke",
+}
+
+_TRUE_VALUES = {"true", "yes", "on", "1"}
+_FALSE_VALUES = {"false", "no", "off", "0", ""}
+
+# Issue tuples are (level, message); level is "error" or "warning"
+Issue = Tuple[str, str]
+
+# Per-entry result from a worker: (index, trigger, valid, references, issues)
+EntryResult = Tuple[int, Any, bool, Tuple[str, ...], List[Issue]]
+
+
+def nested_references(text: str) -> List[str]:
+    """
+    Return the triggers a snippet body embeds, in order of appearance.
+
+    Args:
+        text (str): The snippet body.
+
+    Returns:
+        List[str]: Referenced triggers such as "/sig" for "{/sig}".
+    """
+    return [m.group(0)[1:-1] for m in NESTED_PATTERN.finditer(text)]
+
+
+def _to_bool(value: Any, default: bool) -> bool | None:
+    """
+    Coerce YAML and JSON spellings of a flag to a bool.
+
+    Args:
+        value (Any): The raw value.
+        default (bool): Used when the value is missing.
+
+    Returns:
+        bool | None: The flag, or None if the value is not recognised.
+    """
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return False
+    return None
+
+
+def normalise_entry(entry: Any) -> Tuple[Dict[str, Any] | None, List[Issue]]:
+    """
+    Validate one imported entry and bring it into the form the editor saves.
+
+    Triggers, labels and folders are trimmed, tags are lowercased and
+    de-duplicated, flags become bools and paste styles are mapped to
+    "Clipboard" or "Keystroke". Unknown keys are dropped.
+
+    Args:
+        entry (Any): A raw entry from an import file.
+
+    Returns:
+        Tuple[Dict[str, Any] | None, List[Issue]]: The normalised entry,
+            or None if it has errors, and every issue found.
+    """
+    if not isinstance(entry, dict):
+        return None, [("error", "entry is not a mapping")]
+
+    issues: List[Issue] = []
+    result: Dict[str, Any] = {}
+
+    trigger = entry.get("trigger")
+    trigger = trigger.strip() if isinstance(trigger, str) else ""
+    if not trigger:
+        issues.append(("error", "trigger is required"))
+    elif not TRIGGER_PATTERN.match(trigger):
+        issues.append(("error", f"trigger {trigger!r} must start with a special character, "
+                                "be 2-256 characters long and contain no whitespace"))
+    result["trigger"] = trigger
+
+    snippet = entry.get("snippet")
+    if isinstance(snippet, (int, float)) and not isinstance(snippet, bool):
+        issues.append(("warning", "snippet was a number and has been converted to text"))
+        snippet = str(snippet)
+    if not isinstance(snippet, str) or not snippet:
+        issues.append(("error", "snippet text is required"))
+    result["snippet"] = snippet
+
+    label = entry.get("label")
+    label = str(label).strip() if label is not None else ""
+    if not label:
+        issues.append(("warning", "label is missing; using the trigger"))
+        label = trigger
+    result["label"] = label
+
+    folder = entry.get("folder")
+    result["folder"] = (str(folder).strip() if folder is not None else "") or "Default"
+
+    tags = entry.get("tags")
+    if tags is None:
+        raw_tags = []
+    elif isinstance(tags, (list, tuple)):
+        raw_tags = [str(t) for t in tags]
+    else:
+        raw_tags = str(tags).split(",")
+    result["tags"] = ",".join(dict.fromkeys(t.strip().lower() for t in raw_tags if t.strip()))
+
+    for key, default in (("enabled", True), ("return_press", False)):
+        value = _to_bool(entry.get(key), default)
+        if value is None:
+            issues.append(("error", f"{key} must be true or false, not {entry.get(key)!r}"))
+        result[key] = value
+
+    style = entry.get("paste_style")
+    if style is None or (isinstance(style, str) and not style.strip()):
+        result["paste_style"] = "Clipboard"
+    elif isinstance(style, str) and style.strip().lower() in PASTE_STYLES:
+        result["paste_style"] = PASTE_STYLES[style.strip().lower()]
+    else:
+        issues.append(("error", f"paste_style must be Clipboard or Keystroke, not {style!r}"))
+
+    entry_id = entry.get("id")
+    if isinstance(entry_id, int) and not isinstance(entry_id, bool) and entry_id > 0:
+        result["id"] = entry_id
+    elif entry_id is not None:
+        issues.append(("warning", f"ignoring invalid id {entry_id!r}"))
+
+    if any(level == "error" for level, _ in issues):
+        return None, issues
+    return result, issues
+
+
+def _iter_chunks(entries: Iterable[Any], chunk_size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """
+    Split a stream of entries into numbered chunks.
+
+    Args:
+        entries (Iterable[Any]): The entries.
+        chunk_size (int): Entries per chunk.
+
+    Yields:
+        Tuple[int, List[Any]]: Index of the first entry and the chunk.
+    """
+    iterator = iter(entries)
+    for start in count(0, chunk_size):
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+
+
+def _validate_chunk(chunk: Tuple[int, List[Any]]) -> List[EntryResult]:
+    """
+    Validate a chunk of entries. Runs in a worker process.
+
+    Args:
+        chunk (Tuple[int, List[Any]]): Index of the first entry and the entries.
+
+    Returns:
+        List[EntryResult]: Index, trigger, validity, referenced triggers
+            and issues of every entry.
+    """
+    start, entries = chunk
+    results = []
+    for offset, entry in enumerate(entries):
+        normalised, issues = normalise_entry(entry)
+        if normalised is None:
+            trigger = entry.get("trigger") if isinstance(entry, dict) else None
+            results.append((start + offset, trigger, False, (), issues))
+        else:
+            refs = tuple(dict.fromkeys(nested_references(normalised["snippet"])))
+            results.append((start + offset, normalised["trigger"], True, refs, issues))
+    return results
+
+
+def _find_cycles(graph: Dict[str, Tuple[str, ...]]) -> List[List[str]]:
+    """
+    Find every group of snippets that reference each other in a loop.
+
+    Iterative Tarjan's algorithm, so deep reference chains cannot hit
+    the recursion limit.
+
+    Args:
+        graph (Dict[str, Tuple[str, ...]]): Trigger to referenced triggers.
+
+    Returns:
+        List[List[str]]: Strongly connected groups that form a cycle,
+            including snippets that reference themselves.
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    cycles = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in graph:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, ()))))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == node:
+                            break
+                    if len(group) > 1 or node in graph.get(node, ()):
+                        cycles.append(group[::-1])
+    return cycles
+
+
+def _nesting_depths(graph: Dict[str, Tuple[str, ...]], skip: set) -> Dict[str, int]:
+    """
+    Compute how many levels of nested snippets each trigger expands to.
+
+    Args:
+        graph (Dict[str, Tuple[str, ...]]): Trigger to referenced triggers.
+        skip (set): Triggers on a cycle, which are treated as leaves.
+
+    Returns:
+        Dict[str, int]: Depth per trigger; 0 for snippets without references.
+    """
+    depths: Dict[str, int] = {}
+    for root in graph:
+        if root in depths:
+            continue
+        work = [root]
+        while work:
+            node = work[-1]
+            if node in skip:
+                depths[node] = 0
+                work.pop()
+                continue
+            # References outside the graph are leaves at depth 0
+            nested = [c for c in graph.get(node, ()) if c in graph and c not in skip]
+            pending = [c for c in nested if c not in depths]
+            if pending:
+                work.extend(pending)
+                continue
+            work.pop()
+            if node not in depths:
+                depths[node] = 1 + max((depths[c] for c in nested), default=0)
+    return depths
+
+
+def default_workers() -> int:
+    """
+    Return the number of worker processes used when none is given.
+
+    Returns:
+        int: One less than the CPU count, between 1 and MAX_DEFAULT_WORKERS.
+    """
+    return max(1, min(MAX_DEFAULT_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def validate_entries(
+    entries: Iterable[Any],
+    resolve: Callable[[List[str]], Dict[str, str]] | None = None,
+    workers: int | None = None,
+    chunk_size: int = VALIDATION_CHUNK_SIZE,
+    progress: Callable[[int], Any] | None = None,
+    parallel_threshold: int = PARALLEL_MIN_ENTRIES,
+) -> Dict[str, Any]:
+    """
+    Validate and normalise a stream of import entries without writing them.
+
+    Entries are checked in chunks across a process pool (see
+    normalise_entry), then the parent checks triggers are unique within
+    the stream and resolves nested snippet references against the
+    stream and, through resolve, the database. References that form a
+    loop are errors; unknown references and nesting deeper than the
+    expander follows are warnings.
+
+    The first parallel_threshold entries are validated in-process; only
+    the rest of a larger stream goes to workers. They are started with
+    the spawn method, which behaves the same on every platform and never
+    forks a process running Qt threads. At most two chunks per worker
+    are in flight, so memory stays bounded.
+
+    Args:
+        entries (Iterable[Any]): Raw entries in import order.
+        resolve (Callable[[List[str]], Dict[str, str]] | None): Returns
+            the bodies of existing snippets for the given triggers.
+        workers (int | None): Worker processes; defaults to
+            default_workers(). 1 validates in-process.
+        chunk_size (int): Entries per worker task.
+        progress (Callable[[int], Any] | None): Called after every chunk
+            with entries validated. Returning False cancels.
+        parallel_threshold (int): Entries validated in-process before
+            the remainder is handed to worker processes.
+
+    Returns:
+        Dict[str, Any]: "total", "valid", "cancelled", "error_count",
+            "warning_count", "errors" and "warnings" (at most
+            MAX_REPORTED_ISSUES dicts with "index", "trigger" and
+            "message") and "rejected" (sorted indices of entries that
+            must not be imported).
+    """
+    workers = workers or default_workers()
+    report: Dict[str, Any] = {
+        "total": 0,
+        "valid": 0,
+        "cancelled": 0,
+        "error_count": 0,
+        "warning_count": 0,
+        "errors": [],
+        "warnings": [],
+        "rejected": [],
+    }
+    rejected = set()
+    first_seen: Dict[str, int] = {}
+    graph: Dict[str, Tuple[str, ...]] = {}
+
+    def add_issue(level, index, trigger, message):
+        report[f"{level}_count"] += 1
+        issues = report[f"{level}s"]
+        if len(issues) < MAX_REPORTED_ISSUES:
+            issues.append({"index": index, "trigger": trigger, "message": message})
+
+    def collect(results):
+        for index, trigger, valid, refs, issues in results:
+            for level, message in issues:
+                add_issue(level, index, trigger, message)
+            if not valid:
+                rejected.add(index)
+            elif trigger in first_seen:
+                add_issue("error", index, trigger, f"duplicate trigger, first defined by entry {first_seen[trigger]}")
+                rejected.add(index)
+            else:
+                first_seen[trigger] = index
+                if refs:
+                    graph[trigger] = refs
+        report["total"] += len(results)
+        return progress is None or progress(report["total"]) is not False
+
+    chunks = _iter_chunks(entries, chunk_size)
+    for chunk in chunks:
+        if not collect(_validate_chunk(chunk)):
+            report["cancelled"] = 1
+            break
+        if workers > 1 and report["total"] >= parallel_threshold:
+            break
+
+    # Only start workers if there are at least two more chunks to share
+    head = [] if report["cancelled"] else list(islice(chunks, 2))
+    if len(head) == 1:
+        if not collect(_validate_chunk(head[0])):
+            report["cancelled"] = 1
+    elif head:
+        logger.debug("Validating import entries with %d worker processes", workers)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = deque()
+            for chunk in chain(head, chunks):
+                pending.append(pool.submit(_validate_chunk, chunk))
+                if len(pending) >= workers * 2 and not collect(pending.popleft().result()):
+                    report["cancelled"] = 1
+                    break
+            while pending and not report["cancelled"]:
+                if not collect(pending.popleft().result()):
+                    report["cancelled"] = 1
+            for future in pending:
+                future.cancel()
+
+    # Pull in existing snippets the stream references, level by level
+    known = dict(graph)
+    missing = {r for refs in graph.values() for r in refs if r not in first_seen}
+    existing = set()
+    while missing and resolve is not None:
+        bodies = resolve(sorted(missing))
+        existing.update(bodies)
+        missing = set()
+        for trigger, body in bodies.items():
+            refs = tuple(dict.fromkeys(nested_references(body or "")))
+            if refs:
+                known[trigger] = refs
+                missing.update(r for r in refs if r not in first_seen and r not in existing)
+
+    defined = set(first_seen) | existing
+    for trigger, refs in graph.items():
+        for ref in refs:
+            if ref not in defined:
+                add_issue("warning", first_seen[trigger], trigger, f"references unknown snippet {ref!r}")
+
+    # Snippets without references cannot be part of a loop, so the
+    # graph only needs the ones that have some
+    on_cycle = set()
+    for cycle in _find_cycles(known):
+        on_cycle.update(cycle)
+        members = ", ".join(sorted(cycle))
+        for trigger in cycle:
+            if trigger in first_seen:
+                add_issue("error", first_seen[trigger], trigger, f"circular reference between {members}")
+                rejected.add(first_seen[trigger])
+
+    for trigger, depth in _nesting_depths(known, on_cycle).items():
+        if depth > MAX_NESTING_DEPTH and trigger in graph:
+            add_issue("warning", first_seen[trigger], trigger,
+                      f"nests {depth} levels deep; expansion stops after {MAX_NESTING_DEPTH}")
+
+    report["rejected"] = sorted(rejected)
+    report["valid"] = report["total"] - len(rejected)
+    logger.info(
+        "Validated %d import entries: %d valid, %d errors, %d warnings",
+        report["total"], report["valid"], report["error_count"], report["warning_count"],
+    )
+    return report
@@ -4,13 +4,14 @@ import pyperclip
 import re
 import datetime
 from utils.snippet_db import SnippetDB
+from utils.db_libraries import library_rank
 
 logger = logging.getLogger(__name__)
 
 
 
 class SnippetExpander():
-    def __init__(self, snippets_db: SnippetDB, parent) -> None:
+    def __init__(self, snippets_db: SnippetDB, parent, usage_tracker=None) -> None:
         """
         Initialize the SnippetExpander.
 
@@ -21,6 +22,8 @@ class SnippetExpander():
         Args:
             snippets_db (SnippetDB): The snippet database instance.
             parent (Any): The parent object.
+            usage_tracker (UsageTracker | None): Receives one record per
+                expansion, or None to skip usage statistics.
 
         Returns:
             None
@@ -31,17 +34,19 @@ class SnippetExpander():
         logger.info("Initializing SnippetExpander")
 
         self.snippets_db = snippets_db
-        self.snippets = self.snippets_db.get_all_snippets()
         self.parent = parent
+        self.usage_tracker = usage_tracker
 
         self.disabled = False
-        self.trigger_prefixs = self.retrieve_trigger_chars(self.snippets)
+        self.trigger_prefixs = []
         self.keys_to_ignore = [self.keyboard.Key.space, self.keyboard.Key.shift, self.keyboard.Key.enter, self.keyboard.Key.ctrl_l, self.keyboard.Key.ctrl_r]
         self.buffer = ""
         self.cursor_pos = 0  # Cursor position in the buffer
         self.max_trigger_len = 255
         self.trigger_flag = False   # Used to track if we are within a snippet trigger sequence
 
+        self.change_seq = None      # Last change log seq applied to the trigger map
+        self._trigger_by_id = {}
         self.build_trigger_map()
 
         self.listener = self.keyboard.Listener(on_press=self._on_key_press)
@@ -50,59 +55,157 @@ class SnippetExpander():
 
         logger.info("SnippetExpander initialized successfully")
 
-    def build_trigger_map(self) -> None:
+    def build_trigger_map(self, snippets=None) -> None:
         """
-        Build the trigger lookup map and compiled regex.
+        Build the trigger lookup map, prefixes and compiled regex.
 
         Creates a dictionary of enabled snippet triggers mapped to their
         data and compiles a regex pattern to detect trigger matches
-        at the end of the buffer.
+        at the end of the buffer. Snippets are streamed from the database
+        and its attached libraries in a single pass unless an iterable is
+        supplied. When several define a trigger, the main database wins,
+        then libraries in their configured order.
+
+        Args:
+            snippets (Iterable[dict] | None): Snippets to index, or None
+                to stream enabled snippets from the database.
 
         Returns:
             None
         """
         logger.info("Building trigger map")
-    
-        self.trigger_map = {
-            s["trigger"]: s
-            for s in self.snippets
-            if s.get("enabled", True)
-        }
+
+        if snippets is None:
+            # Note the change log position first; changes racing with the
+            # stream are re-applied by the next refresh, which is harmless
+            self.change_seq = self.snippets_db.latest_change_seq()
+            snippets = self.snippets_db.iter_all_snippets(filters={"enabled": True})
+        else:
+            self.change_seq = None
+
+        trigger_map = {}
+        trigger_by_id = {}
+        for s in snippets:
+            if s.get("enabled", True):
+                current = trigger_map.get(s["trigger"])
+                if current is None or library_rank(s["id"]) < library_rank(current["id"]):
+                    trigger_map[s["trigger"]] = s
+                trigger_by_id[s["id"]] = s["trigger"]
+
+        self._install_trigger_map(trigger_map, trigger_by_id)
+
+    def apply_changes(self, changes) -> None:
+        """
+        Update the trigger map from change log entries.
+
+        Only the snippets named in the changes are re-read. A fresh map is
+        built and swapped in so the listener thread never sees a map that
+        is half updated. Triggers the main database gave up fall back to
+        an attached library's definition, if one exists.
+
+        Args:
+            changes (list[dict]): Entries from SnippetDB.changes_since.
+
+        Returns:
+            None
+        """
+        if not changes:
+            return
+
+        logger.info(f"Applying {len(changes)} snippet changes")
+
+        trigger_map = dict(self.trigger_map)
+        trigger_by_id = dict(self._trigger_by_id)
+        touched = {change["snippet_id"] for change in changes}
+        released = set()
+
+        # Drop the old state of every touched snippet, then re-add the
+        # ones that still exist and are enabled
+        for snippet_id in touched:
+            old_trigger = trigger_by_id.pop(snippet_id, None)
+            if old_trigger is not None and trigger_map.get(old_trigger, {}).get("id") == snippet_id:
+                trigger_map.pop(old_trigger)
+                released.add(old_trigger)
+
+        records = self.snippets_db.get_snippets_by_ids(touched)
+        if records is None:
+            # Could not read the rows; fall back to a full rebuild
+            self.build_trigger_map()
+            return
+
+        for record in records:
+            if record["enabled"]:
+                trigger_map[record["trigger"]] = record
+                trigger_by_id[record["id"]] = record["trigger"]
+
+        released.difference_update(trigger_map)
+        for record in self.snippets_db.get_library_snippets(released) or []:
+            if not record["enabled"]:
+                continue
+            current = trigger_map.get(record["trigger"])
+            if current is None or library_rank(record["id"]) < library_rank(current["id"]):
+                trigger_map[record["trigger"]] = record
+            trigger_by_id[record["id"]] = record["trigger"]
+
+        self.change_seq = max(change["seq"] for change in changes)
+        self._install_trigger_map(trigger_map, trigger_by_id)
+
+    def _install_trigger_map(self, trigger_map: dict, trigger_by_id: dict) -> None:
+        """
+        Swap in a new trigger map and rebuild the prefixes and regex.
+
+        Args:
+            trigger_map (dict): Trigger to snippet mapping.
+            trigger_by_id (dict): Snippet id to trigger mapping.
+
+        Returns:
+            None
+        """
         escapes = sorted(
-            (re.escape(t) for t in self.trigger_map),
+            (re.escape(t) for t in trigger_map),
             key=len, reverse=True
         )
         pattern = r'(?:' + '|'.join(escapes) + r')\Z'
+
+        self.trigger_prefixs = self.retrieve_trigger_chars(trigger_map.values())
         self.trigger_regex = re.compile(pattern)
+        self._trigger_by_id = trigger_by_id
+        self.trigger_map = trigger_map
 
         logger.debug(f"Trigger map size: {len(self.trigger_map)}")
         logger.debug(f"Trigger regex: {self.trigger_regex}")
 
     def refresh_snippets(self) -> None:
         """
-        Reload snippets from the database and rebuild trigger handling.
+        Bring the trigger map up to date with the database.
 
-        Refreshes the internal snippet list, trigger map, and trigger
-        prefix characters to reflect database updates.
+        Applies only the logged changes since the last refresh. Falls back
+        to a full rebuild when the change log no longer reaches back that
+        far or the map was built from a caller supplied list.
 
         Returns:
             None
         """
         logger.info("Refreshing snippets from database")
 
-        self.snippets = self.snippets_db.get_all_snippets()
-        self.build_trigger_map()    # Rebuild trigger map
-        # This single line fixes the issue where new snippets don't get recognized until restart
-        # smh...
-        self.trigger_prefixs = self.retrieve_trigger_chars(self.snippets)   # Reload prefixes
-        logging.info("SnippetExpander reloaded snippets from DB.")
+        if self.change_seq is not None and self.snippets_db.change_log_covers(self.change_seq):
+            changes = self.snippets_db.changes_since(self.change_seq)
+            if changes is not None:
+                self.apply_changes(changes)
+                logger.info("SnippetExpander applied snippet changes from DB.")
+                return
+
+        # Rebuilds the trigger map and prefixes together, so new snippets
+        # are recognized without a restart
+        self.build_trigger_map()
+        logger.info("SnippetExpander reloaded snippets from DB.")
 
     def retrieve_trigger_chars(self, snippets) -> list:
         """
         Retrieve unique first characters from enabled snippet triggers.
 
         Args:
-            snippets (list[dict]): List of snippet dictionaries.
+            snippets (Iterable[dict]): Snippet dictionaries.
 
         Returns:
             list: A list of unique trigger prefix characters.
@@ -273,6 +376,10 @@ class SnippetExpander():
             self.expand(trigger, snippet["snippet"], style, return_press)
             self.clear_buffer()
 
+            # In-memory only; the service flushes counts in batches
+            if self.usage_tracker is not None:
+                self.usage_tracker.record(snippet.get("id"))
+
     def expand_clipboard(self, snippet) -> None:
         """
         Expand a snippet using clipboard paste.
@@ -0,0 +1,149 @@
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+# Defaults for SnippetDB's query cache
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_ROWS = 50_000
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache for query results, invalidated by generation.
+
+    Every write to the database bumps the generation counter. Entries
+    remember the generation they were loaded under and are ignored once it
+    moves on, so no write can be followed by a stale read. A result that
+    finishes loading after a concurrent write is returned but not stored.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_rows: int = DEFAULT_MAX_ROWS) -> None:
+        """
+        Initialize the QueryCache.
+
+        Args:
+            max_entries (int): Maximum number of cached results. 0 disables
+                caching entirely.
+            max_rows (int): Results with more rows than this are not cached,
+                which bounds the memory a single large library can pin.
+
+        Returns:
+            None
+        """
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+
+        self._entries: OrderedDict[Hashable, tuple[int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skipped = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Return the current write generation.
+
+        Returns:
+            int: The generation counter.
+        """
+        return self._generation
+
+    def bump(self) -> None:
+        """
+        Advance the generation, invalidating every cached result.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for key, loading it on a miss.
+
+        Results of None are treated as errors and never cached.
+
+        Args:
+            key (Hashable): The query name and arguments.
+            loader (Callable[[], Any]): Runs the query.
+
+        Returns:
+            Any: The cached or freshly loaded result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self._generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        # Run the query outside the lock so other threads are not blocked
+        value = loader()
+
+        if value is None or self.max_entries <= 0:
+            return value
+        if hasattr(value, "__len__") and len(value) > self.max_rows:
+            self.skipped += 1
+            return value
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (generation, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache counters and limits.
+
+        Returns:
+            Dict[str, int]: hits, misses, evictions, skipped (too large to
+                cache), size, max_entries, max_rows and generation.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "skipped": self.skipped,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_rows": self.max_rows,
+                "generation": self._generation,
+            }
+
+
+def cached_query(method: Callable) -> Callable:
+    """
+    Serve a SnippetDB read method through the instance's query cache.
+
+    The cache key is the method name and its arguments. List results are
+    copied on the way out so callers can modify them freely.
+
+    Args:
+        method (Callable): The read method to wrap.
+
+    Returns:
+        Callable: The wrapped method.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._check_external_changes()
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        value = self.cache.get_or_load(key, lambda: method(self, *args, **kwargs))
+        return list(value) if isinstance(value, list) else value
+    return wrapper
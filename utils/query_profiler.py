@@ -0,0 +1,609 @@
+import re
+import time
+import inspect
+import logging
+import threading
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .logging_utils import CompressedRotatingFileHandler
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are written to the slow query log
+DEFAULT_SLOW_QUERY_MS = 50.0
+
+# Rows shown per table in the text report
+REPORT_TOP_N = 20
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Reduce a traced statement to its shape for aggregation.
+
+    The trace callback reports statements with parameters expanded, so
+    literals are replaced with ? and whitespace is collapsed.
+
+    Args:
+        sql (str): The statement as traced.
+
+    Returns:
+        str: The normalized statement.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class _Stat:
+    """Running count, total and maximum of a latency in milliseconds."""
+    __slots__ = ("count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty _Stat.
+
+        Returns:
+            None
+        """
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        """
+        Add one measurement.
+
+        Args:
+            elapsed_ms (float): The measured latency in milliseconds.
+
+        Returns:
+            None
+        """
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Return the aggregate as a dictionary.
+
+        Returns:
+            Dict[str, float]: count, total_ms, mean_ms and max_ms.
+        """
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+        }
+
+
+class QueryProfiler:
+    """
+    Opt-in profiler for SnippetDB instances.
+
+    When enabled, every public SnippetDB method is timed and every SQL
+    statement is captured with sqlite3's trace callback. A statement's
+    latency is measured from its trace event to the next statement or the
+    end of the calling method, on the same thread. Statements are charged
+    to the innermost profiled method only: while a nested profiled call
+    runs, the caller's open statement is paused. Generator methods are
+    timed across their whole iteration, excluding time spent by the
+    consumer between items. Statements above the threshold are written
+    to a slow query log together with their EXPLAIN QUERY PLAN.
+    """
+    def __init__(
+        self,
+        slow_log_path: Path | None = None,
+        threshold_ms: float = DEFAULT_SLOW_QUERY_MS,
+        enabled: bool = False,
+    ) -> None:
+        """
+        Initialize the QueryProfiler.
+
+        Args:
+            slow_log_path (Path | None): File for slow statements, or None
+                to only keep them in memory.
+            threshold_ms (float): Latency above which a statement is slow.
+            enabled (bool): Start profiling attached databases immediately.
+
+        Returns:
+            None
+        """
+        self.slow_log_path = Path(slow_log_path) if slow_log_path else None
+        self.threshold_ms = threshold_ms
+        self.enabled = False
+
+        self._dbs: List[Any] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._slow_logger = None
+
+        self._methods: Dict[str, _Stat] = {}
+        self._statements: Dict[str, _Stat] = {}
+        self.slow_queries: List[Dict[str, Any]] = []
+
+        if enabled:
+            self.enable()
+
+    # Lifecycle
+    def attach(self, db) -> None:
+        """
+        Register a SnippetDB instance with the profiler.
+
+        Args:
+            db (SnippetDB): The database to profile while enabled.
+
+        Returns:
+            None
+        """
+        if db in self._dbs:
+            return
+        self._dbs.append(db)
+        if self.enabled:
+            self._install(db)
+
+    def detach(self, db) -> None:
+        """
+        Stop profiling a SnippetDB instance and forget it.
+
+        Args:
+            db (SnippetDB): The database to release.
+
+        Returns:
+            None
+        """
+        if db in self._dbs:
+            self._uninstall(db)
+            self._dbs.remove(db)
+
+    def enable(self) -> None:
+        """
+        Start profiling every attached database.
+
+        Returns:
+            None
+        """
+        if self.enabled:
+            return
+        logger.info("Enabling database profiler (slow threshold %.1f ms)", self.threshold_ms)
+        self.enabled = True
+        for db in self._dbs:
+            self._install(db)
+
+    def disable(self) -> None:
+        """
+        Stop profiling. Collected statistics are kept.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        logger.info("Disabling database profiler")
+        self.enabled = False
+        for db in self._dbs:
+            self._uninstall(db)
+
+    def reset(self) -> None:
+        """
+        Clear all collected statistics.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._methods.clear()
+            self._statements.clear()
+            self.slow_queries.clear()
+
+    def _install(self, db) -> None:
+        """
+        Wrap the public methods of db and start tracing its connections.
+
+        Wrappers are set on the instance, so other SnippetDB instances and
+        the class itself are unaffected.
+
+        Args:
+            db (SnippetDB): The database to profile.
+
+        Returns:
+            None
+        """
+        for name in dir(type(db)):
+            if name.startswith("_") or name in db.__dict__:
+                continue
+            attr = getattr(type(db), name)
+            if callable(attr) and not isinstance(attr, property):
+                setattr(db, name, self._wrap(db, name, getattr(db, name)))
+        db.pool.set_trace_callback(self._on_statement)
+
+    def _uninstall(self, db) -> None:
+        """
+        Remove the method wrappers and trace callback from db.
+
+        Args:
+            db (SnippetDB): The database to release.
+
+        Returns:
+            None
+        """
+        db.pool.set_trace_callback(None)
+        for name, value in list(db.__dict__.items()):
+            if getattr(value, "_profiled", False):
+                delattr(db, name)
+
+    # Capture
+    def _wrap(self, db, name: str, method):
+        """
+        Time a bound method and collect the statements it runs.
+
+        Generator methods get a generator wrapper, so they are timed over
+        their full iteration rather than only until the generator object
+        is created.
+
+        Args:
+            db (SnippetDB): The database the method belongs to.
+            name (str): The method name used in the statistics.
+            method (Callable): The bound method to wrap.
+
+        Returns:
+            Callable: The profiling wrapper, marked with _profiled.
+        """
+        if inspect.isgeneratorfunction(method):
+            @wraps(method)
+            def wrapper(*args, **kwargs):
+                frame = self._new_frame(name)
+                elapsed = 0.0
+                iterator = None
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        self._enter(frame, start)
+                        try:
+                            if iterator is None:
+                                iterator = method(*args, **kwargs)
+                            item = next(iterator)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            end = time.perf_counter()
+                            self._leave(frame, end)
+                            elapsed += end - start
+                        yield item
+                finally:
+                    if iterator is not None:
+                        start = time.perf_counter()
+                        self._enter(frame, start)
+                        try:
+                            iterator.close()
+                        finally:
+                            end = time.perf_counter()
+                            self._leave(frame, end)
+                            elapsed += end - start
+                    self._close_statement(frame, time.perf_counter())
+                    self._record(db, name, elapsed * 1000, frame["statements"])
+        else:
+            @wraps(method)
+            def wrapper(*args, **kwargs):
+                frame = self._new_frame(name)
+                start = time.perf_counter()
+                self._enter(frame, start)
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    end = time.perf_counter()
+                    self._leave(frame, end)
+                    self._close_statement(frame, end)
+                    self._record(db, name, (end - start) * 1000, frame["statements"])
+        wrapper._profiled = True
+        return wrapper
+
+    @staticmethod
+    def _new_frame(name: str) -> dict:
+        """
+        Create the bookkeeping frame for one profiled call.
+
+        Args:
+            name (str): The method name.
+
+        Returns:
+            dict: "method", the "open" statement as [sql, started or None,
+                carried ms] or None, and finished "statements" as
+                (sql, ms) tuples.
+        """
+        return {"method": name, "open": None, "statements": []}
+
+    def _stack(self) -> list:
+        """
+        Return the calling thread's stack of active frames.
+
+        Returns:
+            list: Frames of profiled calls running on this thread,
+                innermost last.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, frame: dict, now: float) -> None:
+        """
+        Make frame the innermost one, pausing the caller's open statement.
+
+        Args:
+            frame (dict): The frame being entered or resumed.
+            now (float): The current perf_counter value.
+
+        Returns:
+            None
+        """
+        stack = self._stack()
+        if stack:
+            self._pause_statement(stack[-1], now)
+        stack.append(frame)
+        self._resume_statement(frame, now)
+
+    def _leave(self, frame: dict, now: float) -> None:
+        """
+        Pop frame, pausing its open statement and resuming the caller's.
+
+        Args:
+            frame (dict): The innermost frame.
+            now (float): The current perf_counter value.
+
+        Returns:
+            None
+        """
+        stack = self._stack()
+        stack.pop()
+        self._pause_statement(frame, now)
+        if stack:
+            self._resume_statement(stack[-1], now)
+
+    def _on_statement(self, sql: str) -> None:
+        """
+        Trace callback: close the previous statement and open this one.
+
+        Args:
+            sql (str): The statement with parameters expanded.
+
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        stack = self._stack()
+        if not stack:
+            # Statement outside any profiled method, count it untimed
+            with self._lock:
+                self._statements.setdefault(normalize_sql(sql), _Stat()).add(0.0)
+            return
+        frame = stack[-1]
+        self._close_statement(frame, now)
+        frame["open"] = [sql, now, 0.0]
+
+    @staticmethod
+    def _pause_statement(frame: dict, now: float) -> None:
+        """
+        Stop the clock of the frame's open statement, keeping it open.
+
+        Args:
+            frame (dict): The frame whose statement is paused.
+            now (float): The current perf_counter value.
+
+        Returns:
+            None
+        """
+        statement = frame["open"]
+        if statement is not None and statement[1] is not None:
+            statement[2] += (now - statement[1]) * 1000
+            statement[1] = None
+
+    @staticmethod
+    def _resume_statement(frame: dict, now: float) -> None:
+        """
+        Restart the clock of the frame's paused statement.
+
+        Args:
+            frame (dict): The frame whose statement is resumed.
+            now (float): The current perf_counter value.
+
+        Returns:
+            None
+        """
+        statement = frame["open"]
+        if statement is not None and statement[1] is None:
+            statement[1] = now
+
+    @staticmethod
+    def _close_statement(frame: dict, now: float) -> None:
+        """
+        Finish the frame's open statement and add it to its statements.
+
+        Args:
+            frame (dict): The frame whose statement is closed.
+            now (float): The current perf_counter value.
+
+        Returns:
+            None
+        """
+        statement = frame["open"]
+        if statement is not None:
+            sql, started, carried_ms = statement
+            running_ms = (now - started) * 1000 if started is not None else 0.0
+            frame["statements"].append((sql, carried_ms + running_ms))
+            frame["open"] = None
+
+    def _record(self, db, method: str, elapsed_ms: float, statements: list) -> None:
+        """
+        Aggregate a finished method call and log its slow statements.
+
+        Args:
+            db (SnippetDB): The database the method belongs to.
+            method (str): The method name.
+            elapsed_ms (float): Time spent in the call.
+            statements (list): (sql, ms) tuples charged to the call.
+
+        Returns:
+            None
+        """
+        slow = []
+        with self._lock:
+            self._methods.setdefault(method, _Stat()).add(elapsed_ms)
+            for sql, statement_ms in statements:
+                self._statements.setdefault(normalize_sql(sql), _Stat()).add(statement_ms)
+                if statement_ms >= self.threshold_ms:
+                    slow.append((sql, statement_ms))
+
+        for sql, statement_ms in slow:
+            self._log_slow(db, method, sql, statement_ms)
+
+    def _log_slow(self, db, method: str, sql: str, elapsed_ms: float) -> None:
+        """
+        Record a slow statement with its query plan.
+
+        Args:
+            db (SnippetDB): The database the statement ran against.
+            method (str): The profiled method that ran it.
+            sql (str): The statement with parameters expanded.
+            elapsed_ms (float): The statement's latency.
+
+        Returns:
+            None
+        """
+        plan = self.explain(db, sql)
+        entry = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "method": method,
+            "elapsed_ms": elapsed_ms,
+            "sql": sql,
+            "plan": plan,
+        }
+        with self._lock:
+            self.slow_queries.append(entry)
+            del self.slow_queries[:-REPORT_TOP_N * 5]
+
+        slow_logger = self._get_slow_logger()
+        if slow_logger:
+            plan_text = "\n".join(f"    {line}" for line in plan) or "    (no plan)"
+            slow_logger.warning(
+                "%s %.1f ms in %s\n  %s\n%s",
+                entry["time"], elapsed_ms, method, _WHITESPACE.sub(" ", sql).strip(), plan_text,
+            )
+
+    def _get_slow_logger(self):
+        """
+        Return the dedicated slow query logger, creating it on first use.
+
+        Returns:
+            logging.Logger | None: The logger, or None without a log path.
+        """
+        if self.slow_log_path is None:
+            return None
+        if self._slow_logger is None:
+            self.slow_log_path.parent.mkdir(parents=True, exist_ok=True)
+            # Not registered with the logging manager, so it never reaches
+            # the application log and each profiler owns its own handler
+            slow_logger = logging.Logger(f"{__name__}.slow", logging.WARNING)
+            handler = CompressedRotatingFileHandler(
+                str(self.slow_log_path), maxBytes=1024 * 1024, backupCount=2
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            slow_logger.addHandler(handler)
+            self._slow_logger = slow_logger
+        return self._slow_logger
+
+    def explain(self, db, sql: str) -> List[str]:
+        """
+        Return the EXPLAIN QUERY PLAN lines for a traced statement.
+
+        Tracing is paused on the calling thread while the plan is read so
+        the EXPLAIN itself is not profiled.
+
+        Args:
+            db (SnippetDB): The database the statement ran against.
+            sql (str): The statement with literal parameters.
+
+        Returns:
+            List[str]: One line per plan step, empty if no plan applies.
+        """
+        stripped = sql.lstrip().upper()
+        if not stripped.startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+            return []
+
+        stack = self._stack()
+        self._local.stack = []
+        try:
+            rows = db.conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            return [row[-1] for row in rows]
+        except Exception as e:
+            logger.debug("Could not explain statement: %s", e)
+            return []
+        finally:
+            self._local.stack = stack
+
+    # Reporting
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return collected statistics.
+
+        Returns:
+            Dict[str, Any]: "methods" and "statements" mapping names to
+                count/total_ms/mean_ms/max_ms, plus recent "slow_queries".
+        """
+        with self._lock:
+            return {
+                "methods": {k: v.as_dict() for k, v in self._methods.items()},
+                "statements": {k: v.as_dict() for k, v in self._statements.items()},
+                "slow_queries": list(self.slow_queries),
+            }
+
+    def report(self) -> str:
+        """
+        Build a plain text report of the collected statistics.
+
+        Returns:
+            str: The report.
+        """
+        stats = self.stats()
+        lines = [
+            "QSnippet Database Profile",
+            f"Generated: {datetime.now().isoformat(timespec='seconds')}",
+            f"Profiling enabled: {self.enabled}",
+            f"Slow query threshold: {self.threshold_ms:.1f} ms",
+            "",
+            "Methods (by total time)",
+            f"{'Calls':>8}  {'Total ms':>10}  {'Mean ms':>9}  {'Max ms':>9}  Method",
+        ]
+        methods = sorted(stats["methods"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+        for name, s in methods[:REPORT_TOP_N]:
+            lines.append(f"{s['count']:>8}  {s['total_ms']:>10.1f}  {s['mean_ms']:>9.2f}  {s['max_ms']:>9.2f}  {name}")
+
+        lines += [
+            "",
+            "Statements (by total time)",
+            f"{'Calls':>8}  {'Total ms':>10}  {'Mean ms':>9}  {'Max ms':>9}  SQL",
+        ]
+        statements = sorted(stats["statements"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True)
+        for sql, s in statements[:REPORT_TOP_N]:
+            lines.append(f"{s['count']:>8}  {s['total_ms']:>10.1f}  {s['mean_ms']:>9.2f}  {s['max_ms']:>9.2f}  {sql[:200]}")
+
+        lines += ["", f"Slow queries (latest {min(len(stats['slow_queries']), REPORT_TOP_N)})"]
+        for entry in stats["slow_queries"][-REPORT_TOP_N:]:
+            lines.append(f"{entry['time']}  {entry['elapsed_ms']:.1f} ms  {entry['method']}")
+            lines.append(f"  {normalize_sql(entry['sql'])[:200]}")
+            lines.extend(f"    {step}" for step in entry["plan"])
+
+        for db in self._dbs:
+            cache = getattr(db, "cache", None)
+            if cache is not None:
+                lines += ["", f"Query cache ({db.db_path}): {cache.stats()}"]
+
+        return "\n".join(lines) + "\n"
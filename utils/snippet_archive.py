@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import zipfile
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Sequence
+
+from .yaml_stream import ProgressCallback, StreamCancelled
+
+logger = logging.getLogger(__name__)
+
+# File extension and format identifiers stored in the manifest
+ARCHIVE_SUFFIX = ".qsnip"
+ARCHIVE_FORMAT = "qsnip"
+ARCHIVE_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+CHUNK_NAME = "snippets/{:06d}.jsonl"
+
+# Records per JSON-Lines member. Each member is listed in the manifest with
+# its folders and tags, so partial imports only inflate matching members.
+ARCHIVE_CHUNK_SIZE = 1000
+
+
+class ArchiveError(ValueError):
+    """
+    Raised when a .qsnip archive is malformed or fails its checksums.
+    """
+
+
+def split_tags(tags: Any) -> List[str]:
+    """
+    Split a comma-separated tag string into trimmed, non-empty tags.
+
+    Args:
+        tags (Any): The tags column value.
+
+    Returns:
+        List[str]: The individual tags.
+    """
+    if not isinstance(tags, str):
+        return []
+    return [t.strip() for t in tags.split(",") if t.strip()]
+
+
+def write_archive(
+    f: BinaryIO,
+    snippets: Iterable[Mapping[str, Any]],
+    total: int | None = None,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """
+    Stream snippets into a .qsnip archive.
+
+    The archive is a zip holding JSON-Lines members of chunk_size records
+    each, followed by manifest.json listing every member's record count,
+    SHA-256 and the folders and tags it contains. Members are written as
+    rows arrive, so only one chunk is held in memory.
+
+    Args:
+        f (BinaryIO): An open binary file to write the zip to.
+        snippets (Iterable[Mapping[str, Any]]): Entries in export order.
+        total (int | None): Total number of entries, for progress only.
+        chunk_size (int): Records per member.
+        progress (ProgressCallback | None): Called after every member with
+            entries written and total. Returning False cancels.
+
+    Returns:
+        int: The number of entries written.
+
+    Raises:
+        StreamCancelled: If progress returned False.
+    """
+    snippets = iter(snippets)
+    chunks: List[Dict[str, Any]] = []
+    written = 0
+
+    with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        while True:
+            rows = list(islice(snippets, chunk_size))
+            if not rows:
+                break
+
+            folders, tags = set(), set()
+            lines = []
+            for row in rows:
+                row = dict(row)
+                folders.add(row.get("folder") or "")
+                tags.update(split_tags(row.get("tags")))
+                lines.append(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+
+            name = CHUNK_NAME.format(len(chunks))
+            archive.writestr(name, data)
+            chunks.append({
+                "name": name,
+                "count": len(rows),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "folders": sorted(folders),
+                "tags": sorted(tags),
+            })
+
+            written += len(rows)
+            if progress is not None and progress(written, total if total is not None else written) is False:
+                raise StreamCancelled(f"Export cancelled after {written} snippets")
+
+        manifest = {
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "count": written,
+            "chunks": chunks,
+        }
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+
+    return written
+
+
+def read_manifest(path: Path) -> Dict[str, Any]:
+    """
+    Read and validate the manifest of a .qsnip archive.
+
+    Args:
+        path (Path): The archive file.
+
+    Returns:
+        Dict[str, Any]: The manifest.
+
+    Raises:
+        ArchiveError: If the file is not a supported archive.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+    except (zipfile.BadZipFile, KeyError, ValueError) as e:
+        raise ArchiveError(f"Not a QSnippet archive: {path} ({e})") from e
+
+    if manifest.get("format") != ARCHIVE_FORMAT:
+        raise ArchiveError(f"Not a QSnippet archive: {path}")
+    if manifest.get("version", 0) > ARCHIVE_VERSION:
+        raise ArchiveError(f"Archive version {manifest['version']} is newer than supported ({ARCHIVE_VERSION})")
+    return manifest
+
+
+def iter_archive(
+    path: Path,
+    folders: Sequence[str] | None = None,
+    tags: Sequence[str] | None = None,
+    progress: ProgressCallback | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream snippet entries from a .qsnip archive.
+
+    With folders or tags given only matching entries are yielded: an
+    entry matches if its folder is in folders or it carries any of tags.
+    Members whose manifest entry cannot contain a match are not read.
+    Each member's checksum is verified before any of its entries are
+    yielded.
+
+    Args:
+        path (Path): The archive file.
+        folders (Sequence[str] | None): Folders to include.
+        tags (Sequence[str] | None): Tags to include.
+        progress (ProgressCallback | None): Called after every member with
+            records scanned and the total in the members being read.
+
+    Yields:
+        Dict[str, Any]: Snippet entries in archive order.
+
+    Raises:
+        ArchiveError: If the archive is malformed or a checksum fails.
+    """
+    manifest = read_manifest(path)
+    folder_set = set(folders or ())
+    tag_set = set(tags or ())
+    filtered = bool(folder_set or tag_set)
+
+    chunks = [
+        c for c in manifest["chunks"]
+        if not filtered or folder_set & set(c["folders"]) or tag_set & set(c["tags"])
+    ]
+    total = sum(c["count"] for c in chunks)
+    scanned = 0
+    logger.debug("Reading %d of %d archive members from %s", len(chunks), len(manifest["chunks"]), path)
+
+    with zipfile.ZipFile(path) as archive:
+        for chunk in chunks:
+            data = archive.read(chunk["name"])
+            if hashlib.sha256(data).hexdigest() != chunk["sha256"]:
+                raise ArchiveError(f"Checksum mismatch in {chunk['name']} of {path}")
+
+            # Split on bytes: str.splitlines would also break on U+2028,
+            # which json.dumps leaves unescaped with ensure_ascii=False
+            for line in data.splitlines():
+                entry = json.loads(line)
+                if (
+                    not filtered
+                    or (entry.get("folder") or "") in folder_set
+                    or tag_set.intersection(split_tags(entry.get("tags")))
+                ):
+                    yield entry
+
+            scanned += chunk["count"]
+            if progress is not None:
+                progress(scanned, total)
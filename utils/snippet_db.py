@@ -1,25 +1,187 @@
 import sqlite3
 import logging
 import random
+import threading
+import time
+import os
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 
 from .file_utils import FileUtils
+from .db_migrations import MigrationRunner, BASELINE_TABLE_SQL, BASELINE_INDEXES_SQL, SQL_EPOCH_NOW
+from .db_pool import ConnectionPool
+from .snippet_record import SnippetRecord, SNIPPET_SELECT
+from .db_libraries import ALL_SNIPPETS_VIEW, library_alias, library_rank, library_uri, build_view_sql
+from .yaml_stream import iter_yaml_snippets, StreamCancelled
+from .snippet_archive import iter_archive
+from .import_validation import normalise_entry, validate_entries
+from .import_preview import COMPARED_SQL, diff_entries
+from .body_codec import encode_body, content_hash, SNIPPET_TEXT_SQL, DEFAULT_COMPRESS_THRESHOLD, DEFAULT_COMPRESSION
+from .query_cache import QueryCache, cached_query, DEFAULT_MAX_ENTRIES, DEFAULT_MAX_ROWS
 
 logger = logging.getLogger(__name__)
 
+# Time budget for data backfills during startup.
+# Anything left over is resumed via run_backfills.
+STARTUP_BACKFILL_SECONDS = 0.5
+
+# Rows fetched per round trip when streaming snippets.
+STREAM_CHUNK_SIZE = 500
+
+# Columns accepted for keyset ordering. Each is backed by an index, and
+# id is always appended as a tie breaker so page keys are unique.
+PAGE_ORDER_COLUMNS = ("id", "label", "trigger", "folder")
+
+# Equality filters accepted by the streaming APIs, plus "keyword".
+FILTER_COLUMNS = ("enabled", "folder", "paste_style", "return_press")
+
+# Page key type: (value of the order column, id) of the last row seen.
+PageKey = Tuple[Any, int]
+
+# Change log rows kept when pruning. Readers that fall further behind
+# than this do a full reload instead of applying deltas.
+CHANGE_LOG_MAX_ROWS = 10_000
+
+# Days deletions are kept in snippet_tombstones. Peers that last synced
+# longer ago than this no longer learn about older deletions.
+TOMBSTONE_RETENTION_DAYS = 90
+
+# Maintenance limits. Incremental vacuum releases pages in small steps
+# so the writer lock is never held for long; a one-off full VACUUM to
+# switch old files to incremental mode only runs automatically below
+# FULL_VACUUM_MAX_PAGES (about 100 MB at 4 KiB pages).
+MAINTENANCE_MAX_SECONDS = 2.0
+INCREMENTAL_VACUUM_PAGES = 256
+FULL_VACUUM_MAX_PAGES = 25_000
+ANALYSIS_LIMIT = 1000
+MAINTENANCE_LOG_MAX_ROWS = 100
+AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+
+# Maximum host parameters per IN (...) query.
+ID_BATCH_SIZE = 500
+
+# Primary key probes made by get_random_snippet before falling back to
+# the next enabled id. Keeps sampling close to uniform on sparse tables.
+RANDOM_SAMPLE_ATTEMPTS = 8
+
+# Ways import_snippets can treat entries whose body already exists.
+IMPORT_DUPLICATE_MODES = ("keep", "skip", "merge")
+
+# Entries written per transaction by streaming imports.
+IMPORT_BATCH_SIZE = 500
+
+# Snippet fields carried by deltas. Ids, usage counters and storage
+# details are local to each database, so deltas match snippets by trigger.
+DELTA_FIELDS = (
+    "enabled",
+    "label",
+    "trigger",
+    "snippet",
+    "paste_style",
+    "return_press",
+    "folder",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+
+# Pages copied per online backup step. Locks are released between steps,
+# so writers are never blocked for longer than one step.
+BACKUP_PAGES_PER_STEP = 1024
+
+
+def _build_filters(filters: Dict[str, Any] | None) -> Tuple[List[str], List[Any]]:
+    """
+    Translate a filter dictionary into WHERE clauses and parameters.
+
+    Args:
+        filters (dict | None): Column equality filters from FILTER_COLUMNS,
+            and optionally "keyword" for a substring search across label,
+            snippet, trigger and tags.
+
+    Returns:
+        Tuple[List[str], List[Any]]: SQL conditions and their parameters.
+
+    Raises:
+        ValueError: If a filter key is not supported.
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    for key, value in (filters or {}).items():
+        if key == "keyword":
+            wildcard = f"%{value}%"
+            # Body last, so compressed bodies are only decoded when needed
+            clauses.append(f"(label LIKE ? OR trigger LIKE ? OR tags LIKE ? OR {SNIPPET_TEXT_SQL} LIKE ?)")
+            params.extend([wildcard] * 4)
+        elif key in FILTER_COLUMNS:
+            if value is None:
+                clauses.append(f"{key} IS NULL")
+            else:
+                clauses.append(f"{key} = ?")
+                params.append(int(value) if isinstance(value, bool) else value)
+        else:
+            raise ValueError(f"Unsupported snippet filter: {key}")
+
+    return clauses, params
+
+
+def db_options_from_config(db_config: Dict[str, Any] | None) -> Dict[str, Any]:
+    """
+    Build SnippetDB keyword arguments from the "database" config section.
+
+    Every SnippetDB opened on the user's database is created from the
+    same section, so all of them share one pragma profile, library list
+    and body codec.
+
+    Args:
+        db_config (Dict[str, Any] | None): The "database" config section.
+
+    Returns:
+        Dict[str, Any]: profile, libraries, compress_threshold and
+            compression keyword arguments.
+    """
+    db_config = db_config or {}
+    return {
+        "profile": db_config.get("pragma_profile"),
+        "libraries": [Path(path).expanduser() for path in db_config.get("libraries") or []],
+        "compress_threshold": int(db_config.get("compress_threshold_bytes", DEFAULT_COMPRESS_THRESHOLD)),
+        "compression": db_config.get("compression", DEFAULT_COMPRESSION),
+    }
 
 
 class SnippetDB:
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        profile: str | Dict[str, Any] | None = None,
+        cache_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_max_rows: int = DEFAULT_MAX_ROWS,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        compression: str = DEFAULT_COMPRESSION,
+        libraries: List[Path] | None = None,
+    ) -> None:
         """
         Initialize the SnippetDB instance.
 
-        Establishes a SQLite connection, ensures required tables and indexes
-        exist, and seeds the database with default snippets if empty.
+        Opens a per-thread connection pool, applies pending schema
+        migrations, seeds the database with default snippets if empty, and
+        trims the change log.
 
         Args:
             db_path (Path): Path to the SQLite database file.
+            profile (str | dict | None): Pragma profile name from
+                PRAGMA_PROFILES or a dictionary of pragma overrides.
+            cache_entries (int): Maximum number of cached query results.
+                0 disables the query cache.
+            cache_max_rows (int): Results larger than this are not cached.
+            compress_threshold (int): Snippet bodies of at least this many
+                bytes are stored compressed. 0 disables compression.
+            compression (str): "zlib", "lzma" or "none".
+            libraries (List[Path] | None): Read-only snippet libraries to
+                attach, highest precedence first. See attach_libraries.
 
         Returns:
             None
@@ -27,12 +189,140 @@ class SnippetDB:
         logger.info("Initializing SnippetDB")
         self.db_path = db_path
         logger.debug(f"SQLite Path: {db_path}")
-        self.conn = sqlite3.connect(self.db_path)
-        self.create_table()
-        self.create_indexes()
+        self.cache = QueryCache(cache_entries, cache_max_rows)
+        self.compress_threshold = compress_threshold
+        self.compression = compression
+        self._local = threading.local()
+        self.libraries: List[Path] = []
+        self._libraries_gen = 0
+        self.pool = ConnectionPool(self.db_path, profile)
+        self.attach_libraries(libraries or [])
+        self.migrate()
         self.seed_empty_db()
+        self.prune_change_log()
+        self.prune_tombstones()
         logger.info("SnippetDB initialized successfully")
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Return the connection owned by the calling thread.
+
+        Attached libraries and the all_snippets view are brought up to
+        date the first time a thread uses its connection after a change.
+
+        Returns:
+            sqlite3.Connection: The calling thread's connection.
+        """
+        conn = self.pool.reader()
+        if getattr(self._local, "libraries_gen", None) != self._libraries_gen:
+            self._sync_libraries(conn)
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a write transaction and invalidate cached query results.
+
+        Every mutating method goes through here, so the cache generation
+        always moves past any result that the write could have changed.
+
+        Yields:
+            sqlite3.Connection: The writer connection.
+        """
+        try:
+            with self.pool.write() as conn:
+                yield conn
+        finally:
+            self.cache.bump()
+
+    def _check_external_changes(self) -> None:
+        """
+        Invalidate the query cache if another connection wrote to the database.
+
+        Compares PRAGMA data_version with the value this thread saw last,
+        which catches writes from other processes and other SnippetDB
+        instances. A thread's first check always invalidates because it
+        has no earlier value to compare against.
+
+        Returns:
+            None
+        """
+        version = self.data_version()
+        if version is None or version != getattr(self._local, "data_version", None):
+            self.cache.bump()
+        self._local.data_version = version
+
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Return query cache counters and limits.
+
+        Returns:
+            Dict[str, int]: See QueryCache.stats.
+        """
+        return self.cache.stats()
+
+    def _snippet_cursor(self) -> sqlite3.Cursor:
+        """
+        Return a cursor that yields SnippetRecord rows.
+
+        Queries run on this cursor must select SNIPPET_SELECT.
+
+        Returns:
+            sqlite3.Cursor: A cursor on the calling thread's connection.
+        """
+        cur = self.conn.cursor()
+        cur.row_factory = SnippetRecord.from_row
+        return cur
+
+    def _codec_settings(self) -> Dict[str, Any]:
+        """
+        Return the body codec settings handed to migration backfills.
+
+        Returns:
+            Dict[str, Any]: compress_threshold and compression.
+        """
+        return {"compress_threshold": self.compress_threshold, "compression": self.compression}
+
+    def migrate(self) -> None:
+        """
+        Upgrade the database schema to the latest version.
+
+        Applies pending migrations keyed on PRAGMA user_version, then runs
+        data backfills within a small time budget so startup is not blocked.
+
+        Returns:
+            None
+        """
+        logger.info("Ensuring database schema is up to date")
+        try:
+            with self._write() as conn:
+                runner = MigrationRunner(conn, settings=self._codec_settings())
+                version = runner.upgrade()
+                logger.info(f"Database schema is at version {version}")
+                runner.backfill(max_seconds=STARTUP_BACKFILL_SECONDS)
+        except Exception as e:
+            logger.error(f"An error occured while migrating the database schema: {e}")
+            return None
+
+    def run_backfills(self, max_seconds: float | None = None) -> bool:
+        """
+        Continue any pending migration backfills.
+
+        Args:
+            max_seconds (float | None): Optional time budget in seconds.
+
+        Returns:
+            bool | None: True if all backfills are complete, False if work
+                remains, or None if an error occurred.
+        """
+        try:
+            with self._write() as conn:
+                return MigrationRunner(conn, settings=self._codec_settings()).backfill(max_seconds=max_seconds)
+        except Exception as e:
+            logger.error(f"An error occured while running database backfills: {e}")
+            return None
+
     def create_table(self) -> None:
         """
         Create the snippets table if it does not exist.
@@ -42,20 +332,8 @@ class SnippetDB:
         """
         logger.info("Ensuring snippet table exists in database")
         try:
-            with self.conn:
-                self.conn.execute("""
-                    CREATE TABLE IF NOT EXISTS snippets (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        enabled BOOLEAN DEFAULT True,
-                        label TEXT NOT NULL,
-                        trigger TEXT UNIQUE NOT NULL,
-                        snippet TEXT NOT NULL,
-                        paste_style TEXT,
-                        return_press BOOLEAN DEFAULT False,
-                        folder TEXT,
-                        tags TEXT DEFAULT ''
-                    )
-                """)
+            with self._write() as conn:
+                conn.execute(BASELINE_TABLE_SQL)
             logger.info("Snippet tabe should now exist in database")
         except Exception as e:
             logger.error(f"An error occured while ensuring snippet table exists in database: {e}")
@@ -70,11 +348,9 @@ class SnippetDB:
         """
         logger.info("Ensuring indexes exists in database")
         try:
-            with self.conn:
-                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_enabled ON snippets(enabled);")
-                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_folder ON snippets(folder);")
-                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_label ON snippets(label);")
-                self.conn.execute("CREATE INDEX IF NOT EXISTS idx_snippets_tags ON snippets(tags);")
+            with self._write() as conn:
+                for statement in BASELINE_INDEXES_SQL:
+                    conn.execute(statement)
 
                 logger.info("Indexes should now exist in database")
         except Exception as e:
@@ -118,17 +394,10 @@ class SnippetDB:
         logger.info("Attempting to seed the databse with default snippets.")
         logger.debug(f"Default Snippets: {default_snippets}")
         try:
-            with self.conn:
+            with self._write():
                 for entry in default_snippets:
-                    self.conn.execute(
-                        """
-                        INSERT INTO snippets
-                        (enabled, label, trigger, snippet, paste_style, return_press, folder, tags)
-                        VALUES
-                        (:enabled, :label, :trigger, :snippet, :paste_style, :return_press, :folder, :tags)
-                        """,
-                        entry,
-                    )
+                    # insert_snippet fills in the storage columns
+                    self.insert_snippet(entry)
                 logger.info("The database has been seeded successfully!")
 
         except Exception as e:
@@ -142,6 +411,7 @@ class SnippetDB:
 
         If an entry with the same id exists, it is updated. Otherwise,
         a new snippet is inserted. Conflicts on trigger result in an update.
+        Bodies above the compression threshold are stored compressed.
 
         Args:
             entry (Dict[str, Any]): Snippet data to insert or update.
@@ -160,41 +430,52 @@ class SnippetDB:
             return None """
         
         try:
-            with self.conn:
-                cur = self.conn.cursor()
+            params = dict(entry)
+            params["snippet"], params["body_format"] = encode_body(
+                entry.get("snippet"), self.compress_threshold, self.compression
+            )
+            params["content_hash"] = content_hash(entry.get("snippet"))
+            params["now"] = time.time()
+
+            with self._write() as conn:
+                cur = conn.cursor()
                 cur.execute("SELECT 1 FROM snippets WHERE id = ?", (entry_id,))
                 exists = cur.fetchone() is not None
 
                 if exists:  # update existing
                     logger.info("Found existing snippet. Updating entry.")
-                    self.conn.execute("""
+                    conn.execute("""
                         UPDATE snippets
                         SET
                             enabled = :enabled,
                             label = :label,
                             trigger = :trigger,
                             snippet = :snippet,
+                            body_format = :body_format,
+                            content_hash = :content_hash,
                             paste_style = :paste_style,
                             return_press = :return_press,
                             folder = :folder,
                             tags = :tags
                         WHERE id = :id
-                    """, entry)
+                    """, params)
                     
                 else:   # insert new snippet
                     logger.info("No existing snippet found. Making new entry.")
-                    self.conn.execute("""
-                        INSERT INTO snippets (enabled, label, trigger, snippet, paste_style, return_press, folder, tags)
-                        VALUES (:enabled, :label, :trigger, :snippet, :paste_style, :return_press, :folder, :tags)
+                    conn.execute("""
+                        INSERT INTO snippets (enabled, label, trigger, snippet, body_format, content_hash, paste_style, return_press, folder, tags, created_at, updated_at)
+                        VALUES (:enabled, :label, :trigger, :snippet, :body_format, :content_hash, :paste_style, :return_press, :folder, :tags, :now, :now)
                         ON CONFLICT(trigger) DO UPDATE SET
                             enabled = excluded.enabled,
                             label = excluded.label,
                             snippet = excluded.snippet,
+                            body_format = excluded.body_format,
+                            content_hash = excluded.content_hash,
                             paste_style = excluded.paste_style,
                             return_press = excluded.return_press,
                             folder = excluded.folder,
                             tags = excluded.tags
-                    """, entry)
+                    """, params)
 
                 logger.info("Snippet created successfully.")
                 return not exists   # True if it was new
@@ -217,44 +498,147 @@ class SnippetDB:
         logger.debug(f"Snippet ID: {snippet_id}")
 
         try:
-            with self.conn:
-                self.conn.execute("DELETE FROM snippets WHERE id = ?", (snippet_id,))
+            with self._write() as conn:
+                conn.execute("DELETE FROM snippets WHERE id = ?", (snippet_id,))
                 logger.info("Snippet deleted from the database")
 
         except Exception as e:
             logger.error(f"An error occured while deleting a snippet from the database: {e}")
             return None
 
-    def get_all_snippets(self) -> List[Dict[str, Any]]:
+    @cached_query
+    def get_all_snippets(self) -> List[SnippetRecord]:
         """
         Retrieve all snippets from the database.
 
         Returns:
-            List[Dict[str, Any]] | None: A list of snippet dictionaries,
+            List[SnippetRecord] | None: A list of snippet records,
                 or None if an error occurred.
         """
         logger.info("Fetching all snippets from the database.")
 
         try:
-            cur = self.conn.cursor()
-            cur.execute("SELECT * FROM snippets")
-            columns = [col[0] for col in cur.description]
-            rows = cur.fetchall()
-            result = []
-
-            for row in rows:
-                item = dict(zip(columns, row))
-                item["enabled"] = bool(item["enabled"])  # convert 1/0 to True/False
-                item["return_press"] = bool(item["return_press"])
-                result.append(item)
+            cur = self._snippet_cursor()
+            cur.execute(f"SELECT {SNIPPET_SELECT} FROM snippets")
+            result = cur.fetchall()
 
             logger.info("Successfully fetched all snippets from database.")
-            logger.debug(f"Snippets: {result}")
+            logger.debug(f"Snippet count: {len(result)}")
             return result
         except Exception as e:
             logger.error(f"An error occured while retrieving snippets from the database: {e}")
             return None
 
+    def get_snippets_page(
+        self,
+        after_key: PageKey | None = None,
+        limit: int = STREAM_CHUNK_SIZE,
+        order_by: str = "id",
+        filters: Dict[str, Any] | None = None,
+    ) -> Tuple[List[SnippetRecord], PageKey | None]:
+        """
+        Retrieve one page of snippets using keyset pagination.
+
+        Pages are addressed by the key of the last row on the previous page
+        rather than an OFFSET, so every page costs the same regardless of
+        how deep into the library it is.
+
+        Args:
+            after_key (tuple | None): The next_key returned by the previous
+                call, or None for the first page.
+            limit (int): Maximum number of rows to return.
+            order_by (str): Column from PAGE_ORDER_COLUMNS to sort by.
+            filters (dict | None): Filters accepted by _build_filters.
+
+        Returns:
+            Tuple[List[SnippetRecord], tuple | None] | None: The page rows
+                and the key for the next page (None when this was the last
+                page), or None if an error occurred.
+        """
+        logger.debug(f"Fetching snippet page after {after_key} (order_by={order_by}, limit={limit})")
+
+        try:
+            if order_by not in PAGE_ORDER_COLUMNS:
+                raise ValueError(f"Unsupported order column: {order_by}")
+            if limit < 1:
+                raise ValueError("Page limit must be at least 1")
+
+            clauses, params = _build_filters(filters)
+
+            if after_key is not None:
+                last_value, last_id = after_key
+                if order_by == "id":
+                    clauses.append("id > ?")
+                    params.append(last_id)
+                elif last_value is None:
+                    # NULLs sort first, so the rest of the NULL run comes next
+                    clauses.append(f"(({order_by} IS NULL AND id > ?) OR {order_by} IS NOT NULL)")
+                    params.append(last_id)
+                else:
+                    # Row values let SQLite seek the index instead of scanning
+                    clauses.append(f"({order_by}, id) > (?, ?)")
+                    params.extend([last_value, last_id])
+
+            query = f"SELECT {SNIPPET_SELECT} FROM snippets"
+            if clauses:
+                query += " WHERE " + " AND ".join(clauses)
+            query += " ORDER BY id" if order_by == "id" else f" ORDER BY {order_by}, id"
+            query += " LIMIT ?"
+            params.append(limit)
+
+            cur = self._snippet_cursor()
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+            next_key = None
+            if len(rows) == limit:
+                last = rows[-1]
+                next_key = (last[order_by], last["id"])
+
+            return rows, next_key
+        except Exception as e:
+            logger.error(f"An error occured while retrieving a page of snippets from the database: {e}")
+            return None
+
+    def iter_snippets(
+        self,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        filters: Dict[str, Any] | None = None,
+        order_by: str = "id",
+    ) -> Iterator[SnippetRecord]:
+        """
+        Stream snippets from the database in fixed-size chunks.
+
+        Each chunk is fetched with get_snippets_page, so at most chunk_size
+        rows are held in memory and no read transaction stays open between
+        chunks. Rows written while iterating may or may not be seen.
+
+        Args:
+            chunk_size (int): Number of rows fetched per query.
+            filters (dict | None): Filters accepted by _build_filters.
+            order_by (str): Column from PAGE_ORDER_COLUMNS to sort by.
+
+        Yields:
+            SnippetRecord: Snippet records in the requested order.
+        """
+        logger.info("Streaming snippets from the database.")
+        after_key = None
+        count = 0
+
+        while True:
+            page = self.get_snippets_page(after_key, chunk_size, order_by, filters)
+            if page is None:
+                # Error already logged; stop instead of looping forever
+                return
+
+            rows, after_key = page
+            count += len(rows)
+            yield from rows
+
+            if after_key is None:
+                logger.debug(f"Streamed {count} snippets")
+                return
+
     def get_snippet(self, snippet_id: int) -> Dict[str, Any]:
         """
         Retrieve a single snippet from the database.
@@ -270,13 +654,12 @@ class SnippetDB:
         logger.debug(f"Snippet ID: {snippet_id}")
 
         try:
-            cur = self.conn.cursor()
-            cur.execute("SELECT * FROM snippets WHERE trigger = ?", (snippet_id,))
+            cur = self._snippet_cursor()
+            cur.execute(f"SELECT {SNIPPET_SELECT} FROM snippets WHERE trigger = ?", (snippet_id,))
             row = cur.fetchone()
 
             if row:
-                columns = [col[0] for col in cur.description]
-                result = dict(zip(columns, row))
+                result = row.to_dict()
                 logger.info("Successfully fetched all snippets from database.")
                 logger.debug(f"Snippet: {result}")
                 return result
@@ -291,6 +674,13 @@ class SnippetDB:
         """
         Retrieve a random enabled snippet.
 
+        Samples by rowid instead of loading every enabled row: the enabled
+        id range is read from idx_snippets_enabled, then random ids are
+        probed by primary key a few times. If every probe lands in a gap
+        (deleted or disabled rows), the next enabled id at or after a final
+        random point is used, which slightly favours rows after large gaps.
+        Each step is an index seek, so cost does not grow with library size.
+
         Returns:
             Dict[str, Any] | None: A randomly selected snippet dictionary,
                 an empty dictionary if none exist, or None if an error occurred.
@@ -298,19 +688,40 @@ class SnippetDB:
         logger.info("Fetching random snippet from the database.")
 
         try:
-            cur = self.conn.cursor()
-            cur.execute("SELECT * FROM snippets WHERE enabled = 1")
-            rows = cur.fetchall()
+            cur = self._snippet_cursor()
+            # Separate subqueries so each MIN/MAX is a single index seek
+            low, high = self.conn.execute(
+                "SELECT (SELECT MIN(id) FROM snippets WHERE enabled = 1), "
+                "(SELECT MAX(id) FROM snippets WHERE enabled = 1)"
+            ).fetchone()
+
+            if low is None:
+                logger.info("No entry found for the snippet.")
+                return {}
 
-            if not rows:
+            row = None
+            for _ in range(RANDOM_SAMPLE_ATTEMPTS):
+                cur.execute(
+                    f"SELECT {SNIPPET_SELECT} FROM snippets WHERE id = ? AND enabled = 1",
+                    (random.randint(low, high),),
+                )
+                row = cur.fetchone()
+                if row is not None:
+                    break
+
+            if row is None:
+                cur.execute(
+                    f"SELECT {SNIPPET_SELECT} FROM snippets WHERE enabled = 1 AND id >= ? ORDER BY id LIMIT 1",
+                    (random.randint(low, high),),
+                )
+                row = cur.fetchone()
+
+            if row is None:
+                # Rows were removed between the range lookup and the probe
                 logger.info("No entry found for the snippet.")
                 return {}
-            
-            columns = [col[0] for col in cur.description]
-            row = random.choice(rows)
-            item = dict(zip(columns, row))
-            item["enabled"] = bool(item["enabled"])
-            item["return_press"] = bool(item["return_press"])
+
+            item = row.to_dict()
 
             logger.info("Successfully fetched random snippets from database.")
             logger.debug(f"Snippet: {item}")
@@ -318,7 +729,7 @@ class SnippetDB:
         except Exception as e:
             logger.error(f"An error occured while retrieving a random snippet from the database: {e}")
             return None
-    
+
     def rename_folder(self, old_folder: str, new_folder: str) -> None:
         """
         Rename a folder for all associated snippets.
@@ -334,8 +745,8 @@ class SnippetDB:
         logger.debug(f"OLD Folder: {old_folder} - NEW Folder {new_folder}")
 
         try:
-            with self.conn:
-                self.conn.execute("UPDATE snippets SET folder = ? WHERE folder = ?", (new_folder, old_folder))
+            with self._write() as conn:
+                conn.execute("UPDATE snippets SET folder = ? WHERE folder = ?", (new_folder, old_folder))
                 logger.info("Successfully renamed folder.")
         except Exception as e:
             logger.error(f"An error occured while renaming a folder within the database: {e}")
@@ -355,13 +766,14 @@ class SnippetDB:
         logger.debug(f"Folder {folder}")
 
         try:
-            with self.conn:
-                self.conn.execute("DELETE FROM snippets WHERE folder = ?", (folder,))
+            with self._write() as conn:
+                conn.execute("DELETE FROM snippets WHERE folder = ?", (folder,))
                 logger.info("Successfully deleted folder.")
         except Exception as e:
             logger.error(f"An error occured while deleting a folder from the database: {e}")
             return None
 
+    @cached_query
     def get_all_folders(self) -> List[str]:
         """
         Retrieve all distinct folder names.
@@ -399,15 +811,16 @@ class SnippetDB:
         logger.debug(f"Snippet ID: {snippet_id} | New Label: {new_label}")
 
         try:
-            with self.conn:
-                self.conn.execute("UPDATE snippets SET label = ? WHERE id = ?", (new_label, snippet_id))
+            with self._write() as conn:
+                conn.execute("UPDATE snippets SET label = ? WHERE id = ?", (new_label, snippet_id))
                 logger.info("Successfully renamed snippet.")
 
         except Exception as e:
             logger.error(f"An error occured while renaming a snippit within the database: {e}")
             return None
         
-    def search_snippets(self, keyword: str) -> List[Dict[str, Any]]:
+    @cached_query
+    def search_snippets(self, keyword: str) -> List[SnippetRecord]:
         """
         Search for snippets matching a keyword.
 
@@ -418,30 +831,30 @@ class SnippetDB:
             keyword (str): The search keyword.
 
         Returns:
-            List[Dict[str, Any]] | None: A list of matching snippets,
+            List[SnippetRecord] | None: A list of matching snippets,
                 or None if an error occurred.
         """
         logger.info("Searching snippets in the database.")
         logger.debug(f"Keyword: {keyword}")
         
         try:
-            cur = self.conn.cursor()
-            query = """
-                SELECT * FROM snippets
-                WHERE label LIKE ? OR snippet LIKE ? OR trigger LIKE ? OR tags LIKE ?
+            cur = self._snippet_cursor()
+            query = f"""
+                SELECT {SNIPPET_SELECT} FROM snippets
+                WHERE label LIKE ? OR trigger LIKE ? OR tags LIKE ? OR {SNIPPET_TEXT_SQL} LIKE ?
             """
             wildcard = f"%{keyword}%"
             cur.execute(query, (wildcard, wildcard, wildcard, wildcard))
-            columns = [col[0] for col in cur.description]
-            results =  [dict(zip(columns, row)) for row in cur.fetchall()]
+            results = cur.fetchall()
 
             logger.info("Successfully searched snippets.")
-            logger.debug(f"Results: {results}")
+            logger.debug(f"Result count: {len(results)}")
             return results
         except Exception as e:
             logger.error(f"An error occured while searching snippets within the database: {e}")
             return None
     
+    @cached_query
     def get_all_tags(self) -> list[str]:
         """
         Retrieve all distinct tags across snippets.
@@ -473,6 +886,31 @@ class SnippetDB:
             logger.error(f"An error occured while fetching tags from the database: {e}")
             return None
     
+    @cached_query
+    def get_all_triggers(self) -> List[str]:
+        """
+        Retrieve every snippet trigger.
+
+        Cheaper than get_all_snippets for callers such as completion lists
+        that only need the triggers.
+
+        Returns:
+            List[str] | None: Triggers sorted alphabetically, or None if an
+                error occurred.
+        """
+        logger.info("Fetching all triggers from the database.")
+
+        try:
+            cur = self.conn.cursor()
+            cur.execute("SELECT trigger FROM snippets ORDER BY trigger")
+            triggers = [row[0] for row in cur.fetchall()]
+
+            logger.debug(f"Trigger count: {len(triggers)}")
+            return triggers
+        except Exception as e:
+            logger.error(f"An error occured while fetching triggers from the database: {e}")
+            return None
+
     def delete_tag(self, tag: str) -> None:
         """
         Remove a tag from all snippets that contain it.
@@ -487,79 +925,1461 @@ class SnippetDB:
         logger.debug(f"Tag: {tag}")
 
         try:
-            cur = self.conn.cursor()
-            cur.execute("SELECT id, tags FROM snippets WHERE tags LIKE ?", (f"%{tag}%",))
-            rows = cur.fetchall()
-
-            for row in rows:
-                sid, tags = row
-                tag_list = [t.strip() for t in tags.split(",") if t.strip().lower() != tag.lower()]
-                new_tags = ",".join(tag_list)
-                with self.conn:
-                    self.conn.execute("UPDATE snippets SET tags = ? WHERE id = ?", (new_tags, sid))
-                    logger.info("Successfully deleted tag from snippets.")
+            with self._write() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT id, tags FROM snippets WHERE tags LIKE ?", (f"%{tag}%",))
+                rows = cur.fetchall()
+
+                for row in rows:
+                    sid, tags = row
+                    tag_list = [t.strip() for t in tags.split(",") if t.strip().lower() != tag.lower()]
+                    new_tags = ",".join(tag_list)
+                    conn.execute("UPDATE snippets SET tags = ? WHERE id = ?", (new_tags, sid))
+                logger.info("Successfully deleted tag from snippets.")
         except Exception as e:
             logger.error(f"An error occured while deleting a tag from the database: {e}")
             return None
 
-    # Import / Export
-    def export_to_yaml(self, yaml_path: Path) -> None:
+    def get_snippets_by_ids(self, snippet_ids) -> List[SnippetRecord]:
         """
-        Export all snippets to a YAML file.
+        Retrieve the snippets with the given ids.
+
+        Ids that no longer exist are skipped, so the result can be shorter
+        than the input.
 
         Args:
-            yaml_path (Path): The destination YAML file path.
+            snippet_ids (Iterable[int]): The snippet identifiers.
 
         Returns:
-            None
+            List[SnippetRecord] | None: The matching records in id order,
+                or None if an error occurred.
         """
-        logger.info("Exporting snippets to YAML.")
-        logger.debug(f"YAML Path: {yaml_path}")
+        ids = sorted(set(snippet_ids))
+        logger.debug(f"Fetching {len(ids)} snippets by id")
 
         try:
-            snippets = self.get_all_snippets()
-            FileUtils.export_snippets_yaml(yaml_path, snippets)
-            logger.info("Successfully exported snippets to YAML.")
+            cur = self._snippet_cursor()
+            result = []
+            for start in range(0, len(ids), ID_BATCH_SIZE):
+                batch = ids[start:start + ID_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                cur.execute(f"SELECT {SNIPPET_SELECT} FROM snippets WHERE id IN ({placeholders}) ORDER BY id", batch)
+                result.extend(cur.fetchall())
+            return result
         except Exception as e:
-            logger.error(f"An error occured while exporting your snippets: {e}")
+            logger.error(f"An error occured while retrieving snippets by id from the database: {e}")
             return None
 
-    def import_from_yaml(self, yaml_path: Path) -> None:
+    # Duplicate detection
+    def find_duplicates(self) -> List[List[SnippetRecord]]:
         """
-        Import snippets from a YAML file into the database.
+        Group snippets whose bodies are identical after normalisation.
+
+        Grouping runs in SQL on the content_hash index, so the cost is
+        linear in the number of rows rather than pairwise.
+
+        Returns:
+            List[List[SnippetRecord]] | None: One list per duplicated body,
+                each ordered by id, or None if an error occurred.
+        """
+        logger.info("Finding duplicate snippets.")
+        try:
+            cur = self._snippet_cursor()
+            cur.execute(f"""
+                SELECT {SNIPPET_SELECT} FROM snippets
+                WHERE content_hash IN (
+                    SELECT content_hash FROM snippets
+                    WHERE content_hash IS NOT NULL
+                    GROUP BY content_hash HAVING COUNT(*) > 1
+                )
+                ORDER BY content_hash, id
+            """)
+            groups: List[List[SnippetRecord]] = []
+            for record in cur:
+                if groups and groups[-1][0].content_hash == record.content_hash:
+                    groups[-1].append(record)
+                else:
+                    groups.append([record])
+            logger.info(f"Found {len(groups)} groups of duplicate snippets.")
+            return groups
+        except Exception as e:
+            logger.error(f"An error occured while finding duplicate snippets: {e}")
+            return None
+
+    def find_by_content(self, text: str) -> List[SnippetRecord]:
+        """
+        Retrieve snippets whose body matches text after normalisation.
 
         Args:
-            yaml_path (Path): The source YAML file path.
+            text (str): The body to look for.
 
         Returns:
-            None
+            List[SnippetRecord] | None: Matching records ordered by id, or
+                None if an error occurred.
         """
-        logger.info("Importing snippets from YAML.")
-        logger.debug(f"YAML Path: {yaml_path}")
+        try:
+            cur = self._snippet_cursor()
+            cur.execute(
+                f"SELECT {SNIPPET_SELECT} FROM snippets WHERE content_hash = ? ORDER BY id",
+                (content_hash(text),),
+            )
+            return cur.fetchall()
+        except Exception as e:
+            logger.error(f"An error occured while looking up snippets by content: {e}")
+            return None
+
+    # Usage statistics
+    def record_usage(self, usage: Dict[int, Tuple[int, float]]) -> int | None:
+        """
+        Add batched expansion counts to the usage columns.
+
+        All snippets are updated in a single transaction. Usage columns
+        are not part of the change log, so this does not notify change
+        feed readers.
+
+        Args:
+            usage (Dict[int, Tuple[int, float]]): Maps snippet id to the
+                number of new uses and the epoch time of the latest one.
+
+        Returns:
+            int | None: The number of snippets updated, or None if an error occurred.
+        """
+        logger.debug(f"Recording usage for {len(usage)} snippets")
+
+        try:
+            with self._write() as conn:
+                cur = conn.executemany(
+                    """
+                    UPDATE snippets
+                    SET use_count = use_count + ?,
+                        last_used = MAX(COALESCE(last_used, 0), ?)
+                    WHERE id = ?
+                    """,
+                    [(count, last_used, snippet_id) for snippet_id, (count, last_used) in usage.items()],
+                )
+                return cur.rowcount
+        except Exception as e:
+            logger.error(f"An error occured while recording snippet usage: {e}")
+            return None
+
+    @cached_query
+    def get_top_snippets(self, limit: int = 10) -> List[SnippetRecord]:
+        """
+        Retrieve the most used snippets.
+
+        Args:
+            limit (int): Maximum number of snippets to return.
+
+        Returns:
+            List[SnippetRecord] | None: Used snippets by descending
+                use_count, or None if an error occurred.
+        """
+        logger.debug(f"Fetching top {limit} snippets")
 
         try:
-            snippets = FileUtils.import_snippets_yaml(yaml_path)
-            logger.debug(f"Imported Snippets: {snippets}")
+            cur = self._snippet_cursor()
+            cur.execute(
+                f"SELECT {SNIPPET_SELECT} FROM snippets WHERE use_count > 0 "
+                "ORDER BY use_count DESC, id LIMIT ?",
+                (limit,),
+            )
+            return cur.fetchall()
+        except Exception as e:
+            logger.error(f"An error occured while retrieving the most used snippets: {e}")
+            return None
+
+    @cached_query
+    def get_recent_snippets(self, limit: int = 10) -> List[SnippetRecord]:
+        """
+        Retrieve the most recently used snippets.
+
+        Args:
+            limit (int): Maximum number of snippets to return.
 
-            for entry in snippets:
-                self.insert_snippet(entry)
+        Returns:
+            List[SnippetRecord] | None: Used snippets by descending
+                last_used, or None if an error occurred.
+        """
+        logger.debug(f"Fetching {limit} recently used snippets")
 
-            logger.info("Successfully imported snippets from YAML.")
+        try:
+            cur = self._snippet_cursor()
+            cur.execute(
+                f"SELECT {SNIPPET_SELECT} FROM snippets WHERE last_used IS NOT NULL "
+                "ORDER BY last_used DESC LIMIT ?",
+                (limit,),
+            )
+            return cur.fetchall()
         except Exception as e:
-            logger.error(f"An error occured while importing your snippets: {e}")
+            logger.error(f"An error occured while retrieving recently used snippets: {e}")
+            return None
+
+    # Change feed
+    def data_version(self) -> int | None:
+        """
+        Return PRAGMA data_version for the calling thread's connection.
+
+        The value changes whenever another connection, including the
+        shared writer and other processes, commits to the database. It is
+        only comparable between calls made on the same thread, and it is
+        cheap enough to poll on a timer.
+
+        Returns:
+            int | None: The current data version, or None if an error occurred.
+        """
+        try:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+        except Exception as e:
+            logger.error(f"An error occured while reading the database data version: {e}")
+            return None
+
+    def latest_change_seq(self) -> int | None:
+        """
+        Return the sequence number of the most recent change.
+
+        Read from sqlite_sequence so it stays correct after the log has
+        been pruned.
+
+        Returns:
+            int | None: The latest seq (0 if nothing was ever logged),
+                or None if an error occurred.
+        """
+        try:
+            row = self.conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'snippet_changes'"
+            ).fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            logger.error(f"An error occured while reading the latest change sequence: {e}")
+            return None
+
+    def change_log_covers(self, seq: int) -> bool:
+        """
+        Check whether every change after seq is still in the log.
+
+        Args:
+            seq (int): The last sequence number the caller has applied.
+
+        Returns:
+            bool: True if changes_since(seq) is complete, False if the
+                log was pruned past seq and the caller must reload fully.
+        """
+        try:
+            earliest = self.conn.execute("SELECT MIN(seq) FROM snippet_changes").fetchone()[0]
+            if earliest is None:
+                # Nothing retained, so only callers already up to date are covered
+                return seq >= self.latest_change_seq()
+            return seq >= earliest - 1
+        except Exception as e:
+            logger.error(f"An error occured while checking the change log: {e}")
+            return False
+
+    def changes_since(self, seq: int, limit: int | None = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve logged snippet changes with a sequence number above seq.
+
+        Args:
+            seq (int): The last sequence number the caller has applied.
+            limit (int | None): Optional maximum number of changes.
+
+        Returns:
+            List[Dict[str, Any]] | None: Changes in seq order, each with
+                seq, op ("insert", "update" or "delete"), snippet_id,
+                trigger and changed_at (epoch seconds), or None if an error
+                occurred.
+        """
+        logger.debug(f"Fetching snippet changes since seq {seq}")
+
+        try:
+            cur = self.conn.cursor()
+            query = "SELECT seq, op, snippet_id, trigger, changed_at FROM snippet_changes WHERE seq > ? ORDER BY seq"
+            params = [seq]
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            cur.execute(query, params)
+            columns = [col[0] for col in cur.description]
+            changes = [dict(zip(columns, row)) for row in cur.fetchall()]
+
+            logger.debug(f"Change count: {len(changes)}")
+            return changes
+        except Exception as e:
+            logger.error(f"An error occured while retrieving snippet changes: {e}")
+            return None
+
+    def prune_change_log(self, keep: int = CHANGE_LOG_MAX_ROWS) -> None:
+        """
+        Delete all but the most recent change log rows.
+
+        Args:
+            keep (int): Number of most recent changes to keep.
+
+        Returns:
+            None
+        """
+        try:
+            with self._write() as conn:
+                cur = conn.execute(
+                    "DELETE FROM snippet_changes WHERE seq <= "
+                    "(SELECT seq FROM sqlite_sequence WHERE name = 'snippet_changes') - ?",
+                    (keep,),
+                )
+                if cur.rowcount:
+                    logger.info(f"Pruned {cur.rowcount} change log entries.")
+        except Exception as e:
+            logger.error(f"An error occured while pruning the change log: {e}")
+            return None
+
+    def prune_tombstones(self, max_age_days: float = TOMBSTONE_RETENTION_DAYS) -> None:
+        """
+        Delete deletion records older than the retention period.
+
+        Args:
+            max_age_days (float): Age in days after which tombstones are dropped.
+
+        Returns:
+            None
+        """
+        try:
+            with self._write() as conn:
+                cur = conn.execute(
+                    "DELETE FROM snippet_tombstones WHERE deleted_at < ?",
+                    (time.time() - max_age_days * 86400,),
+                )
+                if cur.rowcount:
+                    logger.info(f"Pruned {cur.rowcount} snippet tombstones.")
+        except Exception as e:
+            logger.error(f"An error occured while pruning snippet tombstones: {e}")
             return None
 
+    # Attached libraries
+    def attach_libraries(self, libraries: List[Path]) -> List[Path]:
+        """
+        Set the read-only snippet libraries queried alongside this database.
+
+        Libraries are other snippets.db files, such as a shared company
+        library, attached read-only to every reader connection. They are
+        listed highest precedence first; the main database always wins a
+        trigger conflict. Files that are missing or have no snippets table
+        are skipped. Library rows appear in the all_snippets view with
+        negative ids (see db_libraries.library_rank) and are never
+        written to.
+
+        Args:
+            libraries (List[Path]): Library files in precedence order.
+
+        Returns:
+            List[Path]: The libraries actually attached.
+        """
+        valid = []
+        for path in libraries:
+            path = Path(path)
+            try:
+                conn = sqlite3.connect(library_uri(path), uri=True)
+                try:
+                    found = conn.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snippets'"
+                    ).fetchone()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Skipping snippet library {path}: {e}")
+                continue
+            if not found:
+                logger.warning(f"Skipping snippet library {path}: no snippets table")
+                continue
+            valid.append(path)
+
+        self.libraries = valid
+        self._libraries_gen += 1
+        logger.info(f"Attached {len(valid)} snippet libraries")
+        return valid
+
+    def _sync_libraries(self, conn: sqlite3.Connection) -> None:
+        """
+        Attach the configured libraries to a connection and rebuild the view.
+
+        Args:
+            conn (sqlite3.Connection): The calling thread's connection.
+
+        Returns:
+            None
+        """
+        generation = self._libraries_gen
+        try:
+            attached = [row[1] for row in conn.execute("PRAGMA database_list")]
+            for alias in attached:
+                if alias.startswith("lib_"):
+                    conn.execute("DETACH DATABASE ?", (alias,))
+
+            ranks = []
+            for rank, path in enumerate(self.libraries, start=1):
+                try:
+                    conn.execute("ATTACH DATABASE ? AS ?", (library_uri(path), library_alias(rank)))
+                    ranks.append(rank)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not attach snippet library {path}: {e}")
+
+            conn.execute(f"DROP VIEW IF EXISTS temp.{ALL_SNIPPETS_VIEW}")
+            conn.execute(build_view_sql(conn, ranks))
+        except Exception as e:
+            logger.error(f"An error occured while attaching snippet libraries: {e}")
+        self._local.libraries_gen = generation
+
+    def iter_all_snippets(
+        self,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        filters: Dict[str, Any] | None = None,
+    ) -> Iterator[SnippetRecord]:
+        """
+        Stream snippets from this database and every attached library.
+
+        Rows come from the all_snippets view in a single pass with no
+        ordering, so no temporary sort is built however large the
+        libraries are. Rows sharing a trigger are all returned; callers
+        resolve conflicts with db_libraries.library_rank.
+
+        Args:
+            chunk_size (int): Rows fetched per round trip.
+            filters (dict | None): Filters as accepted by iter_snippets.
+
+        Yields:
+            SnippetRecord: Snippet records; library rows have negative ids.
+        """
+        logger.info("Streaming snippets from all libraries.")
+        try:
+            clauses, params = _build_filters(filters)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            cur = self._snippet_cursor()
+            cur.execute(f"SELECT {SNIPPET_SELECT} FROM {ALL_SNIPPETS_VIEW} {where}", params)
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield from rows
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"An error occured while streaming snippets from all libraries: {e}")
+            return
+
+    def get_library_snippets(self, triggers) -> List[SnippetRecord]:
+        """
+        Retrieve library snippets for the given triggers.
+
+        Used to fall back to a library definition once the main database
+        no longer defines a trigger. Each lookup uses the trigger index of
+        every attached library.
+
+        Args:
+            triggers (Iterable[str]): Triggers to look up.
+
+        Returns:
+            List[SnippetRecord] | None: Matching library rows, possibly
+                several per trigger, or None if an error occurred.
+        """
+        triggers = sorted(set(triggers))
+        if not self.libraries or not triggers:
+            return []
+
+        try:
+            cur = self._snippet_cursor()
+            result = []
+            for start in range(0, len(triggers), ID_BATCH_SIZE):
+                batch = triggers[start:start + ID_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                cur.execute(
+                    f"SELECT {SNIPPET_SELECT} FROM {ALL_SNIPPETS_VIEW} WHERE trigger IN ({placeholders}) AND id < 0",
+                    batch,
+                )
+                result.extend(cur.fetchall())
+            return result
+        except Exception as e:
+            logger.error(f"An error occured while retrieving library snippets: {e}")
+            return None
+
+    def get_snippets_by_triggers(self, triggers) -> List[SnippetRecord]:
+        """
+        Retrieve snippets for the given triggers from every library.
+
+        Args:
+            triggers (Iterable[str]): Triggers to look up.
+
+        Returns:
+            List[SnippetRecord] | None: Matching rows from this database and
+                the attached libraries, possibly several per trigger, or
+                None if an error occurred.
+        """
+        triggers = sorted(set(triggers))
+        try:
+            cur = self._snippet_cursor()
+            result = []
+            for start in range(0, len(triggers), ID_BATCH_SIZE):
+                batch = triggers[start:start + ID_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                cur.execute(f"SELECT {SNIPPET_SELECT} FROM {ALL_SNIPPETS_VIEW} WHERE trigger IN ({placeholders})", batch)
+                result.extend(cur.fetchall())
+            return result
+        except Exception as e:
+            logger.error(f"An error occured while retrieving snippets by trigger: {e}")
+            return None
+
+    def library_version(self) -> Tuple[int, ...] | None:
+        """
+        Return PRAGMA data_version for every attached library.
+
+        Like data_version, the values change when another connection
+        commits to a library file and are only comparable on one thread.
+
+        Returns:
+            Tuple[int, ...] | None: One version per library, or None if an
+                error occurred.
+        """
+        try:
+            conn = self.conn
+            return tuple(
+                conn.execute(f"PRAGMA {library_alias(rank)}.data_version").fetchone()[0]
+                for rank in range(1, len(self.libraries) + 1)
+            )
+        except Exception as e:
+            logger.error(f"An error occured while reading library data versions: {e}")
+            return None
+
+    # Maintenance
+    def storage_stats(self) -> Dict[str, Any]:
+        """
+        Return size and fragmentation metrics for the database file.
+
+        Returns:
+            Dict[str, Any] | None: page_size, page_count, freelist_count,
+                size_bytes, free_bytes, fragmentation (free pages as a
+                fraction of all pages) and auto_vacuum, or None on error.
+        """
+        try:
+            conn = self.conn
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            return {
+                "page_size": page_size,
+                "page_count": page_count,
+                "freelist_count": freelist,
+                "size_bytes": page_size * page_count,
+                "free_bytes": page_size * freelist,
+                "fragmentation": freelist / page_count if page_count else 0.0,
+                "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+            }
+        except Exception as e:
+            logger.error(f"An error occured while reading database storage stats: {e}")
+            return None
+
+    def run_maintenance(
+        self,
+        max_seconds: float = MAINTENANCE_MAX_SECONDS,
+        vacuum_pages: int = INCREMENTAL_VACUUM_PAGES,
+        analyze: bool = True,
+        full_vacuum: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Reclaim free pages and refresh query planner statistics.
+
+        Free pages are returned to the file system with incremental
+        vacuum steps of vacuum_pages each, every step in its own short
+        write transaction, until none are left or max_seconds pass.
+        Databases created before auto_vacuum was enabled are converted
+        with a one-off full VACUUM, but only when small enough to finish
+        quickly unless full_vacuum is set. ANALYZE runs with a bounded
+        analysis_limit, followed by PRAGMA optimize. The change log is
+        pruned and the run is recorded in db_maintenance.
+
+        Args:
+            max_seconds (float): Time budget for incremental vacuum steps.
+            vacuum_pages (int): Pages released per incremental step.
+            analyze (bool): Whether to refresh planner statistics.
+            full_vacuum (bool): Run a full VACUUM regardless of size.
+
+        Returns:
+            Dict[str, Any] | None: The recorded metrics, or None on error.
+        """
+        logger.info("Running database maintenance")
+        try:
+            start = time.perf_counter()
+            before = self.storage_stats()
+            vacuum = "none"
+            wants_incremental = str(self.pool.pragmas.get("auto_vacuum", "")).upper() == "INCREMENTAL"
+
+            if full_vacuum or (
+                wants_incremental
+                and before["auto_vacuum"] != "INCREMENTAL"
+                and before["page_count"] <= FULL_VACUUM_MAX_PAGES
+            ):
+                # VACUUM rewrites the file and cannot run inside a transaction
+                with self._write() as conn:
+                    conn.execute(f"PRAGMA auto_vacuum = {self.pool.pragmas['auto_vacuum']}")
+                    conn.execute("VACUUM")
+                vacuum = "full"
+            elif before["auto_vacuum"] == "INCREMENTAL":
+                deadline = time.perf_counter() + max_seconds
+                freelist = before["freelist_count"]
+                while freelist and time.perf_counter() < deadline:
+                    with self._write() as conn:
+                        conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})").fetchall()
+                        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    vacuum = "incremental"
+            elif before["freelist_count"]:
+                logger.info("Database too large to convert to incremental vacuum automatically")
+
+            if analyze:
+                with self._write() as conn:
+                    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+                    conn.execute("ANALYZE")
+                    conn.execute("PRAGMA optimize")
+
+            self.prune_change_log()
+            self.prune_tombstones()
+
+            after = self.storage_stats()
+            metrics = {
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "page_size": after["page_size"],
+                "pages_before": before["page_count"],
+                "pages_after": after["page_count"],
+                "free_pages_before": before["freelist_count"],
+                "free_pages_after": after["freelist_count"],
+                "vacuum": vacuum,
+                "analyzed": analyze,
+            }
+            with self._write() as conn:
+                conn.execute("""
+                    INSERT INTO db_maintenance (duration_ms, page_size, pages_before, pages_after,
+                        free_pages_before, free_pages_after, vacuum, analyzed)
+                    VALUES (:duration_ms, :page_size, :pages_before, :pages_after,
+                        :free_pages_before, :free_pages_after, :vacuum, :analyzed)
+                """, metrics)
+                conn.execute(
+                    "DELETE FROM db_maintenance WHERE id <= (SELECT MAX(id) FROM db_maintenance) - ?",
+                    (MAINTENANCE_LOG_MAX_ROWS,),
+                )
+
+            logger.info(
+                f"Database maintenance finished in {metrics['duration_ms']:.0f} ms: "
+                f"{before['page_count']} -> {after['page_count']} pages, "
+                f"{before['freelist_count']} -> {after['freelist_count']} free, vacuum={vacuum}"
+            )
+            return metrics
+        except Exception as e:
+            logger.error(f"An error occured while running database maintenance: {e}")
+            return None
+
+    def last_maintenance(self) -> Dict[str, Any]:
+        """
+        Return the most recent maintenance run.
+
+        Returns:
+            Dict[str, Any] | None: The newest db_maintenance row as a
+                dictionary, or None if maintenance never ran or on error.
+        """
+        try:
+            cur = self.conn.execute("SELECT * FROM db_maintenance ORDER BY id DESC LIMIT 1")
+            row = cur.fetchone()
+            if row is None:
+                return None
+            return dict(zip([c[0] for c in cur.description], row))
+        except Exception as e:
+            logger.error(f"An error occured while reading the maintenance log: {e}")
+            return None
+
+    # Backup / Restore
+    def backup(self, dest_path: Path, pages: int = BACKUP_PAGES_PER_STEP, progress=None) -> Path:
+        """
+        Copy the live database to dest_path with SQLite's online backup API.
+
+        The copy is made in steps of the given number of pages from this
+        thread's reader connection, so other readers and the writer keep
+        working while it runs. It is written to a temporary file first and
+        moved into place once complete, so dest_path is never partial.
+
+        Args:
+            dest_path (Path): The backup file to create or replace.
+            pages (int): Pages copied per step.
+            progress (Callable[[int, int, int], None] | None): Optional
+                sqlite3 progress callback (status, remaining, total).
+
+        Returns:
+            Path | None: The backup path, or None if an error occurred.
+        """
+        dest_path = Path(dest_path)
+        partial = dest_path.with_name(dest_path.name + ".partial")
+        logger.info("Backing up the database.")
+        logger.debug(f"Backup path: {dest_path}")
+
+        try:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest = sqlite3.connect(partial)
+            try:
+                self.conn.backup(dest, pages=pages, progress=progress)
+                # Snapshots are standalone files, so leave WAL mode behind
+                dest.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                dest.close()
+            os.replace(partial, dest_path)
+            logger.info("Database backup completed.")
+            return dest_path
+        except Exception as e:
+            logger.error(f"An error occured while backing up the database: {e}")
+            partial.unlink(missing_ok=True)
+            return None
+
+    def restore(self, src_path: Path, pages: int = BACKUP_PAGES_PER_STEP) -> bool:
+        """
+        Replace the live database contents with a backup.
+
+        The backup is checked first, then copied over the live database
+        while holding the write lock. Older backups are migrated to the
+        current schema afterwards. The change log is cleared and its
+        sequence moved past every value handed out before, so change feed
+        readers see that they must reload fully.
+
+        Args:
+            src_path (Path): The backup file to restore.
+            pages (int): Pages copied per step.
+
+        Returns:
+            bool | None: True if restored, False if the backup is not a
+                valid snippet database, or None if an error occurred.
+        """
+        src_path = Path(src_path)
+        logger.info("Restoring the database from a backup.")
+        logger.debug(f"Backup path: {src_path}")
+
+        try:
+            src = sqlite3.connect(f"file:{src_path}?mode=ro", uri=True)
+        except Exception as e:
+            logger.error(f"An error occured while opening the backup: {e}")
+            return None
+
+        try:
+            try:
+                status = src.execute("PRAGMA quick_check").fetchone()[0]
+                has_table = src.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snippets'"
+                ).fetchone()
+            except sqlite3.DatabaseError as e:
+                status, has_table = str(e), None
+            if status != "ok" or not has_table:
+                logger.warning(f"Refusing to restore {src_path}: not a valid snippet database ({status})")
+                return False
+
+            last_seq = self.latest_change_seq() or 0
+            with self._write() as conn:
+                src.backup(conn, pages=pages)
+
+            self.migrate()
+            with self._write() as conn:
+                conn.execute("DELETE FROM snippet_changes")
+                moved = conn.execute(
+                    "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'snippet_changes'",
+                    (last_seq + 1,),
+                ).rowcount
+                if not moved:
+                    conn.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) VALUES ('snippet_changes', ?)",
+                        (last_seq + 1,),
+                    )
+
+            logger.info("Database restored from backup.")
+            return True
+        except Exception as e:
+            logger.error(f"An error occured while restoring the database: {e}")
+            return None
+        finally:
+            src.close()
+
+    # Import / Export
+    def export_to_yaml(self, yaml_path: Path, progress=None) -> Dict[str, int]:
+        """
+        Export all snippets to a YAML file.
+
+        Rows are streamed with iter_snippets and written chunk by chunk,
+        so the library is never held in memory as a whole. The file is
+        replaced atomically once the export completes.
+
+        Args:
+            yaml_path (Path): The destination YAML file path.
+            progress (Callable[[int, int], bool] | None): Called after each
+                chunk with snippets written and the total. Returning False
+                cancels the export and leaves yaml_path untouched.
+
+        Returns:
+            Dict[str, int] | None: "exported" (snippets written) and
+                "cancelled" (1 if stopped early), or None on error.
+        """
+        logger.info("Exporting snippets to YAML.")
+        logger.debug(f"YAML Path: {yaml_path}")
+
+        try:
+            total = self.conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+            exported = FileUtils.export_snippets_yaml_stream(
+                Path(yaml_path), self.iter_snippets(), total=total, progress=progress
+            )
+            logger.info("Successfully exported snippets to YAML.")
+            return {"exported": exported, "cancelled": 0}
+        except StreamCancelled:
+            logger.info("Snippet export cancelled.")
+            return {"exported": 0, "cancelled": 1}
+        except Exception as e:
+            logger.error(f"An error occured while exporting your snippets: {e}")
+            return None
+
+    def import_snippets(self, entries, duplicates: str = "keep") -> Dict[str, int]:
+        """
+        Insert or update a batch of snippet entries in one transaction.
+
+        Entries are upserted as in insert_snippet. With duplicates set to
+        "skip" or "merge", an entry whose body already exists under a
+        different trigger (in the database or earlier in the batch) is
+        not added as a new snippet: "skip" drops it, "merge" adds its
+        tags to the existing snippet instead.
+
+        Args:
+            entries (Iterable[dict]): Snippet entries to import.
+            duplicates (str): One of IMPORT_DUPLICATE_MODES.
+
+        Returns:
+            Dict[str, int] | None: Counts for "new", "updated", "skipped",
+                "merged" and "failed" (entries insert_snippet rejected), or
+                None if an error occurred.
+
+        Raises:
+            ValueError: If duplicates is not a supported mode.
+        """
+        if duplicates not in IMPORT_DUPLICATE_MODES:
+            raise ValueError(f"Unsupported duplicate handling: {duplicates}")
+
+        counts = {"new": 0, "updated": 0, "skipped": 0, "merged": 0, "failed": 0}
+        try:
+            with self._write() as conn:
+                for entry in entries:
+                    if duplicates != "keep":
+                        existing = conn.execute(
+                            "SELECT id, tags FROM snippets WHERE content_hash = ? AND trigger IS NOT ? LIMIT 1",
+                            (content_hash(entry.get("snippet")), entry.get("trigger")),
+                        ).fetchone()
+                        if existing is not None:
+                            if duplicates == "merge":
+                                self._merge_tags(conn, existing[0], existing[1], entry.get("tags"))
+                                counts["merged"] += 1
+                            else:
+                                counts["skipped"] += 1
+                            continue
+
+                    is_new = self.insert_snippet(entry)
+                    if is_new is None:
+                        counts["failed"] += 1
+                    else:
+                        counts["new" if is_new else "updated"] += 1
+
+            logger.info(f"Imported snippets: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"An error occured while importing snippets: {e}")
+            return None
+
+    def _merge_tags(self, conn: sqlite3.Connection, snippet_id: int, tags: str | None, new_tags: str | None) -> None:
+        """
+        Add tags to an existing snippet, keeping their order and skipping repeats.
+
+        Args:
+            conn (sqlite3.Connection): The writer connection.
+            snippet_id (int): The snippet to update.
+            tags (str | None): Its current comma-separated tags.
+            new_tags (str | None): Comma-separated tags to add.
+
+        Returns:
+            None
+        """
+        merged = [t.strip() for t in (tags or "").split(",") if t.strip()]
+        for tag in (new_tags or "").split(","):
+            tag = tag.strip()
+            if tag and tag not in merged:
+                merged.append(tag)
+        conn.execute("UPDATE snippets SET tags = ? WHERE id = ?", (",".join(merged), snippet_id))
+
+    def import_from_yaml(
+        self,
+        yaml_path: Path,
+        duplicates: str = "keep",
+        batch_size: int = IMPORT_BATCH_SIZE,
+        progress=None,
+        validation: Dict[str, Any] | None = None,
+        indices=None,
+    ) -> Dict[str, int]:
+        """
+        Import snippets from a YAML file into the database.
+
+        The file is streamed with iter_yaml_snippets and written in
+        batches of batch_size entries, each in its own transaction, so
+        memory stays flat and other writers get a turn between batches.
+        Batches already written are kept if the import is cancelled or
+        a later entry fails to parse.
+
+        Given the report of validate_yaml for the same file, entries it
+        rejected are left out and the rest are normalised first. Given
+        indices, for example categories picked from preview_yaml, only
+        those entries are imported.
+
+        Args:
+            yaml_path (Path): The source YAML file path.
+            duplicates (str): Duplicate handling, see import_snippets.
+            batch_size (int): Entries written per transaction.
+            progress (Callable[[int, int], bool] | None): Called after each
+                batch with bytes read and file size. Returning False
+                cancels the import.
+            validation (Dict[str, Any] | None): A validate_yaml report.
+            indices (Iterable[int] | None): Positions of the entries to import.
+
+        Returns:
+            Dict[str, int] | None: The import_snippets counts summed over
+                all batches plus "cancelled" (1 if stopped early) and
+                "invalid" (entries left out by validation), or None if an
+                error occurred.
+        """
+        logger.info("Importing snippets from YAML.")
+        logger.debug(f"YAML Path: {yaml_path}")
+
+        try:
+            counts = self._import_stream(
+                lambda track: iter_yaml_snippets(Path(yaml_path), progress=track),
+                duplicates,
+                batch_size,
+                progress,
+                validation,
+                indices,
+            )
+            if counts is not None:
+                logger.info(f"Successfully imported snippets from YAML: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"An error occured while importing your snippets: {e}")
+            return None
+
+    def export_to_archive(self, archive_path: Path, progress=None) -> Dict[str, int]:
+        """
+        Export all snippets to a .qsnip archive.
+
+        Streams rows exactly like export_to_yaml, but writes the
+        checksummed JSON-Lines archive described in snippet_archive.
+
+        Args:
+            archive_path (Path): The destination archive path.
+            progress (Callable[[int, int], bool] | None): Called after each
+                archive member with snippets written and the total.
+                Returning False cancels the export and leaves
+                archive_path untouched.
+
+        Returns:
+            Dict[str, int] | None: "exported" (snippets written) and
+                "cancelled" (1 if stopped early), or None on error.
+        """
+        logger.info("Exporting snippets to archive.")
+        logger.debug(f"Archive Path: {archive_path}")
+
+        try:
+            total = self.conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+            exported = FileUtils.export_snippets_archive(
+                Path(archive_path), self.iter_snippets(), total=total, progress=progress
+            )
+            logger.info("Successfully exported snippets to archive.")
+            return {"exported": exported, "cancelled": 0}
+        except StreamCancelled:
+            logger.info("Snippet export cancelled.")
+            return {"exported": 0, "cancelled": 1}
+        except Exception as e:
+            logger.error(f"An error occured while exporting your snippets: {e}")
+            return None
+
+    def import_from_archive(
+        self,
+        archive_path: Path,
+        duplicates: str = "keep",
+        folders: List[str] | None = None,
+        tags: List[str] | None = None,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        progress=None,
+        validation: Dict[str, Any] | None = None,
+        indices=None,
+    ) -> Dict[str, int]:
+        """
+        Import snippets from a .qsnip archive into the database.
+
+        Behaves like import_from_yaml. With folders or tags only the
+        matching snippets are imported, and archive members that hold
+        none of them are never decompressed.
+
+        Args:
+            archive_path (Path): The source archive path.
+            duplicates (str): Duplicate handling, see import_snippets.
+            folders (List[str] | None): Only import snippets in these folders.
+            tags (List[str] | None): Only import snippets with any of these tags.
+            batch_size (int): Entries written per transaction.
+            progress (Callable[[int, int], bool] | None): Called after each
+                batch with records read and the total to read. Returning
+                False cancels the import.
+            validation (Dict[str, Any] | None): A validate_archive report
+                made with the same folders and tags.
+            indices (Iterable[int] | None): Positions of the entries to
+                import, as reported by preview_archive.
+
+        Returns:
+            Dict[str, int] | None: Counts as for import_from_yaml, or None
+                if an error occurred.
+        """
+        logger.info("Importing snippets from archive.")
+        logger.debug(f"Archive Path: {archive_path}, folders: {folders}, tags: {tags}")
+
+        try:
+            counts = self._import_stream(
+                lambda track: iter_archive(Path(archive_path), folders=folders, tags=tags, progress=track),
+                duplicates,
+                batch_size,
+                progress,
+                validation,
+                indices,
+            )
+            if counts is not None:
+                logger.info(f"Successfully imported snippets from archive: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"An error occured while importing your snippets: {e}")
+            return None
+
+    def export_since(self, since: float) -> Dict[str, Any]:
+        """
+        Collect the snippets changed and deleted since a timestamp.
+
+        Changed rows are found through the updated_at index and deletions
+        through snippet_tombstones, so the cost depends on how much
+        changed rather than on the size of the library. Pass the returned
+        "until" as since next time to continue where this delta ends. The
+        bound is inclusive, because timestamps only have millisecond
+        resolution; rows stamped exactly at "until" are sent again, and
+        import_delta applies them as no-ops.
+
+        Args:
+            since (float): Epoch seconds of the previous delta's "until".
+                0 exports everything.
+
+        Returns:
+            Dict[str, Any] | None: "since", "until", "snippets" (DELTA_FIELDS
+                dicts in updated_at order) and "deleted" (dicts with
+                "trigger" and "deleted_at"), or None if an error occurred.
+        """
+        logger.info("Exporting snippet changes.")
+        logger.debug(f"Since: {since}")
+
+        try:
+            cur = self.conn.cursor()
+            selected = ", ".join(SNIPPET_TEXT_SQL if f == "snippet" else f for f in DELTA_FIELDS)
+            cur.execute(
+                f"SELECT {selected} FROM snippets WHERE updated_at >= ? OR updated_at IS NULL ORDER BY updated_at, id",
+                (since,),
+            )
+            snippets = [dict(zip(DELTA_FIELDS, row)) for row in cur.fetchall()]
+            cur.execute(
+                "SELECT trigger, deleted_at FROM snippet_tombstones WHERE deleted_at >= ? ORDER BY deleted_at",
+                (since,),
+            )
+            deleted = [{"trigger": trigger, "deleted_at": deleted_at} for trigger, deleted_at in cur.fetchall()]
+
+            stamps = [s["updated_at"] for s in snippets if s["updated_at"] is not None]
+            stamps += [d["deleted_at"] for d in deleted]
+            delta = {"since": since, "until": max(stamps, default=since), "snippets": snippets, "deleted": deleted}
+
+            logger.info(f"Exported {len(snippets)} changed and {len(deleted)} deleted snippets.")
+            return delta
+        except Exception as e:
+            logger.error(f"An error occured while exporting snippet changes: {e}")
+            return None
+
+    def import_delta(self, delta: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Apply a delta produced by export_since in one transaction.
+
+        Snippets are upserted by trigger and deletions remove the trigger.
+        Both keep the source's timestamps, and the most recent change
+        wins: an entry older than the local snippet, or older than a
+        local deletion of its trigger, is counted as stale and skipped.
+        Deletions of triggers that do not exist here are still recorded
+        as tombstones, without being counted, so they are passed on in
+        this database's own deltas. Entries are normalised as in
+        validated imports.
+
+        Args:
+            delta (Dict[str, Any]): A delta from export_since, for example
+                read back with FileUtils.read_yaml.
+
+        Returns:
+            Dict[str, int] | None: Counts for "new", "updated", "deleted",
+                "stale" and "invalid", or None if an error occurred.
+        """
+        logger.info("Importing snippet changes.")
+
+        counts = {"new": 0, "updated": 0, "deleted": 0, "stale": 0, "invalid": 0}
+        try:
+            with self._write() as conn:
+                for entry in delta.get("snippets") or []:
+                    normalised, _ = normalise_entry(entry)
+                    if normalised is None:
+                        counts["invalid"] += 1
+                        continue
+                    updated_at = entry.get("updated_at")
+                    row = conn.execute(
+                        "SELECT updated_at FROM snippets WHERE trigger = ? "
+                        "UNION ALL SELECT deleted_at FROM snippet_tombstones WHERE trigger = ?",
+                        (normalised["trigger"], normalised["trigger"]),
+                    ).fetchone()
+                    if row is not None and None not in (row[0], updated_at) and row[0] > updated_at:
+                        counts["stale"] += 1
+                        continue
+
+                    params = dict(normalised, created_at=entry.get("created_at"), updated_at=updated_at)
+                    params["snippet"], params["body_format"] = encode_body(
+                        normalised["snippet"], self.compress_threshold, self.compression
+                    )
+                    params["content_hash"] = content_hash(normalised["snippet"])
+                    exists = conn.execute("SELECT 1 FROM snippets WHERE trigger = ?", (normalised["trigger"],)).fetchone()
+                    conn.execute("""
+                        INSERT INTO snippets (enabled, label, trigger, snippet, body_format, content_hash, paste_style, return_press, folder, tags, created_at, updated_at)
+                        VALUES (:enabled, :label, :trigger, :snippet, :body_format, :content_hash, :paste_style, :return_press, :folder, :tags, :created_at, :updated_at)
+                        ON CONFLICT(trigger) DO UPDATE SET
+                            enabled = excluded.enabled,
+                            label = excluded.label,
+                            snippet = excluded.snippet,
+                            body_format = excluded.body_format,
+                            content_hash = excluded.content_hash,
+                            paste_style = excluded.paste_style,
+                            return_press = excluded.return_press,
+                            folder = excluded.folder,
+                            tags = excluded.tags,
+                            updated_at = COALESCE(excluded.updated_at, updated_at)
+                    """, params)
+                    counts["updated" if exists else "new"] += 1
+
+                for tombstone in delta.get("deleted") or []:
+                    trigger, deleted_at = tombstone.get("trigger"), tombstone.get("deleted_at")
+                    row = conn.execute("SELECT updated_at FROM snippets WHERE trigger = ?", (trigger,)).fetchone()
+                    if row is None:
+                        # Record it anyway, so it is forwarded to other
+                        # peers and blocks older upserts of the trigger
+                        conn.execute(f"""
+                            INSERT INTO snippet_tombstones (trigger, deleted_at)
+                            VALUES (?, COALESCE(?, {SQL_EPOCH_NOW}))
+                            ON CONFLICT(trigger) DO UPDATE SET
+                                deleted_at = MAX(deleted_at, excluded.deleted_at)
+                        """, (trigger, deleted_at))
+                        continue
+                    if None not in (row[0], deleted_at) and row[0] > deleted_at:
+                        counts["stale"] += 1
+                        continue
+                    conn.execute("DELETE FROM snippets WHERE trigger = ?", (trigger,))
+                    if deleted_at is not None:
+                        conn.execute("UPDATE snippet_tombstones SET deleted_at = ? WHERE trigger = ?", (deleted_at, trigger))
+                    counts["deleted"] += 1
+
+            logger.info(f"Imported snippet changes: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"An error occured while importing snippet changes: {e}")
+            return None
+
+    def validate_yaml(self, yaml_path: Path, workers: int | None = None, progress=None) -> Dict[str, Any]:
+        """
+        Check a YAML export file before importing it.
+
+        Nothing is written. The report can be passed to import_from_yaml
+        to import only the entries that passed.
+
+        Args:
+            yaml_path (Path): The source YAML file path.
+            workers (int | None): Worker processes, see validate_entries.
+            progress (Callable[[int, int], bool] | None): Called after each
+                chunk with bytes read and file size. Returning False cancels.
+
+        Returns:
+            Dict[str, Any] | None: The validate_entries report, or None if
+                the file could not be read.
+        """
+        logger.info("Validating snippets in YAML file.")
+        try:
+            return self._validate_stream(
+                lambda track: iter_yaml_snippets(Path(yaml_path), progress=track), workers, progress
+            )
+        except Exception as e:
+            logger.error(f"An error occured while validating your snippets: {e}")
+            return None
+
+    def validate_archive(
+        self,
+        archive_path: Path,
+        folders: List[str] | None = None,
+        tags: List[str] | None = None,
+        workers: int | None = None,
+        progress=None,
+    ) -> Dict[str, Any]:
+        """
+        Check a .qsnip archive, or part of one, before importing it.
+
+        Args:
+            archive_path (Path): The source archive path.
+            folders (List[str] | None): Only check snippets in these folders.
+            tags (List[str] | None): Only check snippets with any of these tags.
+            workers (int | None): Worker processes, see validate_entries.
+            progress (Callable[[int, int], bool] | None): Called after each
+                chunk with records read and the total. Returning False cancels.
+
+        Returns:
+            Dict[str, Any] | None: The validate_entries report, or None if
+                the archive could not be read.
+        """
+        logger.info("Validating snippets in archive.")
+        try:
+            return self._validate_stream(
+                lambda track: iter_archive(Path(archive_path), folders=folders, tags=tags, progress=track),
+                workers,
+                progress,
+            )
+        except Exception as e:
+            logger.error(f"An error occured while validating your snippets: {e}")
+            return None
+
+    def _validate_stream(self, open_entries, workers: int | None, progress) -> Dict[str, Any]:
+        """
+        Run validate_entries over a stream, resolving references here.
+
+        Nested references to triggers outside the stream are looked up in
+        this database and its libraries, with the same precedence the
+        expander uses.
+
+        Args:
+            open_entries (Callable): Opens the entry stream, as for _import_stream.
+            workers (int | None): Worker processes.
+            progress (Callable[[int, int], bool] | None): Called with the
+                reader's position after each chunk.
+
+        Returns:
+            Dict[str, Any]: The validate_entries report.
+        """
+        position = [0, 0]
+
+        def track(done, total):
+            position[0], position[1] = done, total
+
+        def resolve(triggers):
+            rows = self.get_snippets_by_triggers(triggers) or []
+            bodies = {}
+            # Lower ranks win, so they are applied last
+            for row in sorted(rows, key=lambda r: library_rank(r["id"]), reverse=True):
+                bodies[row["trigger"]] = row["snippet"]
+            return bodies
+
+        return validate_entries(
+            open_entries(track),
+            resolve=resolve,
+            workers=workers,
+            progress=None if progress is None else lambda done: progress(*position),
+        )
+
+    def preview_yaml(self, yaml_path: Path, validation: Dict[str, Any] | None = None, progress=None) -> Dict[str, Any]:
+        """
+        Work out what importing a YAML file would change, without importing it.
+
+        Args:
+            yaml_path (Path): The source YAML file path.
+            validation (Dict[str, Any] | None): A validate_yaml report; its
+                rejected entries are counted as invalid and the rest are
+                compared in normalised form.
+            progress (Callable[[int, int], bool] | None): Called periodically
+                with bytes read and file size. Returning False cancels.
+
+        Returns:
+            Dict[str, Any] | None: The import_preview.diff_entries result,
+                or None if an error occurred.
+        """
+        logger.info("Previewing YAML import.")
+        try:
+            return self._preview_stream(
+                lambda track: iter_yaml_snippets(Path(yaml_path), progress=track), validation, progress
+            )
+        except Exception as e:
+            logger.error(f"An error occured while previewing the import: {e}")
+            return None
+
+    def preview_archive(
+        self,
+        archive_path: Path,
+        folders: List[str] | None = None,
+        tags: List[str] | None = None,
+        validation: Dict[str, Any] | None = None,
+        progress=None,
+    ) -> Dict[str, Any]:
+        """
+        Work out what importing a .qsnip archive would change.
+
+        Args:
+            archive_path (Path): The source archive path.
+            folders (List[str] | None): Only preview snippets in these folders.
+            tags (List[str] | None): Only preview snippets with any of these tags.
+            validation (Dict[str, Any] | None): A validate_archive report
+                made with the same folders and tags.
+            progress (Callable[[int, int], bool] | None): Called periodically
+                with records read and the total. Returning False cancels.
+
+        Returns:
+            Dict[str, Any] | None: The import_preview.diff_entries result,
+                or None if an error occurred.
+        """
+        logger.info("Previewing archive import.")
+        try:
+            return self._preview_stream(
+                lambda track: iter_archive(Path(archive_path), folders=folders, tags=tags, progress=track),
+                validation,
+                progress,
+            )
+        except Exception as e:
+            logger.error(f"An error occured while previewing the import: {e}")
+            return None
+
+    def _preview_stream(self, open_entries, validation: Dict[str, Any] | None, progress) -> Dict[str, Any]:
+        """
+        Diff a stream of entries against a snapshot of the snippets table.
+
+        The snapshot comes from a single query returning every trigger, id,
+        content hash and compared setting. Rows whose hash has not been
+        backfilled yet also return their body so it can be hashed here.
+
+        Args:
+            open_entries (Callable): Opens the entry stream, as for _import_stream.
+            validation (Dict[str, Any] | None): A validate_entries report.
+            progress (Callable[[int, int], bool] | None): Called with the
+                reader's position.
+
+        Returns:
+            Dict[str, Any]: The import_preview.diff_entries result.
+        """
+        existing, existing_ids, existing_hashes = {}, {}, {}
+        cur = self.conn.execute(f"""
+            SELECT id, trigger, content_hash, CASE WHEN content_hash IS NULL THEN {SNIPPET_TEXT_SQL} END,
+                   {COMPARED_SQL}
+            FROM snippets
+        """)
+        for row in cur:
+            snippet_id, trigger, digest = row[0], row[1], row[2]
+            if digest is None:
+                digest = content_hash(row[3])
+            existing[trigger] = (snippet_id, digest, row[4:])
+            existing_ids[snippet_id] = trigger
+            existing_hashes.setdefault(digest, trigger)
+
+        position = [0, 0]
+
+        def track(done, total):
+            position[0], position[1] = done, total
+
+        entries = open_entries(track)
+        skip = ()
+        if validation is not None:
+            skip = set(validation["rejected"])
+            entries = (
+                None if index in skip else normalise_entry(entry)[0]
+                for index, entry in enumerate(entries)
+            )
+
+        return diff_entries(
+            entries,
+            existing,
+            existing_ids,
+            existing_hashes,
+            skip=skip,
+            progress=None if progress is None else lambda done: progress(*position),
+        )
+
+    def _import_stream(
+        self,
+        open_entries,
+        duplicates: str,
+        batch_size: int,
+        progress,
+        validation: Dict[str, Any] | None = None,
+        indices=None,
+    ) -> Dict[str, int]:
+        """
+        Write streamed entries to the database in batches.
+
+        Args:
+            open_entries (Callable[[Callable[[int, int], None]], Iterator[dict]]):
+                Opens the entry stream, given a callback that records the
+                reader's (done, total) position.
+            duplicates (str): Duplicate handling, see import_snippets.
+            batch_size (int): Entries written per transaction.
+            progress (Callable[[int, int], bool] | None): Called after each
+                batch with the reader's position. Returning False cancels.
+            validation (Dict[str, Any] | None): A validate_entries report for
+                the same stream; its rejected entries are skipped and the
+                rest normalised.
+            indices (Iterable[int] | None): Only import entries at these
+                positions in the stream.
+
+        Returns:
+            Dict[str, int] | None: Summed import_snippets counts plus
+                "cancelled" and "invalid", or None if a batch failed.
+        """
+        counts = {"new": 0, "updated": 0, "skipped": 0, "merged": 0, "failed": 0, "cancelled": 0, "invalid": 0}
+        position = [0, 0]
+
+        def track(done, total):
+            position[0], position[1] = done, total
+
+        entries = open_entries(track)
+        if validation is not None:
+            rejected = set(validation["rejected"])
+            counts["invalid"] = len(rejected)
+        if validation is not None or indices is not None:
+            wanted = None if indices is None else set(indices)
+            entries = (
+                normalise_entry(entry)[0] if validation is not None else entry
+                for index, entry in enumerate(entries)
+                if (validation is None or index not in rejected) and (wanted is None or index in wanted)
+            )
+        while True:
+            batch = list(islice(entries, batch_size))
+            if not batch:
+                break
+
+            result = self.import_snippets(batch, duplicates)
+            if result is None:
+                return None
+            for key, value in result.items():
+                counts[key] += value
+
+            if progress is not None and progress(*position) is False:
+                logger.info("Snippet import cancelled.")
+                counts["cancelled"] = 1
+                break
+
+        return counts
+
     # Close Connection
     def close(self):
         """
-        Close the database connection.
+        Close every pooled database connection.
 
         Returns:
             None
         """
         logger.info("Closing database connection.")
         try:
-            self.conn.close()
+            self.pool.close()
             logger.info("Database connection closed successfully.")
         except Exception as e:
             logger.error(f"An error occured while closing the database connection: {e}")
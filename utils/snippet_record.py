@@ -0,0 +1,157 @@
+import sqlite3
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+from .body_codec import decode_body
+
+# Keys exposed by SnippetRecord as a mapping, in SELECT order.
+SNIPPET_COLUMNS = (
+    "id",
+    "enabled",
+    "label",
+    "trigger",
+    "snippet",
+    "paste_style",
+    "return_press",
+    "folder",
+    "tags",
+    "use_count",
+    "last_used",
+)
+
+# Storage details selected after SNIPPET_COLUMNS but not exposed as keys
+STORAGE_COLUMNS = ("body_format", "content_hash")
+
+# SnippetRecord is built positionally from rows in this order, so
+# queries must select SNIPPET_SELECT rather than "*".
+SNIPPET_SELECT = ", ".join(SNIPPET_COLUMNS + STORAGE_COLUMNS)
+_COLUMN_SET = frozenset(SNIPPET_COLUMNS)
+
+# Values SQLite may hand back for a false BOOLEAN column
+_FALSE_VALUES = frozenset((b"0", b"", b"False", b"false"))
+
+
+def _convert_boolean(value: bytes) -> bool:
+    """
+    Convert a raw BOOLEAN column value into a Python bool.
+
+    Args:
+        value (bytes): The column value as returned by SQLite.
+
+    Returns:
+        bool: False for 0 or "False", otherwise True.
+    """
+    return value not in _FALSE_VALUES
+
+
+# Registered once for the process. Connections opened with
+# detect_types=PARSE_DECLTYPES apply it to every BOOLEAN column in C,
+# so rows no longer need a Python pass to fix up 1/0 flags.
+sqlite3.register_converter("BOOLEAN", _convert_boolean)
+
+
+class SnippetRecord(Mapping):
+    """
+    Compact, read-only representation of a snippet row.
+
+    Records use __slots__ instead of a per-instance dictionary, which
+    roughly halves memory for large libraries, while still supporting
+    dictionary style access (record["trigger"], record.get("tags"),
+    dict(record)) so existing callers keep working. Attribute access
+    (record.trigger) is also available and is the fastest path.
+
+    Compressed bodies stay compressed in memory and are only decoded
+    when the snippet key or attribute is read.
+    """
+    __slots__ = tuple(c for c in SNIPPET_COLUMNS if c != "snippet") + ("_body",) + STORAGE_COLUMNS
+
+    def __init__(self, id, enabled, label, trigger, snippet, paste_style, return_press, folder, tags,
+                 use_count=0, last_used=None, body_format=0, content_hash=None) -> None:
+        """
+        Initialize the SnippetRecord.
+
+        Args:
+            id (int): The snippet identifier.
+            enabled (bool): Whether the snippet is active.
+            label (str): Display name of the snippet.
+            trigger (str): Text that expands the snippet.
+            snippet (str | bytes): The snippet body as stored.
+            paste_style (str): Paste method.
+            return_press (bool): Whether Enter is pressed after pasting.
+            folder (str | None): Folder name.
+            tags (str): Comma-separated tags.
+            use_count (int): Number of recorded expansions.
+            last_used (float | None): Epoch seconds of the last expansion.
+            body_format (int): Storage format of snippet, see body_codec.
+            content_hash (str | None): Normalised body hash used to find
+                duplicates, see body_codec.content_hash.
+
+        Returns:
+            None
+        """
+        self.id = id
+        self.enabled = enabled
+        self.label = label
+        self.trigger = trigger
+        self._body = snippet
+        self.paste_style = paste_style
+        self.return_press = return_press
+        self.folder = folder
+        self.tags = tags
+        self.use_count = use_count
+        self.last_used = last_used
+        self.body_format = body_format
+        self.content_hash = content_hash
+
+    @property
+    def snippet(self) -> str:
+        """
+        Return the plaintext snippet body, decompressing it if needed.
+
+        Returns:
+            str: The snippet body.
+        """
+        return decode_body(self._body, self.body_format)
+
+    @classmethod
+    def from_row(cls, cursor: sqlite3.Cursor, row: tuple) -> "SnippetRecord":
+        """
+        Build a record from a row selected with SNIPPET_SELECT.
+
+        The signature matches sqlite3 row factories, so this can be set
+        directly as cursor.row_factory.
+
+        Args:
+            cursor (sqlite3.Cursor): The cursor that produced the row.
+            row (tuple): The row values in SNIPPET_COLUMNS order.
+
+        Returns:
+            SnippetRecord: The new record.
+        """
+        return cls(*row)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _COLUMN_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SNIPPET_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(SNIPPET_COLUMNS)
+
+    def __repr__(self) -> str:
+        return f"SnippetRecord(id={self.id!r}, trigger={self.trigger!r}, label={self.label!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return a plain dictionary copy of the record.
+
+        Use this when the data leaves Python code that understands
+        mappings, such as Qt signals declared with dict or YAML dumping.
+
+        Returns:
+            Dict[str, Any]: The snippet as a dictionary.
+        """
+        return {column: getattr(self, column) for column in SNIPPET_COLUMNS}
@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds between batched usage writes
+DEFAULT_FLUSH_SECONDS = 30.0
+
+
+class UsageTracker:
+    """
+    Write-behind buffer for snippet usage statistics.
+
+    Expansions call record() from the keyboard listener thread, which
+    only updates an in-memory map. flush() swaps the map out and writes
+    every pending count to SnippetDB in a single transaction, so typing
+    never waits on SQLite.
+    """
+    def __init__(self, snippet_db, flush_seconds: float = DEFAULT_FLUSH_SECONDS) -> None:
+        """
+        Initialize the UsageTracker.
+
+        Args:
+            snippet_db (SnippetDB): The database the counts are written to.
+            flush_seconds (float): Minimum seconds between automatic flushes.
+
+        Returns:
+            None
+        """
+        self.snippet_db = snippet_db
+        self.flush_seconds = flush_seconds
+
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[int, float]] = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, snippet_id: int | None) -> None:
+        """
+        Count one use of a snippet.
+
+        Args:
+            snippet_id (int | None): The expanded snippet. None is ignored.
+
+        Returns:
+            None
+        """
+        if snippet_id is None:
+            return
+        now = time.time()
+        with self._lock:
+            count, _ = self._pending.get(snippet_id, (0, now))
+            self._pending[snippet_id] = (count + 1, now)
+
+    def pending_count(self) -> int:
+        """
+        Return the number of snippets with unsaved usage.
+
+        Returns:
+            int: Snippets waiting to be flushed.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def flush_due(self) -> bool:
+        """
+        Check whether the flush interval has passed with usage pending.
+
+        Returns:
+            bool: True if flush() should run now.
+        """
+        return bool(self._pending) and time.monotonic() - self._last_flush >= self.flush_seconds
+
+    def flush(self) -> int:
+        """
+        Write all pending usage to the database in one transaction.
+
+        If the write fails the counts are merged back so they are retried
+        on the next flush.
+
+        Returns:
+            int: The number of snippets written.
+        """
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+
+        if not batch:
+            return 0
+
+        if self.snippet_db.record_usage(batch) is None:
+            logger.warning("Usage flush failed; keeping %d snippets for retry", len(batch))
+            with self._lock:
+                for snippet_id, (count, last_used) in batch.items():
+                    pending_count, pending_last = self._pending.get(snippet_id, (0, last_used))
+                    self._pending[snippet_id] = (count + pending_count, max(last_used, pending_last))
+            return 0
+
+        logger.debug("Flushed usage for %d snippets", len(batch))
+        return len(batch)
@@ -0,0 +1,74 @@
+import logging
+from typing import Any, BinaryIO, TextIO
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+
+logger = logging.getLogger(__name__)
+
+# True when PyYAML was built against libyaml
+HAS_LIBYAML = bool(getattr(yaml, "__with_libyaml__", False))
+
+if HAS_LIBYAML:
+    from yaml._yaml import CParser
+
+    SafeLoader = yaml.CSafeLoader
+    SafeDumper = yaml.CSafeDumper
+
+    class StreamLoader(CParser, Composer, SafeConstructor, Resolver):
+        """
+        Safe loader that parses events in C but composes nodes in Python.
+
+        CSafeLoader only composes whole documents, while streaming readers
+        need compose_node() to build one list item at a time. This pairs
+        libyaml's event parser with PyYAML's composer and safe constructor.
+        """
+
+        compose_node = Composer.compose_node
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+else:
+    SafeLoader = yaml.SafeLoader
+    SafeDumper = yaml.SafeDumper
+    StreamLoader = yaml.SafeLoader
+
+logger.debug("YAML codec using %s", "libyaml" if HAS_LIBYAML else "pure Python")
+
+
+def load(stream: str | bytes | TextIO | BinaryIO) -> Any:
+    """
+    Parse a single YAML document with the fastest available safe loader.
+
+    Drop-in replacement for yaml.safe_load.
+
+    Args:
+        stream (str | bytes | TextIO | BinaryIO): YAML text or an open file.
+
+    Returns:
+        Any: The parsed document, or None for an empty stream.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump(data: Any, stream: TextIO | None = None, **kwargs: Any) -> str | None:
+    """
+    Serialise data with the fastest available safe dumper.
+
+    Drop-in replacement for yaml.safe_dump; both dumpers emit the same
+    text for the plain dicts, lists and scalars QSnippet writes.
+
+    Args:
+        data (Any): The object to serialise.
+        stream (TextIO | None): File to write to, or None to return a string.
+        **kwargs (Any): Extra yaml.dump options such as sort_keys.
+
+    Returns:
+        str | None: The YAML text when no stream is given.
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
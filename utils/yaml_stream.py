@@ -0,0 +1,156 @@
+import logging
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, TextIO
+
+from yaml.events import (
+    DocumentEndEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from . import yaml_codec
+
+logger = logging.getLogger(__name__)
+
+# Receives (done, total) as a file is read or written
+ProgressCallback = Callable[[int, int], Any]
+
+# Entries serialised per emitter call when exporting
+EXPORT_CHUNK_SIZE = 500
+
+
+class StreamCancelled(Exception):
+    """
+    Raised when a progress callback asks a streaming export to stop.
+    """
+
+
+def iter_yaml_snippets(path: Path, progress: ProgressCallback | None = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream snippet entries from an export file one at a time.
+
+    Reads the same {"snippets": [...]} layout as
+    FileUtils.import_snippets_yaml, but walks the parser's event stream
+    and composes only one list item at a time, so memory stays flat
+    however large the file is. Events come from libyaml when available. Other top-level keys are parsed and
+    discarded. Items that are not mappings are skipped with a warning.
+
+    Args:
+        path (Path): The YAML file to read.
+        progress (ProgressCallback | None): Called after every entry with
+            the bytes consumed so far and the file size.
+
+    Yields:
+        Dict[str, Any]: Snippet entries in file order.
+
+    Raises:
+        ValueError: If "snippets" is present but is not a list.
+        yaml.YAMLError: If the file is not valid YAML.
+    """
+    path = Path(path)
+    total = os.path.getsize(path)
+
+    with path.open("rb") as f:
+        loader = yaml_codec.StreamLoader(f)
+        try:
+            # StreamStart, then an empty stream or a DocumentStart
+            loader.get_event()
+            if loader.check_event(StreamEndEvent):
+                return
+            loader.get_event()
+            if not loader.check_event(MappingStartEvent):
+                # An empty or scalar document has no snippets
+                return
+            loader.get_event()
+
+            while not loader.check_event(MappingEndEvent):
+                key_node = loader.compose_node(None, None)
+                key = key_node.value if key_node.tag.endswith(":str") else None
+
+                if key != "snippets":
+                    loader.compose_node(None, None)
+                    continue
+
+                if loader.check_event(ScalarEvent) and loader.peek_event().value in ("", "~", "null"):
+                    loader.get_event()
+                    continue
+                if not loader.check_event(SequenceStartEvent):
+                    raise ValueError("Invalid YAML format: 'snippets' must be a list.")
+                loader.get_event()
+
+                count = 0
+                while not loader.check_event(SequenceEndEvent):
+                    node = loader.compose_node(None, None)
+                    entry = loader.construct_document(node)
+                    if isinstance(entry, dict):
+                        count += 1
+                        yield entry
+                    else:
+                        logger.warning("Skipping snippet entry that is not a mapping: %r", entry)
+                    if progress is not None:
+                        progress(min(f.tell(), total), total)
+                loader.get_event()
+                logger.info("Streamed %d snippets from %s", count, path)
+
+            loader.get_event()
+            if not loader.check_event(DocumentEndEvent):
+                logger.warning("Ignoring extra YAML documents after the first in %s", path)
+        finally:
+            loader.dispose()
+
+    if progress is not None:
+        progress(total, total)
+
+
+def write_yaml_snippets(
+    f: TextIO,
+    snippets: Iterable[Mapping[str, Any]],
+    total: int | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    progress: ProgressCallback | None = None,
+) -> int:
+    """
+    Write snippets in the export layout without holding them all in memory.
+
+    Produces the same text as yaml.safe_dump({"snippets": [...]}): the
+    top-level key is written once and each chunk of entries is dumped
+    as a block sequence, which PyYAML emits at the same indentation as
+    a sequence nested under a mapping key.
+
+    Args:
+        f (TextIO): An open text file to write to.
+        snippets (Iterable[Mapping[str, Any]]): Entries in export order.
+        total (int | None): Total number of entries, for progress only.
+        chunk_size (int): Entries serialised per emitter call.
+        progress (ProgressCallback | None): Called after every chunk with
+            entries written and total. Returning False cancels.
+
+    Returns:
+        int: The number of entries written.
+
+    Raises:
+        StreamCancelled: If progress returned False.
+    """
+    snippets = iter(snippets)
+    written = 0
+
+    while True:
+        # Rows may be SnippetRecord mappings, which YAML cannot represent
+        chunk = [dict(s) for s in islice(snippets, chunk_size)]
+        if not chunk:
+            break
+        if not written:
+            f.write("snippets:\n")
+        yaml_codec.dump(chunk, f)
+        written += len(chunk)
+        if progress is not None and progress(written, total if total is not None else written) is False:
+            raise StreamCancelled(f"Export cancelled after {written} snippets")
+
+    if not written:
+        f.write("snippets: []\n")
+    return written